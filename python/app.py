@@ -3,193 +3,194 @@ Módulo: API REST Flask
 Descripción: API para el Sistema de Gestión de Inventario
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, make_response
 from flask_cors import CORS
-import sys
-import os
 
-# Agregar src al path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from gestor_inventario import GestorInventario
+import servicio_inventario as servicio
 
 app = Flask(__name__)
 CORS(app)
 
 # Instancia global del gestor
-gestor = GestorInventario()
+# INVENTARIO_ALMACEN=columnar usa el almacén columnar (requiere NumPy)
+gestor = servicio.crear_gestor()
+
+# Procesador de órdenes en segundo plano
+# INVENTARIO_TRABAJADORES=n lo inicia con n hilos al arrancar el servidor
+procesador = servicio.crear_procesador(gestor)
+
+# Instantáneas periódicas (INVENTARIO_INSTANTANEA_SEGUNDOS), None si no se configuran
+instantaneas = servicio.crear_instantaneas(gestor)
 
 # Cargar datos de ejemplo
 def cargar_datos_ejemplo():
     """Carga datos de ejemplo para demostración"""
-    gestor.agregar_producto("Laptop", 5, 999.99, "Electrónica")
-    gestor.agregar_producto("Mouse", 20, 29.99, "Electrónica")
-    gestor.agregar_producto("Teclado", 15, 79.99, "Electrónica")
-    gestor.agregar_producto("Arroz 1kg", 50, 2.50, "Alimentos")
-    gestor.agregar_producto("Frijoles 1kg", 30, 3.00, "Alimentos")
-    gestor.agregar_producto("Camisa", 25, 45.00, "Ropa")
-    gestor.agregar_producto("Pantalón", 18, 65.00, "Ropa")
-    gestor.agregar_producto("JavaScript Básico", 8, 29.99, "Libros")
+    servicio.cargar_datos_ejemplo(gestor)
+
+def responder(resultado):
+    """Convierte la tupla (cuerpo, estado) del servicio en respuesta Flask"""
+    cuerpo, estado = resultado
+    if isinstance(cuerpo, servicio.JSONCodificado):
+        return Response(cuerpo.texto + "\n", status=estado, mimetype="application/json")
+    if isinstance(cuerpo, servicio.ArregloJSON):
+        return Response(cuerpo.bloques, status=estado, mimetype="application/json")
+    return jsonify(cuerpo), estado
+
+def transmitir(resultado, tipo="application/x-ndjson"):
+    """Responde con un iterador de bloques del servicio (o JSON si es un error)"""
+    cuerpo, estado = resultado
+    if isinstance(cuerpo, (dict, list)):
+        return responder(resultado)
+    if isinstance(cuerpo, servicio.Exportacion):
+        return Response(cuerpo.bloques, status=estado, content_type=cuerpo.tipo,
+                        headers={"Content-Disposition": cuerpo.disposicion()})
+    return Response(cuerpo, status=estado, mimetype=tipo)
+
+def condicional(etag, generar):
+    """
+    GET condicional: responde 304 si If-None-Match coincide con el ETag,
+    antes de recorrer o serializar nada; si no, genera la respuesta y le
+    agrega el ETag.
+    
+    Args:
+        etag: ETag vigente del recurso (None si no existe)
+        generar: Función que produce la respuesta completa
+    """
+    if etag is not None and servicio.coincide_etag(etag, request.headers.get("If-None-Match")):
+        respuesta = Response(status=304)
+    else:
+        respuesta = make_response(generar())
+        if etag is None or respuesta.status_code != 200:
+            return respuesta
+    respuesta.headers["ETag"] = etag
+    return respuesta
 
 # API Endpoints
 
 @app.route('/api/saludo', methods=['GET'])
 def saludo():
     """Endpoint de prueba"""
-    return jsonify({"mensaje": "API de Gestión de Inventario funcionando"})
+    return responder(servicio.saludo())
 
 @app.route('/api/productos', methods=['GET'])
 def obtener_productos():
-    """Obtiene todos los productos"""
-    productos = gestor.obtener_todos_productos()
-    productos_dict = [
-        {
-            "id": p.id_producto,
-            "nombre": p.nombre,
-            "cantidad": p.cantidad,
-            "precio": p.precio,
-            "categoria": p.categoria,
-            "total": p.obtener_total()
-        }
-        for p in productos
-    ]
-    return jsonify(productos_dict)
+    """Obtiene los productos (filtros, paginación por cursor o NDJSON)"""
+    if servicio.quiere_ndjson(request.args, request.headers.get("Accept")):
+        return condicional(servicio.etag_inventario(gestor, "ndjson"),
+                           lambda: transmitir(servicio.transmitir_productos(gestor, request.args)))
+    return condicional(servicio.etag_inventario(gestor),
+                       lambda: responder(servicio.obtener_productos(gestor, request.args)))
 
 @app.route('/api/productos/<id_producto>', methods=['GET'])
 def obtener_producto(id_producto):
     """Obtiene un producto específico"""
-    producto = gestor.buscar_producto_por_id(id_producto)
-    
-    if producto is None:
-        return jsonify({"error": "Producto no encontrado"}), 404
-    
-    return jsonify({
-        "id": producto.id_producto,
-        "nombre": producto.nombre,
-        "cantidad": producto.cantidad,
-        "precio": producto.precio,
-        "categoria": producto.categoria,
-        "total": producto.obtener_total()
-    })
+    return condicional(servicio.etag_producto(gestor, id_producto),
+                       lambda: responder(servicio.obtener_producto(gestor, id_producto)))
 
 @app.route('/api/productos', methods=['POST'])
 def crear_producto():
     """Crea un nuevo producto"""
-    data = request.get_json()
-    
-    try:
-        producto = gestor.agregar_producto(
-            data.get("nombre"),
-            data.get("cantidad", 0),
-            data.get("precio", 0),
-            data.get("categoria", "General")
-        )
-        
-        return jsonify({
-            "id": producto.id_producto,
-            "nombre": producto.nombre,
-            "cantidad": producto.cantidad,
-            "precio": producto.precio,
-            "categoria": producto.categoria
-        }), 201
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+    return responder(servicio.crear_producto(gestor, request.get_json(silent=True)))
+
+@app.route('/api/productos/bulk', methods=['POST'])
+def crear_productos_lote():
+    """Crea muchos productos (arreglo JSON o NDJSON)"""
+    return responder(servicio.crear_productos_lote(gestor, request.get_data(), request.content_type))
+
+@app.route('/api/productos/importar', methods=['POST'])
+def importar_productos():
+    """Importa un catálogo CSV o JSONL (el cuerpo se lee por flujo)"""
+    return responder(servicio.importar_productos(gestor, request.stream, request.args, request.content_type))
 
 @app.route('/api/productos/<id_producto>', methods=['DELETE'])
 def eliminar_producto(id_producto):
     """Elimina un producto"""
-    if gestor.eliminar_producto(id_producto):
-        return jsonify({"mensaje": "Producto eliminado"}), 200
-    else:
-        return jsonify({"error": "Producto no encontrado"}), 404
+    return responder(servicio.eliminar_producto(gestor, id_producto))
 
 @app.route('/api/productos/<id_producto>/cantidad', methods=['PUT'])
 def actualizar_cantidad(id_producto):
     """Actualiza la cantidad de un producto"""
-    data = request.get_json()
-    nueva_cantidad = data.get("cantidad")
-    
-    if nueva_cantidad is None:
-        return jsonify({"error": "Cantidad no especificada"}), 400
-    
-    if gestor.actualizar_cantidad(id_producto, nueva_cantidad):
-        return jsonify({"mensaje": "Cantidad actualizada"}), 200
-    else:
-        return jsonify({"error": "Producto no encontrado"}), 404
+    data = request.get_json(silent=True)
+    return responder(servicio.actualizar_cantidad(gestor, id_producto, data))
 
 @app.route('/api/productos/buscar/<nombre>', methods=['GET'])
 def buscar_productos(nombre):
     """Busca productos por nombre"""
-    productos = gestor.buscar_productos_por_nombre(nombre)
-    productos_dict = [
-        {
-            "id": p.id_producto,
-            "nombre": p.nombre,
-            "cantidad": p.cantidad,
-            "precio": p.precio,
-            "categoria": p.categoria
-        }
-        for p in productos
-    ]
-    return jsonify(productos_dict)
+    return condicional(servicio.etag_inventario(gestor),
+                       lambda: responder(servicio.buscar_productos(gestor, nombre)))
+
+@app.route('/api/categorias/<categoria>', methods=['GET'])
+def obtener_categoria(categoria):
+    """Obtiene los productos y totales de una categoría"""
+    return condicional(servicio.etag_inventario(gestor),
+                       lambda: responder(servicio.obtener_categoria(gestor, categoria)))
 
 @app.route('/api/ordenes', methods=['GET'])
 def obtener_ordenes():
-    """Obtiene las órdenes procesadas"""
-    return jsonify(gestor.ordenes_procesadas)
+    """Obtiene las órdenes procesadas (completas o paginadas)"""
+    return condicional(servicio.etag_inventario(gestor),
+                       lambda: responder(servicio.obtener_ordenes(gestor, request.args)))
+
+@app.route('/api/exportar/productos', methods=['GET'])
+def exportar_productos():
+    """Descarga el catálogo como CSV, JSONL o NDJSON (opcionalmente gzip)"""
+    return transmitir(servicio.exportar_productos(gestor, request.args))
+
+@app.route('/api/exportar/ordenes', methods=['GET'])
+def exportar_ordenes():
+    """Descarga las órdenes procesadas como CSV, JSONL o NDJSON (opcionalmente gzip)"""
+    return transmitir(servicio.exportar_ordenes(gestor, request.args))
 
 @app.route('/api/ordenes', methods=['POST'])
 def crear_orden():
     """Crea una nueva orden de venta"""
-    data = request.get_json()
-    
-    try:
-        orden = gestor.crear_orden_venta(
-            data.get("id_cliente"),
-            data.get("productos", [])
-        )
-        return jsonify(orden), 201
-    except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+    return responder(servicio.crear_orden(gestor, request.get_json(silent=True)))
+
+@app.route('/api/ordenes/bulk', methods=['POST'])
+def crear_ordenes_lote():
+    """Crea muchas órdenes (arreglo JSON o NDJSON)"""
+    return responder(servicio.crear_ordenes_lote(gestor, request.get_data(), request.content_type))
 
 @app.route('/api/ordenes/procesar', methods=['POST'])
 def procesar_orden():
     """Procesa el siguiente orden de la cola"""
-    orden = gestor.procesar_proximo_orden()
-    
-    if orden is None:
-        return jsonify({"error": "No hay órdenes pendientes"}), 404
-    
-    return jsonify(orden), 200
+    return responder(servicio.procesar_orden(gestor))
 
 @app.route('/api/ordenes/pendiente', methods=['GET'])
 def obtener_proximo_orden():
     """Obtiene el próximo orden sin procesarlo"""
-    orden = gestor.obtener_proximo_orden()
-    
-    if orden is None:
-        return jsonify({"mensaje": "No hay órdenes pendientes"}), 404
-    
-    return jsonify(orden)
+    return responder(servicio.obtener_proximo_orden(gestor))
 
 @app.route('/api/reporte', methods=['GET'])
 def obtener_reporte():
     """Obtiene el reporte del inventario"""
-    reporte = gestor.generar_reporte()
-    
-    # Convertir productos a diccionarios
-    productos_bajo_stock = [
-        {
-            "id": p.id_producto,
-            "nombre": p.nombre,
-            "cantidad": p.cantidad
-        }
-        for p in reporte["productos_bajo_stock"]
-    ]
-    
-    reporte["productos_bajo_stock"] = productos_bajo_stock
-    
-    return jsonify(reporte)
+    return condicional(servicio.etag_inventario(gestor),
+                       lambda: responder(servicio.obtener_reporte(gestor)))
+
+@app.route('/api/procesador', methods=['GET'])
+def estado_procesador():
+    """Estado y rendimiento del procesador de órdenes"""
+    return responder(servicio.estado_procesador(procesador))
+
+@app.route('/api/procesador/iniciar', methods=['POST'])
+def iniciar_procesador():
+    """Inicia el procesador de órdenes en segundo plano"""
+    return responder(servicio.iniciar_procesador(procesador))
+
+@app.route('/api/procesador/detener', methods=['POST'])
+def detener_procesador():
+    """Detiene el procesador de órdenes (opcionalmente drenando la cola)"""
+    return responder(servicio.detener_procesador(procesador, request.get_json(silent=True)))
+
+@app.route('/api/procesador/drenar', methods=['POST'])
+def drenar_procesador():
+    """Espera a que el procesador deje la cola vacía"""
+    return responder(servicio.drenar_procesador(procesador, request.get_json(silent=True)))
+
+@app.route('/api/instantanea', methods=['POST'])
+def guardar_instantanea():
+    """Guarda una instantánea del inventario y vacía el diario"""
+    return responder(servicio.guardar_instantanea(gestor))
 
 @app.errorhandler(404)
 def no_encontrado(error):
@@ -203,4 +204,18 @@ def error_servidor(error):
 
 if __name__ == '__main__':
     cargar_datos_ejemplo()
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    if servicio.procesador_automatico():
+        procesador.iniciar()
+    if instantaneas is not None:
+        instantaneas.iniciar()
+    # GestorInventario es seguro entre hilos: se atiende cada petición en su hilo.
+    # Sin recargador si hay archivos: el proceso padre tendría otro gestor
+    # con su propio diario e instantáneas (ver servicio.usa_archivos)
+    try:
+        app.run(debug=True, use_reloader=not servicio.usa_archivos(),
+                port=5000, host='0.0.0.0', threaded=True)
+    finally:
+        procesador.detener(tiempo_maximo=5)
+        if instantaneas is not None:
+            instantaneas.detener()
+        gestor.cerrar()
@@ -0,0 +1,424 @@
+"""
+Módulo: API REST ASGI
+Descripción: Versión asyncio/ASGI de la API del Sistema de Gestión de Inventario
+
+Expone las mismas rutas y contratos JSON que app.py (ambas usan
+servicio_inventario), pero atiende cada conexión como una corrutina en
+lugar de ocupar un hilo por cliente.
+
+Uso:
+    pip install uvicorn
+    uvicorn app_asgi:app --port 8000
+"""
+
+import asyncio
+import json
+import re
+from urllib.parse import parse_qsl
+
+import servicio_inventario as servicio
+
+# Instancia global del gestor (mismo criterio que app.py)
+gestor = servicio.crear_gestor()
+
+# Procesador de órdenes en segundo plano (ver servicio.crear_procesador)
+procesador = servicio.crear_procesador(gestor)
+
+# Instantáneas periódicas (ver servicio.crear_instantaneas), None si no se configuran
+instantaneas = servicio.crear_instantaneas(gestor)
+
+CABECERAS_CORS = [
+    (b"access-control-allow-origin", b"*"),
+]
+
+RUTAS = []  # (método, expresión regular, manejador)
+MANEJADORES_FLUJO = set()  # Manejadores que reciben el cuerpo como CuerpoEntrante
+
+
+def ruta(metodo, patron, flujo=False):
+    """
+    Registra un manejador para un método y un patrón de ruta.
+    
+    Los segmentos '<nombre>' del patrón se entregan al manejador como
+    argumentos con ese nombre, igual que en Flask. Con flujo=True el
+    cuerpo no se lee antes de llamar al manejador: peticion.cuerpo es un
+    CuerpoEntrante.
+    """
+    regex = re.compile("^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", patron) + "$")
+    
+    def decorador(manejador):
+        RUTAS.append((metodo, regex, manejador))
+        if flujo:
+            MANEJADORES_FLUJO.add(manejador)
+        return manejador
+    
+    return decorador
+
+
+class Peticion:
+    """Datos de una petición HTTP ya leída"""
+    
+    __slots__ = ('metodo', 'ruta', 'args', 'cuerpo', 'cabeceras')
+    
+    def __init__(self, scope, cuerpo):
+        self.metodo = scope["method"]
+        self.ruta = scope["path"]
+        self.args = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        self.cuerpo = cuerpo
+        self.cabeceras = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+    
+    def json(self):
+        """Cuerpo como JSON, o None si está vacío o es inválido (como get_json(silent=True))"""
+        if not self.cuerpo:
+            return None
+        try:
+            return json.loads(self.cuerpo)
+        except ValueError:
+            return None
+
+
+def serializar(cuerpo):
+    """Codifica JSON con el mismo formato que jsonify (claves ordenadas, compacto)"""
+    return json.dumps(cuerpo, sort_keys=True, separators=(",", ":")).encode() + b"\n"
+
+
+async def enviar(send, estado, cuerpo, tipo=b"application/json", cabeceras=()):
+    """Envía una respuesta completa (sin Content-Type si tipo es None)"""
+    await send({
+        "type": "http.response.start",
+        "status": estado,
+        "headers": [
+            *([(b"content-type", tipo)] if tipo is not None else []),
+            (b"content-length", str(len(cuerpo)).encode()),
+            *CABECERAS_CORS,
+            *cabeceras,
+        ],
+    })
+    await send({"type": "http.response.body", "body": cuerpo})
+
+
+async def enviar_flujo(send, estado, bloques, tipo=b"application/x-ndjson", cabeceras=()):
+    """
+    Envía una respuesta por partes, un mensaje por bloque.
+    
+    Cada bloque se genera en un hilo aparte: leer el segmento en disco del
+    historial o una página de SQLite no bloquea el bucle de eventos.
+    """
+    await send({
+        "type": "http.response.start",
+        "status": estado,
+        "headers": [(b"content-type", tipo), *CABECERAS_CORS, *cabeceras],
+    })
+    bloques = iter(bloques)
+    while (bloque := await asyncio.to_thread(next, bloques, None)) is not None:
+        await send({"type": "http.response.body", "body": bloque, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class CuerpoEntrante:
+    """
+    Cuerpo de la petición como flujo binario bloqueante (read(n)).
+    
+    Se consume desde un hilo (asyncio.to_thread): cada read() que
+    necesita más datos le pide el siguiente mensaje al bucle de eventos,
+    así el cuerpo nunca está completo en memoria.
+    """
+    
+    def __init__(self, receive, bucle):
+        self._receive = receive
+        self._bucle = bucle
+        self._pendiente = b""
+        self._fin = False
+    
+    def read(self, n=-1):
+        """Lee hasta n bytes (b"" al terminar el cuerpo); n < 0 lee lo que queda"""
+        partes = []
+        while not self._fin and (n < 0 or not self._pendiente):
+            mensaje = asyncio.run_coroutine_threadsafe(self._receive(), self._bucle).result()
+            if n < 0:
+                partes.append(mensaje.get("body", b""))
+            else:
+                self._pendiente = mensaje.get("body", b"")
+            self._fin = not mensaje.get("more_body")
+        if n < 0:
+            datos, self._pendiente = self._pendiente + b"".join(partes), b""
+            return datos
+        datos, self._pendiente = self._pendiente[:n], self._pendiente[n:]
+        return datos
+
+
+async def leer_cuerpo(receive):
+    """Lee el cuerpo completo de la petición"""
+    partes = []
+    while True:
+        mensaje = await receive()
+        partes.append(mensaje.get("body", b""))
+        if not mensaje.get("more_body"):
+            return b"".join(partes)
+
+
+async def condicional(peticion, etag, generar):
+    """
+    GET condicional: responde 304 si If-None-Match coincide con el ETag,
+    antes de recorrer o serializar nada; si no, genera la respuesta en un
+    hilo (recorrer el catálogo bloquearía el bucle de eventos) y le agrega
+    el ETag.
+    
+    Args:
+        peticion: La petición en curso
+        etag: ETag vigente del recurso (None si no existe)
+        generar: Función que retorna la tupla (cuerpo, estado) del servicio
+        
+    Returns:
+        Tupla (cuerpo, estado, cabeceras); el cuerpo es None en un 304
+    """
+    if etag is not None and servicio.coincide_etag(etag, peticion.cabeceras.get("if-none-match")):
+        return None, 304, [(b"etag", etag.encode())]
+    
+    cuerpo, estado = await asyncio.to_thread(generar)
+    if etag is None or estado != 200:
+        return cuerpo, estado, []
+    return cuerpo, estado, [(b"etag", etag.encode())]
+
+
+def resolver(metodo, ruta_peticion):
+    """
+    Busca el manejador de una ruta.
+    
+    Returns:
+        (manejador, parámetros) o (None, estado) con 404/405
+    """
+    ruta_existe = False
+    for metodo_ruta, regex, manejador in RUTAS:
+        coincidencia = regex.match(ruta_peticion)
+        if coincidencia:
+            ruta_existe = True
+            if metodo_ruta == metodo:
+                return manejador, coincidencia.groupdict()
+    return None, 405 if ruta_existe else 404
+
+
+async def app(scope, receive, send):
+    """Aplicación ASGI"""
+    if scope["type"] == "lifespan":
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                servicio.cargar_datos_ejemplo(gestor)
+                if servicio.procesador_automatico():
+                    procesador.iniciar()
+                if instantaneas is not None:
+                    instantaneas.iniciar()
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                procesador.detener(tiempo_maximo=5)
+                if instantaneas is not None:
+                    instantaneas.detener()
+                gestor.cerrar()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    
+    if scope["type"] != "http":
+        return
+    
+    if scope["method"] == "OPTIONS":
+        await enviar(send, 200, b"", tipo=b"text/plain", cabeceras=[
+            (b"access-control-allow-methods", b"GET, POST, PUT, DELETE, OPTIONS"),
+            (b"access-control-allow-headers", b"Content-Type"),
+        ])
+        return
+    
+    manejador, parametros = resolver(scope["method"], scope["path"])
+    if manejador in MANEJADORES_FLUJO:
+        peticion = Peticion(scope, CuerpoEntrante(receive, asyncio.get_running_loop()))
+    else:
+        peticion = Peticion(scope, await leer_cuerpo(receive))
+    
+    if manejador is None:
+        mensaje = "Ruta no encontrada" if parametros == 404 else "Método no permitido"
+        await enviar(send, parametros, serializar({"error": mensaje}))
+        return
+    
+    try:
+        # Los manejadores retornan (cuerpo, estado) o (cuerpo, estado, cabeceras)
+        cuerpo, estado, *extra = await manejador(peticion, **parametros)
+    except Exception:
+        cuerpo, estado, extra = {"error": "Error interno del servidor"}, 500, []
+    cabeceras = extra[0] if extra else ()
+    
+    if cuerpo is None:
+        await enviar(send, estado, b"", tipo=None, cabeceras=cabeceras)
+    elif isinstance(cuerpo, servicio.JSONCodificado):
+        await enviar(send, estado, cuerpo.texto.encode() + b"\n", cabeceras=cabeceras)
+    elif isinstance(cuerpo, (dict, list)):
+        await enviar(send, estado, serializar(cuerpo), cabeceras=cabeceras)
+    elif isinstance(cuerpo, servicio.ArregloJSON):
+        await enviar_flujo(send, estado, cuerpo.bloques, tipo=b"application/json", cabeceras=cabeceras)
+    elif isinstance(cuerpo, servicio.Exportacion):
+        await enviar_flujo(send, estado, cuerpo.bloques, tipo=cuerpo.tipo.encode(), cabeceras=[
+            *cabeceras, (b"content-disposition", cuerpo.disposicion().encode())])
+    else:
+        # Iterador de bloques: se transmite sin armar el cuerpo completo
+        await enviar_flujo(send, estado, cuerpo, cabeceras=cabeceras)
+
+
+# API Endpoints
+
+@ruta("GET", "/api/saludo")
+async def saludo(peticion):
+    """Endpoint de prueba"""
+    return servicio.saludo()
+
+
+@ruta("GET", "/api/productos")
+async def obtener_productos(peticion):
+    """Obtiene los productos (filtros, paginación por cursor o NDJSON)"""
+    if servicio.quiere_ndjson(peticion.args, peticion.cabeceras.get("accept")):
+        return await condicional(peticion, servicio.etag_inventario(gestor, "ndjson"),
+                                 lambda: servicio.transmitir_productos(gestor, peticion.args))
+    return await condicional(peticion, servicio.etag_inventario(gestor),
+                             lambda: servicio.obtener_productos(gestor, peticion.args))
+
+
+@ruta("GET", "/api/productos/<id_producto>")
+async def obtener_producto(peticion, id_producto):
+    """Obtiene un producto específico"""
+    # En SQLite la versión del producto es una consulta a la base
+    etag = await asyncio.to_thread(servicio.etag_producto, gestor, id_producto)
+    return await condicional(peticion, etag, lambda: servicio.obtener_producto(gestor, id_producto))
+
+
+@ruta("POST", "/api/productos")
+async def crear_producto(peticion):
+    """Crea un nuevo producto"""
+    # Con diario, la escritura espera su fsync: va en un hilo
+    return await asyncio.to_thread(servicio.crear_producto, gestor, peticion.json())
+
+
+@ruta("POST", "/api/productos/bulk")
+async def crear_productos_lote(peticion):
+    """Crea muchos productos (arreglo JSON o NDJSON)"""
+    return await asyncio.to_thread(servicio.crear_productos_lote, gestor, peticion.cuerpo,
+                                   peticion.cabeceras.get("content-type", ""))
+
+
+@ruta("POST", "/api/productos/importar", flujo=True)
+async def importar_productos(peticion):
+    """Importa un catálogo CSV o JSONL (el cuerpo se lee por flujo)"""
+    # La importación lee el cuerpo con lecturas bloqueantes: va en un hilo
+    return await asyncio.to_thread(servicio.importar_productos, gestor, peticion.cuerpo,
+                                   peticion.args, peticion.cabeceras.get("content-type", ""))
+
+
+@ruta("DELETE", "/api/productos/<id_producto>")
+async def eliminar_producto(peticion, id_producto):
+    """Elimina un producto"""
+    return await asyncio.to_thread(servicio.eliminar_producto, gestor, id_producto)
+
+
+@ruta("PUT", "/api/productos/<id_producto>/cantidad")
+async def actualizar_cantidad(peticion, id_producto):
+    """Actualiza la cantidad de un producto"""
+    return await asyncio.to_thread(servicio.actualizar_cantidad, gestor, id_producto, peticion.json())
+
+
+@ruta("GET", "/api/productos/buscar/<nombre>")
+async def buscar_productos(peticion, nombre):
+    """Busca productos por nombre"""
+    return await condicional(peticion, servicio.etag_inventario(gestor),
+                             lambda: servicio.buscar_productos(gestor, nombre))
+
+
+@ruta("GET", "/api/categorias/<categoria>")
+async def obtener_categoria(peticion, categoria):
+    """Obtiene los productos y totales de una categoría"""
+    return await condicional(peticion, servicio.etag_inventario(gestor),
+                             lambda: servicio.obtener_categoria(gestor, categoria))
+
+
+@ruta("GET", "/api/ordenes")
+async def obtener_ordenes(peticion):
+    """Obtiene las órdenes procesadas (completas o paginadas)"""
+    return await condicional(peticion, servicio.etag_inventario(gestor),
+                             lambda: servicio.obtener_ordenes(gestor, peticion.args))
+
+
+@ruta("GET", "/api/exportar/productos")
+async def exportar_productos(peticion):
+    """Descarga el catálogo como CSV, JSONL o NDJSON (opcionalmente gzip)"""
+    return servicio.exportar_productos(gestor, peticion.args)
+
+
+@ruta("GET", "/api/exportar/ordenes")
+async def exportar_ordenes(peticion):
+    """Descarga las órdenes procesadas como CSV, JSONL o NDJSON (opcionalmente gzip)"""
+    return servicio.exportar_ordenes(gestor, peticion.args)
+
+
+@ruta("POST", "/api/ordenes")
+async def crear_orden(peticion):
+    """Crea una nueva orden de venta"""
+    return await asyncio.to_thread(servicio.crear_orden, gestor, peticion.json())
+
+
+@ruta("POST", "/api/ordenes/bulk")
+async def crear_ordenes_lote(peticion):
+    """Crea muchas órdenes (arreglo JSON o NDJSON)"""
+    return await asyncio.to_thread(servicio.crear_ordenes_lote, gestor, peticion.cuerpo,
+                                   peticion.cabeceras.get("content-type", ""))
+
+
+@ruta("POST", "/api/ordenes/procesar")
+async def procesar_orden(peticion):
+    """Procesa el siguiente orden de la cola"""
+    return await asyncio.to_thread(servicio.procesar_orden, gestor)
+
+
+@ruta("GET", "/api/ordenes/pendiente")
+async def obtener_proximo_orden(peticion):
+    """Obtiene el próximo orden sin procesarlo"""
+    return await asyncio.to_thread(servicio.obtener_proximo_orden, gestor)
+
+
+@ruta("GET", "/api/reporte")
+async def obtener_reporte(peticion):
+    """Obtiene el reporte del inventario"""
+    return await condicional(peticion, servicio.etag_inventario(gestor),
+                             lambda: servicio.obtener_reporte(gestor))
+
+
+@ruta("GET", "/api/procesador")
+async def estado_procesador(peticion):
+    """Estado y rendimiento del procesador de órdenes"""
+    return servicio.estado_procesador(procesador)
+
+
+@ruta("POST", "/api/procesador/iniciar")
+async def iniciar_procesador(peticion):
+    """Inicia el procesador de órdenes en segundo plano"""
+    return servicio.iniciar_procesador(procesador)
+
+
+@ruta("POST", "/api/procesador/detener")
+async def detener_procesador(peticion):
+    """Detiene el procesador de órdenes (opcionalmente drenando la cola)"""
+    # Esperar a los hilos bloquearía el bucle de eventos
+    return await asyncio.to_thread(servicio.detener_procesador, procesador, peticion.json())
+
+
+@ruta("POST", "/api/procesador/drenar")
+async def drenar_procesador(peticion):
+    """Espera a que el procesador deje la cola vacía"""
+    return await asyncio.to_thread(servicio.drenar_procesador, procesador, peticion.json())
+
+
+@ruta("POST", "/api/instantanea")
+async def guardar_instantanea(peticion):
+    """Guarda una instantánea del inventario y vacía el diario"""
+    # Escribir el archivo bloquearía el bucle de eventos
+    return await asyncio.to_thread(servicio.guardar_instantanea, gestor)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("app_asgi:app", host="0.0.0.0", port=8000)
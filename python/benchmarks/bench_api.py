@@ -0,0 +1,121 @@
+"""
+Módulo: Benchmark de la API
+Descripción: Compara el throughput y la latencia (p50/p99) de la API Flask
+con hilos (app.py) contra la API ASGI sobre uvicorn (app_asgi.py)
+
+Levanta cada servidor como subproceso y lo carga con un generador asyncio
+de N clientes concurrentes durante unos segundos.
+
+Uso:
+    python benchmarks/bench_api.py [clientes] [segundos]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(__file__), '..')
+
+RUTAS = ["/api/productos", "/api/productos/PROD-3", "/api/reporte"]
+
+SERVIDORES = {
+    "Flask (hilos)": (
+        [sys.executable, "-c",
+         "import app; app.cargar_datos_ejemplo(); "
+         "app.app.run(port={puerto}, threaded=True)"],
+        5055,
+    ),
+    "ASGI (uvicorn)": (
+        [sys.executable, "-m", "uvicorn", "app_asgi:app",
+         "--port", "{puerto}", "--log-level", "warning"],
+        8055,
+    ),
+}
+
+
+async def peticion(puerto, ruta):
+    """Ejecuta un GET HTTP/1.1 y retorna el código de estado"""
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    escritor.write(f"GET {ruta} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+    return int(respuesta.split(b" ", 2)[1])
+
+
+async def esperar_servidor(puerto, tiempo_maximo=10.0):
+    """Espera a que el servidor acepte conexiones"""
+    limite = time.perf_counter() + tiempo_maximo
+    while time.perf_counter() < limite:
+        try:
+            await peticion(puerto, "/api/saludo")
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"El servidor en el puerto {puerto} no respondió")
+
+
+async def cargar(puerto, ruta, clientes, segundos):
+    """
+    Mantiene 'clientes' peticiones concurrentes durante 'segundos'.
+    
+    Returns:
+        Tupla (latencias en segundos, errores)
+    """
+    latencias = []
+    errores = 0
+    fin = time.perf_counter() + segundos
+    
+    async def cliente():
+        nonlocal errores
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            try:
+                estado = await peticion(puerto, ruta)
+            except OSError:
+                errores += 1
+                continue
+            latencias.append(time.perf_counter() - inicio)
+            if estado != 200:
+                errores += 1
+    
+    await asyncio.gather(*(cliente() for _ in range(clientes)))
+    return latencias, errores
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) de una lista ordenada"""
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def medir_servidor(nombre, comando, puerto, clientes, segundos):
+    """Levanta un servidor, lo carga en cada ruta e imprime los resultados"""
+    comando = [parte.format(puerto=puerto) for parte in comando]
+    proceso = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(esperar_servidor(puerto))
+        for ruta in RUTAS:
+            latencias, errores = asyncio.run(cargar(puerto, ruta, clientes, segundos))
+            latencias.sort()
+            print(f"{nombre:<16} {ruta:<24} {len(latencias) / segundos:>9.0f} "
+                  f"{percentil(latencias, 50) * 1000:>9.2f} {percentil(latencias, 99) * 1000:>9.2f} "
+                  f"{errores:>7}")
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    segundos = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    
+    print(f"Clientes concurrentes: {clientes}, {segundos:.0f} s por ruta\n")
+    print(f"{'Servidor':<16} {'Ruta':<24} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errores':>7}")
+    for nombre, (comando, puerto) in SERVIDORES.items():
+        medir_servidor(nombre, comando, puerto, clientes, segundos)
+
+
+if __name__ == "__main__":
+    main()
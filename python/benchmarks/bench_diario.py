@@ -0,0 +1,89 @@
+"""
+Módulo: Benchmark del Diario
+Descripción: Mide órdenes por segundo con varios hilos creando órdenes sin
+diario, con un fsync por operación y con confirmación agrupada
+
+Uso:
+    python benchmarks/bench_diario.py [hilos] [ordenes_por_hilo]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gestor_inventario import GestorInventario
+from diario import DiarioEscritura
+
+
+class DiarioSinAgrupar(DiarioEscritura):
+    """Diario que hace un fsync por registro (sin confirmación agrupada)"""
+    
+    def registrar(self, registro):
+        with self._condicion:
+            self._escribir([self._codificar(registro)])
+            self._secuencia += 1
+            self._confirmada = self._secuencia
+            return self._secuencia
+
+
+CONFIGURACIONES = {
+    "sin diario": None,
+    "fsync por operación": lambda ruta: DiarioSinAgrupar(ruta),
+    "agrupado (0 ms)": lambda ruta: DiarioEscritura(ruta, intervalo_grupo=0),
+    "agrupado (2 ms)": lambda ruta: DiarioEscritura(ruta, intervalo_grupo=0.002),
+    "sin fsync": lambda ruta: DiarioEscritura(ruta, sincronizar=False),
+}
+
+
+def medir(crear_diario, hilos, ordenes_por_hilo, directorio):
+    """Crea órdenes desde varios hilos y retorna (órdenes/s, escrituras a disco)"""
+    diario = None
+    escrituras = [0]
+    if crear_diario is not None:
+        diario = crear_diario(os.path.join(directorio, f"bench-{time.perf_counter_ns()}.diario"))
+        escribir = diario._escribir
+        
+        def contar(lineas):
+            escrituras[0] += 1
+            escribir(lineas)
+        diario._escribir = contar
+    
+    gestor = GestorInventario(diario=diario)
+    ids = [gestor.agregar_producto(f"Producto {i}", 10 ** 9, 1.0).id_producto for i in range(64)]
+    escrituras[0] = 0
+    
+    def trabajo(indice):
+        for i in range(ordenes_por_hilo):
+            gestor.crear_orden_venta(f"CLIENTE-{indice}", [(ids[(indice + i) % len(ids)], 1)])
+    
+    lista_hilos = [threading.Thread(target=trabajo, args=(i,)) for i in range(hilos)]
+    inicio = time.perf_counter()
+    for hilo in lista_hilos:
+        hilo.start()
+    for hilo in lista_hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+    
+    gestor.cerrar()
+    return hilos * ordenes_por_hilo / transcurrido, escrituras[0]
+
+
+def main():
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    ordenes_por_hilo = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    
+    print(f"{hilos} hilos x {ordenes_por_hilo} órdenes\n")
+    print(f"{'Configuración':<22} {'órdenes/s':>10} {'escrituras':>11}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, crear_diario in CONFIGURACIONES.items():
+            por_segundo, escrituras = medir(crear_diario, hilos, ordenes_por_hilo, directorio)
+            print(f"{nombre:<22} {por_segundo:>10.0f} {escrituras:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Módulo: Benchmark de Instantáneas
+Descripción: Compara el tiempo de arranque reproduciendo el diario completo
+contra cargar una instantánea binaria (y reproducir solo el resto del diario)
+
+Uso:
+    python benchmarks/bench_instantanea.py [productos] [operaciones_posteriores]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gestor_inventario import GestorInventario
+from diario import DiarioEscritura
+
+CATEGORIAS = ["Electrónica", "Alimentos", "Ropa", "Libros", "Hogar"]
+
+
+def cronometrar(funcion):
+    """Ejecuta funcion() y retorna (resultado, segundos)"""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    productos = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    posteriores = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_diario = os.path.join(directorio, "inventario.diario")
+        ruta_instantanea = os.path.join(directorio, "inventario.snap")
+        diario = DiarioEscritura(ruta_diario, sincronizar=False)
+        
+        gestor = GestorInventario(diario=diario)
+        gestor.agregar_productos_lote(
+            (f"Producto {i}", i % 100, round(1 + i % 997 * 0.37, 2), CATEGORIAS[i % len(CATEGORIAS)])
+            for i in range(productos)
+        )
+        print(f"{productos} productos, {posteriores} operaciones después de la instantánea\n")
+        
+        # Arranque reproduciendo el diario completo
+        gestor.cerrar()
+        tamano_diario = os.path.getsize(ruta_diario)
+        reproducido, t_diario = cronometrar(lambda: GestorInventario(
+            diario=DiarioEscritura(ruta_diario, sincronizar=False)))
+        
+        resultado, t_guardar = cronometrar(lambda: reproducido.guardar_instantanea(ruta_instantanea))
+        for i in range(posteriores):
+            reproducido.restar_stock(f"PROD-{i + 1}", 0)
+        reproducido.cerrar()
+        
+        # Arranque desde la instantánea (más el resto del diario)
+        cargado, t_instantanea = cronometrar(lambda: GestorInventario(
+            diario=DiarioEscritura(ruta_diario, sincronizar=False), ruta_instantanea=ruta_instantanea))
+        _, t_busqueda = cronometrar(lambda: cargado.buscar_productos_por_nombre("Producto 12"))
+        _, t_nombres = cronometrar(lambda: sum(len(p.nombre) for p in cargado.productos))
+        cargado.cerrar()
+        
+        print(f"{'Diario completo':<34} {tamano_diario / 1e6:>8.1f} MB {t_diario:>8.2f} s")
+        print(f"{'Guardar instantánea':<34} {resultado['bytes'] / 1e6:>8.1f} MB {t_guardar:>8.2f} s")
+        print(f"{'Instantánea + resto del diario':<34} {'':>11} {t_instantanea:>8.2f} s")
+        print(f"{'  primera búsqueda por nombre':<34} {'':>11} {t_busqueda:>8.2f} s")
+        print(f"{'  decodificar todos los nombres':<34} {'':>11} {t_nombres:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
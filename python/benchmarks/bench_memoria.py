@@ -0,0 +1,113 @@
+"""
+Módulo: Benchmark de Memoria
+Descripción: Mide con tracemalloc los bytes por producto y por orden encolada,
+comparando los nodos y productos con __slots__ contra la versión con __dict__
+y la Cola sobre buffer circular contra la cola sobre lista enlazada
+
+Uso:
+    python benchmarks/bench_memoria.py [cantidad]
+"""
+
+import gc
+import sys
+import os
+import tracemalloc
+from unittest import mock
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import lista_doble
+import lista_enlazada
+from lista_doble import ListaDoblementeEnlazada
+from lista_enlazada import ListaEnlazada
+from cola import Cola
+from producto import Producto
+
+
+class NodoConDict:
+    """Nodo con el diseño anterior (un __dict__ por instancia)"""
+    
+    def __init__(self, dato):
+        self.dato = dato
+        self.siguiente = None
+
+
+class NodoDobleConDict(NodoConDict):
+    """Nodo doble con el diseño anterior"""
+    
+    def __init__(self, dato):
+        super().__init__(dato)
+        self.anterior = None
+
+
+class ProductoConDict:
+    """Producto con el diseño anterior"""
+    
+    def __init__(self, id_producto, nombre, cantidad, precio, categoria="General"):
+        self.id_producto = id_producto
+        self.nombre = nombre
+        self.cantidad = cantidad
+        self.precio = precio
+        self.categoria = categoria
+
+
+def medir(construir):
+    """
+    Mide los bytes retenidos por la estructura que retorna construir().
+    
+    Returns:
+        Bytes asignados que siguen vivos al terminar la construcción
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    estructura = construir()
+    final = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del estructura
+    return final - inicio
+
+
+def construir_catalogo(clase_producto, cantidad):
+    """Inserta productos en una lista doble como lo hace el gestor"""
+    lista = ListaDoblementeEnlazada()
+    for i in range(cantidad):
+        lista.insertar_final(clase_producto(f"PROD-{i}", "Producto", i % 100, 9.99, "General"))
+    return lista
+
+
+def construir_ordenes(cola, encolar, cantidad):
+    """Encola órdenes mínimas como las de crear_orden_venta"""
+    for i in range(cantidad):
+        encolar({"id_cliente": i, "productos": [], "total": 0, "estado": "Pendiente"})
+    return cola
+
+
+def main():
+    """Ejecuta el benchmark y muestra bytes por elemento"""
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    with mock.patch.object(lista_doble, "NodoDoble", NodoDobleConDict), \
+            mock.patch.object(lista_enlazada, "Nodo", NodoConDict):
+        producto_antes = medir(lambda: construir_catalogo(ProductoConDict, cantidad))
+        # Diseño anterior de la cola: un nodo con __dict__ por orden
+        lista = ListaEnlazada()
+        orden_antes = medir(lambda: construir_ordenes(lista, lista.insertar_final, cantidad))
+    
+    producto_despues = medir(lambda: construir_catalogo(Producto, cantidad))
+    cola = Cola()
+    orden_despues = medir(lambda: construir_ordenes(cola, cola.encolar, cantidad))
+    
+    print(f"Elementos: {cantidad:,}")
+    print(f"{'':<20} {'Antes':>12} {'Después':>12} {'Ahorro':>8}")
+    for etiqueta, antes, despues in (
+        ("Bytes por producto", producto_antes, producto_despues),
+        ("Bytes por orden", orden_antes, orden_despues),
+    ):
+        ahorro = 100 * (antes - despues) / antes
+        print(f"{etiqueta:<20} {antes / cantidad:>12.1f} {despues / cantidad:>12.1f} {ahorro:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
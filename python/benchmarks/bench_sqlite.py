@@ -0,0 +1,80 @@
+"""
+Módulo: Benchmark del Almacén SQLite
+Descripción: Compara GestorInventarioSQLite contra el gestor en memoria en
+alta por lote, búsquedas por ID y por nombre, consultas y reportes
+
+Uso:
+    python benchmarks/bench_sqlite.py [productos] [consultas]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from gestor_inventario import GestorInventario
+from gestor_sqlite import GestorInventarioSQLite
+
+CATEGORIAS = ["Electrónica", "Alimentos", "Ropa", "Libros", "Hogar"]
+
+
+def cronometrar(funcion, repeticiones=1):
+    """Ejecuta funcion() 'repeticiones' veces y retorna los segundos por ejecución"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def medir(gestor, productos, consultas):
+    """Tiempos de cada operación sobre un gestor vacío"""
+    azar = random.Random(1)
+    ids = [f"PROD-{azar.randint(1, productos)}" for _ in range(consultas)]
+    nombres = [f"Producto {azar.randint(1, productos)}" for _ in range(consultas // 10)]
+    tiempos = {}
+    
+    tiempos["Alta por lote (total)"] = cronometrar(lambda: gestor.agregar_productos_lote(
+        (f"Producto {i}", 1 + i % 100, round(1 + i % 997 * 0.37, 2), CATEGORIAS[i % len(CATEGORIAS)])
+        for i in range(productos)
+    ))
+    tiempos["Buscar por ID"] = cronometrar(
+        lambda: [gestor.buscar_producto_por_id(i) for i in ids]) / consultas
+    tiempos["Buscar por nombre"] = cronometrar(
+        lambda: [gestor.buscar_productos_por_nombre(n) for n in nombres]) / len(nombres)
+    tiempos["Restar stock"] = cronometrar(
+        lambda: [gestor.restar_stock(i, 0) for i in ids]) / consultas
+    tiempos["Crear orden de venta"] = cronometrar(
+        lambda: [gestor.crear_orden_venta("CLIENTE", [(i, 1)]) for i in ids[:consultas // 10]]
+    ) / (consultas // 10)
+    tiempos["Top 10 por precio"] = cronometrar(
+        lambda: gestor.obtener_productos_ordenados("precio", 10, descendente=True), 100)
+    tiempos["Valor de una categoría"] = cronometrar(
+        lambda: gestor.obtener_valor_categoria("Ropa"), 10)
+    tiempos["Reporte"] = cronometrar(gestor.generar_reporte, 10)
+    return tiempos
+
+
+def main():
+    productos = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.db")
+        memoria = medir(GestorInventario(), productos, consultas)
+        sqlite = GestorInventarioSQLite(ruta)
+        en_base = medir(sqlite, productos, consultas)
+        sqlite.cerrar()
+        tamano = os.path.getsize(ruta)
+    
+    print(f"{productos} productos, {consultas} consultas (base de {tamano / 1e6:.1f} MB)\n")
+    print(f"{'Operación':<26} {'Memoria':>12} {'SQLite':>12}")
+    for operacion, segundos in memoria.items():
+        print(f"{operacion:<26} {segundos * 1e6:>9.1f} µs {en_base[operacion] * 1e6:>9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
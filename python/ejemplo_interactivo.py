@@ -1,6 +1,9 @@
 """
 Módulo: Ejemplo Interactivo
 Descripción: Demostración interactiva del sistema de inventario
+
+Uso:
+    python ejemplo_interactivo.py [catalogo.csv|catalogo.jsonl]
 """
 
 import sys
@@ -10,6 +13,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from gestor_inventario import GestorInventario
+from importador import detectar_formato, importar_catalogo
 
 
 def mostrar_menu():
@@ -52,11 +56,8 @@ def mostrar_productos(productos):
     print("-"*80)
 
 
-def main():
-    """Función principal"""
-    gestor = GestorInventario()
-    
-    # Cargar datos de ejemplo
+def cargar_datos_ejemplo(gestor):
+    """Carga los productos de demostración"""
     print("\n⏳ Cargando datos de ejemplo...")
     gestor.agregar_producto("Laptop", 5, 999.99, "Electrónica")
     gestor.agregar_producto("Mouse", 20, 29.99, "Electrónica")
@@ -65,6 +66,21 @@ def main():
     gestor.agregar_producto("Frijoles 1kg", 30, 3.00, "Alimentos")
     gestor.agregar_producto("Camisa", 25, 45.00, "Ropa")
     print("✅ Datos de ejemplo cargados\n")
+
+
+def main():
+    """Función principal"""
+    gestor = GestorInventario()
+    
+    # Con un archivo CSV/JSONL como argumento se importa ese catálogo
+    if len(sys.argv) > 1:
+        ruta = sys.argv[1]
+        print(f"\n⏳ Importando {ruta}...")
+        with open(ruta, "rb") as archivo:
+            resumen = importar_catalogo(gestor, archivo, detectar_formato(ruta) or "csv")
+        print(f"✅ {resumen['importados']} productos importados, {resumen['rechazados']} rechazados\n")
+    else:
+        cargar_datos_ejemplo(gestor)
     
     while True:
         mostrar_menu()
@@ -0,0 +1,74 @@
+"""
+Módulo: Exportar Inventario
+Descripción: Línea de comandos para exportar el catálogo o las órdenes
+procesadas del almacén configurado por las variables de entorno del servidor
+
+Uso:
+    INVENTARIO_ALMACEN=sqlite INVENTARIO_SQLITE=inventario.db \\
+        python exportar_inventario.py productos catalogo.csv.gz
+    INVENTARIO_DIARIO=inventario.diario \\
+        python exportar_inventario.py ordenes ordenes.jsonl --desde 1760659200
+        
+El formato sale de la extensión (.csv, .jsonl, .ndjson) y un .gz final
+comprime la salida. Con '-' la exportación va a la salida estándar.
+"""
+
+import argparse
+import os
+import sys
+
+import servicio_inventario as servicio
+from exportador import FORMATOS, exportar_ordenes, exportar_productos, guardar_exportacion
+
+
+def formato_por_extension(ruta):
+    """Retorna (formato, comprimir) según la extensión, o (None, comprimir)"""
+    comprimir = ruta.endswith(".gz")
+    extension = os.path.splitext(ruta[:-3] if comprimir else ruta)[1].lstrip(".").lower()
+    return (extension if extension in FORMATOS else None), comprimir
+
+
+def main(argumentos=None):
+    """Función principal (retorna el código de salida)"""
+    parser = argparse.ArgumentParser(description="Exporta el catálogo o las órdenes procesadas")
+    parser.add_argument("recurso", choices=("productos", "ordenes"))
+    parser.add_argument("archivo", help="Archivo destino ('-' para la salida estándar)")
+    parser.add_argument("--formato", choices=FORMATOS,
+                        help="Formato de salida (por defecto según la extensión)")
+    parser.add_argument("--gzip", action="store_true", help="Comprime la salida con gzip")
+    parser.add_argument("--categoria", help="Solo productos de esta categoría")
+    parser.add_argument("--desde", type=float, help="Solo órdenes procesadas desde (epoch)")
+    parser.add_argument("--hasta", type=float, help="Solo órdenes procesadas hasta (epoch)")
+    opciones = parser.parse_args(argumentos)
+    
+    formato, comprimir = formato_por_extension(opciones.archivo)
+    formato = opciones.formato or formato
+    comprimir = opciones.gzip or comprimir
+    if formato is None:
+        parser.error("No se reconoce el formato por la extensión: use --formato")
+    
+    gestor = servicio.crear_gestor()
+    try:
+        if opciones.recurso == "productos":
+            bloques = exportar_productos(gestor, formato, opciones.categoria, comprimir)
+        else:
+            bloques = exportar_ordenes(gestor.ordenes_procesadas, formato,
+                                       opciones.desde, opciones.hasta, comprimir)
+        if opciones.archivo == "-":
+            for bloque in bloques:
+                sys.stdout.buffer.write(bloque)
+            sys.stdout.buffer.flush()
+            return 0
+        escritos = guardar_exportacion(bloques, opciones.archivo)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        gestor.cerrar()
+    
+    print(f"✅ {opciones.archivo}: {escritos / 1e6:.1f} MB", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Módulo: Importar Catálogo
+Descripción: Línea de comandos para importar un catálogo CSV o JSONL en el
+almacén configurado por las variables de entorno del servidor
+
+Uso:
+    INVENTARIO_ALMACEN=sqlite INVENTARIO_SQLITE=inventario.db \\
+        python importar_catalogo.py catalogo.csv
+    INVENTARIO_DIARIO=inventario.diario python importar_catalogo.py catalogo.jsonl
+    
+Con el gestor en memoria (sin diario ni SQLite) nada persiste: sirve para
+validar el archivo y ver sus rechazos.
+"""
+
+import argparse
+import sys
+
+import servicio_inventario as servicio
+from importador import FORMATOS, TAMANO_TRAMO, detectar_formato, importar_catalogo
+
+
+def mostrar_progreso(resumen):
+    """Muestra el avance en stderr, sobre la misma línea"""
+    print(f"\r{resumen['filas']} filas, {resumen['importados']} importadas, "
+          f"{resumen['rechazados']} rechazadas ({resumen['bytes'] / 1e6:.1f} MB)",
+          end="", file=sys.stderr, flush=True)
+
+
+def main(argumentos=None):
+    """Función principal (retorna el código de salida)"""
+    parser = argparse.ArgumentParser(description="Importa un catálogo CSV o JSONL")
+    parser.add_argument("archivo", help="Archivo a importar ('-' para la entrada estándar)")
+    parser.add_argument("--formato", choices=FORMATOS,
+                        help="Formato del archivo (por defecto según la extensión)")
+    parser.add_argument("--tramo", type=int, default=TAMANO_TRAMO,
+                        help=f"Filas por lote (por defecto {TAMANO_TRAMO})")
+    opciones = parser.parse_args(argumentos)
+    
+    formato = opciones.formato or detectar_formato(opciones.archivo)
+    if formato is None:
+        parser.error("No se reconoce el formato por la extensión: use --formato")
+    
+    gestor = servicio.crear_gestor()
+    try:
+        if opciones.archivo == "-":
+            resumen = importar_catalogo(gestor, sys.stdin.buffer, formato, opciones.tramo,
+                                        mostrar_progreso)
+        else:
+            with open(opciones.archivo, "rb") as archivo:
+                resumen = importar_catalogo(gestor, archivo, formato, opciones.tramo,
+                                            mostrar_progreso)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        gestor.cerrar()
+    
+    print(file=sys.stderr)
+    for rechazo in resumen["rechazos"]:
+        print(f"   línea {rechazo['linea']}: {rechazo['error']}")
+    if resumen["rechazados"] > len(resumen["rechazos"]):
+        print(f"   ... y {resumen['rechazados'] - len(resumen['rechazos'])} rechazos más")
+    print(f"✅ {resumen['importados']} productos importados, {resumen['rechazados']} rechazados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,930 @@
+"""
+Módulo: Servicio de Inventario
+Descripción: Lógica de los endpoints de la API, independiente del framework
+
+Cada función recibe el gestor y los datos ya extraídos de la petición
+(parámetros de ruta, query string como mapeo y cuerpo JSON) y retorna una
+tupla (cuerpo, estado). Así la API Flask (app.py) y la API ASGI
+(app_asgi.py) comparten exactamente los mismos contratos JSON.
+
+El cuerpo es un dict/list a serializar, un JSONCodificado que se envía
+tal cual, un iterador de bloques en bytes para transmitir, un ArregloJSON
+(arreglo JSON transmitido por bloques) o una Exportacion (bloques con su
+Content-Type y nombre de archivo).
+"""
+
+from itertools import islice
+from numbers import Number
+import json
+import sys
+import os
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from gestor_inventario import GestorInventario
+from procesador_ordenes import ProcesadorOrdenes
+from diario import DiarioEscritura
+from instantanea import InstantaneasPeriodicas
+from importador import detectar_formato, importar_catalogo
+import exportador
+
+# Paginación por cursor de GET /api/productos
+LIMITE_PAGINA = 100
+LIMITE_PAGINA_MAXIMO = 1000
+
+# Productos por bloque al transmitir NDJSON
+TAMANO_BLOQUE_NDJSON = 256
+
+FILTROS_PRODUCTOS = ("precio_min", "precio_max", "cantidad_min", "cantidad_max", "orden")
+
+
+def _leer_carriles(texto):
+    """
+    Convierte "express:3,normal:1" en {"express": 3, "normal": 1}.
+    
+    Raises:
+        ValueError: Si algún carril no tiene la forma nombre:peso
+    """
+    pesos = {}
+    for parte in texto.split(","):
+        nombre, _, peso = parte.strip().partition(":")
+        if not nombre or not peso.isdigit():
+            raise ValueError(f"Carril inválido en INVENTARIO_CARRILES: {parte!r}")
+        pesos[nombre] = int(peso)
+    return pesos
+
+
+def crear_gestor():
+    """
+    Crea el gestor según las variables de entorno.
+    
+    INVENTARIO_ALMACEN=columnar usa el almacén columnar (requiere NumPy).
+    INVENTARIO_ALMACEN=sqlite guarda el catálogo en la base SQLite
+    INVENTARIO_SQLITE (por defecto inventario.db); no admite diario ni
+    instantáneas, la base ya es persistente.
+    INVENTARIO_CARRILES="express:3,normal:1" usa una cola de órdenes con
+    carriles ponderados y prioridades.
+    INVENTARIO_HISTORIAL_CAPACIDAD acota las órdenes procesadas en memoria;
+    las anteriores se guardan en INVENTARIO_HISTORIAL_RUTA (o en un
+    archivo temporal si no se indica).
+    INVENTARIO_DIARIO=ruta registra cada operación en un diario de escritura
+    anticipada y lo reproduce al arrancar. INVENTARIO_DIARIO_GRUPO_MS fija
+    cuánto espera cada grupo de escrituras antes del fsync e
+    INVENTARIO_DIARIO_FSYNC=0 omite el fsync.
+    INVENTARIO_INSTANTANEA=ruta carga esa instantánea al arrancar (antes
+    del diario) y es donde POST /api/instantanea la guarda.
+    """
+    almacen = os.environ.get("INVENTARIO_ALMACEN")
+    if almacen == "sqlite" and (os.environ.get("INVENTARIO_DIARIO") or os.environ.get("INVENTARIO_INSTANTANEA")):
+        raise ValueError("El almacén SQLite no admite INVENTARIO_DIARIO ni INVENTARIO_INSTANTANEA")
+    
+    carriles = os.environ.get("INVENTARIO_CARRILES")
+    capacidad = os.environ.get("INVENTARIO_HISTORIAL_CAPACIDAD")
+    opciones = {
+        "pesos_carriles": _leer_carriles(carriles) if carriles else None,
+        "capacidad_historial": int(capacidad) if capacidad else None,
+        "ruta_historial": os.environ.get("INVENTARIO_HISTORIAL_RUTA") or None,
+        "diario": _crear_diario(),
+        "ruta_instantanea": os.environ.get("INVENTARIO_INSTANTANEA") or None
+    }
+    
+    if almacen == "sqlite":
+        del opciones["diario"], opciones["ruta_instantanea"]
+        from gestor_sqlite import GestorInventarioSQLite
+        return GestorInventarioSQLite(os.environ.get("INVENTARIO_SQLITE") or "inventario.db", **opciones)
+    if almacen == "columnar":
+        from gestor_columnar import GestorInventarioColumnar
+        return GestorInventarioColumnar(**opciones)
+    return GestorInventario(**opciones)
+
+
+def _crear_diario():
+    """Diario de escritura anticipada según el entorno (None si no se configura)"""
+    ruta = os.environ.get("INVENTARIO_DIARIO")
+    if not ruta:
+        return None
+    grupo_ms = os.environ.get("INVENTARIO_DIARIO_GRUPO_MS")
+    return DiarioEscritura(
+        ruta,
+        intervalo_grupo=float(grupo_ms) / 1000 if grupo_ms else DiarioEscritura.INTERVALO_GRUPO,
+        sincronizar=os.environ.get("INVENTARIO_DIARIO_FSYNC", "1") != "0"
+    )
+
+
+def crear_procesador(gestor):
+    """
+    Crea el procesador de órdenes en segundo plano.
+    
+    INVENTARIO_TRABAJADORES fija la cantidad de hilos (si es mayor a 0 el
+    servidor lo inicia al arrancar, ver procesador_automatico) e
+    INVENTARIO_LOTE_ORDENES el tamaño de lote.
+    """
+    hilos = int(os.environ.get("INVENTARIO_TRABAJADORES") or 0)
+    tamano_lote = int(os.environ.get("INVENTARIO_LOTE_ORDENES") or ProcesadorOrdenes.TAMANO_LOTE)
+    return ProcesadorOrdenes(gestor, hilos=hilos or ProcesadorOrdenes.HILOS, tamano_lote=tamano_lote)
+
+
+def crear_instantaneas(gestor):
+    """
+    Instantáneas periódicas según el entorno.
+    
+    INVENTARIO_INSTANTANEA_SEGUNDOS fija cada cuántos segundos se guarda
+    una instantánea (requiere INVENTARIO_INSTANTANEA).
+    
+    Returns:
+        InstantaneasPeriodicas sin iniciar, o None si no se configuran
+    """
+    segundos = os.environ.get("INVENTARIO_INSTANTANEA_SEGUNDOS")
+    if not segundos or gestor.ruta_instantanea is None:
+        return None
+    return InstantaneasPeriodicas(gestor, float(segundos))
+
+
+def procesador_automatico():
+    """True si el procesador debe iniciarse junto con el servidor"""
+    return int(os.environ.get("INVENTARIO_TRABAJADORES") or 0) > 0
+
+
+def usa_archivos():
+    """
+    True si el gestor del entorno escribe archivos propios (diario,
+    instantánea, base SQLite o historial en disco).
+    
+    Con el recargador de Werkzeug el proceso padre también crea su gestor:
+    sus instantáneas periódicas pisarían la instantánea y vaciarían el
+    diario del proceso que atiende. app.py lo desactiva en ese caso.
+    """
+    return any(os.environ.get(variable) for variable in (
+        "INVENTARIO_DIARIO", "INVENTARIO_INSTANTANEA", "INVENTARIO_HISTORIAL_RUTA"
+    )) or os.environ.get("INVENTARIO_ALMACEN") == "sqlite"
+
+
+def cargar_datos_ejemplo(gestor):
+    """
+    Carga datos de ejemplo para demostración.
+    
+    Si INVENTARIO_CATALOGO indica un archivo CSV o JSONL se importa ese
+    catálogo en lugar de los datos de ejemplo. No hace nada si el gestor
+    ya tiene productos (por ejemplo los recuperados de un diario al arrancar).
+    """
+    if gestor.obtener_cantidad_total():
+        return
+    ruta = os.environ.get("INVENTARIO_CATALOGO")
+    if ruta:
+        formato = detectar_formato(ruta)
+        if formato is None:
+            raise ValueError(f"Formato no reconocido en INVENTARIO_CATALOGO: {ruta}")
+        with open(ruta, "rb") as archivo:
+            importar_catalogo(gestor, archivo, formato)
+        return
+    gestor.agregar_producto("Laptop", 5, 999.99, "Electrónica")
+    gestor.agregar_producto("Mouse", 20, 29.99, "Electrónica")
+    gestor.agregar_producto("Teclado", 15, 79.99, "Electrónica")
+    gestor.agregar_producto("Arroz 1kg", 50, 2.50, "Alimentos")
+    gestor.agregar_producto("Frijoles 1kg", 30, 3.00, "Alimentos")
+    gestor.agregar_producto("Camisa", 25, 45.00, "Ropa")
+    gestor.agregar_producto("Pantalón", 18, 65.00, "Ropa")
+    gestor.agregar_producto("JavaScript Básico", 8, 29.99, "Libros")
+
+
+class JSONCodificado:
+    """
+    Cuerpo de respuesta ya codificado como JSON.
+    
+    Las listas de productos se arman uniendo los fragmentos cacheados de
+    cada producto (Producto.convertir_a_json) en lugar de construir
+    diccionarios y serializarlos en cada petición.
+    """
+    
+    __slots__ = ('texto',)
+    
+    def __init__(self, texto):
+        self.texto = texto
+
+
+class ArregloJSON:
+    """
+    Cuerpo JSON (un arreglo) transmitido por bloques en lugar de armarse
+    completo: la memoria por petición no depende de su largo.
+    """
+    
+    __slots__ = ('bloques',)
+    
+    def __init__(self, bloques):
+        self.bloques = bloques
+    
+    def __iter__(self):
+        return iter(self.bloques)
+
+
+class Exportacion:
+    """
+    Cuerpo de una exportación: iterador de bloques en bytes que se
+    descarga como archivo (Content-Disposition: attachment).
+    """
+    
+    __slots__ = ('bloques', 'tipo', 'nombre')
+    
+    def __init__(self, bloques, tipo, nombre):
+        self.bloques = bloques
+        self.tipo = tipo
+        self.nombre = nombre
+    
+    def __iter__(self):
+        return iter(self.bloques)
+    
+    def disposicion(self):
+        """Valor de la cabecera Content-Disposition"""
+        return f'attachment; filename="{self.nombre}"'
+
+
+def _lista_productos_json(productos):
+    """Arreglo JSON con los fragmentos cacheados de los productos"""
+    return JSONCodificado("[" + ",".join(p.convertir_a_json() for p in productos) + "]")
+
+
+def _objeto_json(campos):
+    """
+    Objeto JSON con claves ordenadas (como jsonify) cuyos valores pueden
+    ser JSONCodificado ya armados.
+    """
+    partes = []
+    for clave in sorted(campos):
+        valor = campos[clave]
+        texto = valor.texto if isinstance(valor, JSONCodificado) else _linea_json(valor)
+        partes.append(f"{json.dumps(clave)}:{texto}")
+    return JSONCodificado("{" + ",".join(partes) + "}")
+
+
+def etag_inventario(gestor, variante=None):
+    """
+    ETag de las respuestas que dependen de todo el inventario.
+    
+    Se deriva de la versión global, así que se calcula en O(1) sin
+    recorrer ni serializar nada. Lleva el identificador de la instancia
+    del gestor: la versión vuelve a contar al reiniciar (no se guarda ni
+    se reproduce exacta), y sin él un ETag ya entregado podría repetirse
+    con otro contenido.
+    
+    Args:
+        gestor: El gestor de inventario
+        variante: Sufijo para otra representación de la misma URL (ej. "ndjson")
+    """
+    if variante:
+        return f'"{gestor.id_instancia}-v{gestor.obtener_version()}-{variante}"'
+    return f'"{gestor.id_instancia}-v{gestor.obtener_version()}"'
+
+
+def etag_producto(gestor, id_producto):
+    """ETag de un producto (None si no existe), con el identificador de la instancia"""
+    version = gestor.obtener_version_producto(id_producto)
+    if version is None:
+        return None
+    return f'"{gestor.id_instancia}-{id_producto}-v{version}"'
+
+
+def coincide_etag(etag, if_none_match):
+    """
+    Indica si la cabecera If-None-Match incluye el ETag.
+    
+    Acepta '*', listas separadas por comas y ETags débiles (W/"...").
+    """
+    if not etag or not if_none_match:
+        return False
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato == "*" or candidato.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _error(mensaje, estado):
+    """Cuerpo y estado de una respuesta de error"""
+    return {"error": mensaje}, estado
+
+
+def _parametro_numerico(args, nombre, tipo=float):
+    """Lee un parámetro numérico de la query string (None si no viene)"""
+    valor = args.get(nombre)
+    if valor is None or valor == "":
+        return None
+    try:
+        return tipo(valor)
+    except ValueError:
+        raise ValueError(f"Parámetro '{nombre}' inválido: {valor}")
+
+
+def _consultar_productos(gestor, args):
+    """
+    Resuelve los filtros de GET /api/productos sobre los índices del gestor.
+    
+    Parámetros opcionales:
+        precio_min, precio_max: Rango de precio (ordenado por precio)
+        cantidad_min, cantidad_max: Rango de cantidad (ordenado por cantidad)
+        orden: "cantidad" o "precio" para top-N; con un rango solo puede ser
+            el campo por el que se ordena el rango
+        direccion: "asc" (por defecto) o "desc", también para los rangos
+        limite: Cantidad máxima de productos
+        cursor: ID del último producto recibido (sin filtros de rango ni orden)
+        
+    Raises:
+        ValueError: Si un parámetro no es válido o 'orden' no coincide con el rango
+    """
+    cursor = _validar_cursor(args)
+    precio_min = _parametro_numerico(args, "precio_min")
+    precio_max = _parametro_numerico(args, "precio_max")
+    cantidad_min = _parametro_numerico(args, "cantidad_min", int)
+    cantidad_max = _parametro_numerico(args, "cantidad_max", int)
+    limite = _parametro_numerico(args, "limite", int)
+    orden = args.get("orden")
+    descendente = args.get("direccion", "asc") == "desc"
+    
+    if limite is not None and limite < 0:
+        raise ValueError("Parámetro 'limite' debe ser positivo")
+    
+    filtra_cantidad = cantidad_min is not None or cantidad_max is not None
+    if precio_min is not None or precio_max is not None:
+        campo = "precio"
+    elif filtra_cantidad:
+        campo = "cantidad"
+    elif orden is not None:
+        return gestor.obtener_productos_ordenados(orden, limite, descendente)
+    else:
+        return islice(gestor.iterar_productos(cursor), limite)
+    
+    if orden is not None and orden != campo:
+        raise ValueError(f"Un rango de {campo} se ordena por {campo}: 'orden' no puede ser '{orden}'")
+    
+    if campo == "cantidad":
+        return gestor.obtener_productos_en_rango(campo, cantidad_min, cantidad_max, limite, descendente)
+    if not filtra_cantidad:
+        return gestor.obtener_productos_en_rango(campo, precio_min, precio_max, limite, descendente)
+    
+    # El filtro de cantidad se aplica sobre el rango de precio: el límite, después
+    productos = gestor.obtener_productos_en_rango(campo, precio_min, precio_max, descendente=descendente)
+    return islice((
+        p for p in productos
+        if (cantidad_min is None or p.cantidad >= cantidad_min)
+        and (cantidad_max is None or p.cantidad <= cantidad_max)
+    ), limite)
+
+
+def _validar_cursor(args):
+    """
+    Lee el cursor de la query string.
+    
+    Returns:
+        El cursor, o None si no viene o está vacío (primera página)
+        
+    Raises:
+        ValueError: Si se combina con filtros de rango u orden
+    """
+    cursor = args.get("cursor") or None
+    if cursor is not None and any(args.get(filtro) for filtro in FILTROS_PRODUCTOS):
+        raise ValueError("El cursor no admite filtros de rango ni orden")
+    return cursor
+
+
+def _pagina_productos(gestor, args):
+    """
+    Una página de productos en orden de inserción.
+    
+    Se lee un producto de más para saber si hay página siguiente; el
+    cursor siguiente es el ID del último producto de la página.
+    """
+    cursor = _validar_cursor(args)
+    limite = _parametro_numerico(args, "limite", int)
+    if limite is None:
+        limite = LIMITE_PAGINA
+    if not 0 < limite <= LIMITE_PAGINA_MAXIMO:
+        raise ValueError(f"Parámetro 'limite' debe estar entre 1 y {LIMITE_PAGINA_MAXIMO}")
+    
+    productos = list(islice(gestor.iterar_productos(cursor), limite + 1))
+    siguiente = productos[limite - 1].id_producto if len(productos) > limite else None
+    
+    return _objeto_json({
+        "productos": _lista_productos_json(productos[:limite]),
+        "siguiente_cursor": siguiente
+    })
+
+
+def _linea_json(datos):
+    """Codifica un objeto como línea NDJSON (mismo formato que las respuestas JSON)"""
+    return json.dumps(datos, sort_keys=True, separators=(",", ":"))
+
+
+def _bloques_ndjson(productos):
+    """
+    Genera el cuerpo NDJSON en bloques de TAMANO_BLOQUE_NDJSON productos.
+    
+    Los productos se leen a medida que se envían, así que la memoria por
+    petición no depende del tamaño del catálogo.
+    """
+    bloque = []
+    for producto in productos:
+        bloque.append(producto.convertir_a_json())
+        if len(bloque) == TAMANO_BLOQUE_NDJSON:
+            yield ("\n".join(bloque) + "\n").encode()
+            bloque = []
+    if bloque:
+        yield ("\n".join(bloque) + "\n").encode()
+
+
+def _bloques_arreglo_json(elementos):
+    """Genera un arreglo JSON en bloques de TAMANO_BLOQUE_NDJSON elementos"""
+    apertura = "["
+    bloque = []
+    for elemento in elementos:
+        bloque.append(_linea_json(elemento))
+        if len(bloque) == TAMANO_BLOQUE_NDJSON:
+            yield (apertura + ",".join(bloque)).encode()
+            apertura, bloque = ",", []
+    if bloque:
+        yield (apertura + ",".join(bloque) + "]\n").encode()
+    else:
+        yield ("[]\n" if apertura == "[" else "]\n").encode()
+
+
+def quiere_ndjson(args, aceptar=""):
+    """True si la petición pide NDJSON (?formato=ndjson o Accept: application/x-ndjson)"""
+    return args.get("formato") == "ndjson" or "application/x-ndjson" in (aceptar or "")
+
+
+def _elementos_lote(cuerpo, tipo_contenido):
+    """
+    Decodifica el cuerpo de un endpoint bulk.
+    
+    Acepta un arreglo JSON o NDJSON (un objeto JSON por línea). Se usa
+    NDJSON si el Content-Type lo indica o si el cuerpo no empieza con '['.
+    Las líneas NDJSON se decodifican a medida que se consumen; una línea
+    inválida se entrega como ValueError para reportarla en su posición.
+    
+    Args:
+        cuerpo: Bytes del cuerpo de la petición
+        tipo_contenido: Cabecera Content-Type (puede ser vacía)
+        
+    Returns:
+        Iterador de elementos (objetos decodificados o ValueError)
+        
+    Raises:
+        ValueError: Si el cuerpo está vacío o el arreglo JSON es inválido
+    """
+    try:
+        texto = cuerpo.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("El cuerpo debe estar codificado en UTF-8")
+    
+    if not texto.strip():
+        raise ValueError("Cuerpo requerido")
+    
+    if "ndjson" not in (tipo_contenido or "") and texto.lstrip().startswith("["):
+        try:
+            datos = json.loads(texto)
+        except ValueError:
+            raise ValueError("JSON inválido")
+        return iter(datos)
+    
+    def lineas():
+        for numero, linea in enumerate(texto.splitlines(), 1):
+            if not linea.strip():
+                continue
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                yield ValueError(f"JSON inválido en la línea {numero}")
+    
+    return lineas()
+
+
+def _es_numero(valor):
+    """True si el valor es numérico (los booleanos no cuentan)"""
+    return isinstance(valor, Number) and not isinstance(valor, bool)
+
+
+def _tupla_producto(datos):
+    """Valida un elemento de /api/productos/bulk y lo convierte en tupla"""
+    if not isinstance(datos, dict):
+        raise ValueError("Cada elemento debe ser un objeto JSON")
+    
+    nombre = datos.get("nombre")
+    cantidad = datos.get("cantidad", 0)
+    precio = datos.get("precio", 0)
+    
+    if not isinstance(nombre, str) or not nombre:
+        raise ValueError("Nombre requerido")
+    if not isinstance(cantidad, int) or isinstance(cantidad, bool) or not _es_numero(precio):
+        raise ValueError("Cantidad debe ser entera y precio numérico")
+    
+    return nombre, cantidad, precio, datos.get("categoria", "General")
+
+
+def _tupla_orden(datos):
+    """Valida un elemento de /api/ordenes/bulk y lo convierte en tupla"""
+    if not isinstance(datos, dict):
+        raise ValueError("Cada elemento debe ser un objeto JSON")
+    
+    lineas = datos.get("productos", [])
+    if not isinstance(lineas, list):
+        raise ValueError("Productos debe ser una lista")
+    
+    productos = []
+    for linea in lineas:
+        if (not isinstance(linea, list) or len(linea) != 2
+                or not isinstance(linea[1], int) or isinstance(linea[1], bool) or linea[1] <= 0):
+            raise ValueError("Cada línea debe ser [id_producto, cantidad positiva]")
+        productos.append((linea[0], linea[1]))
+    
+    return datos.get("id_cliente"), productos, datos.get("prioridad", 0), datos.get("carril")
+
+
+def _ejecutar_lote(elementos, convertir, operacion, describir):
+    """
+    Valida los elementos de un lote, ejecuta la operación por lote del
+    gestor una sola vez y arma el resultado por elemento.
+    
+    Args:
+        elementos: Iterador de _elementos_lote
+        convertir: Valida un elemento y retorna la tupla para el gestor
+        operacion: Método por lote del gestor (recibe la lista de tuplas)
+        describir: Convierte un resultado exitoso en campos de la respuesta
+        
+    Returns:
+        Tupla (cuerpo, estado)
+    """
+    resultados = []
+    validos = []
+    posiciones = []
+    
+    for indice, elemento in enumerate(elementos):
+        try:
+            if isinstance(elemento, ValueError):
+                raise elemento
+            validos.append(convertir(elemento))
+        except ValueError as e:
+            resultados.append({"indice": indice, "estado": 400, "error": str(e)})
+            continue
+        posiciones.append(indice)
+        resultados.append(None)
+    
+    for indice, resultado in zip(posiciones, operacion(validos)):
+        if isinstance(resultado, ValueError):
+            resultados[indice] = {"indice": indice, "estado": 400, "error": str(resultado)}
+        else:
+            resultados[indice] = {"indice": indice, "estado": 201, **describir(resultado)}
+    
+    exitosos = sum(1 for r in resultados if r["estado"] == 201)
+    return {
+        "total": len(resultados),
+        "exitosos": exitosos,
+        "fallidos": len(resultados) - exitosos,
+        "resultados": resultados
+    }, 200
+
+
+def saludo():
+    """Endpoint de prueba"""
+    return {"mensaje": "API de Gestión de Inventario funcionando"}, 200
+
+
+def obtener_productos(gestor, args):
+    """
+    Obtiene los productos, con filtros opcionales de rango y top-N.
+    
+    Si viene el parámetro cursor (vacío para la primera página) la
+    respuesta es una página {"productos", "siguiente_cursor"}.
+    """
+    try:
+        if "cursor" in args:
+            return _pagina_productos(gestor, args), 200
+        productos = _consultar_productos(gestor, args)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return _lista_productos_json(productos), 200
+
+
+def transmitir_productos(gestor, args):
+    """
+    Obtiene los productos como NDJSON transmitido por bloques.
+    
+    Admite los mismos filtros que obtener_productos y el cursor.
+    
+    Returns:
+        Tupla (iterador de bloques en bytes, 200) o (error, 400)
+    """
+    try:
+        productos = _consultar_productos(gestor, args)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return _bloques_ndjson(productos), 200
+
+
+def obtener_producto(gestor, id_producto):
+    """Obtiene un producto específico"""
+    producto = gestor.buscar_producto_por_id(id_producto)
+    
+    if producto is None:
+        return _error("Producto no encontrado", 404)
+    
+    return JSONCodificado(producto.convertir_a_json()), 200
+
+
+def crear_producto(gestor, data):
+    """Crea un nuevo producto"""
+    if data is None:
+        return _error("Cuerpo JSON requerido", 400)
+    
+    nombre = data.get("nombre")
+    if not isinstance(nombre, str) or not nombre:
+        return _error("Nombre requerido", 400)
+    
+    try:
+        producto = gestor.agregar_producto(
+            nombre,
+            data.get("cantidad", 0),
+            data.get("precio", 0),
+            data.get("categoria", "General")
+        )
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return producto.convertir_a_dict(incluir_total=False), 201
+
+
+def crear_productos_lote(gestor, cuerpo, tipo_contenido=""):
+    """Crea muchos productos desde un arreglo JSON o NDJSON"""
+    try:
+        elementos = _elementos_lote(cuerpo, tipo_contenido)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return _ejecutar_lote(
+        elementos, _tupla_producto, gestor.agregar_productos_lote,
+        lambda p: {"producto": p.convertir_a_dict(incluir_total=False)}
+    )
+
+
+def importar_productos(gestor, flujo, args, tipo_contenido=""):
+    """
+    Importa un catálogo CSV o JSONL leyendo el cuerpo por flujo.
+    
+    El formato sale de ?formato=csv|jsonl o del Content-Type. La respuesta
+    es el resumen de importar_catalogo (filas, importados, rechazados,
+    rechazos por línea y bytes leídos).
+    
+    Args:
+        gestor: El gestor de inventario
+        flujo: Cuerpo de la petición como flujo binario (read(n))
+        args: Query string
+        tipo_contenido: Cabecera Content-Type
+    """
+    formato = args.get("formato") or detectar_formato(tipo_contenido=tipo_contenido)
+    if formato is None:
+        return _error("Indique el formato con ?formato=csv|jsonl o el Content-Type", 400)
+    
+    try:
+        return importar_catalogo(gestor, flujo, formato), 200
+    except ValueError as e:
+        return _error(str(e), 400)
+
+
+def _exportacion(recurso, args, exportar):
+    """
+    Valida formato y gzip de la query string y arma la Exportacion.
+    
+    Args:
+        recurso: Nombre base del archivo ("productos", "ordenes")
+        args: Query string
+        exportar: Función (formato, comprimir) -> generador de bloques
+    """
+    formato = args.get("formato") or "jsonl"
+    if formato not in exportador.FORMATOS:
+        return _error(f"Parámetro 'formato' debe ser {', '.join(exportador.FORMATOS)}", 400)
+    comprimir = args.get("gzip") in ("1", "true")
+    
+    bloques = exportar(formato, comprimir)
+    if comprimir:
+        return Exportacion(bloques, "application/gzip", f"{recurso}.{formato}.gz"), 200
+    return Exportacion(bloques, exportador.TIPOS_CONTENIDO[formato], f"{recurso}.{formato}"), 200
+
+
+def exportar_productos(gestor, args):
+    """
+    Exporta el catálogo como archivo CSV, JSONL o NDJSON transmitido por
+    bloques (?formato=, ?gzip=1, ?categoria=).
+    """
+    return _exportacion("productos", args, lambda formato, comprimir: exportador.exportar_productos(
+        gestor, formato, args.get("categoria") or None, comprimir))
+
+
+def exportar_ordenes(gestor, args):
+    """
+    Exporta las órdenes procesadas (incluidas las que están en disco)
+    como archivo CSV, JSONL o NDJSON transmitido por bloques (?formato=,
+    ?gzip=1, ?desde= y ?hasta= sobre procesada_en).
+    """
+    try:
+        desde = _parametro_numerico(args, "desde")
+        hasta = _parametro_numerico(args, "hasta")
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return _exportacion("ordenes", args, lambda formato, comprimir: exportador.exportar_ordenes(
+        gestor.ordenes_procesadas, formato, desde, hasta, comprimir))
+
+
+def eliminar_producto(gestor, id_producto):
+    """Elimina un producto"""
+    if gestor.eliminar_producto(id_producto):
+        return {"mensaje": "Producto eliminado"}, 200
+    return _error("Producto no encontrado", 404)
+
+
+def actualizar_cantidad(gestor, id_producto, data):
+    """Actualiza la cantidad de un producto"""
+    nueva_cantidad = (data or {}).get("cantidad")
+    
+    if nueva_cantidad is None:
+        return _error("Cantidad no especificada", 400)
+    
+    try:
+        actualizado = gestor.actualizar_cantidad(id_producto, nueva_cantidad)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    if actualizado:
+        return {"mensaje": "Cantidad actualizada"}, 200
+    return _error("Producto no encontrado", 404)
+
+
+def buscar_productos(gestor, nombre):
+    """Busca productos por nombre"""
+    productos = gestor.buscar_productos_por_nombre(nombre)
+    return [p.convertir_a_dict(incluir_total=False) for p in productos], 200
+
+
+def obtener_categoria(gestor, categoria):
+    """Obtiene los productos y totales de una categoría"""
+    productos = gestor.obtener_productos_por_categoria(categoria)
+    
+    if not productos:
+        return _error("Categoría no encontrada", 404)
+    
+    return _objeto_json({
+        "categoria": categoria,
+        "total_productos": gestor.contar_productos_por_categoria(categoria),
+        "total_valor_inventario": gestor.obtener_valor_categoria(categoria),
+        "productos": _lista_productos_json(productos)
+    }), 200
+
+
+def obtener_ordenes(gestor, args):
+    """
+    Obtiene las órdenes procesadas.
+    
+    Con alguno de los parámetros limite, cursor, desde o hasta la
+    respuesta es una página {"ordenes", "siguiente_cursor"}: cursor es el
+    número de la última orden recibida y desde/hasta acotan procesada_en
+    (segundos desde epoch). Sin parámetros retorna el historial completo
+    como arreglo transmitido por bloques (la parte en disco se lee línea a
+    línea, sin cargarla en memoria).
+    """
+    if not any(nombre in args for nombre in ("limite", "cursor", "desde", "hasta")):
+        return ArregloJSON(_bloques_arreglo_json(gestor.ordenes_procesadas.recorrer())), 200
+    
+    try:
+        cursor = _parametro_numerico(args, "cursor", int)
+        desde = _parametro_numerico(args, "desde")
+        hasta = _parametro_numerico(args, "hasta")
+        limite = _parametro_numerico(args, "limite", int)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    if limite is None:
+        limite = LIMITE_PAGINA
+    if not 0 < limite <= LIMITE_PAGINA_MAXIMO:
+        return _error(f"Parámetro 'limite' debe estar entre 1 y {LIMITE_PAGINA_MAXIMO}", 400)
+    
+    ordenes, siguiente = gestor.ordenes_procesadas.consultar(cursor, limite, desde, hasta)
+    return {"ordenes": ordenes, "siguiente_cursor": siguiente}, 200
+
+
+def crear_orden(gestor, data):
+    """Crea una nueva orden de venta"""
+    if data is None:
+        return _error("Cuerpo JSON requerido", 400)
+    
+    try:
+        orden = gestor.crear_orden_venta(
+            data.get("id_cliente"),
+            data.get("productos", []),
+            prioridad=data.get("prioridad", 0),
+            carril=data.get("carril")
+        )
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return orden, 201
+
+
+def crear_ordenes_lote(gestor, cuerpo, tipo_contenido=""):
+    """Crea muchas órdenes desde un arreglo JSON o NDJSON"""
+    try:
+        elementos = _elementos_lote(cuerpo, tipo_contenido)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    return _ejecutar_lote(
+        elementos, _tupla_orden, gestor.crear_ordenes_lote,
+        lambda orden: {"orden": orden}
+    )
+
+
+def procesar_orden(gestor):
+    """Procesa el siguiente orden de la cola"""
+    orden = gestor.procesar_proximo_orden()
+    
+    if orden is None:
+        return _error("No hay órdenes pendientes", 404)
+    
+    return orden, 200
+
+
+def obtener_proximo_orden(gestor):
+    """Obtiene el próximo orden sin procesarlo"""
+    orden = gestor.obtener_proximo_orden()
+    
+    if orden is None:
+        return {"mensaje": "No hay órdenes pendientes"}, 404
+    
+    return orden, 200
+
+
+def obtener_reporte(gestor):
+    """Obtiene el reporte del inventario"""
+    reporte = gestor.generar_reporte()
+    
+    # Convertir productos a diccionarios
+    reporte["productos_bajo_stock"] = [
+        {
+            "id": p.id_producto,
+            "nombre": p.nombre,
+            "cantidad": p.cantidad
+        }
+        for p in reporte["productos_bajo_stock"]
+    ]
+    
+    return reporte, 200
+
+
+def estado_procesador(procesador):
+    """Obtiene el estado y el rendimiento del procesador de órdenes"""
+    return procesador.obtener_estadisticas(), 200
+
+
+def iniciar_procesador(procesador):
+    """Inicia el procesador de órdenes en segundo plano"""
+    procesador.iniciar()
+    return procesador.obtener_estadisticas(), 200
+
+
+def _tiempo_maximo(data):
+    """Lee 'tiempo_maximo' (segundos) del cuerpo; por defecto 30"""
+    tiempo = (data or {}).get("tiempo_maximo", 30)
+    if not _es_numero(tiempo) or tiempo < 0:
+        raise ValueError("tiempo_maximo debe ser un número positivo")
+    return tiempo
+
+
+def detener_procesador(procesador, data):
+    """Detiene el procesador; con {"drenar": true} procesa antes lo pendiente"""
+    try:
+        tiempo = _tiempo_maximo(data)
+    except ValueError as e:
+        return _error(str(e), 400)
+    
+    procesador.detener(drenar=bool((data or {}).get("drenar")), tiempo_maximo=tiempo)
+    return procesador.obtener_estadisticas(), 200
+
+
+def drenar_procesador(procesador, data):
+    """Espera a que el procesador deje la cola vacía"""
+    try:
+        tiempo = _tiempo_maximo(data)
+        drenado = procesador.drenar(tiempo)
+    except ValueError as e:
+        return _error(str(e), 400)
+    except RuntimeError as e:
+        return _error(str(e), 409)
+    
+    return {"drenado": drenado, **procesador.obtener_estadisticas()}, 200
+
+
+def guardar_instantanea(gestor):
+    """Guarda una instantánea del inventario y vacía el diario"""
+    try:
+        return gestor.guardar_instantanea(), 200
+    except ValueError as e:
+        return _error(str(e), 409)
@@ -3,16 +3,37 @@ Paquete: src
 Módulos de estructuras de datos y gestor de inventario
 """
 
-from .nodo import Nodo
+from .nodo import Nodo, NodoDoble
 from .lista_enlazada import ListaEnlazada
+from .lista_doble import ListaDoblementeEnlazada
 from .cola import Cola
+from .cola_prioridad import ColaPrioridad, ColaCarriles
 from .producto import Producto
+from .indice_ngramas import IndiceNGramas
+from .lista_salto import ListaSalto
+from .concurrencia import CandadosRayados
+from .historial_ordenes import HistorialOrdenes
 from .gestor_inventario import GestorInventario
+from .procesador_ordenes import ProcesadorOrdenes
+from .almacen_columnar import AlmacenColumnar, ProductoColumnar
+from .gestor_columnar import GestorInventarioColumnar
 
 __all__ = [
     'Nodo',
+    'NodoDoble',
     'ListaEnlazada',
+    'ListaDoblementeEnlazada',
     'Cola',
+    'ColaPrioridad',
+    'ColaCarriles',
     'Producto',
-    'GestorInventario'
+    'IndiceNGramas',
+    'ListaSalto',
+    'CandadosRayados',
+    'HistorialOrdenes',
+    'GestorInventario',
+    'ProcesadorOrdenes',
+    'AlmacenColumnar',
+    'ProductoColumnar',
+    'GestorInventarioColumnar'
 ]
@@ -0,0 +1,351 @@
+"""
+Módulo: Almacén Columnar
+Descripción: Almacenamiento del inventario en columnas contiguas de NumPy
+y productos como vistas livianas sobre esas columnas
+
+Requiere NumPy (dependencia opcional: pip install numpy).
+"""
+
+import json
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+def cantidad_entera(valor):
+    """
+    Convierte una cantidad para la columna int64 sin truncarla.
+    
+    Raises:
+        ValueError: Si la cantidad no es un número entero (2.5, "3"...)
+    """
+    if isinstance(valor, bool) or not (isinstance(valor, (int, np.integer))
+                                       or isinstance(valor, float) and valor.is_integer()):
+        raise ValueError("La cantidad debe ser un número entero")
+    return int(valor)
+
+
+class AlmacenColumnar:
+    """
+    Guarda los datos de los productos en arreglos paralelos (una fila por
+    producto) para poder calcular reportes y filtros con operaciones
+    vectorizadas en lugar de recorrer objetos.
+    
+    Las filas eliminadas se marcan como inactivas y no se reutilizan, de
+    modo que la fila de un producto no cambia mientras exista.
+    
+    Columnas:
+        ids: Parte numérica del ID del producto
+        cantidades: Stock de cada producto
+        precios: Precio unitario
+        precios_enteros: Si el precio se agregó como int (para devolverlo igual)
+        codigos_categoria: Código entero de la categoría
+        activos: Máscara de filas vigentes
+    """
+    
+    CAPACIDAD_INICIAL = 1024
+    
+    def __init__(self, capacidad_inicial=CAPACIDAD_INICIAL):
+        """
+        Inicializa un almacén vacío.
+        
+        Args:
+            capacidad_inicial: Filas reservadas al inicio
+            
+        Raises:
+            ImportError: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ImportError("El almacén columnar requiere NumPy (pip install numpy)")
+        
+        self._capacidad_inicial = max(1, capacidad_inicial)
+        self.limpiar()
+    
+    def limpiar(self):
+        """Descarta todas las filas y vuelve a la capacidad inicial"""
+        capacidad = self._capacidad_inicial
+        self.ids = np.zeros(capacidad, dtype=np.int64)
+        self.cantidades = np.zeros(capacidad, dtype=np.int64)
+        self.precios = np.zeros(capacidad, dtype=np.float64)
+        self.precios_enteros = np.zeros(capacidad, dtype=bool)
+        self.codigos_categoria = np.zeros(capacidad, dtype=np.int32)
+        self.activos = np.zeros(capacidad, dtype=bool)
+        self.nombres = []
+        self.categorias = []   # código -> nombre de categoría
+        self._codigos = {}     # nombre de categoría -> código
+        self.filas = 0
+    
+    def _crecer(self):
+        """Duplica la capacidad de todas las columnas"""
+        capacidad = 2 * len(self.ids)
+        for columna in ("ids", "cantidades", "precios", "precios_enteros", "codigos_categoria", "activos"):
+            anterior = getattr(self, columna)
+            nueva = np.zeros(capacidad, dtype=anterior.dtype)
+            nueva[:self.filas] = anterior[:self.filas]
+            setattr(self, columna, nueva)
+    
+    def codigo_categoria(self, categoria, crear=False):
+        """
+        Obtiene el código entero de una categoría.
+        
+        Args:
+            categoria: Nombre de la categoría
+            crear: True para registrar la categoría si no existe
+            
+        Returns:
+            El código, o None si no existe y crear es False
+        """
+        codigo = self._codigos.get(categoria)
+        if codigo is None and crear:
+            codigo = len(self.categorias)
+            self._codigos[categoria] = codigo
+            self.categorias.append(categoria)
+        return codigo
+    
+    def agregar(self, id_numerico, nombre, cantidad, precio, categoria):
+        """
+        Agrega una fila al final de las columnas.
+        
+        Complejidad: O(1) amortizado
+        
+        Returns:
+            El número de fila asignado
+            
+        Raises:
+            ValueError: Si la cantidad no es un número entero
+        """
+        cantidad = cantidad_entera(cantidad)
+        if self.filas == len(self.ids):
+            self._crecer()
+        
+        fila = self.filas
+        self.ids[fila] = id_numerico
+        self.cantidades[fila] = cantidad
+        self.precios[fila] = precio
+        self.precios_enteros[fila] = isinstance(precio, int)
+        self.codigos_categoria[fila] = self.codigo_categoria(categoria, crear=True)
+        self.activos[fila] = True
+        self.nombres.append(nombre)
+        self.filas += 1
+        return fila
+    
+    def eliminar(self, fila):
+        """
+        Marca una fila como eliminada.
+        
+        Complejidad: O(1)
+        """
+        self.activos[fila] = False
+        self.nombres[fila] = None
+    
+    def _mascara(self):
+        """Máscara de filas activas dentro de las filas usadas"""
+        return self.activos[:self.filas]
+    
+    def filas_activas(self):
+        """Índices de las filas activas, en orden de inserción"""
+        return np.flatnonzero(self._mascara())
+    
+    def valor_total(self):
+        """Suma vectorizada de cantidad * precio de las filas activas"""
+        mascara = self._mascara()
+        return float(np.dot(self.cantidades[:self.filas][mascara], self.precios[:self.filas][mascara]))
+    
+    def filas_bajo_stock(self, umbral):
+        """Filas activas con cantidad menor al umbral"""
+        return np.flatnonzero(self._mascara() & (self.cantidades[:self.filas] < umbral))
+    
+    def _mascara_categoria(self, categoria):
+        """Máscara de filas activas de una categoría (None si no existe)"""
+        codigo = self.codigo_categoria(categoria)
+        if codigo is None:
+            return None
+        return self._mascara() & (self.codigos_categoria[:self.filas] == codigo)
+    
+    def filas_categoria(self, categoria):
+        """Filas activas de una categoría, en orden de inserción"""
+        mascara = self._mascara_categoria(categoria)
+        if mascara is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(mascara)
+    
+    def contar_categoria(self, categoria):
+        """Cantidad de filas activas de una categoría"""
+        mascara = self._mascara_categoria(categoria)
+        return 0 if mascara is None else int(np.count_nonzero(mascara))
+    
+    def valor_categoria(self, categoria):
+        """Valor de inventario de una categoría"""
+        mascara = self._mascara_categoria(categoria)
+        if mascara is None:
+            return 0.0
+        return float(np.dot(self.cantidades[:self.filas][mascara], self.precios[:self.filas][mascara]))
+    
+    def categorias_activas(self):
+        """Nombres de las categorías con filas activas, por orden de aparición"""
+        codigos = self.codigos_categoria[:self.filas][self._mascara()]
+        presentes, primera_aparicion = np.unique(codigos, return_index=True)
+        return [self.categorias[c] for c in presentes[np.argsort(primera_aparicion)]]
+    
+    def columna(self, campo):
+        """
+        Obtiene la columna de valores de un campo ordenable.
+        
+        Raises:
+            ValueError: Si el campo no es "cantidad" ni "precio"
+        """
+        if campo == "cantidad":
+            return self.cantidades[:self.filas]
+        if campo == "precio":
+            return self.precios[:self.filas]
+        raise ValueError(f"Campo no ordenable: {campo}. Opciones: cantidad, precio")
+    
+    def filas_ordenadas(self, campo, limite=None, descendente=False):
+        """
+        Filas activas ordenadas por un campo (empates por orden de inserción).
+        
+        Con límite usa una selección parcial antes de ordenar.
+        """
+        return self._ordenar_filas(self.filas_activas(), campo, limite, descendente)
+    
+    def _ordenar_filas(self, filas, campo, limite, descendente):
+        """Ordena filas por un campo, con selección parcial si hay límite"""
+        valores = self.columna(campo)[filas]
+        if descendente:
+            valores = -valores
+        
+        if limite is not None and limite < len(filas):
+            if limite <= 0:
+                return filas[:0]
+            # Se conserva todo valor igual al k-ésimo para desempatar por fila
+            corte = np.partition(valores, limite - 1)[limite - 1]
+            candidatos = valores <= corte
+            filas, valores = filas[candidatos], valores[candidatos]
+        
+        orden = np.lexsort((filas, valores))
+        return filas[orden][:limite]
+    
+    def filas_en_rango(self, campo, minimo=None, maximo=None, limite=None, descendente=False):
+        """Filas activas con minimo <= campo <= maximo, ordenadas por el campo"""
+        columna = self.columna(campo)
+        mascara = self._mascara().copy()
+        if minimo is not None:
+            mascara &= columna >= minimo
+        if maximo is not None:
+            mascara &= columna <= maximo
+        return self._ordenar_filas(np.flatnonzero(mascara), campo, limite, descendente)
+
+
+class ProductoColumnar:
+    """
+    Vista liviana de un producto guardado en un AlmacenColumnar.
+    
+    Expone los mismos atributos y métodos que Producto, pero lee y
+    escribe directamente en las columnas del almacén. Solo la cantidad
+    es modificable, así que es lo único que invalida el JSON cacheado.
+    """
+    
+    __slots__ = ('id_producto', '_almacen', '_fila', '_json')
+    
+    def __init__(self, id_producto, almacen, fila):
+        """
+        Constructor de la vista.
+        
+        Args:
+            id_producto: ID único
+            almacen: AlmacenColumnar que contiene la fila
+            fila: Número de fila del producto
+        """
+        self.id_producto = id_producto
+        self._almacen = almacen
+        self._fila = fila
+        self._json = None
+    
+    @property
+    def fila(self):
+        """Número de fila en el almacén"""
+        return self._fila
+    
+    @property
+    def nombre(self):
+        return self._almacen.nombres[self._fila]
+    
+    @property
+    def cantidad(self):
+        return int(self._almacen.cantidades[self._fila])
+    
+    @cantidad.setter
+    def cantidad(self, valor):
+        self._almacen.cantidades[self._fila] = cantidad_entera(valor)
+        self._json = None
+    
+    @property
+    def precio(self):
+        almacen = self._almacen
+        precio = almacen.precios[self._fila]
+        return int(precio) if almacen.precios_enteros[self._fila] else float(precio)
+    
+    @property
+    def categoria(self):
+        almacen = self._almacen
+        return almacen.categorias[almacen.codigos_categoria[self._fila]]
+    
+    def obtener_total(self):
+        """Calcula el valor total del producto"""
+        return self.cantidad * self.precio
+    
+    def convertir_a_dict(self, incluir_total=True):
+        """
+        Convierte el producto al diccionario de la API.
+        
+        Args:
+            incluir_total: Si se agrega el valor total (cantidad * precio)
+            
+        Returns:
+            Diccionario con id, nombre, cantidad, precio, categoria y total
+        """
+        cantidad, precio = self.cantidad, self.precio
+        datos = {
+            "id": self.id_producto,
+            "nombre": self.nombre,
+            "cantidad": cantidad,
+            "precio": precio,
+            "categoria": self.categoria
+        }
+        if incluir_total:
+            datos["total"] = cantidad * precio
+        return datos
+    
+    def convertir_a_json(self):
+        """
+        Obtiene el producto (con total) codificado como JSON compacto y
+        con claves ordenadas, cacheado hasta que cambie la cantidad.
+        
+        Returns:
+            String JSON
+        """
+        fragmento = self._json
+        if fragmento is None:
+            datos = self.convertir_a_dict()
+            fragmento = json.dumps(datos, sort_keys=True, separators=(",", ":"))
+            self._json = fragmento
+            if self.cantidad != datos["cantidad"]:
+                # Otro hilo lo modificó mientras se codificaba: no cachear
+                self._json = None
+        return fragmento
+    
+    def __eq__(self, otro):
+        """Compara productos por ID"""
+        if isinstance(otro, ProductoColumnar):
+            return self.id_producto == otro.id_producto
+        return False
+    
+    def __repr__(self):
+        """Representación en string del producto"""
+        return f"Producto(id={self.id_producto}, nombre={self.nombre}, cant={self.cantidad})"
+    
+    def __str__(self):
+        """String amigable del producto"""
+        return f"[{self.id_producto}] {self.nombre} - {self.cantidad} unidades @ ${self.precio}"
@@ -1,11 +1,9 @@
 """
 Módulo: Cola (Queue)
-Descripción: Implementación de una Cola usando la Lista Enlazada
+Descripción: Implementación de una Cola sobre un buffer circular redimensionable
 Una Cola es FIFO (First In, First Out) - el primero en entrar es el primero en salir
 """
 
-from lista_enlazada import ListaEnlazada
-
 
 class Cola:
     """
@@ -16,6 +14,11 @@ class Cola:
     - Los elementos se extraen del inicio (desencolar)
     - El primer elemento que entra es el primero que sale
     
+    Los elementos se guardan en un buffer circular (arreglo con índice de
+    inicio) que duplica su capacidad cuando se llena y la reduce a la
+    mitad cuando queda ocupado a menos de un cuarto. Encolar no crea un
+    nodo por elemento y los lotes se copian con asignación por rebanadas.
+    
     Casos de uso:
         - Procesamiento de tareas
         - Gestión de impresoras
@@ -23,32 +26,107 @@ class Cola:
         - Atención al cliente
     
     Complejidad de operaciones:
-        - Encolar: O(1)
-        - Desencolar: O(1)
-        - Ver frente: O(1)
+        - Encolar: O(1) amortizado
+        - Desencolar: O(1) amortizado
+        - Ver frente/final: O(1)
+        - Encolar/desencolar lote de k: O(k)
         - Buscar: O(n)
     """
     
-    def __init__(self):
-        """Inicializa una cola vacía"""
-        self._lista = ListaEnlazada()
+    CAPACIDAD_INICIAL = 8
+    
+    def __init__(self, capacidad_inicial=CAPACIDAD_INICIAL):
+        """
+        Inicializa una cola vacía.
+        
+        Args:
+            capacidad_inicial: Tamaño inicial del buffer
+        """
+        self._capacidad_minima = max(1, capacidad_inicial)
+        self._datos = [None] * self._capacidad_minima
+        self._inicio = 0
+        self._cantidad = 0
+    
+    def _redimensionar(self, capacidad):
+        """
+        Copia los elementos a un buffer nuevo, dejando el frente en 0.
+        
+        Complejidad: O(n)
+        
+        Args:
+            capacidad: Tamaño del nuevo buffer
+        """
+        elementos = self.convertir_a_lista()
+        elementos.extend([None] * (capacidad - self._cantidad))
+        self._datos = elementos
+        self._inicio = 0
+    
+    def _asegurar_capacidad(self, requerida):
+        """Duplica el buffer hasta que quepan 'requerida' elementos"""
+        capacidad = len(self._datos)
+        if requerida <= capacidad:
+            return
+        while capacidad < requerida:
+            capacidad *= 2
+        self._redimensionar(capacidad)
+    
+    def _reducir_si_conviene(self):
+        """Reduce el buffer a la mitad si está ocupado a menos de un cuarto"""
+        capacidad = len(self._datos)
+        if capacidad > self._capacidad_minima and self._cantidad < capacidad // 4:
+            self._redimensionar(max(self._capacidad_minima, capacidad // 2))
     
     def encolar(self, dato):
         """
         Añade un elemento al final de la cola.
         
-        Complejidad: O(1)
+        Complejidad: O(1) amortizado
         
         Args:
             dato: El valor a encolar
         """
-        self._lista.insertar_final(dato)
+        self._asegurar_capacidad(self._cantidad + 1)
+        posicion = (self._inicio + self._cantidad) % len(self._datos)
+        self._datos[posicion] = dato
+        self._cantidad += 1
+    
+    def encolar_lote(self, datos):
+        """
+        Añade varios elementos al final de la cola, en orden.
+        
+        Reserva la capacidad una sola vez y copia el lote en a lo sumo
+        dos asignaciones por rebanadas.
+        
+        Complejidad: O(k) - k es el tamaño del lote
+        
+        Args:
+            datos: Iterable con los valores a encolar
+            
+        Returns:
+            Cantidad de elementos encolados
+        """
+        lote = datos if isinstance(datos, list) else list(datos)
+        k = len(lote)
+        if k == 0:
+            return 0
+        
+        self._asegurar_capacidad(self._cantidad + k)
+        capacidad = len(self._datos)
+        posicion = (self._inicio + self._cantidad) % capacidad
+        primer_tramo = min(k, capacidad - posicion)
+        
+        self._datos[posicion:posicion + primer_tramo] = lote[:primer_tramo]
+        if primer_tramo < k:
+            self._datos[:k - primer_tramo] = lote[primer_tramo:]
+        
+        self._cantidad += k
+        return k
     
     def desencolar(self):
         """
         Extrae el elemento del inicio de la cola.
         
-        Complejidad: O(1)
+        Complejidad: O(1) amortizado
         
         Returns:
             El primer elemento de la cola
@@ -59,7 +137,44 @@ class Cola:
         if self.esta_vacia():
             raise IndexError("Cola vacía")
         
-        return self._lista.eliminar_posicion(0)
+        dato = self._datos[self._inicio]
+        self._datos[self._inicio] = None  # Liberar la referencia
+        self._inicio = (self._inicio + 1) % len(self._datos)
+        self._cantidad -= 1
+        self._reducir_si_conviene()
+        return dato
+    
+    def desencolar_lote(self, n):
+        """
+        Extrae hasta n elementos del inicio de la cola, en orden FIFO.
+        
+        Complejidad: O(k) - k es la cantidad extraída
+        
+        Args:
+            n: Cantidad máxima de elementos a extraer
+            
+        Returns:
+            Lista con los elementos extraídos (vacía si la cola está vacía)
+        """
+        k = min(max(n, 0), self._cantidad)
+        if k == 0:
+            return []
+        
+        capacidad = len(self._datos)
+        inicio = self._inicio
+        primer_tramo = min(k, capacidad - inicio)
+        
+        lote = self._datos[inicio:inicio + primer_tramo]
+        self._datos[inicio:inicio + primer_tramo] = [None] * primer_tramo
+        if primer_tramo < k:
+            resto = k - primer_tramo
+            lote.extend(self._datos[:resto])
+            self._datos[:resto] = [None] * resto
+        
+        self._inicio = (inicio + k) % capacidad
+        self._cantidad -= k
+        self._reducir_si_conviene()
+        return lote
     
     def frente(self):
         """
@@ -76,13 +191,13 @@ class Cola:
         if self.esta_vacia():
             raise IndexError("Cola vacía")
         
-        return self._lista.obtener(0)
+        return self._datos[self._inicio]
     
     def final(self):
         """
         Obtiene el elemento al final sin extraerlo.
         
-        Complejidad: O(1) si mantenemos referencia a la cola
+        Complejidad: O(1)
         
         Returns:
             El último elemento de la cola
@@ -93,7 +208,7 @@ class Cola:
         if self.esta_vacia():
             raise IndexError("Cola vacía")
         
-        return self._lista.obtener(self._lista.obtener_cantidad() - 1)
+        return self._datos[(self._inicio + self._cantidad - 1) % len(self._datos)]
     
     def esta_vacia(self):
         """
@@ -104,7 +219,7 @@ class Cola:
         Returns:
             True si la cola está vacía
         """
-        return self._lista.esta_vacia()
+        return self._cantidad == 0
     
     def obtener_cantidad(self):
         """
@@ -115,7 +230,7 @@ class Cola:
         Returns:
             Número de elementos
         """
-        return self._lista.obtener_cantidad()
+        return self._cantidad
     
     def convertir_a_lista(self):
         """
@@ -126,7 +241,38 @@ class Cola:
         Returns:
             Lista con todos los elementos de la cola
         """
-        return self._lista.recorrer()
+        fin = self._inicio + self._cantidad
+        if fin <= len(self._datos):
+            return self._datos[self._inicio:fin]
+        return self._datos[self._inicio:] + self._datos[:fin - len(self._datos)]
+    
+    def filtrar(self, predicado):
+        """
+        Recorre de forma perezosa los elementos que cumplen un predicado.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional
+        
+        Args:
+            predicado: Función que recibe un dato y retorna True/False
+            
+        Returns:
+            Generador con los datos en orden FIFO
+        """
+        return (dato for dato in self if predicado(dato))
+    
+    def mapear(self, funcion):
+        """
+        Recorre de forma perezosa los elementos transformados.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional
+        
+        Args:
+            funcion: Función que se aplica a cada dato
+            
+        Returns:
+            Generador con los resultados en orden FIFO
+        """
+        return (funcion(dato) for dato in self)
     
     def limpiar(self):
         """
@@ -134,7 +280,9 @@ class Cola:
         
         Complejidad: O(1)
         """
-        self._lista.limpiar()
+        self._datos = [None] * self._capacidad_minima
+        self._inicio = 0
+        self._cantidad = 0
     
     def buscar(self, dato):
         """
@@ -148,11 +296,29 @@ class Cola:
         Returns:
             True si existe, False en caso contrario
         """
-        return self._lista.buscar(dato)
+        return any(elemento == dato for elemento in self)
+    
+    def __iter__(self):
+        """Recorre la cola del frente al final sin extraer elementos"""
+        datos = self._datos
+        capacidad = len(datos)
+        for i in range(self._cantidad):
+            yield datos[(self._inicio + i) % capacidad]
+    
+    def __reversed__(self):
+        """Recorre la cola del final al frente"""
+        datos = self._datos
+        capacidad = len(datos)
+        for i in range(self._cantidad - 1, -1, -1):
+            yield datos[(self._inicio + i) % capacidad]
+    
+    def __contains__(self, dato):
+        """Permite usar el operador 'in'"""
+        return self.buscar(dato)
     
     def __repr__(self):
         """Representación en string de la cola"""
-        return f"Cola({self._lista.recorrer()})"
+        return f"Cola({list(self)})"
     
     def __len__(self):
         """Retorna la cantidad de elementos"""
@@ -160,5 +326,5 @@ class Cola:
     
     def __str__(self):
         """Retorna string amigable de la cola"""
-        elementos = " <- ".join(str(d) for d in self._lista.recorrer())
+        elementos = " <- ".join(str(d) for d in self)
         return f"[{elementos}]" if elementos else "[]"
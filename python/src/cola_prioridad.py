@@ -0,0 +1,516 @@
+"""
+Módulo: Cola de Prioridad y Cola por Carriles
+Descripción: Cola de prioridad sobre un montículo binario con desempate FIFO,
+cola FIFO que admite prioridades y cola de varios carriles con planificación
+ponderada (weighted round-robin)
+"""
+
+from cola import Cola
+
+
+class ColaPrioridad:
+    """
+    Implementa una Cola de Prioridad sobre un montículo binario (heap).
+    
+    Sale primero el elemento de mayor prioridad; entre elementos con la
+    misma prioridad se respeta el orden de llegada (FIFO), gracias a un
+    número de secuencia que desempata. Con una sola prioridad se comporta
+    exactamente como una Cola.
+    
+    Cada entrada del montículo es la tupla (-prioridad, secuencia, dato):
+    el montículo es de mínimos, así que negar la prioridad deja arriba a
+    la mayor, y la secuencia (única) evita comparar los datos.
+    
+    Complejidad de operaciones:
+        - Encolar: O(log n)
+        - Desencolar: O(log n)
+        - Ver frente: O(1)
+        - Desencolar lote de k: O(k log n)
+        - Recorrer en orden de salida: O(n log n)
+    """
+    
+    def __init__(self):
+        """Inicializa una cola de prioridad vacía"""
+        self._monticulo = []
+        self._secuencia = 0
+    
+    def _subir(self, i):
+        """Sube la entrada i hasta restaurar la propiedad del montículo"""
+        monticulo = self._monticulo
+        entrada = monticulo[i]
+        while i > 0:
+            padre = (i - 1) // 2
+            if monticulo[padre] <= entrada:
+                break
+            monticulo[i] = monticulo[padre]
+            i = padre
+        monticulo[i] = entrada
+    
+    def _bajar(self, i):
+        """Baja la entrada i hasta restaurar la propiedad del montículo"""
+        monticulo = self._monticulo
+        n = len(monticulo)
+        entrada = monticulo[i]
+        while True:
+            hijo = 2 * i + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and monticulo[hijo + 1] < monticulo[hijo]:
+                hijo += 1
+            if entrada <= monticulo[hijo]:
+                break
+            monticulo[i] = monticulo[hijo]
+            i = hijo
+        monticulo[i] = entrada
+    
+    def encolar(self, dato, prioridad=0):
+        """
+        Añade un elemento con una prioridad.
+        
+        Complejidad: O(log n)
+        
+        Args:
+            dato: El valor a encolar
+            prioridad: Entero; mayor prioridad sale antes (por defecto 0)
+        """
+        self._monticulo.append((-prioridad, self._secuencia, dato))
+        self._secuencia += 1
+        self._subir(len(self._monticulo) - 1)
+    
+    def encolar_lote(self, datos, prioridad=0):
+        """
+        Añade varios elementos con la misma prioridad, en orden.
+        
+        Complejidad: O(k log n) - k es el tamaño del lote
+        
+        Args:
+            datos: Iterable de valores
+            prioridad: Prioridad de todos los elementos
+        """
+        for dato in datos:
+            self.encolar(dato, prioridad)
+    
+    def desencolar(self):
+        """
+        Extrae el elemento de mayor prioridad (el más antiguo si empatan).
+        
+        Complejidad: O(log n)
+        
+        Returns:
+            El elemento extraído
+            
+        Raises:
+            IndexError: Si la cola está vacía
+        """
+        if not self._monticulo:
+            raise IndexError("Cola vacía")
+        
+        monticulo = self._monticulo
+        ultimo = monticulo.pop()
+        if not monticulo:
+            return ultimo[2]
+        
+        primero = monticulo[0]
+        monticulo[0] = ultimo
+        self._bajar(0)
+        return primero[2]
+    
+    def desencolar_lote(self, n):
+        """
+        Extrae hasta n elementos en orden de salida.
+        
+        Complejidad: O(k log n) - k es la cantidad extraída
+        
+        Args:
+            n: Cantidad máxima de elementos a extraer
+            
+        Returns:
+            Lista con los elementos extraídos (vacía si la cola está vacía)
+        """
+        k = min(max(n, 0), len(self._monticulo))
+        return [self.desencolar() for _ in range(k)]
+    
+    def frente(self):
+        """
+        Obtiene el próximo elemento a salir sin extraerlo.
+        
+        Complejidad: O(1)
+        
+        Returns:
+            El elemento de mayor prioridad
+            
+        Raises:
+            IndexError: Si la cola está vacía
+        """
+        if not self._monticulo:
+            raise IndexError("Cola vacía")
+        return self._monticulo[0][2]
+    
+    def prioridad_frente(self):
+        """
+        Obtiene la prioridad del próximo elemento a salir.
+        
+        Complejidad: O(1)
+        
+        Raises:
+            IndexError: Si la cola está vacía
+        """
+        if not self._monticulo:
+            raise IndexError("Cola vacía")
+        return -self._monticulo[0][0]
+    
+    def esta_vacia(self):
+        """Verifica si la cola está vacía"""
+        return not self._monticulo
+    
+    def obtener_cantidad(self):
+        """Retorna la cantidad de elementos"""
+        return len(self._monticulo)
+    
+    def convertir_a_lista(self):
+        """
+        Convierte la cola a una lista en orden de salida.
+        
+        Complejidad: O(n log n)
+        """
+        return [dato for _, _, dato in sorted(self._monticulo)]
+    
+    def limpiar(self):
+        """
+        Limpia toda la cola.
+        
+        Complejidad: O(1)
+        """
+        self._monticulo = []
+    
+    def __iter__(self):
+        """Recorre los elementos en orden de salida sin extraerlos"""
+        return iter(self.convertir_a_lista())
+    
+    def __len__(self):
+        """Retorna la cantidad de elementos"""
+        return len(self._monticulo)
+    
+    def __repr__(self):
+        """Representación en string de la cola"""
+        return f"ColaPrioridad({self.convertir_a_lista()})"
+
+
+class ColaConPrioridades:
+    """
+    Cola FIFO que también admite prioridades.
+    
+    Sale primero el elemento de mayor prioridad y, entre iguales, el más
+    antiguo, como en una ColaPrioridad. Pero los elementos de prioridad 0
+    (el caso común) van a una Cola y no al montículo: mientras nadie pida
+    otra prioridad, encolar y desencolar siguen siendo O(1).
+    
+    Complejidad de operaciones:
+        - Encolar: O(1) con prioridad 0, O(log p) con otra prioridad
+        - Desencolar: O(1) si no hay prioridades pendientes, O(log p) si hay
+        - Ver frente: O(1)
+        (p es la cantidad de elementos con prioridad distinta de 0)
+    """
+    
+    def __init__(self):
+        """Inicializa una cola vacía"""
+        self._fifo = Cola()
+        self._prioritarios = ColaPrioridad()
+    
+    def _sale_prioritario(self):
+        """True si el próximo elemento sale del montículo y no de la Cola"""
+        if self._prioritarios.esta_vacia():
+            return False
+        return self._fifo.esta_vacia() or self._prioritarios.prioridad_frente() > 0
+    
+    def encolar(self, dato, prioridad=0):
+        """
+        Añade un elemento con una prioridad.
+        
+        Args:
+            dato: El valor a encolar
+            prioridad: Entero; mayor prioridad sale antes (por defecto 0)
+        """
+        if prioridad:
+            self._prioritarios.encolar(dato, prioridad)
+        else:
+            self._fifo.encolar(dato)
+    
+    def encolar_lote(self, datos, prioridad=0):
+        """
+        Añade varios elementos con la misma prioridad, en orden.
+        
+        Complejidad: O(k) con prioridad 0, O(k log p) con otra
+        """
+        if prioridad:
+            self._prioritarios.encolar_lote(datos, prioridad)
+        else:
+            self._fifo.encolar_lote(datos)
+    
+    def desencolar(self):
+        """
+        Extrae el elemento de mayor prioridad (el más antiguo si empatan).
+        
+        Raises:
+            IndexError: Si la cola está vacía
+        """
+        if self._sale_prioritario():
+            return self._prioritarios.desencolar()
+        return self._fifo.desencolar()
+    
+    def desencolar_lote(self, n):
+        """
+        Extrae hasta n elementos en orden de salida.
+        
+        Complejidad: O(k) sin prioridades pendientes, O(k log p) con ellas
+        """
+        if self._prioritarios.esta_vacia():
+            return self._fifo.desencolar_lote(n)
+        k = min(max(n, 0), len(self))
+        return [self.desencolar() for _ in range(k)]
+    
+    def frente(self):
+        """
+        Obtiene el próximo elemento a salir sin extraerlo.
+        
+        Raises:
+            IndexError: Si la cola está vacía
+        """
+        if self._sale_prioritario():
+            return self._prioritarios.frente()
+        return self._fifo.frente()
+    
+    def esta_vacia(self):
+        """Verifica si la cola está vacía"""
+        return self._fifo.esta_vacia() and self._prioritarios.esta_vacia()
+    
+    def obtener_cantidad(self):
+        """Retorna la cantidad de elementos"""
+        return len(self)
+    
+    def convertir_a_lista(self):
+        """
+        Convierte la cola a una lista en orden de salida.
+        
+        Complejidad: O(n + p log p)
+        """
+        # Entradas (-prioridad, secuencia, dato): las positivas salen antes que la Cola
+        prioritarios = sorted(self._prioritarios._monticulo)
+        mayores = [dato for clave, _, dato in prioritarios if clave < 0]
+        menores = [dato for clave, _, dato in prioritarios if clave > 0]
+        return mayores + self._fifo.convertir_a_lista() + menores
+    
+    def limpiar(self):
+        """Limpia toda la cola"""
+        self._fifo.limpiar()
+        self._prioritarios.limpiar()
+    
+    def __iter__(self):
+        """Recorre los elementos en orden de salida sin extraerlos"""
+        return iter(self.convertir_a_lista())
+    
+    def __len__(self):
+        """Retorna la cantidad de elementos"""
+        return len(self._fifo) + len(self._prioritarios)
+    
+    def __repr__(self):
+        """Representación en string de la cola"""
+        return f"ColaConPrioridades({self.convertir_a_lista()})"
+
+
+class ColaCarriles:
+    """
+    Cola con varios carriles (por ejemplo "express" y "mayorista") que se
+    atienden con planificación ponderada.
+    
+    Cada carril es una ColaPrioridad. Al desencolar se elige el carril con
+    round-robin ponderado suave: un carril de peso 3 frente a uno de peso
+    1 recibe 3 de cada 4 turnos, intercalados (E E M E, no E E E M), y un
+    carril vacío cede su turno. Así la espera del carril prioritario queda
+    acotada y los carriles de menor peso nunca se quedan sin atender.
+    
+    Complejidad de operaciones:
+        - Encolar: O(log n)
+        - Desencolar: O(c + log n) - c es la cantidad de carriles
+        - Ver frente: O(c)
+    """
+    
+    def __init__(self, pesos):
+        """
+        Crea los carriles.
+        
+        Args:
+            pesos: Diccionario carril -> peso (entero positivo). El primer
+                carril es el carril por defecto.
+                
+        Raises:
+            ValueError: Si no hay carriles o algún peso no es positivo
+        """
+        if not pesos:
+            raise ValueError("Se requiere al menos un carril")
+        if any(not isinstance(peso, int) or peso < 1 for peso in pesos.values()):
+            raise ValueError("Los pesos de los carriles deben ser enteros positivos")
+        
+        self.pesos = dict(pesos)
+        self.carril_por_defecto = next(iter(self.pesos))
+        self._carriles = {carril: ColaPrioridad() for carril in self.pesos}
+        self._credito = dict.fromkeys(self.pesos, 0)
+        self._cantidad = 0
+    
+    def _cola_de(self, carril):
+        """ColaPrioridad de un carril (ValueError si no existe)"""
+        try:
+            return self._carriles[self.carril_por_defecto if carril is None else carril]
+        except KeyError:
+            raise ValueError(f"Carril desconocido: {carril}")
+    
+    def _elegir_carril(self, aplicar=True):
+        """
+        Elige el próximo carril con round-robin ponderado suave.
+        
+        Cada carril no vacío suma su peso a su crédito; gana el de mayor
+        crédito (el primero declarado si empatan) y se le descuenta la
+        suma de los pesos participantes.
+        
+        Args:
+            aplicar: Si False solo calcula el carril, sin modificar créditos
+            
+        Returns:
+            El carril elegido
+        """
+        credito = self._credito if aplicar else dict(self._credito)
+        elegido = None
+        total = 0
+        for carril, cola in self._carriles.items():
+            if cola.esta_vacia():
+                continue
+            peso = self.pesos[carril]
+            credito[carril] += peso
+            total += peso
+            if elegido is None or credito[carril] > credito[elegido]:
+                elegido = carril
+        credito[elegido] -= total
+        return elegido
+    
+    def encolar(self, dato, carril=None, prioridad=0):
+        """
+        Añade un elemento a un carril.
+        
+        Complejidad: O(log n)
+        
+        Args:
+            dato: El valor a encolar
+            carril: Nombre del carril (None = carril por defecto)
+            prioridad: Prioridad dentro del carril (mayor sale antes)
+            
+        Raises:
+            ValueError: Si el carril no existe
+        """
+        self._cola_de(carril).encolar(dato, prioridad)
+        self._cantidad += 1
+    
+    def encolar_lote(self, datos, carril=None, prioridad=0):
+        """
+        Añade varios elementos a un mismo carril, en orden.
+        
+        Complejidad: O(k log n) - k es el tamaño del lote
+        """
+        cola = self._cola_de(carril)
+        for dato in datos:
+            cola.encolar(dato, prioridad)
+            self._cantidad += 1
+    
+    def desencolar(self):
+        """
+        Extrae el próximo elemento según la planificación entre carriles.
+        
+        Complejidad: O(c + log n)
+        
+        Raises:
+            IndexError: Si todos los carriles están vacíos
+        """
+        if self._cantidad == 0:
+            raise IndexError("Cola vacía")
+        self._cantidad -= 1
+        return self._carriles[self._elegir_carril()].desencolar()
+    
+    def desencolar_lote(self, n):
+        """
+        Extrae hasta n elementos en orden de planificación.
+        
+        Complejidad: O(k (c + log n))
+        """
+        k = min(max(n, 0), self._cantidad)
+        return [self.desencolar() for _ in range(k)]
+    
+    def frente(self):
+        """
+        Obtiene el elemento que saldría al desencolar, sin extraerlo.
+        
+        Complejidad: O(c)
+        
+        Raises:
+            IndexError: Si todos los carriles están vacíos
+        """
+        if self._cantidad == 0:
+            raise IndexError("Cola vacía")
+        return self._carriles[self._elegir_carril(aplicar=False)].frente()
+    
+    def esta_vacia(self):
+        """Verifica si todos los carriles están vacíos"""
+        return self._cantidad == 0
+    
+    def obtener_cantidad(self):
+        """Retorna la cantidad total de elementos"""
+        return self._cantidad
+    
+    def cantidad_por_carril(self):
+        """
+        Cantidad de elementos en cada carril.
+        
+        Returns:
+            Diccionario carril -> cantidad
+        """
+        return {carril: len(cola) for carril, cola in self._carriles.items()}
+    
+    def obtener_creditos(self):
+        """Créditos actuales de la planificación (para guardar la cola y retomarla)"""
+        return dict(self._credito)
+    
+    def restaurar_creditos(self, creditos):
+        """
+        Restablece créditos guardados con obtener_creditos, así la cola
+        retomada alterna los carriles igual que la original.
+        
+        Args:
+            creditos: Diccionario carril -> crédito (los carriles ausentes quedan en 0)
+        """
+        self._credito = {carril: creditos.get(carril, 0) for carril in self.pesos}
+    
+    def convertir_a_lista(self):
+        """
+        Lista con todos los elementos, carril por carril (sin simular la
+        planificación).
+        
+        Complejidad: O(n log n)
+        """
+        return [dato for cola in self._carriles.values() for dato in cola]
+    
+    def limpiar(self):
+        """Limpia todos los carriles y reinicia la planificación"""
+        for cola in self._carriles.values():
+            cola.limpiar()
+        self._credito = dict.fromkeys(self.pesos, 0)
+        self._cantidad = 0
+    
+    def __iter__(self):
+        """Recorre los elementos carril por carril"""
+        return iter(self.convertir_a_lista())
+    
+    def __len__(self):
+        """Retorna la cantidad total de elementos"""
+        return self._cantidad
+    
+    def __repr__(self):
+        """Representación en string de la cola"""
+        return f"ColaCarriles({self.cantidad_por_carril()})"
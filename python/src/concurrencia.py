@@ -0,0 +1,82 @@
+"""
+Módulo: Concurrencia
+Descripción: Candados rayados (striped locks) para sincronizar operaciones
+por clave sin un candado global
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class CandadosRayados:
+    """
+    Conjunto fijo de candados repartidos por hash de la clave.
+    
+    Dos claves distintas casi siempre caen en candados distintos, por lo
+    que las operaciones sobre productos no relacionados se ejecutan en
+    paralelo, sin reservar un candado por cada producto.
+    
+    Complejidad de operaciones:
+        - Obtener el candado de una clave: O(1)
+        - Tomar los candados de k claves: O(k log k)
+    """
+    
+    CANTIDAD_POR_DEFECTO = 64
+    
+    def __init__(self, cantidad=CANTIDAD_POR_DEFECTO):
+        """
+        Crea los candados.
+        
+        Args:
+            cantidad: Número de franjas (candados) a repartir
+        """
+        self._candados = [threading.Lock() for _ in range(cantidad)]
+    
+    def _franja(self, clave):
+        """Índice del candado asignado a una clave"""
+        return hash(clave) % len(self._candados)
+    
+    def para(self, clave):
+        """
+        Obtiene el candado que protege una clave.
+        
+        Args:
+            clave: Clave a proteger (por ejemplo el ID del producto)
+            
+        Returns:
+            threading.Lock utilizable con 'with'
+        """
+        return self._candados[self._franja(clave)]
+    
+    @contextmanager
+    def para_varias(self, claves):
+        """
+        Toma los candados de varias claves en un orden global fijo.
+        
+        Ordenar las franjas evita interbloqueos entre hilos que piden
+        conjuntos de claves que se solapan.
+        
+        Args:
+            claves: Iterable de claves a proteger
+        """
+        franjas = sorted({self._franja(clave) for clave in claves})
+        tomados = []
+        try:
+            for franja in franjas:
+                self._candados[franja].acquire()
+                tomados.append(franja)
+            yield
+        finally:
+            for franja in reversed(tomados):
+                self._candados[franja].release()
+    
+    @contextmanager
+    def todos(self):
+        """Toma todos los candados (para operaciones sobre el conjunto completo)"""
+        for candado in self._candados:
+            candado.acquire()
+        try:
+            yield
+        finally:
+            for candado in reversed(self._candados):
+                candado.release()
@@ -0,0 +1,207 @@
+"""
+Módulo: Diario de Escritura Anticipada
+Descripción: Registro de solo agregado (write-ahead log) de las operaciones
+que modifican el inventario, con confirmación agrupada (group commit)
+"""
+
+import json
+import os
+import threading
+import zlib
+
+
+class DiarioEscritura:
+    """
+    Diario en disco de las operaciones de un GestorInventario.
+    
+    Cada registro es una línea "crc32 json": el CRC detecta la última
+    línea a medio escribir si el proceso se cayó durante una escritura, y
+    la lectura se detiene ahí (y la recorta) en lugar de fallar.
+    
+    Confirmación agrupada:
+        registrar() solo agrega el registro a un buffer en memoria y
+        retorna su número de secuencia. esperar(secuencia) bloquea hasta
+        que el registro está en disco. El primer hilo que espera se vuelve
+        líder: aguarda hasta intervalo_grupo segundos a que otros hilos
+        agreguen registros, escribe todo el buffer y hace un solo fsync;
+        los demás hilos que esperaban quedan confirmados con ese fsync.
+        Con muchas peticiones concurrentes el costo del fsync se reparte
+        entre todas, y con intervalo_grupo=0 igual se agrupan los
+        registros que llegan mientras el líder escribe.
+    
+    Complejidad de operaciones:
+        - Registrar: O(tamaño del registro)
+        - Esperar: un fsync por grupo, no por registro
+        - Leer: O(tamaño del archivo)
+    """
+    
+    INTERVALO_GRUPO = 0  # Segundos extra que el líder espera a juntar registros
+    
+    def __init__(self, ruta, intervalo_grupo=INTERVALO_GRUPO, sincronizar=True):
+        """
+        Abre (o crea) el diario.
+        
+        Args:
+            ruta: Archivo del diario
+            intervalo_grupo: Segundos que el líder espera antes de escribir
+            sincronizar: Si False se omite el fsync (los registros llegan al
+                sistema operativo pero pueden perderse si se cae la máquina)
+        """
+        self.ruta = ruta
+        self.intervalo_grupo = intervalo_grupo
+        self.sincronizar = sincronizar
+        
+        self._pendientes = []    # Líneas registradas aún no escritas
+        self._secuencia = 0      # Último número de secuencia asignado
+        self._confirmada = 0     # Último número de secuencia en disco
+        self._escribiendo = False
+        self._condicion = threading.Condition()
+        self._archivo = open(ruta, "ab")
+    
+    @staticmethod
+    def _codificar(registro):
+        """Línea del archivo para un registro"""
+        datos = json.dumps(registro, separators=(",", ":")).encode()
+        return b"%08x %s\n" % (zlib.crc32(datos), datos)
+    
+    def registrar(self, registro):
+        """
+        Agrega un registro al diario sin esperar a que llegue al disco.
+        
+        Complejidad: O(tamaño del registro)
+        
+        Args:
+            registro: Diccionario serializable a JSON
+            
+        Returns:
+            Número de secuencia del registro (para esperar())
+        """
+        linea = self._codificar(registro)
+        with self._condicion:
+            self._pendientes.append(linea)
+            self._secuencia += 1
+            return self._secuencia
+    
+    def esperar(self, secuencia):
+        """
+        Bloquea hasta que el registro 'secuencia' (y todos los anteriores)
+        está escrito en disco.
+        
+        Args:
+            secuencia: Número retornado por registrar()
+            
+        Raises:
+            OSError: Si falla la escritura (los registros quedan pendientes
+                y el próximo líder los reintenta)
+        """
+        with self._condicion:
+            while self._confirmada < secuencia:
+                if not self._escribiendo:
+                    break
+                self._condicion.wait()
+            else:
+                return
+            
+            # Este hilo es el líder del grupo
+            self._escribiendo = True
+            if self.intervalo_grupo:
+                self._condicion.wait(self.intervalo_grupo)
+            lineas, hasta = self._pendientes, self._secuencia
+            self._pendientes = []
+        
+        escrito = False
+        try:
+            self._escribir(lineas)
+            escrito = True
+        finally:
+            with self._condicion:
+                if escrito:
+                    self._confirmada = hasta
+                else:
+                    self._pendientes[:0] = lineas
+                self._escribiendo = False
+                self._condicion.notify_all()
+    
+    def confirmar(self, registro):
+        """Registra y espera a que el registro esté en disco"""
+        self.esperar(self.registrar(registro))
+    
+    def _escribir(self, lineas):
+        """Escribe un grupo de líneas con un solo fsync"""
+        self._archivo.write(b"".join(lineas))
+        self._archivo.flush()
+        if self.sincronizar:
+            os.fsync(self._archivo.fileno())
+    
+    def leer(self, desde=0):
+        """
+        Recorre los registros del archivo en orden.
+        
+        Si la última línea está incompleta o su CRC no coincide (escritura
+        interrumpida), la lectura termina ahí y el archivo se recorta a la
+        última línea válida.
+        
+        Complejidad: O(tamaño del archivo desde 'desde')
+        
+        Args:
+            desde: Posición en bytes (inicio de una línea) desde la que leer
+            
+        Yields:
+            Cada registro como diccionario
+        """
+        valido = min(desde, os.path.getsize(self.ruta))
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(valido)
+            for linea in archivo:
+                crc, _, datos = linea.rstrip(b"\n").partition(b" ")
+                try:
+                    correcta = linea.endswith(b"\n") and int(crc, 16) == zlib.crc32(datos)
+                except ValueError:
+                    correcta = False
+                if not correcta:
+                    break
+                valido += len(linea)
+                yield json.loads(datos)
+        
+        if valido != os.path.getsize(self.ruta):
+            os.truncate(self.ruta, valido)
+    
+    def obtener_tamano(self):
+        """
+        Bytes escritos en el archivo. Después de esperar(obtener_secuencia())
+        y sin registros concurrentes, es la posición hasta la que llega todo
+        lo registrado.
+        """
+        with self._condicion:
+            return self._archivo.tell()
+    
+    def reiniciar(self, registro):
+        """
+        Vacía el diario y deja como único contenido 'registro' (la marca de
+        la instantánea que pasa a contener todo lo anterior).
+        
+        Escribe antes lo pendiente. Debe llamarse sin registros
+        concurrentes: el gestor lo hace con todos sus candados tomados.
+        
+        Args:
+            registro: Diccionario serializable a JSON
+        """
+        self.esperar(self._secuencia)
+        with self._condicion:
+            self._archivo.truncate(0)
+            self._escribir([self._codificar(registro)])
+    
+    def obtener_secuencia(self):
+        """Número de registros agregados desde que se abrió el diario"""
+        return self._secuencia
+    
+    def cerrar(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        if self._archivo.closed:
+            return
+        self.esperar(self._secuencia)
+        self._archivo.close()
+    
+    def __repr__(self):
+        """Representación en string del diario"""
+        return f"DiarioEscritura({self.ruta!r}, confirmados={self._confirmada})"
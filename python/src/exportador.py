@@ -0,0 +1,190 @@
+"""
+Módulo: Exportador
+Descripción: Exportación por flujo del catálogo y del historial de órdenes
+procesadas en CSV, JSONL o NDJSON, opcionalmente comprimida con gzip
+"""
+
+import csv
+import io
+import json
+import os
+import zlib
+
+
+FORMATOS = ("csv", "jsonl", "ndjson")   # jsonl y ndjson tienen el mismo contenido
+TIPOS_CONTENIDO = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/jsonl",
+    "ndjson": "application/x-ndjson",
+}
+FILAS_POR_BLOQUE = 256
+NIVEL_GZIP = 6
+
+COLUMNAS_PRODUCTOS = ("id", "nombre", "cantidad", "precio", "categoria", "total")
+
+# Una fila CSV por línea de cada orden (los datos de la orden se repiten)
+COLUMNAS_ORDENES = ("numero", "id_orden", "id_cliente", "estado", "procesada_en", "carril",
+                    "prioridad", "total", "id_producto", "nombre", "cantidad",
+                    "precio_unitario", "subtotal")
+COLUMNAS_LINEA = ("id_producto", "nombre", "cantidad", "precio_unitario", "subtotal")
+
+
+def _validar_formato(formato):
+    """Raises ValueError si el formato no es uno de FORMATOS"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}. Opciones: {', '.join(FORMATOS)}")
+
+
+def _bloques_json(lineas):
+    """Une las líneas JSON de a FILAS_POR_BLOQUE y las codifica"""
+    bloque = []
+    for linea in lineas:
+        bloque.append(linea)
+        if len(bloque) == FILAS_POR_BLOQUE:
+            yield ("\n".join(bloque) + "\n").encode()
+            bloque = []
+    if bloque:
+        yield ("\n".join(bloque) + "\n").encode()
+
+
+def _bloques_csv(columnas, filas):
+    """Escribe la cabecera y las filas en CSV, un bloque cada FILAS_POR_BLOQUE filas"""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+    escritor.writerow(columnas)
+    for numero, fila in enumerate(filas, 1):
+        escritor.writerow(fila)
+        if numero % FILAS_POR_BLOQUE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def comprimir_gzip(bloques, nivel=NIVEL_GZIP):
+    """
+    Comprime un flujo de bloques en formato gzip sin acumularlo.
+    
+    Args:
+        bloques: Iterable de bytes
+        nivel: Nivel de compresión (1-9)
+        
+    Yields:
+        Bloques comprimidos (se omiten los vacíos)
+    """
+    compresor = zlib.compressobj(nivel, zlib.DEFLATED, 31)  # 31 = cabecera gzip
+    for bloque in bloques:
+        comprimido = compresor.compress(bloque)
+        if comprimido:
+            yield comprimido
+    yield compresor.flush()
+
+
+def exportar_productos(gestor, formato, categoria=None, comprimir=False):
+    """
+    Exporta el catálogo recorriendo la lista de productos.
+    
+    Usa gestor.iterar_productos, que no copia la lista: la memoria usada
+    es la de un bloque, no la del catálogo. Con categoría, los productos
+    salen del índice por categoría (gestor.obtener_productos_por_categoria)
+    sin recorrer el resto del catálogo. Las líneas JSON son los fragmentos
+    cacheados de cada producto (Producto.convertir_a_json), el mismo
+    formato que GET /api/productos.
+    
+    Complejidad: O(n), o O(k) con categoría - k productos de la categoría
+    
+    Args:
+        gestor: GestorInventario a exportar
+        formato: "csv", "jsonl" o "ndjson"
+        categoria: Solo los productos de esta categoría (None = todos)
+        comprimir: True para comprimir con gzip
+        
+    Returns:
+        Generador de bloques en bytes
+        
+    Raises:
+        ValueError: Si el formato no es válido (antes de leer nada)
+    """
+    _validar_formato(formato)
+    
+    if categoria is None:
+        productos = gestor.iterar_productos()
+    else:
+        productos = gestor.obtener_productos_por_categoria(categoria)
+    
+    if formato == "csv":
+        bloques = _bloques_csv(COLUMNAS_PRODUCTOS, (
+            (p.id_producto, p.nombre, p.cantidad, p.precio, p.categoria, p.obtener_total())
+            for p in productos
+        ))
+    else:
+        bloques = _bloques_json(p.convertir_a_json() for p in productos)
+    return comprimir_gzip(bloques) if comprimir else bloques
+
+
+def _filas_ordenes(ordenes):
+    """Una fila CSV por línea de cada orden (una fila sin línea si la orden está vacía)"""
+    for orden in ordenes:
+        cabecera = [orden.get(columna, "") for columna in COLUMNAS_ORDENES[:8]]
+        lineas = orden.get("productos") or [{}]
+        for linea in lineas:
+            yield cabecera + [linea.get(columna, "") for columna in COLUMNAS_LINEA]
+
+
+def exportar_ordenes(historial, formato, desde=None, hasta=None, comprimir=False):
+    """
+    Exporta las órdenes procesadas, incluidas las que el historial ya
+    pasó a disco, leyéndolas una por una (ver HistorialOrdenes.recorrer).
+    
+    Complejidad: O(log n + k) - k órdenes del rango
+    
+    Args:
+        historial: HistorialOrdenes (gestor.ordenes_procesadas)
+        formato: "csv", "jsonl" o "ndjson"
+        desde: Solo órdenes con procesada_en >= desde (segundos desde epoch)
+        hasta: Solo órdenes con procesada_en <= hasta
+        comprimir: True para comprimir con gzip
+        
+    Returns:
+        Generador de bloques en bytes
+        
+    Raises:
+        ValueError: Si el formato no es válido (antes de leer nada)
+    """
+    _validar_formato(formato)
+    
+    ordenes = historial.recorrer(desde, hasta)
+    if formato == "csv":
+        bloques = _bloques_csv(COLUMNAS_ORDENES, _filas_ordenes(ordenes))
+    else:
+        bloques = _bloques_json(json.dumps(o, sort_keys=True, separators=(",", ":")) for o in ordenes)
+    return comprimir_gzip(bloques) if comprimir else bloques
+
+
+def guardar_exportacion(bloques, ruta):
+    """
+    Escribe una exportación en un archivo de forma atómica (archivo
+    temporal + rename): un proceso que lea la ruta nunca ve un archivo a
+    medio escribir.
+    
+    Args:
+        bloques: Generador de exportar_productos o exportar_ordenes
+        ruta: Archivo destino
+        
+    Returns:
+        Bytes escritos
+    """
+    temporal = ruta + ".tmp"
+    escritos = 0
+    try:
+        with open(temporal, "wb") as archivo:
+            for bloque in bloques:
+                archivo.write(bloque)
+                escritos += len(bloque)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return escritos
@@ -0,0 +1,174 @@
+"""
+Módulo: Gestor de Inventario Columnar
+Descripción: Variante de GestorInventario que guarda los datos en un
+AlmacenColumnar y resuelve reportes y filtros con NumPy
+
+Requiere NumPy (dependencia opcional: pip install numpy).
+"""
+
+from gestor_inventario import GestorInventario
+from almacen_columnar import AlmacenColumnar, ProductoColumnar
+
+
+class GestorInventarioColumnar(GestorInventario):
+    """
+    Gestor de Inventario con almacenamiento columnar.
+    
+    Mantiene la misma interfaz pública que GestorInventario. La lista
+    enlazada, el índice por ID y el índice de nombres se conservan, pero
+    los productos son vistas sobre columnas de NumPy y, en lugar de
+    mantener índices y agregados por producto, los reportes, filtros por
+    categoría, bajo stock y consultas ordenadas se calculan con
+    operaciones vectorizadas sobre todas las filas.
+    
+    Complejidad de operaciones:
+        - Agregar/eliminar/cambiar stock: O(1) amortizado (sin índices secundarios)
+        - Reporte, categoría, top-N, rango: O(n) vectorizado
+    """
+    
+    def __init__(self, umbral_bajo_stock=GestorInventario.UMBRAL_BAJO_STOCK,
+                 capacidad_inicial=AlmacenColumnar.CAPACIDAD_INICIAL, pesos_carriles=None,
+                 capacidad_historial=None, ruta_historial=None, diario=None,
+                 ruta_instantanea=None):
+        """
+        Inicializa el gestor columnar.
+        
+        Args:
+            umbral_bajo_stock: Umbral de bajo stock (por defecto 5)
+            capacidad_inicial: Filas reservadas en el almacén
+            pesos_carriles: Carriles de la cola de órdenes (ver GestorInventario)
+            capacidad_historial: Órdenes procesadas en memoria (ver GestorInventario)
+            ruta_historial: Archivo del historial de órdenes (ver GestorInventario)
+            diario: Diario de operaciones a reproducir y usar (ver GestorInventario)
+            ruta_instantanea: Instantánea a cargar al arrancar (ver GestorInventario)
+            
+        Raises:
+            ImportError: Si NumPy no está instalado
+        """
+        self.almacen = AlmacenColumnar(capacidad_inicial)
+        self._vistas = []  # fila -> ProductoColumnar (None si se eliminó)
+        super().__init__(umbral_bajo_stock, pesos_carriles, capacidad_historial, ruta_historial,
+                         diario, ruta_instantanea)
+    
+    def _crear_producto(self, id_producto, nombre, cantidad, precio, categoria):
+        """Agrega una fila al almacén y retorna su vista"""
+        id_numerico = int(id_producto.rsplit("-", 1)[1])
+        fila = self.almacen.agregar(id_numerico, nombre, cantidad, precio, categoria)
+        vista = ProductoColumnar(id_producto, self.almacen, fila)
+        self._vistas.append(vista)
+        return vista
+    
+    def _indexar(self, producto):
+        """Las columnas ya contienen todo lo necesario para las consultas"""
+    
+    def _desindexar(self, producto):
+        """Marca la fila del producto como eliminada"""
+        self.almacen.eliminar(producto.fila)
+        self._vistas[producto.fila] = None
+    
+    def _cambiar_cantidad(self, producto, nueva_cantidad):
+        """
+        Escribe la nueva cantidad directamente en la columna.
+        
+        Con el candado de catálogo tomado, como en GestorInventario: al
+        agregar productos el almacén puede crecer (copia las columnas y
+        luego las reemplaza) y una escritura entre la copia y el reemplazo
+        se perdería en la columna anterior.
+        """
+        with self._candado_catalogo:
+            producto.cantidad = nueva_cantidad
+            self._registrar_cambio(producto.id_producto)
+    
+    def _cargar_productos(self, instantanea):
+        """Agrega las filas de la instantánea al almacén (con los nombres decodificados)"""
+        for id_prod, nombre, cantidad, precio, categoria in instantanea.filas():
+            producto = self._crear_producto(id_prod, nombre, cantidad, precio, categoria)
+            self._indice_id[id_prod] = self.productos.insertar_final(producto)
+            self._versiones[id_prod] = self._version
+        self._nombres_pendientes = self._armar_nombres_al_buscar = bool(self._indice_id)
+    
+    def _filas_ordenadas(self, productos):
+        """Sin listas de salto: la instantánea ordena las filas al escribirse"""
+        return None
+    
+    def _vistas_de(self, filas):
+        """Convierte un arreglo de filas en la lista de vistas de producto"""
+        vistas = self._vistas
+        return [vistas[f] for f in filas.tolist()]
+    
+    def obtener_productos_por_categoria(self, categoria):
+        """
+        Obtiene productos de una categoría con un filtro vectorizado.
+        
+        Complejidad: O(n) vectorizado
+        """
+        with self._candado_catalogo:
+            return self._vistas_de(self.almacen.filas_categoria(categoria))
+    
+    def contar_productos_por_categoria(self, categoria):
+        """Cantidad de productos de una categoría (vectorizado)"""
+        with self._candado_catalogo:
+            return self.almacen.contar_categoria(categoria)
+    
+    def obtener_valor_categoria(self, categoria):
+        """Valor de inventario de una categoría (vectorizado)"""
+        with self._candado_catalogo:
+            return round(self.almacen.valor_categoria(categoria), 2)
+    
+    def obtener_categorias(self):
+        """Categorías con al menos un producto"""
+        with self._candado_catalogo:
+            return self.almacen.categorias_activas()
+    
+    def obtener_productos_ordenados(self, campo, limite=None, descendente=False):
+        """
+        Obtiene los productos ordenados por cantidad o precio (top-N).
+        
+        Complejidad: O(n) con selección parcial + O(k log k)
+        """
+        with self._candado_catalogo:
+            return self._vistas_de(self.almacen.filas_ordenadas(campo, limite, descendente))
+    
+    def obtener_productos_en_rango(self, campo, minimo=None, maximo=None, limite=None,
+                                   descendente=False):
+        """
+        Obtiene los productos con minimo <= campo <= maximo, ordenados por el campo.
+        
+        Complejidad: O(n) vectorizado + O(k log k), con selección parcial si hay límite
+        """
+        with self._candado_catalogo:
+            return iter(self._vistas_de(
+                self.almacen.filas_en_rango(campo, minimo, maximo, limite, descendente)))
+    
+    def generar_reporte(self):
+        """
+        Genera el reporte con operaciones vectorizadas sobre las columnas.
+        
+        Complejidad: O(n) vectorizado
+        """
+        with self._candado_catalogo:
+            return {
+                "total_productos": self.productos.obtener_cantidad(),
+                "total_valor_inventario": round(self.almacen.valor_total(), 2),
+                "productos_bajo_stock": self._vistas_de(
+                    self.almacen.filas_bajo_stock(self.umbral_bajo_stock)
+                ),
+                "ordenes_procesadas": len(self.ordenes_procesadas),
+                "ordenes_pendientes": self.obtener_cantidad_ordenes_pendientes()
+            }
+    
+    def establecer_umbral_bajo_stock(self, umbral):
+        """Cambia el umbral; no hay conjunto que recalcular"""
+        if umbral < 0:
+            raise ValueError("El umbral no puede ser negativo")
+        with self._candado_catalogo:
+            self.umbral_bajo_stock = umbral
+            self._anotar({"op": "umbral", "valor": umbral})
+        self._registrar_cambio()
+        self._confirmar_diario()
+    
+    def _limpiar_indices(self):
+        """Vacía también el almacén columnar"""
+        super()._limpiar_indices()
+        self.almacen.limpiar()
+        self._vistas.clear()
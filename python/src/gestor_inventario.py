@@ -3,16 +3,48 @@ Módulo: Gestor de Inventario
 Descripción: Sistema de gestión de inventario usando Listas Enlazadas y Colas
 """
 
-from lista_enlazada import ListaEnlazada
-from cola import Cola
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from itertools import count, islice
+
+from lista_doble import ListaDoblementeEnlazada
+from cola_prioridad import ColaCarriles, ColaConPrioridades
+from historial_ordenes import HistorialOrdenes
 from producto import Producto
+from indice_ngramas import IndiceNGramas
+from lista_salto import ListaSalto
+from concurrencia import CandadosRayados
+from instantanea import Instantanea, escribir_instantanea
+
+
+@contextmanager
+def _recolector_pausado():
+    """
+    Pausa el recolector de ciclos mientras se crean muchos objetos de una
+    vez: cada nodo nuevo cuenta para disparar una recolección, y con
+    cientos de miles de nodos vivos el recolector recorre el heap una y
+    otra vez sin encontrar basura.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
 
 
 class GestorInventario:
     """
     Gestor de Inventario usando Estructuras de Datos:
-    - Lista Enlazada: Para almacenar productos
-    - Cola: Para manejar órdenes/solicitudes de venta
+    - Lista Doblemente Enlazada: Para almacenar productos
+    - Cola: Para manejar órdenes/solicitudes de venta (con un montículo
+      aparte para las que traen prioridad)
+    - HistorialOrdenes: Órdenes procesadas, acotadas en memoria y
+      desbordadas a disco
     
     Funcionalidades:
         - Agregar productos
@@ -21,20 +53,201 @@ class GestorInventario:
         - Eliminar productos
         - Procesar órdenes de venta (FIFO)
         - Generar reportes
+    
+    Concurrencia:
+        Es seguro compartir una instancia entre hilos. Cada producto se
+        protege con un candado rayado (las operaciones sobre productos
+        distintos no se bloquean entre sí); los índices y agregados
+        compartidos usan un candado de catálogo que solo se toma durante
+        la actualización, y la cola de órdenes tiene su propio candado.
+        Una orden de varias líneas toma a la vez los candados de todos sus
+        productos, en un orden global fijo, y reserva todo o nada.
+        Orden de adquisición: producto -> catálogo; órdenes es independiente.
+    
+    Versiones:
+        Cada operación que modifica el inventario o las órdenes incrementa
+        una versión global, y cada producto guarda la versión global de su
+        último cambio. Permiten saber en O(1) si una respuesta cacheada
+        sigue vigente (ETags de la API). La versión se incrementa después
+        de aplicar el cambio, nunca antes.
+    
+    Persistencia:
+        Con un DiarioEscritura cada operación que modifica el estado agrega
+        un registro al diario mientras tiene tomados los candados que la
+        ordenan (producto u órdenes), y espera a que llegue al disco recién
+        al terminar, ya sin candados: las peticiones concurrentes comparten
+        el mismo fsync. Al crear el gestor se reproduce el diario completo.
+    
+        Con una instantánea (guardar_instantanea) el estado completo se
+        escribe en un archivo binario y el diario se vacía: al arrancar se
+        carga la instantánea con mmap y solo se reproduce lo registrado
+        después. Los nombres de los productos cargados se decodifican al
+        usarse y el índice de nombres se arma en la primera búsqueda.
     """
     
-    def __init__(self):
-        """Inicializa el gestor de inventario"""
-        self.productos = ListaEnlazada()  # Lista enlazada de productos
-        self.ordenes_venta = Cola()       # Cola de órdenes de venta
+    UMBRAL_BAJO_STOCK = 5
+    
+    # Elementos por tramo en las operaciones por lote: el candado de
+    # catálogo se suelta entre tramos para no bloquear a los lectores
+    TAMANO_TRAMO_LOTE = 1000
+    
+    def __init__(self, umbral_bajo_stock=UMBRAL_BAJO_STOCK, pesos_carriles=None,
+                 capacidad_historial=None, ruta_historial=None, diario=None,
+                 ruta_instantanea=None):
+        """
+        Inicializa el gestor de inventario.
+        
+        Args:
+            umbral_bajo_stock: Un producto con cantidad menor a este valor
+                se considera con bajo stock (por defecto 5)
+            pesos_carriles: Diccionario carril -> peso para usar una cola de
+                órdenes con carriles y prioridades (ColaCarriles). None
+                (por defecto) usa una única cola FIFO que también admite
+                prioridades (ColaConPrioridades).
+            capacidad_historial: Órdenes procesadas que se guardan en
+                memoria; las más antiguas pasan a disco. None (por
+                defecto) las guarda todas en memoria.
+            ruta_historial: Archivo JSONL donde se guardan las órdenes
+                procesadas que no caben en memoria (ver HistorialOrdenes)
+            diario: DiarioEscritura donde registrar las operaciones. Su
+                contenido se reproduce al crear el gestor (las órdenes
+                procesadas que falten en el historial se registran desde él).
+            ruta_instantanea: Archivo de instantáneas. Si existe se carga al
+                crear el gestor (antes del diario), y es el destino por
+                defecto de guardar_instantanea.
+        """
+        self.productos = ListaDoblementeEnlazada()  # Lista de productos
+        
+        # Cola de órdenes de venta: FIFO (con prioridades) o por carriles
+        self._con_carriles = pesos_carriles is not None
+        self.ordenes_venta = ColaCarriles(pesos_carriles) if self._con_carriles else ColaConPrioridades()
         self.proximo_id = 1
-        self.ordenes_procesadas = []
+        self._numeros_orden = count(1)  # Número de la próxima orden (ORD-n)
+        self.ordenes_procesadas = HistorialOrdenes(capacidad_historial, ruta_historial)
+        
+        # Índice primario: id_producto -> nodo de la lista (manejador O(1))
+        self._indice_id = {}
+        
+        # Índice secundario: categoria -> {id_producto: producto}
+        self._indice_categoria = {}
+        self._valor_categoria = {}
+        
+        # Índice de trigramas sobre los nombres normalizados. Tras cargar
+        # una instantánea queda pendiente hasta la primera búsqueda, y tras
+        # un lote con diferir_nombres hasta armar_indice_nombres. Mientras
+        # se arma, las altas y bajas se anotan en _cambios_nombres
+        self._indice_nombres = IndiceNGramas()
+        self._nombres_pendientes = False
+        self._armar_nombres_al_buscar = False
+        self._cambios_nombres = None
+        
+        # Índices ordenados para top-N y consultas de rango
+        self._indices_ordenados = {
+            "cantidad": ListaSalto(),
+            "precio": ListaSalto()
+        }
+        
+        # Agregados del reporte, mantenidos en cada cambio de stock
+        self.umbral_bajo_stock = umbral_bajo_stock
+        self._valor_total = 0
+        self._bajo_stock = {}  # id_producto -> producto con bajo stock
+        
+        # Candados: por producto, de catálogo (índices) y de órdenes
+        self._candados_producto = CandadosRayados()
+        self._candado_catalogo = threading.RLock()
+        self._candado_ordenes = threading.Lock()
+        
+        # Versión global y versión por producto (id_producto -> versión).
+        # No se reproducen exactas al reiniciar, así que quien las exponga
+        # (los ETags) las acompaña con el identificador de esta instancia
+        self._version = 0
+        self._versiones = {}
+        self._candado_version = threading.Lock()
+        self.id_instancia = os.urandom(4).hex()
+        
+        # Funciones a llamar cada vez que se encolan órdenes
+        self._oyentes_ordenes = []
+        
+        # Órdenes fuera de la cola, para incluirlas en las instantáneas:
+        # reservadas aún no encoladas y tomadas aún no completadas
+        self._reservas_en_curso = {}
+        self._ordenes_en_proceso = {}
+        
+        # Diario de escritura anticipada (None = solo en memoria) y último
+        # registro agregado por cada hilo, para esperar su confirmación
+        self._diario = None
+        self._ultimo_registro = threading.local()
+        self.ruta_instantanea = ruta_instantanea
+        if diario is not None or (ruta_instantanea is not None and os.path.exists(ruta_instantanea)):
+            self._recuperar(diario)
+    
+    def _registrar_cambio(self, id_producto=None, eliminado=False):
+        """
+        Incrementa la versión global tras aplicar un cambio.
+        
+        Complejidad: O(1)
+        
+        Args:
+            id_producto: Producto modificado (None si el cambio no es de
+                un producto, por ejemplo la cola de órdenes)
+            eliminado: True si el producto dejó de existir
+        """
+        with self._candado_version:
+            self._version += 1
+            if id_producto is None:
+                return
+            if eliminado:
+                self._versiones.pop(id_producto, None)
+            else:
+                self._versiones[id_producto] = self._version
+    
+    def _anotar(self, registro):
+        """
+        Agrega un registro al diario sin esperar al disco.
+        
+        Se llama con tomados los candados que ordenan la operación, así el
+        orden del diario coincide con el orden en que se aplicaron.
+        """
+        if self._diario is not None:
+            self._ultimo_registro.secuencia = self._diario.registrar(registro)
+    
+    def _confirmar_diario(self):
+        """Espera a que los registros de este hilo estén en disco (sin candados tomados)"""
+        secuencia = getattr(self._ultimo_registro, "secuencia", 0)
+        if secuencia:
+            self._ultimo_registro.secuencia = 0
+            self._diario.esperar(secuencia)
+    
+    def obtener_version(self):
+        """
+        Obtiene la versión global del inventario.
+        
+        Complejidad: O(1)
+        
+        Returns:
+            Entero que crece con cada modificación
+        """
+        return self._version
+    
+    def obtener_version_producto(self, id_producto):
+        """
+        Obtiene la versión del último cambio de un producto.
+        
+        Complejidad: O(1)
+        
+        Args:
+            id_producto: ID del producto
+            
+        Returns:
+            La versión, o None si el producto no existe
+        """
+        return self._versiones.get(id_producto)
     
     def agregar_producto(self, nombre, cantidad, precio, categoria="General"):
         """
         Agrega un nuevo producto al inventario.
         
-        Complejidad: O(1)
+        Complejidad: O(log n) - por los índices ordenados
         
         Args:
             nombre: Nombre del producto
@@ -44,23 +257,249 @@ class GestorInventario:
             
         Returns:
             El producto creado
+            
+        Raises:
+            ValueError: Si falta el nombre o la cantidad o el precio son negativos
+        """
+        with self._candado_catalogo:
+            producto = self._insertar_producto(nombre, cantidad, precio, categoria)
+        self._confirmar_diario()
+        return producto
+    
+    def agregar_productos_lote(self, productos, diferir_nombres=False):
+        """
+        Agrega muchos productos en una sola pasada.
+        
+        Equivale a llamar agregar_producto por cada elemento, pero toma el
+        candado de catálogo una vez por tramo de TAMANO_TRAMO_LOTE elementos.
+        Un elemento inválido no detiene el lote: su error queda en la
+        posición correspondiente del resultado.
+        
+        Complejidad: O(k log n) - k es el tamaño del lote
+        
+        Args:
+            productos: Iterable de tuplas (nombre, cantidad, precio[, categoria])
+            diferir_nombres: True para no mantener el índice de nombres fila
+                por fila: queda pendiente hasta que se llama a
+                armar_indice_nombres, que lo arma completo en O(n). Conviene
+                solo en lotes grandes respecto del catálogo (ver
+                importar_catalogo); mientras tanto las búsquedas recorren
+                los nombres.
+                
+        Returns:
+            Lista alineada con la entrada: el producto creado o el
+            ValueError que impidió crearlo
+        """
+        if diferir_nombres:
+            self._diferir_indice_nombres()
+        
+        resultados = []
+        tramo = []
+        
+        for datos in productos:
+            tramo.append(datos)
+            if len(tramo) == self.TAMANO_TRAMO_LOTE:
+                self._insertar_tramo(tramo, resultados)
+                tramo = []
+        
+        if tramo:
+            self._insertar_tramo(tramo, resultados)
+        
+        self._confirmar_diario()
+        return resultados
+    
+    def _insertar_tramo(self, tramo, resultados):
+        """
+        Inserta un tramo del lote con el candado de catálogo tomado una vez
+        y el recolector de ciclos pausado (ver _recolector_pausado)
+        """
+        with self._candado_catalogo, _recolector_pausado():
+            for datos in tramo:
+                try:
+                    resultados.append(self._insertar_producto(*datos))
+                except ValueError as e:
+                    resultados.append(e)
+    
+    def _insertar_producto(self, nombre, cantidad, precio, categoria="General"):
+        """
+        Crea un producto y lo registra en la lista y en todos los índices.
+        
+        Debe llamarse con el candado de catálogo tomado.
+        
+        Complejidad: O(log n)
+        
+        Raises:
+            ValueError: Si falta el nombre o la cantidad o el precio son negativos
         """
+        if not isinstance(nombre, str) or not nombre:
+            raise ValueError("Nombre requerido")
         if cantidad < 0 or precio < 0:
             raise ValueError("Cantidad y precio deben ser positivos")
         
         id_prod = f"PROD-{self.proximo_id}"
-        self.proximo_id += 1
+        producto = self._crear_producto(id_prod, nombre, cantidad, precio, categoria)
         
-        producto = Producto(id_prod, nombre, cantidad, precio, categoria)
-        self.productos.insertar_final(producto)
+        # Los índices se arman antes de enlazar el nodo: si alguno falla, el
+        # producto no queda visible a medias en la lista ni en el índice por ID
+        if not self._nombres_pendientes:
+            self._indice_nombres.agregar(id_prod, nombre)
+        elif self._cambios_nombres is not None:
+            self._cambios_nombres.append((id_prod, nombre))
+        try:
+            self._indexar(producto)
+        except BaseException:
+            self._indice_nombres.eliminar(id_prod)
+            raise
         
+        self.proximo_id += 1
+        self._anotar({"op": "producto", "id": id_prod, "nombre": nombre, "cantidad": cantidad,
+                      "precio": precio, "categoria": categoria})
+        self._indice_id[id_prod] = self.productos.insertar_final(producto)
+        self._registrar_cambio(id_prod)
         return producto
     
+    def _crear_producto(self, id_producto, nombre, cantidad, precio, categoria):
+        """Construye el objeto producto (punto de extensión para otros almacenes)"""
+        return Producto(id_producto, nombre, cantidad, precio, categoria)
+    
+    def _indexar(self, producto):
+        """
+        Registra un producto nuevo en los índices secundarios y agregados.
+        
+        Complejidad: O(log n)
+        
+        Args:
+            producto: El producto a registrar
+        """
+        id_prod = producto.id_producto
+        self._indexar_categoria(producto)
+        self._indices_ordenados["cantidad"].insertar(producto.cantidad, id_prod, producto)
+        self._indices_ordenados["precio"].insertar(producto.precio, id_prod, producto)
+        self._valor_total += producto.obtener_total()
+        self._actualizar_bajo_stock(producto)
+    
+    def _desindexar(self, producto):
+        """
+        Quita un producto de los índices secundarios y agregados.
+        
+        Complejidad: O(log n)
+        
+        Args:
+            producto: El producto a quitar
+        """
+        id_prod = producto.id_producto
+        self._desindexar_categoria(producto)
+        self._indices_ordenados["cantidad"].eliminar(producto.cantidad, id_prod)
+        self._indices_ordenados["precio"].eliminar(producto.precio, id_prod)
+        self._valor_total -= producto.obtener_total()
+        self._bajo_stock.pop(id_prod, None)
+    
+    def _indexar_categoria(self, producto):
+        """
+        Registra un producto en el índice de categorías.
+        
+        Complejidad: O(1)
+        
+        Args:
+            producto: El producto a registrar
+        """
+        categoria = producto.categoria
+        self._indice_categoria.setdefault(categoria, {})[producto.id_producto] = producto
+        self._valor_categoria[categoria] = (
+            self._valor_categoria.get(categoria, 0) + producto.obtener_total()
+        )
+    
+    def _desindexar_categoria(self, producto):
+        """
+        Quita un producto del índice de categorías.
+        
+        Complejidad: O(1)
+        
+        Args:
+            producto: El producto a quitar
+        """
+        categoria = producto.categoria
+        miembros = self._indice_categoria[categoria]
+        del miembros[producto.id_producto]
+        
+        if miembros:
+            self._valor_categoria[categoria] -= producto.obtener_total()
+        else:
+            # Categoría vacía: se descarta para no acumular error de redondeo
+            del self._indice_categoria[categoria]
+            del self._valor_categoria[categoria]
+    
+    def _limpiar_indices(self):
+        """Vacía los índices secundarios y agregados (con los candados tomados)"""
+        self._indice_categoria.clear()
+        self._valor_categoria.clear()
+        for indice in self._indices_ordenados.values():
+            indice.limpiar()
+        self._valor_total = 0
+        self._bajo_stock.clear()
+    
+    def _actualizar_bajo_stock(self, producto):
+        """
+        Agrega o quita un producto del conjunto de bajo stock.
+        
+        Complejidad: O(1)
+        
+        Args:
+            producto: El producto cuya cantidad cambió
+        """
+        if producto.cantidad < self.umbral_bajo_stock:
+            self._bajo_stock[producto.id_producto] = producto
+        else:
+            self._bajo_stock.pop(producto.id_producto, None)
+    
+    def _cambiar_cantidad(self, producto, nueva_cantidad):
+        """
+        Cambia el stock de un producto manteniendo los agregados al día.
+        
+        Todas las modificaciones de cantidad deben pasar por aquí, con el
+        candado del producto tomado (ver _producto_bloqueado).
+        
+        Complejidad: O(log n) por el índice ordenado de cantidad
+        
+        Args:
+            producto: El producto a modificar
+            nueva_cantidad: Cantidad resultante
+        """
+        with self._candado_catalogo:
+            diferencia = (nueva_cantidad - producto.cantidad) * producto.precio
+            self._valor_categoria[producto.categoria] += diferencia
+            self._valor_total += diferencia
+            
+            indice_cantidad = self._indices_ordenados["cantidad"]
+            indice_cantidad.eliminar(producto.cantidad, producto.id_producto)
+            indice_cantidad.insertar(nueva_cantidad, producto.id_producto, producto)
+            
+            producto.cantidad = nueva_cantidad
+            self._actualizar_bajo_stock(producto)
+            self._registrar_cambio(producto.id_producto)
+    
+    @contextmanager
+    def _producto_bloqueado(self, id_producto):
+        """
+        Toma el candado de un producto y entrega el producto vigente.
+        
+        La búsqueda se hace con el candado tomado, así una eliminación
+        concurrente no puede dejar una referencia a un producto ya quitado.
+        
+        Args:
+            id_producto: ID del producto
+            
+        Yields:
+            El producto o None si no existe
+        """
+        with self._candados_producto.para(id_producto):
+            yield self.buscar_producto_por_id(id_producto)
+    
     def buscar_producto_por_id(self, id_producto):
         """
-        Busca un producto por su ID.
+        Busca un producto por su ID usando el índice primario.
         
-        Complejidad: O(n)
+        Complejidad: O(1)
         
         Args:
             id_producto: ID del producto
@@ -68,17 +507,20 @@ class GestorInventario:
         Returns:
             El producto si existe, None en caso contrario
         """
-        lista_productos = self.productos.recorrer()
-        for producto in lista_productos:
-            if producto.id_producto == id_producto:
-                return producto
-        return None
+        nodo = self._indice_id.get(id_producto)
+        return nodo.dato if nodo is not None else None
     
     def buscar_productos_por_nombre(self, nombre):
         """
         Busca productos por nombre (búsqueda parcial).
         
-        Complejidad: O(n)
+        Usa el índice de trigramas para reducir los candidatos antes de
+        comprobar la subcadena. Si el índice está pendiente se recorren
+        los nombres sin candados; tras cargar una instantánea, la primera
+        búsqueda lo arma (ver armar_indice_nombres).
+        
+        Complejidad: O(c) - c candidatos que comparten los trigramas
+        (O(n) mientras el índice está pendiente)
         
         Args:
             nombre: Nombre o parte del nombre
@@ -86,20 +528,70 @@ class GestorInventario:
         Returns:
             Lista de productos que coinciden
         """
-        resultados = []
-        lista_productos = self.productos.recorrer()
+        if self._armar_nombres_al_buscar:
+            self.armar_indice_nombres()
+        with self._candado_catalogo:
+            if not self._nombres_pendientes:
+                return [self._indice_id[id_prod].dato for id_prod in self._indice_nombres.buscar(nombre)]
+        
+        consulta = IndiceNGramas.normalizar(nombre)
+        return [producto for producto in self.iterar_productos()
+                if consulta in IndiceNGramas.normalizar(producto.nombre)]
+    
+    def _diferir_indice_nombres(self):
+        """Descarta el índice de nombres y lo deja pendiente hasta la próxima búsqueda"""
+        with self._candado_catalogo:
+            if not self._nombres_pendientes:
+                self._indice_nombres.limpiar()
+                self._nombres_pendientes = True
+    
+    def armar_indice_nombres(self):
+        """
+        Arma el índice de nombres que quedó pendiente, sin retener el
+        candado de catálogo mientras se indexa.
         
-        for producto in lista_productos:
-            if nombre.lower() in producto.nombre.lower():
-                resultados.append(producto)
+        Los nombres se indexan en un índice nuevo recorriendo la lista sin
+        candados (ver iterar_productos). Las altas y bajas que llegan
+        mientras tanto se anotan, y al final, con el candado tomado, se
+        aplican y se reemplaza el índice. Si otro hilo ya lo está armando
+        retorna sin esperar.
         
-        return resultados
+        Complejidad: O(n); con el candado tomado, O(a) - a altas y bajas
+        ocurridas durante el armado
+        """
+        with self._candado_catalogo:
+            if not self._nombres_pendientes or self._cambios_nombres is not None:
+                return
+            cambios = self._cambios_nombres = []
+        
+        indice = IndiceNGramas()
+        try:
+            with _recolector_pausado():
+                for producto in self.iterar_productos():
+                    indice.agregar(producto.id_producto, producto.nombre)
+        except BaseException:
+            with self._candado_catalogo:
+                if self._cambios_nombres is cambios:
+                    self._cambios_nombres = None
+            raise
+        
+        with self._candado_catalogo:
+            if self._cambios_nombres is not cambios:
+                return  # limpiar() vació el catálogo mientras tanto
+            for id_prod, nombre in cambios:
+                if nombre is None:
+                    indice.eliminar(id_prod)
+                elif id_prod in self._indice_id and indice.obtener_texto(id_prod) is None:
+                    indice.agregar(id_prod, nombre)
+            self._indice_nombres = indice
+            self._nombres_pendientes = self._armar_nombres_al_buscar = False
+            self._cambios_nombres = None
     
     def actualizar_cantidad(self, id_producto, nueva_cantidad):
         """
         Actualiza la cantidad de un producto.
         
-        Complejidad: O(n)
+        Complejidad: O(log n) - por los índices ordenados
         
         Args:
             id_producto: ID del producto
@@ -108,22 +600,24 @@ class GestorInventario:
         Returns:
             True si se actualizó, False si no existe
         """
-        producto = self.buscar_producto_por_id(id_producto)
-        
-        if producto is None:
-            return False
-        
-        if nueva_cantidad < 0:
-            raise ValueError("La cantidad no puede ser negativa")
+        with self._producto_bloqueado(id_producto) as producto:
+            if producto is None:
+                return False
+            
+            if nueva_cantidad < 0:
+                raise ValueError("La cantidad no puede ser negativa")
+            
+            self._cambiar_cantidad(producto, nueva_cantidad)
+            self._anotar({"op": "cantidad", "id": id_producto, "cantidad": nueva_cantidad})
         
-        producto.cantidad = nueva_cantidad
+        self._confirmar_diario()
         return True
     
     def agregar_stock(self, id_producto, cantidad):
         """
         Aumenta el stock de un producto.
         
-        Complejidad: O(n)
+        Complejidad: O(log n) - por los índices ordenados
         
         Args:
             id_producto: ID del producto
@@ -132,22 +626,25 @@ class GestorInventario:
         Returns:
             Nueva cantidad o -1 si error
         """
-        producto = self.buscar_producto_por_id(id_producto)
-        
-        if producto is None:
-            return -1
-        
-        if cantidad < 0:
-            raise ValueError("Cantidad debe ser positiva")
+        with self._producto_bloqueado(id_producto) as producto:
+            if producto is None:
+                return -1
+            
+            if cantidad < 0:
+                raise ValueError("Cantidad debe ser positiva")
+            
+            self._cambiar_cantidad(producto, producto.cantidad + cantidad)
+            nueva_cantidad = producto.cantidad
+            self._anotar({"op": "cantidad", "id": id_producto, "cantidad": nueva_cantidad})
         
-        producto.cantidad += cantidad
-        return producto.cantidad
+        self._confirmar_diario()
+        return nueva_cantidad
     
     def restar_stock(self, id_producto, cantidad):
         """
         Disminuye el stock de un producto.
         
-        Complejidad: O(n)
+        Complejidad: O(log n) - por los índices ordenados
         
         Args:
             id_producto: ID del producto
@@ -159,25 +656,28 @@ class GestorInventario:
         Raises:
             ValueError: Si no hay suficiente stock
         """
-        producto = self.buscar_producto_por_id(id_producto)
-        
-        if producto is None:
-            return -1
-        
-        if cantidad < 0:
-            raise ValueError("Cantidad debe ser positiva")
-        
-        if producto.cantidad < cantidad:
-            raise ValueError(f"Stock insuficiente. Disponible: {producto.cantidad}")
+        with self._producto_bloqueado(id_producto) as producto:
+            if producto is None:
+                return -1
+            
+            if cantidad < 0:
+                raise ValueError("Cantidad debe ser positiva")
+            
+            if producto.cantidad < cantidad:
+                raise ValueError(f"Stock insuficiente. Disponible: {producto.cantidad}")
+            
+            self._cambiar_cantidad(producto, producto.cantidad - cantidad)
+            nueva_cantidad = producto.cantidad
+            self._anotar({"op": "cantidad", "id": id_producto, "cantidad": nueva_cantidad})
         
-        producto.cantidad -= cantidad
-        return producto.cantidad
+        self._confirmar_diario()
+        return nueva_cantidad
     
     def eliminar_producto(self, id_producto):
         """
-        Elimina un producto del inventario.
+        Elimina un producto del inventario usando su nodo indexado.
         
-        Complejidad: O(n)
+        Complejidad: O(log n) - el nodo se quita en O(1), los índices ordenados en O(log n)
         
         Args:
             id_producto: ID del producto
@@ -185,12 +685,23 @@ class GestorInventario:
         Returns:
             True si se eliminó, False si no existe
         """
-        producto = self.buscar_producto_por_id(id_producto)
-        
-        if producto is None:
-            return False
+        with self._candados_producto.para(id_producto), self._candado_catalogo:
+            nodo = self._indice_id.pop(id_producto, None)
+            
+            if nodo is None:
+                return False
+            
+            producto = self.productos.eliminar_nodo(nodo)
+            if not self._nombres_pendientes:
+                self._indice_nombres.eliminar(id_producto)
+            elif self._cambios_nombres is not None:
+                self._cambios_nombres.append((id_producto, None))
+            self._desindexar(producto)
+            self._registrar_cambio(id_producto, eliminado=True)
+            self._anotar({"op": "eliminar", "id": id_producto})
         
-        return self.productos.eliminar(producto)
+        self._confirmar_diario()
+        return True
     
     def obtener_todos_productos(self):
         """
@@ -201,13 +712,87 @@ class GestorInventario:
         Returns:
             Lista de todos los productos
         """
-        return self.productos.recorrer()
+        with self._candado_catalogo:
+            return self.productos.recorrer()
+    
+    def iterar_productos(self, cursor=None):
+        """
+        Recorre los productos sin copiar la lista enlazada.
+        
+        No toma candados: un producto eliminado durante el recorrido
+        conserva su enlace al siguiente, así que el recorrido continúa.
+        
+        Con cursor (el ID del último producto ya entregado) el recorrido
+        empieza en el producto posterior. El cursor es estable: sigue
+        siendo válido aunque se inserten productos o se elimine el propio
+        producto del cursor.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional; ubicar el
+        cursor es O(1) si el producto existe (ver _nodo_posterior_a)
+        
+        Args:
+            cursor: ID del último producto entregado, o None para empezar
+                desde el primero
+                
+        Returns:
+            Iterador sobre los productos en orden de inserción
+            
+        Raises:
+            ValueError: Si el cursor no es un ID de producto
+        """
+        if cursor is None:
+            return iter(self.productos)
+        return self.productos.iterar_desde(self._nodo_posterior_a(cursor))
+    
+    @staticmethod
+    def _numero_id(id_producto):
+        """Número secuencial de un ID 'PROD-n' (ValueError si no tiene ese formato)"""
+        prefijo, _, numero = str(id_producto).partition("-")
+        if prefijo != "PROD" or not numero.isdigit():
+            raise ValueError(f"Cursor inválido: {id_producto}")
+        return int(numero)
+    
+    def _nodo_posterior_a(self, cursor):
+        """
+        Ubica el nodo que sigue al producto del cursor.
+        
+        Los productos se agregan siempre al final con IDs crecientes, así
+        que la lista está ordenada por número de ID. Si el producto del
+        cursor se eliminó, se busca el primer ID mayor recorriendo desde
+        el extremo más cercano según la proporción cursor / próximo ID.
+        
+        Complejidad: O(1) si el producto existe; O(n) en el peor caso si
+        fue eliminado
+        
+        Returns:
+            El nodo siguiente o None si no quedan productos
+        """
+        numero = self._numero_id(cursor)
+        
+        with self._candado_catalogo:
+            nodo = self._indice_id.get(cursor)
+            if nodo is not None:
+                return nodo.siguiente
+            
+            if numero * 2 >= self.proximo_id:
+                # Desde el final: el último nodo con ID mayor al cursor
+                posterior = None
+                actual = self.productos.cola
+                while actual and self._numero_id(actual.dato.id_producto) > numero:
+                    posterior = actual
+                    actual = actual.anterior
+                return posterior
+            
+            actual = self.productos.cabeza
+            while actual and self._numero_id(actual.dato.id_producto) <= numero:
+                actual = actual.siguiente
+            return actual
     
     def obtener_productos_por_categoria(self, categoria):
         """
-        Obtiene productos filtrados por categoría.
+        Obtiene productos filtrados por categoría usando el índice secundario.
         
-        Complejidad: O(n)
+        Complejidad: O(k) - k es la cantidad de productos de la categoría
         
         Args:
             categoria: Categoría a filtrar
@@ -215,44 +800,351 @@ class GestorInventario:
         Returns:
             Lista de productos de esa categoría
         """
-        resultados = []
-        lista_productos = self.productos.recorrer()
+        with self._candado_catalogo:
+            return list(self._indice_categoria.get(categoria, {}).values())
+    
+    def contar_productos_por_categoria(self, categoria):
+        """
+        Obtiene la cantidad de productos de una categoría.
         
-        for producto in lista_productos:
-            if producto.categoria == categoria:
-                resultados.append(producto)
+        Complejidad: O(1)
         
-        return resultados
+        Args:
+            categoria: Categoría a consultar
+            
+        Returns:
+            Número de productos de la categoría
+        """
+        return len(self._indice_categoria.get(categoria, {}))
+    
+    def obtener_valor_categoria(self, categoria):
+        """
+        Obtiene el valor de inventario de una categoría.
+        
+        Complejidad: O(1)
+        
+        Args:
+            categoria: Categoría a consultar
+            
+        Returns:
+            Suma de cantidad * precio de los productos de la categoría
+        """
+        return round(self._valor_categoria.get(categoria, 0), 2)
+    
+    def obtener_categorias(self):
+        """
+        Obtiene las categorías con al menos un producto.
+        
+        Complejidad: O(c) - c es la cantidad de categorías
+        
+        Returns:
+            Lista de nombres de categoría
+        """
+        with self._candado_catalogo:
+            return list(self._indice_categoria)
+    
+    def _indice_ordenado(self, campo):
+        """
+        Obtiene el índice ordenado de un campo.
+        
+        Raises:
+            ValueError: Si el campo no tiene índice ordenado
+        """
+        indice = self._indices_ordenados.get(campo)
+        if indice is None:
+            campos = ", ".join(self._indices_ordenados)
+            raise ValueError(f"Campo no ordenable: {campo}. Opciones: {campos}")
+        return indice
+    
+    def obtener_productos_ordenados(self, campo, limite=None, descendente=False):
+        """
+        Obtiene los productos ordenados por cantidad o precio (top-N).
+        
+        Complejidad: O(k) - k es el límite
+        
+        Args:
+            campo: "cantidad" o "precio"
+            limite: Cantidad máxima de productos (None para todos)
+            descendente: True para empezar por el mayor valor
+            
+        Returns:
+            Lista de productos ordenados
+        """
+        indice = self._indice_ordenado(campo)
+        with self._candado_catalogo:
+            if descendente:
+                return list(indice.ultimos(limite))
+            return list(indice.primeros(limite))
+    
+    def obtener_productos_en_rango(self, campo, minimo=None, maximo=None, limite=None,
+                                   descendente=False):
+        """
+        Obtiene los productos con minimo <= campo <= maximo, ordenados por el campo.
+        
+        Complejidad: O(log n + k) - k es la cantidad de resultados (a lo sumo el límite)
+        
+        Args:
+            campo: "cantidad" o "precio"
+            minimo: Límite inferior inclusivo (None para sin límite)
+            maximo: Límite superior inclusivo (None para sin límite)
+            limite: Cantidad máxima de productos (None para todos)
+            descendente: True para empezar por el mayor valor
+            
+        Returns:
+            Iterador con los productos del rango
+        """
+        indice = self._indice_ordenado(campo)
+        with self._candado_catalogo:
+            # Se materializa con el candado tomado: la lista de salto
+            # no admite recorridos concurrentes con modificaciones. El
+            # límite se aplica al recorrido, así no se copia el rango entero
+            return iter(list(islice(indice.rango(minimo, maximo, descendente), limite)))
     
-    def crear_orden_venta(self, id_cliente, productos_solicitados):
+    def crear_orden_venta(self, id_cliente, productos_solicitados, prioridad=0, carril=None):
         """
         Crea una orden de venta y la añade a la cola de órdenes.
         
-        Complejidad: O(n) - n es la cantidad de productos en la orden
+        Complejidad: O(k) - k es la cantidad de productos en la orden
+        (más O(log n) al encolar si la cola tiene carriles)
         
         Args:
             id_cliente: ID del cliente
             productos_solicitados: Lista de tuplas (id_producto, cantidad)
+            prioridad: Prioridad dentro del carril, o de la cola si no hay
+                carriles (mayor sale antes; entre iguales, FIFO)
+            carril: Carril de la orden (None = el primero); solo con carriles
+            
+        Returns:
+            La orden creada
+            
+        Raises:
+            ValueError: Si un producto no existe o no tiene stock suficiente,
+                o si el carril o la prioridad no son válidos. En ese caso
+                no se descuenta stock de ninguna línea.
+        """
+        carril = self._validar_carril(prioridad, carril)
+        orden = self._reservar_orden(id_cliente, productos_solicitados)
+        
+        with self._candado_ordenes:
+            if not self._quitar_reserva(orden):
+                raise ValueError("El inventario se limpió mientras se creaba la orden")
+            self._encolar_orden(orden, prioridad, carril)
+            self._anotar({"op": "encolar", "ordenes": [[orden["id_orden"], prioridad, carril]]})
+        self._registrar_cambio()
+        self._notificar_ordenes()
+        self._confirmar_diario()
+        return orden
+    
+    def crear_ordenes_lote(self, ordenes):
+        """
+        Crea muchas órdenes de venta y las encola juntas.
+        
+        Cada orden descuenta su stock igual que crear_orden_venta; las que
+        se crearon se encolan con un solo encolar_lote, en el orden de
+        entrada. Una orden inválida no detiene el lote.
+        
+        Complejidad: O(m) - m es el total de líneas de todas las órdenes
+        
+        Args:
+            ordenes: Iterable de tuplas
+                (id_cliente, productos_solicitados[, prioridad[, carril]])
+                
+        Returns:
+            Lista alineada con la entrada: la orden creada o el
+            ValueError que impidió crearla
+        """
+        resultados, creadas = self._reservar_lote(ordenes)
+        
+        if creadas:
+            with self._candado_ordenes:
+                descartadas = {id(orden) for orden, _, _ in creadas if not self._quitar_reserva(orden)}
+                if descartadas:
+                    creadas = [c for c in creadas if id(c[0]) not in descartadas]
+                    resultados = [
+                        ValueError("El inventario se limpió mientras se creaba la orden")
+                        if id(r) in descartadas else r for r in resultados
+                    ]
+                if self._con_carriles or any(prioridad for _, prioridad, _ in creadas):
+                    for orden, prioridad, carril in creadas:
+                        self._encolar_orden(orden, prioridad, carril)
+                else:
+                    self.ordenes_venta.encolar_lote([orden for orden, _, _ in creadas])
+                if creadas:
+                    self._anotar({"op": "encolar", "ordenes": [
+                        [orden["id_orden"], prioridad, carril] for orden, prioridad, carril in creadas
+                    ]})
+            self._registrar_cambio()
+            self._notificar_ordenes()
+        
+        self._confirmar_diario()
+        return resultados
+    
+    def _reservar_lote(self, ordenes):
+        """
+        Valida y reserva cada orden de un lote, sin encolarlas.
+        
+        Returns:
+            Tupla (resultados alineados con la entrada, lista de
+            (orden, prioridad, carril) de las órdenes reservadas)
+        """
+        resultados = []
+        creadas = []
+        
+        for id_cliente, productos_solicitados, *opciones in ordenes:
+            prioridad = opciones[0] if opciones else 0
+            try:
+                carril = self._validar_carril(prioridad, opciones[1] if len(opciones) > 1 else None)
+                orden = self._reservar_orden(id_cliente, productos_solicitados)
+            except ValueError as e:
+                resultados.append(e)
+                continue
+            resultados.append(orden)
+            creadas.append((orden, prioridad, carril))
+        
+        return resultados, creadas
+    
+    def _validar_carril(self, prioridad, carril):
+        """
+        Valida la prioridad y el carril de una orden antes de reservar stock.
+        
+        Returns:
+            El carril resuelto (el por defecto si carril es None), o None
+            si la cola no tiene carriles
             
+        Raises:
+            ValueError: Si la prioridad no es entera, el carril no existe o
+                se pide un carril en una cola sin carriles
+        """
+        if not isinstance(prioridad, int) or isinstance(prioridad, bool):
+            raise ValueError("La prioridad debe ser un número entero")
+        
+        if not self._con_carriles:
+            if carril is not None:
+                raise ValueError("La cola de órdenes no tiene carriles")
+            return None
+        
+        if carril is None:
+            return self.ordenes_venta.carril_por_defecto
+        if carril not in self.ordenes_venta.pesos:
+            raise ValueError(f"Carril desconocido: {carril}")
+        return carril
+    
+    def _quitar_reserva(self, orden):
+        """
+        Quita una orden de las reservas en curso antes de encolarla (con el
+        candado de órdenes tomado).
+        
+        Returns:
+            False si limpiar() descartó la reserva mientras tanto: la orden
+            no debe encolarse. Se compara la orden y no solo su ID, que
+            limpiar() vuelve a numerar desde ORD-1.
+        """
+        if self._reservas_en_curso.get(orden["id_orden"]) is not orden:
+            return False
+        del self._reservas_en_curso[orden["id_orden"]]
+        return True
+    
+    def _encolar_orden(self, orden, prioridad, carril):
+        """Encola una orden (con el candado de órdenes tomado)"""
+        if self._con_carriles:
+            orden["carril"] = carril
+            orden["prioridad"] = prioridad
+            self.ordenes_venta.encolar(orden, carril, prioridad)
+        else:
+            if prioridad:
+                orden["prioridad"] = prioridad
+            self.ordenes_venta.encolar(orden, prioridad)
+    
+    def contar_ordenes_por_carril(self):
+        """
+        Cantidad de órdenes pendientes en cada carril.
+        
+        Complejidad: O(c) - c es la cantidad de carriles
+        
         Returns:
-            La orden creada o None si hay error
+            Diccionario carril -> cantidad, o None si la cola no tiene carriles
+        """
+        if not self._con_carriles:
+            return None
+        with self._candado_ordenes:
+            return self.ordenes_venta.cantidad_por_carril()
+    
+    def _reservar_orden(self, id_cliente, productos_solicitados):
+        """
+        Arma una orden y descuenta su stock, sin encolarla.
+        
+        La reserva es todo o nada: se toman juntos los candados de los
+        productos de la orden (en orden global, ver
+        CandadosRayados.para_varias), se valida cada línea contra el stock
+        vigente y recién entonces se descuenta. Si una línea falla no se
+        toca ningún stock. Las órdenes sobre productos distintos toman
+        candados distintos y se reservan en paralelo.
+        
+        Complejidad: O(k log k) - k es la cantidad de productos en la orden
+        
+        Raises:
+            ValueError: Si una cantidad no es un entero positivo, o si un
+                producto no existe o no tiene stock suficiente
+        """
+        requerido = self._cantidades_requeridas(productos_solicitados)
+        
+        with self._candados_producto.para_varias(requerido):
+            productos = {}
+            for id_prod, cantidad in requerido.items():
+                producto = self.buscar_producto_por_id(id_prod)
+                if producto is None:
+                    raise ValueError(f"Producto {id_prod} no existe")
+                
+                if producto.cantidad < cantidad:
+                    raise ValueError(f"Stock insuficiente de {producto.nombre}")
+                productos[id_prod] = producto
+            
+            orden = self._armar_orden(f"ORD-{next(self._numeros_orden)}", id_cliente,
+                                      productos_solicitados, productos)
+            for id_prod, cantidad in requerido.items():
+                producto = productos[id_prod]
+                self._cambiar_cantidad(producto, producto.cantidad - cantidad)
+            self._anotar({"op": "reserva", "orden": orden})
+            self._reservas_en_curso[orden["id_orden"]] = orden
+        
+        return orden
+    
+    @staticmethod
+    def _cantidades_requeridas(productos_solicitados):
+        """
+        Cantidad total por producto de las líneas de una orden (un producto
+        puede repetirse).
+        
+        Raises:
+            ValueError: Si una cantidad no es un entero positivo
+        """
+        requerido = {}
+        for id_prod, cantidad in productos_solicitados:
+            if not isinstance(cantidad, int) or isinstance(cantidad, bool) or cantidad <= 0:
+                raise ValueError("La cantidad de cada línea debe ser un entero positivo")
+            requerido[id_prod] = requerido.get(id_prod, 0) + cantidad
+        return requerido
+    
+    @staticmethod
+    def _armar_orden(id_orden, id_cliente, productos_solicitados, productos):
+        """
+        Arma el diccionario de una orden ya validada.
+        
+        Args:
+            id_orden: ID asignado ("ORD-n")
+            id_cliente: ID del cliente
+            productos_solicitados: Lista de tuplas (id_producto, cantidad)
+            productos: Diccionario id_producto -> producto vigente
         """
         orden = {
+            "id_orden": id_orden,
             "id_cliente": id_cliente,
             "productos": [],
             "total": 0,
             "estado": "Pendiente"
         }
-        
         for id_prod, cantidad in productos_solicitados:
-            producto = self.buscar_producto_por_id(id_prod)
-            
-            if producto is None:
-                raise ValueError(f"Producto {id_prod} no existe")
-            
-            if producto.cantidad < cantidad:
-                raise ValueError(f"Stock insuficiente de {producto.nombre}")
-            
+            producto = productos[id_prod]
             orden["productos"].append({
                 "id_producto": id_prod,
                 "nombre": producto.nombre,
@@ -260,31 +1152,139 @@ class GestorInventario:
                 "precio_unitario": producto.precio,
                 "subtotal": cantidad * producto.precio
             })
-            
             orden["total"] += cantidad * producto.precio
-            producto.cantidad -= cantidad
-        
-        self.ordenes_venta.encolar(orden)
         return orden
     
     def procesar_proximo_orden(self):
         """
         Procesa el siguiente orden de venta de la cola (FIFO).
         
-        Complejidad: O(1) para desencolar
+        Complejidad: O(1) para desencolar (O(c + log n) con carriles: se
+        elige el carril por round-robin ponderado)
         
         Returns:
             La orden procesada o None si no hay órdenes
         """
-        if self.ordenes_venta.esta_vacia():
-            return None
-        
-        orden = self.ordenes_venta.desencolar()
-        orden["estado"] = "Procesada"
-        self.ordenes_procesadas.append(orden)
+        with self._candado_ordenes:
+            if self.ordenes_venta.esta_vacia():
+                return None
+            
+            orden = self.ordenes_venta.desencolar()
+            orden["estado"] = "Procesada"
+            self.ordenes_procesadas.agregar(orden)
+            self._anotar({"op": "procesar", "id_orden": orden["id_orden"], "numero": orden["numero"],
+                          "procesada_en": orden["procesada_en"]})
         
+        self._registrar_cambio()
+        self._confirmar_diario()
         return orden
     
+    def tomar_ordenes(self, n):
+        """
+        Saca hasta n órdenes de la cola para procesarlas fuera del gestor.
+        
+        Las órdenes quedan en estado "En proceso" hasta que se entregan a
+        completar_ordenes.
+        
+        Complejidad: O(n)
+        
+        Args:
+            n: Cantidad máxima de órdenes
+            
+        Returns:
+            Lista de órdenes en orden FIFO (vacía si no hay)
+        """
+        with self._candado_ordenes:
+            lote = self.ordenes_venta.desencolar_lote(n)
+            for orden in lote:
+                orden["estado"] = "En proceso"
+                self._ordenes_en_proceso[orden["id_orden"]] = orden
+            # No se espera al disco: si se pierde, las órdenes siguen en la
+            # cola al reproducir; completar_ordenes confirma ambos registros
+            if lote:
+                self._anotar({"op": "tomar", "cantidad": len(lote)})
+        
+        if lote:
+            self._registrar_cambio()
+        return lote
+    
+    def completar_ordenes(self, ordenes):
+        """
+        Registra como procesadas órdenes tomadas con tomar_ordenes.
+        
+        Las órdenes que no traen un estado final se marcan "Procesada".
+        
+        Complejidad: O(k) - k es la cantidad de órdenes
+        
+        Args:
+            ordenes: Lista de órdenes, en el orden en que deben registrarse
+        """
+        with self._candado_ordenes:
+            for orden in ordenes:
+                if orden["estado"] == "En proceso":
+                    orden["estado"] = "Procesada"
+                self._ordenes_en_proceso.pop(orden["id_orden"], None)
+            self.ordenes_procesadas.agregar_lote(ordenes)
+            self._anotar({"op": "completar", "ordenes": ordenes})
+        self._registrar_cambio()
+        self._confirmar_diario()
+    
+    def devolver_ordenes(self, ordenes):
+        """
+        Devuelve a la cola órdenes tomadas con tomar_ordenes que no se
+        llegaron a completar (por ejemplo si el procesador falló a mitad
+        del lote). Vuelven al final de su cola con estado "Pendiente"; las
+        que ya se completaron se ignoran.
+        
+        Complejidad: O(k) - k es la cantidad de órdenes
+        (más O(log n) por orden si la cola tiene carriles)
+        
+        Args:
+            ordenes: Lista de órdenes tomadas
+            
+        Returns:
+            Cantidad de órdenes devueltas
+        """
+        with self._candado_ordenes:
+            devueltas = [orden for orden in ordenes
+                         if self._ordenes_en_proceso.pop(orden["id_orden"], None) is not None]
+            for orden in devueltas:
+                orden["estado"] = "Pendiente"
+                orden.pop("error", None)
+                self._encolar_orden(orden, orden.get("prioridad", 0), orden.get("carril"))
+            # El diario ya reproduce "encolar" de una orden tomada (ver _recuperar)
+            if devueltas:
+                self._anotar({"op": "encolar", "ordenes": [
+                    [orden["id_orden"], orden.get("prioridad", 0), orden.get("carril")]
+                    for orden in devueltas
+                ]})
+        
+        if devueltas:
+            self._registrar_cambio()
+            self._notificar_ordenes()
+            self._confirmar_diario()
+        return len(devueltas)
+    
+    def suscribir_ordenes(self, oyente):
+        """
+        Registra una función sin argumentos que se llama cada vez que se
+        encolan órdenes (por ejemplo para despertar a un procesador).
+        
+        Args:
+            oyente: Función a llamar
+        """
+        self._oyentes_ordenes.append(oyente)
+    
+    def cancelar_suscripcion_ordenes(self, oyente):
+        """Quita una función registrada con suscribir_ordenes"""
+        if oyente in self._oyentes_ordenes:
+            self._oyentes_ordenes.remove(oyente)
+    
+    def _notificar_ordenes(self):
+        """Avisa a los oyentes que hay órdenes nuevas en la cola"""
+        for oyente in list(self._oyentes_ordenes):
+            oyente()
+    
     def obtener_proximo_orden(self):
         """
         Obtiene el próximo orden sin procesarlo.
@@ -294,10 +1294,11 @@ class GestorInventario:
         Returns:
             El próximo orden o None si no hay
         """
-        if self.ordenes_venta.esta_vacia():
-            return None
-        
-        return self.ordenes_venta.frente()
+        with self._candado_ordenes:
+            if self.ordenes_venta.esta_vacia():
+                return None
+            
+            return self.ordenes_venta.frente()
     
     def obtener_cantidad_ordenes_pendientes(self):
         """
@@ -312,26 +1313,21 @@ class GestorInventario:
     
     def generar_reporte(self):
         """
-        Genera un reporte del inventario.
+        Genera un reporte del inventario a partir de los agregados.
         
-        Complejidad: O(n)
+        Complejidad: O(b) - b es la cantidad de productos con bajo stock
         
         Returns:
             Diccionario con estadísticas
         """
-        productos = self.obtener_todos_productos()
-        
-        total_productos = len(productos)
-        total_valor = sum(p.obtener_total() for p in productos)
-        productos_bajo_stock = [p for p in productos if p.cantidad < 5]
-        
-        return {
-            "total_productos": total_productos,
-            "total_valor_inventario": round(total_valor, 2),
-            "productos_bajo_stock": productos_bajo_stock,
-            "ordenes_procesadas": len(self.ordenes_procesadas),
-            "ordenes_pendientes": self.obtener_cantidad_ordenes_pendientes()
-        }
+        with self._candado_catalogo:
+            return {
+                "total_productos": self.productos.obtener_cantidad(),
+                "total_valor_inventario": round(self._valor_total, 2),
+                "productos_bajo_stock": list(self._bajo_stock.values()),
+                "ordenes_procesadas": len(self.ordenes_procesadas),
+                "ordenes_pendientes": self.obtener_cantidad_ordenes_pendientes()
+            }
     
     def obtener_cantidad_total(self):
         """
@@ -344,13 +1340,352 @@ class GestorInventario:
         """
         return self.productos.obtener_cantidad()
     
+    def establecer_umbral_bajo_stock(self, umbral):
+        """
+        Cambia el umbral de bajo stock y recalcula el conjunto.
+        
+        Complejidad: O(n)
+        
+        Args:
+            umbral: Nuevo umbral (cantidad mínima sin alerta)
+        """
+        if umbral < 0:
+            raise ValueError("El umbral no puede ser negativo")
+        
+        with self._candado_catalogo:
+            self.umbral_bajo_stock = umbral
+            self._bajo_stock = {
+                p.id_producto: p for p in self.productos if p.cantidad < umbral
+            }
+            self._anotar({"op": "umbral", "valor": umbral})
+        self._registrar_cambio()
+        self._confirmar_diario()
+    
     def limpiar(self):
         """
         Limpia todo el inventario.
         
+        Las órdenes reservadas que aún no se encolaron se descartan: al
+        intentar encolarlas, crear_orden_venta lanza ValueError y el diario
+        nunca registra su "encolar" después del "limpiar".
+        
         Complejidad: O(1)
         """
-        self.productos.limpiar()
-        self.ordenes_venta.limpiar()
-        self.ordenes_procesadas.clear()
-        self.proximo_id = 1
+        with self._candados_producto.todos(), self._candado_catalogo, self._candado_ordenes:
+            self.productos.limpiar()
+            self._indice_id.clear()
+            self._indice_nombres.limpiar()
+            self._nombres_pendientes = self._armar_nombres_al_buscar = False
+            self._cambios_nombres = None
+            self._limpiar_indices()
+            self.ordenes_venta.limpiar()
+            self._reservas_en_curso.clear()
+            self._ordenes_en_proceso.clear()
+            self.ordenes_procesadas.limpiar()
+            self.proximo_id = 1
+            self._numeros_orden = count(1)
+            with self._candado_version:
+                self._versiones.clear()
+            self._registrar_cambio()
+            self._anotar({"op": "limpiar"})
+        self._confirmar_diario()
+    
+    def cerrar(self):
+        """Escribe lo pendiente del diario y cierra los archivos del gestor"""
+        if self._diario is not None:
+            self._diario.cerrar()
+        self.ordenes_procesadas.cerrar()
+    
+    def guardar_instantanea(self, ruta=None):
+        """
+        Escribe una instantánea binaria del estado completo y vacía el diario.
+        
+        Con todos los candados tomados: se escribe al disco lo pendiente
+        del diario, se guardan productos, órdenes (pendientes, reservadas,
+        en proceso y las del historial en memoria) y contadores en el
+        archivo (ver escribir_instantanea), y el diario queda solo con una
+        marca que lleva el id de la instantánea. Si el proceso se cae entre la
+        instantánea y el vaciado, la instantánea recuerda hasta qué byte
+        del diario incluye y al arrancar se reproduce solo lo posterior.
+        
+        Bloquea las escrituras mientras dura (O(n)); las lecturas sin
+        candado, como iterar_productos, siguen atendiéndose.
+        
+        Las órdenes que el historial ya pasó a su segmento en disco no se
+        copian: la instantánea solo guarda cuántas son, y el segmento se
+        retoma tal cual al arrancar (ver HistorialOrdenes.estado).
+        
+        Complejidad: O(n + órdenes en memoria)
+        
+        Args:
+            ruta: Archivo destino (por defecto ruta_instantanea)
+            
+        Returns:
+            Diccionario con "productos", "bytes" y "segundos"
+            
+        Raises:
+            ValueError: Si no se indica ruta y el gestor no tiene una
+        """
+        ruta = ruta or self.ruta_instantanea
+        if ruta is None:
+            raise ValueError("No hay ruta de instantánea configurada")
+        
+        inicio = time.perf_counter()
+        with self._candados_producto.todos(), self._candado_catalogo, self._candado_ordenes:
+            posicion = 0
+            if self._diario is not None:
+                self._diario.esperar(self._diario.obtener_secuencia())
+                posicion = self._diario.obtener_tamano()
+            
+            numero_orden = next(self._numeros_orden)
+            self._numeros_orden = count(numero_orden)
+            metadatos = {
+                "proximo_id": self.proximo_id,
+                "numero_orden": numero_orden,
+                "umbral_bajo_stock": self.umbral_bajo_stock,
+                "version": self._version,
+                "pendientes": list(self.ordenes_venta),
+                "creditos": self.ordenes_venta.obtener_creditos() if self._con_carriles else None,
+                "reservadas": list(self._reservas_en_curso.values()),
+                "en_proceso": list(self._ordenes_en_proceso.values()),
+                "historial": self.ordenes_procesadas.estado()
+            }
+            productos = self.productos.recorrer()
+            id_instantanea = time.time_ns()
+            tamano = escribir_instantanea(ruta, productos, metadatos, self._filas_ordenadas(productos),
+                                          id_instantanea, posicion)
+            if self._diario is not None:
+                self._diario.reiniciar({"op": "instantanea", "id": id_instantanea})
+        
+        return {
+            "productos": len(productos),
+            "bytes": tamano,
+            "segundos": round(time.perf_counter() - inicio, 3)
+        }
+    
+    def _filas_ordenadas(self, productos):
+        """
+        Filas de 'productos' ordenadas por cantidad y por precio, leídas de
+        las listas de salto en O(n) (None para que la instantánea las ordene).
+        """
+        filas = {producto.id_producto: i for i, producto in enumerate(productos)}
+        return {
+            campo: [filas[producto.id_producto] for producto in indice]
+            for campo, indice in self._indices_ordenados.items()
+        }
+    
+    def _recuperar(self, diario):
+        """
+        Reconstruye el estado al crear el gestor: carga la instantánea si
+        existe, reproduce el diario desde donde ella termina y deja el
+        diario activo para las operaciones siguientes.
+        
+        Al terminar, una orden reservada que no llegó a encolarse (el
+        proceso se cayó en medio y el cliente no recibió confirmación) se
+        anula devolviendo su stock, y las órdenes tomadas por un
+        procesador que no se completaron vuelven a la cola.
+        
+        Args:
+            diario: DiarioEscritura a reproducir, o None
+        """
+        reservadas = {}  # id_orden -> orden reservada aún no encolada
+        tomadas = {}     # id_orden -> orden tomada aún no completada
+        
+        instantanea = None
+        with _recolector_pausado():
+            if self.ruta_instantanea is not None and os.path.exists(self.ruta_instantanea):
+                instantanea = Instantanea(self.ruta_instantanea)
+                self._cargar_instantanea(instantanea, reservadas, tomadas)
+            
+            if diario is not None:
+                self._reproducir_diario(diario, instantanea, reservadas, tomadas)
+        self._diario = diario
+        
+        for orden in reservadas.values():
+            self._anular_reserva(orden)
+            self._anotar({"op": "anular", "id_orden": orden["id_orden"]})
+        
+        if tomadas:
+            with self._candado_ordenes:
+                for orden in tomadas.values():
+                    self._encolar_orden(orden, orden.get("prioridad", 0), orden.get("carril"))
+                    orden["estado"] = "Pendiente"
+                self._anotar({"op": "encolar", "ordenes": [
+                    [orden["id_orden"], orden.get("prioridad", 0), orden.get("carril")]
+                    for orden in tomadas.values()
+                ]})
+        self._confirmar_diario()
+    
+    def _cargar_instantanea(self, instantanea, reservadas, tomadas):
+        """
+        Carga el estado guardado por guardar_instantanea en un gestor vacío.
+        
+        Complejidad: O(n + órdenes en memoria)
+        
+        Args:
+            instantanea: Instantanea abierta
+            reservadas: Diccionario donde dejar las órdenes reservadas sin encolar
+            tomadas: Diccionario donde dejar las órdenes en proceso
+        """
+        metadatos = instantanea.metadatos
+        self.proximo_id = metadatos["proximo_id"]
+        self._numeros_orden = count(metadatos["numero_orden"])
+        self.umbral_bajo_stock = metadatos["umbral_bajo_stock"]
+        self._version = metadatos["version"]
+        
+        with self._candado_catalogo:
+            self._cargar_productos(instantanea)
+        
+        for orden in metadatos["pendientes"]:
+            self._encolar_orden(orden, orden.get("prioridad", 0), orden.get("carril"))
+        if self._con_carriles and metadatos["creditos"]:
+            self.ordenes_venta.restaurar_creditos(metadatos["creditos"])
+        for orden in metadatos["reservadas"]:
+            reservadas[orden["id_orden"]] = orden
+        for orden in metadatos["en_proceso"]:
+            tomadas[orden["id_orden"]] = orden
+        self.ordenes_procesadas.retomar(metadatos["historial"])
+    
+    def _cargar_productos(self, instantanea):
+        """
+        Carga los productos de una instantánea armando los índices de una
+        vez, sin las búsquedas de una inserción: la lista y el índice por ID
+        en orden de filas, las listas de salto enlazando en el orden que la
+        instantánea guardó, categorías y agregados en la misma pasada. El
+        índice de nombres queda pendiente (ver armar_indice_nombres).
+        
+        Complejidad: O(n)
+        
+        Args:
+            instantanea: Instantanea abierta
+        """
+        productos = instantanea.productos()
+        insertar = self.productos.insertar_final
+        indice_id = self._indice_id
+        versiones = self._versiones
+        version = self._version
+        por_categoria = self._indice_categoria
+        valor_categoria = self._valor_categoria
+        bajo_stock = self._bajo_stock
+        umbral = self.umbral_bajo_stock
+        valor_total = 0
+        
+        for producto in productos:
+            id_prod = producto.id_producto
+            indice_id[id_prod] = insertar(producto)
+            versiones[id_prod] = version
+            categoria = producto.categoria
+            total = producto.cantidad * producto.precio
+            por_categoria.setdefault(categoria, {})[id_prod] = producto
+            valor_categoria[categoria] = valor_categoria.get(categoria, 0) + total
+            valor_total += total
+            if producto.cantidad < umbral:
+                bajo_stock[id_prod] = producto
+        self._valor_total += valor_total
+        
+        for campo, indice in self._indices_ordenados.items():
+            indice.cargar_ordenadas(
+                (getattr(producto, campo), producto.id_producto, producto)
+                for producto in map(productos.__getitem__, instantanea.orden(campo))
+            )
+        self._nombres_pendientes = self._armar_nombres_al_buscar = bool(productos)
+    
+    def _reproducir_diario(self, diario, instantanea, reservadas, tomadas):
+        """
+        Aplica en orden los registros del diario posteriores a la instantánea.
+        
+        Si el diario empieza con la marca de esta instantánea, ya se vació
+        al guardarla y se reproduce completo. Si no, la instantánea se
+        guardó pero el diario no llegó a vaciarse: se reproduce desde la
+        posición que la instantánea registró.
+        
+        Complejidad: O(r) - r es la cantidad de registros reproducidos
+        
+        Args:
+            diario: DiarioEscritura a reproducir
+            instantanea: Instantanea cargada, o None
+            reservadas: Órdenes reservadas aún no encoladas (se actualiza)
+            tomadas: Órdenes tomadas aún no completadas (se actualiza)
+            
+        Raises:
+            ValueError: Si el diario continúa una instantánea que no se cargó
+        """
+        registros = diario.leer()
+        primero = next(registros, None)
+        marca = primero is not None and primero["op"] == "instantanea"
+        
+        if instantanea is None:
+            if marca:
+                raise ValueError("El diario continúa una instantánea que no se encontró")
+        elif not marca or primero["id"] != instantanea.id_instantanea:
+            registros.close()
+            registros = diario.leer(instantanea.posicion_diario)
+            primero = None
+        
+        if primero is not None and not marca:
+            self._aplicar_registro(primero, reservadas, tomadas)
+        for registro in registros:
+            self._aplicar_registro(registro, reservadas, tomadas)
+    
+    def _aplicar_registro(self, registro, reservadas, tomadas):
+        """Aplica un registro del diario (sin volver a registrarlo)"""
+        operacion = registro["op"]
+        
+        if operacion == "producto":
+            self.proximo_id = self._numero_id(registro["id"])
+            with self._candado_catalogo:
+                self._insertar_producto(registro["nombre"], registro["cantidad"],
+                                        registro["precio"], registro["categoria"])
+        elif operacion == "cantidad":
+            self._cambiar_cantidad(self.buscar_producto_por_id(registro["id"]), registro["cantidad"])
+        elif operacion == "eliminar":
+            self.eliminar_producto(registro["id"])
+        elif operacion == "reserva":
+            orden = registro["orden"]
+            for linea in orden["productos"]:
+                producto = self.buscar_producto_por_id(linea["id_producto"])
+                self._cambiar_cantidad(producto, producto.cantidad - linea["cantidad"])
+            reservadas[orden["id_orden"]] = orden
+            # Reservas de productos distintos pueden llegar al diario fuera
+            # de orden: el próximo número sale de la mayor vista
+            numero = int(orden["id_orden"].rsplit("-", 1)[1]) + 1
+            self._numeros_orden = count(max(next(self._numeros_orden), numero))
+        elif operacion == "anular":
+            self._anular_reserva(reservadas.pop(registro["id_orden"]))
+        elif operacion == "encolar":
+            for id_orden, prioridad, carril in registro["ordenes"]:
+                orden = reservadas.pop(id_orden, None) or tomadas.pop(id_orden, None)
+                if orden is None:
+                    continue  # Descartada por un "limpiar" posterior a su reserva
+                orden["estado"] = "Pendiente"
+                self._encolar_orden(orden, prioridad, carril)
+        elif operacion == "procesar":
+            orden = self.ordenes_venta.desencolar()
+            orden["estado"] = "Procesada"
+            orden["numero"] = registro["numero"]
+            orden["procesada_en"] = registro["procesada_en"]
+            self.ordenes_procesadas.restaurar([orden])
+        elif operacion == "tomar":
+            for orden in self.ordenes_venta.desencolar_lote(registro["cantidad"]):
+                orden["estado"] = "En proceso"
+                tomadas[orden["id_orden"]] = orden
+        elif operacion == "completar":
+            for orden in registro["ordenes"]:
+                tomadas.pop(orden["id_orden"], None)
+            self.ordenes_procesadas.restaurar(registro["ordenes"])
+        elif operacion == "umbral":
+            self.establecer_umbral_bajo_stock(registro["valor"])
+        elif operacion == "limpiar":
+            self.limpiar()
+            reservadas.clear()
+            tomadas.clear()
+        else:
+            raise ValueError(f"Registro de diario desconocido: {operacion}")
+    
+    def _anular_reserva(self, orden):
+        """Devuelve al stock lo reservado por una orden que no se encoló"""
+        for linea in orden["productos"]:
+            producto = self.buscar_producto_por_id(linea["id_producto"])
+            if producto is not None:
+                with self._candados_producto.para(producto.id_producto):
+                    self._cambiar_cantidad(producto, producto.cantidad + linea["cantidad"])
@@ -0,0 +1,694 @@
+"""
+Módulo: Gestor SQLite
+Descripción: GestorInventario con el catálogo en una base SQLite local, para
+inventarios que no caben en memoria
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import count
+
+from gestor_inventario import GestorInventario
+from indice_ngramas import IndiceNGramas
+from producto import Producto
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY,          -- Parte numérica de "PROD-n"
+    nombre TEXT NOT NULL,
+    nombre_normalizado TEXT NOT NULL,
+    cantidad NOT NULL,               -- Sin afinidad: conserva int o float
+    precio NOT NULL,
+    categoria TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS productos_categoria ON productos (categoria);
+CREATE INDEX IF NOT EXISTS productos_cantidad ON productos (cantidad, id);
+CREATE INDEX IF NOT EXISTS productos_precio ON productos (precio, id);
+
+-- Índice de trigramas sobre los nombres (búsqueda por subcadena)
+CREATE VIRTUAL TABLE IF NOT EXISTS productos_nombres USING fts5 (
+    nombre_normalizado, content='productos', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS productos_nombres_insertar AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_nombres (rowid, nombre_normalizado)
+    VALUES (new.id, new.nombre_normalizado);
+END;
+CREATE TRIGGER IF NOT EXISTS productos_nombres_eliminar AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_nombres (productos_nombres, rowid, nombre_normalizado)
+    VALUES ('delete', old.id, old.nombre_normalizado);
+END;
+
+-- Agregados por categoría para el reporte, mantenidos en cada cambio
+CREATE TABLE IF NOT EXISTS categorias (
+    categoria TEXT PRIMARY KEY,
+    productos INTEGER NOT NULL,
+    valor REAL NOT NULL              -- Suma de cantidad * precio
+);
+CREATE TRIGGER IF NOT EXISTS categorias_insertar AFTER INSERT ON productos BEGIN
+    INSERT INTO categorias (categoria, productos, valor)
+    VALUES (new.categoria, 1, new.cantidad * new.precio)
+    ON CONFLICT (categoria) DO UPDATE SET
+        productos = productos + 1, valor = valor + excluded.valor;
+END;
+CREATE TRIGGER IF NOT EXISTS categorias_actualizar
+AFTER UPDATE OF cantidad, precio, categoria ON productos BEGIN
+    UPDATE categorias SET productos = productos - 1, valor = valor - old.cantidad * old.precio
+    WHERE categoria = old.categoria;
+    INSERT INTO categorias (categoria, productos, valor)
+    VALUES (new.categoria, 1, new.cantidad * new.precio)
+    ON CONFLICT (categoria) DO UPDATE SET
+        productos = productos + 1, valor = valor + excluded.valor;
+END;
+CREATE TRIGGER IF NOT EXISTS categorias_eliminar AFTER DELETE ON productos BEGIN
+    UPDATE categorias SET productos = productos - 1, valor = valor - old.cantidad * old.precio
+    WHERE categoria = old.categoria;
+    DELETE FROM categorias WHERE categoria = old.categoria AND productos = 0;
+END;
+
+-- Órdenes reservadas o en la cola, guardadas en la transacción que descuenta
+-- su stock y borradas al procesarse (rowid = orden de creación)
+CREATE TABLE IF NOT EXISTS ordenes (
+    id_orden TEXT PRIMARY KEY,
+    orden TEXT NOT NULL,             -- La orden en JSON
+    encolada INTEGER NOT NULL DEFAULT 0,
+    prioridad INTEGER,
+    carril TEXT
+);
+
+-- Contadores y configuración (proximo_id, numero_orden, version, umbral_bajo_stock)
+CREATE TABLE IF NOT EXISTS estado (
+    clave TEXT PRIMARY KEY,
+    valor NOT NULL
+);
+"""
+
+COLUMNAS = "id, nombre, cantidad, precio, categoria"
+
+
+class GestorInventarioSQLite(GestorInventario):
+    """
+    Gestor de inventario con los productos en una base SQLite.
+    
+    Expone los mismos métodos públicos que GestorInventario, pero la
+    lista de productos y sus índices viven en la base: la memoria usada
+    no crece con el catálogo. La cola de órdenes y el historial siguen
+    en memoria como en el gestor base, pero cada orden pendiente también
+    se guarda en la tabla ordenes (ver _anotar) y vuelve a la cola al
+    reabrir la base.
+    
+    Índices:
+        - id: clave primaria (rowid), búsqueda O(log n)
+        - categoria, (cantidad, id), (precio, id): índices B-tree para
+          filtros, top-N y rangos
+        - categorias: cantidad y valor por categoría, mantenidos por
+          triggers en cada cambio (como los agregados del gestor base)
+        - nombre: tabla FTS5 con tokenizador de trigramas, el mismo
+          criterio que IndiceNGramas (subcadenas de 3 o más caracteres)
+    
+    Conexiones:
+        Un pool de conexiones: cada llamada toma una libre (o abre una si
+        no hay) y la devuelve al terminar, así un servidor que crea un
+        hilo por pedido no deja una conexión abierta por cada hilo. El
+        pool guarda hasta MAX_CONEXIONES_LIBRES; las que sobran se
+        cierran al devolverse. La base está en modo WAL, así los lectores
+        no esperan al escritor. Las sentencias son constantes con
+        parámetros, así que cada conexión las prepara una vez y las
+        reutiliza desde su caché de sentencias.
+    
+    Transacciones:
+        Cada operación de escritura es una transacción (BEGIN IMMEDIATE,
+        que serializa a los escritores). Los lotes de productos escriben
+        un tramo de TAMANO_TRAMO_LOTE filas por transacción, y un lote de
+        órdenes usa una sola transacción con un savepoint por orden, así
+        una orden inválida se deshace sin afectar a las demás.
+    
+    Complejidad de operaciones:
+        - Buscar por ID, cambiar stock, agregar, eliminar: O(log n)
+        - Categoría, top-N, rango: O(log n + k)
+        - Valor o cantidad de una categoría: O(log c)
+        - Reporte: O(c + log n + b) - c categorías, b productos con bajo stock
+    """
+    
+    CACHE_SENTENCIAS = 64
+    MAX_CONEXIONES_LIBRES = 8
+    ESPERA_BLOQUEO = 30  # Segundos que una conexión espera a que se libere la base
+    
+    def __init__(self, ruta, umbral_bajo_stock=GestorInventario.UMBRAL_BAJO_STOCK,
+                 pesos_carriles=None, capacidad_historial=None, ruta_historial=None):
+        """
+        Abre (o crea) la base e inicializa el gestor.
+        
+        Si la base ya tiene datos se retoman, incluidos el próximo ID, la
+        numeración de órdenes, el umbral y las órdenes pendientes (ver
+        _recuperar_ordenes).
+        
+        Args:
+            ruta: Archivo de la base SQLite
+            umbral_bajo_stock: Umbral de bajo stock para una base nueva
+            pesos_carriles: Carriles de la cola de órdenes (ver GestorInventario)
+            capacidad_historial: Órdenes procesadas en memoria (ver GestorInventario)
+            ruta_historial: Archivo del historial de órdenes (ver GestorInventario)
+        """
+        super().__init__(umbral_bajo_stock, pesos_carriles, capacidad_historial, ruta_historial)
+        self.ruta = ruta
+        self._local = threading.local()
+        self._conexiones = set()  # Abiertas, libres o en uso (para cerrar)
+        self._libres = []
+        self._candado_conexiones = threading.Lock()
+        
+        with self._conexion() as conexion:
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.executescript(ESQUEMA)
+            
+            estado = dict(conexion.execute("SELECT clave, valor FROM estado"))
+            maximo = conexion.execute("SELECT COALESCE(MAX(id), 0), COALESCE(MAX(version), 0) "
+                                      "FROM productos").fetchone()
+            self.proximo_id = max(estado.get("proximo_id", 1), maximo[0] + 1)
+            self._numeros_orden = count(estado.get("numero_orden", 1))
+            self.umbral_bajo_stock = estado.get("umbral_bajo_stock", umbral_bajo_stock)
+            self._version = max(estado.get("version", 0), maximo[1])
+            self._guardar_estado(conexion, "version", self._version)
+            self._recuperar_ordenes(conexion)
+    
+    @contextmanager
+    def _conexion(self):
+        """
+        Conexión del pool para el hilo actual mientras dura el bloque.
+        
+        Los bloques anidados del mismo hilo reciben la misma conexión (así
+        una transacción abarca sus savepoints). Al salir del bloque externo
+        la conexión vuelve al pool, o se cierra si el pool ya tiene
+        MAX_CONEXIONES_LIBRES libres. Si no hay una libre se abre otra en
+        vez de esperar: un hilo puede estar esperando un candado del gestor
+        mientras tiene una conexión tomada.
+        
+        Yields:
+            La conexión
+        """
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is not None:
+            yield conexion
+            return
+        
+        with self._candado_conexiones:
+            conexion = self._libres.pop() if self._libres else None
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=self.ESPERA_BLOQUEO,
+                                       isolation_level=None, check_same_thread=False,
+                                       cached_statements=self.CACHE_SENTENCIAS)
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            with self._candado_conexiones:
+                self._conexiones.add(conexion)
+        
+        self._local.conexion = conexion
+        try:
+            yield conexion
+        finally:
+            self._local.conexion = None
+            with self._candado_conexiones:
+                if conexion in self._conexiones and len(self._libres) < self.MAX_CONEXIONES_LIBRES:
+                    self._libres.append(conexion)
+                    conexion = None
+                else:
+                    self._conexiones.discard(conexion)
+            if conexion is not None:
+                conexion.close()
+    
+    @contextmanager
+    def _transaccion(self):
+        """
+        Transacción de escritura en la conexión del hilo.
+        
+        Si el hilo ya está dentro de una transacción se abre un savepoint:
+        un error deshace solo lo hecho dentro de este bloque.
+        
+        Yields:
+            La conexión
+        """
+        with self._conexion() as conexion:
+            anidada = conexion.in_transaction
+            conexion.execute("SAVEPOINT paso" if anidada else "BEGIN IMMEDIATE")
+            try:
+                yield conexion
+            except BaseException:
+                if anidada:
+                    conexion.execute("ROLLBACK TO paso")
+                    conexion.execute("RELEASE paso")
+                else:
+                    conexion.execute("ROLLBACK")
+                raise
+            conexion.execute("RELEASE paso" if anidada else "COMMIT")
+    
+    def _nueva_version(self, conexion):
+        """
+        Versión para una fila modificada dentro de una transacción.
+        
+        El contador está en la tabla estado y se incrementa en la misma
+        transacción que la fila: como BEGIN IMMEDIATE serializa a los
+        escritores, dos transacciones nunca reciben la misma versión,
+        aunque una empiece antes de que la otra llame a _registrar_cambio.
+        La versión global se incrementa recién después del COMMIT, así
+        nadie ve la versión nueva con datos viejos.
+        """
+        return conexion.execute("UPDATE estado SET valor = valor + 1 WHERE clave = 'version' "
+                                "RETURNING valor").fetchone()[0]
+    
+    def _anotar(self, registro):
+        """
+        Guarda en la tabla ordenes los cambios de estado de las órdenes.
+        
+        Ocupa el lugar del diario del gestor base: se llama en los mismos
+        puntos y con los mismos candados, así la tabla sigue el orden en
+        que se aplicaron. La reserva ya quedó guardada en la transacción
+        que descontó el stock (ver _reservar_orden); una orden tomada
+        sigue guardada hasta que se completa.
+        
+        Args:
+            registro: Registro del diario del gestor base
+        """
+        operacion = registro["op"]
+        if operacion == "encolar":
+            filas = [(prioridad, carril, id_orden) for id_orden, prioridad, carril in registro["ordenes"]]
+            with self._transaccion() as conexion:
+                conexion.executemany("UPDATE ordenes SET encolada = 1, prioridad = ?, carril = ? "
+                                     "WHERE id_orden = ?", filas)
+        elif operacion in ("procesar", "completar"):
+            ordenes = [registro] if operacion == "procesar" else registro["ordenes"]
+            with self._transaccion() as conexion:
+                conexion.executemany("DELETE FROM ordenes WHERE id_orden = ?",
+                                     [(orden["id_orden"],) for orden in ordenes])
+    
+    def _recuperar_ordenes(self, conexion):
+        """
+        Retoma las órdenes guardadas al abrir la base, como GestorInventario
+        al reproducir su diario: las encoladas (también las tomadas sin
+        completar) vuelven a la cola en el orden en que se crearon, y las
+        reservadas que no llegaron a encolarse se anulan devolviendo su
+        stock.
+        
+        Args:
+            conexion: Conexión del hilo que abre la base
+        """
+        anuladas = []
+        for texto, encolada, prioridad, carril in list(conexion.execute(
+                "SELECT orden, encolada, prioridad, carril FROM ordenes ORDER BY rowid")):
+            orden = json.loads(texto)
+            if not encolada:
+                anuladas.append(orden)
+                continue
+            if self._con_carriles and carril not in self.ordenes_venta.pesos:
+                carril = self.ordenes_venta.carril_por_defecto
+            orden["estado"] = "Pendiente"
+            self._encolar_orden(orden, prioridad, carril)
+        
+        if anuladas:
+            with self._transaccion() as conexion:
+                version = self._nueva_version(conexion)
+                for orden in anuladas:
+                    conexion.executemany(
+                        "UPDATE productos SET cantidad = cantidad + ?, version = ? WHERE id = ?",
+                        [(linea["cantidad"], version, self._numero(linea["id_producto"]))
+                         for linea in orden["productos"]])
+                conexion.executemany("DELETE FROM ordenes WHERE id_orden = ?",
+                                     [(orden["id_orden"],) for orden in anuladas])
+            self._registrar_cambio()
+    
+    def _guardar_estado(self, conexion, clave, valor):
+        """Guarda un contador o configuración en la tabla estado"""
+        conexion.execute("INSERT OR REPLACE INTO estado (clave, valor) VALUES (?, ?)",
+                         (clave, valor))
+    
+    @staticmethod
+    def _producto(fila):
+        """Producto a partir de una fila (id, nombre, cantidad, precio, categoria)"""
+        return Producto(f"PROD-{fila[0]}", fila[1], fila[2], fila[3], fila[4])
+    
+    def _consultar(self, sql, parametros=()):
+        """Ejecuta una consulta y retorna los productos de sus filas"""
+        with self._conexion() as conexion:
+            return [self._producto(fila) for fila in conexion.execute(sql, parametros)]
+    
+    @staticmethod
+    def _numero(id_producto):
+        """Número de un ID 'PROD-n', o None si no tiene ese formato"""
+        prefijo, _, numero = str(id_producto).partition("-")
+        return int(numero) if prefijo == "PROD" and numero.isdigit() else None
+    
+    def _buscar(self, conexion, id_producto):
+        """Producto por ID usando una conexión dada (None si no existe)"""
+        numero = self._numero(id_producto)
+        if numero is None:
+            return None
+        fila = conexion.execute(f"SELECT {COLUMNAS} FROM productos WHERE id = ?",
+                                (numero,)).fetchone()
+        return self._producto(fila) if fila is not None else None
+    
+    def agregar_producto(self, nombre, cantidad, precio, categoria="General"):
+        """
+        Agrega un nuevo producto al inventario.
+        
+        Complejidad: O(log n)
+        
+        Raises:
+            ValueError: Si falta el nombre o la cantidad o el precio son negativos
+        """
+        resultado = self.agregar_productos_lote([(nombre, cantidad, precio, categoria)])[0]
+        if isinstance(resultado, ValueError):
+            raise resultado
+        return resultado
+    
+    def _insertar_tramo(self, tramo, resultados):
+        """Inserta un tramo del lote en una sola transacción"""
+        filas = []
+        with self._transaccion() as conexion:
+            anterior = self.proximo_id
+            version = self._nueva_version(conexion)
+            try:
+                for nombre, cantidad, precio, *categoria in tramo:
+                    categoria = categoria[0] if categoria else "General"
+                    if not isinstance(nombre, str) or not nombre:
+                        resultados.append(ValueError("Nombre requerido"))
+                        continue
+                    if cantidad < 0 or precio < 0:
+                        resultados.append(ValueError("Cantidad y precio deben ser positivos"))
+                        continue
+                    numero = self.proximo_id
+                    self.proximo_id += 1
+                    filas.append((numero, nombre, IndiceNGramas.normalizar(nombre), cantidad, precio, categoria, version))
+                    resultados.append(Producto(f"PROD-{numero}", nombre, cantidad, precio, categoria))
+                conexion.executemany(
+                    "INSERT INTO productos (id, nombre, nombre_normalizado, cantidad, precio, "
+                    "categoria, version) VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+                self._guardar_estado(conexion, "proximo_id", self.proximo_id)
+            except BaseException:
+                self.proximo_id = anterior
+                raise
+        if filas:
+            self._registrar_cambio()
+    
+    def _diferir_indice_nombres(self):
+        """No aplica: los triggers mantienen el índice FTS en la misma transacción"""
+    
+    def buscar_producto_por_id(self, id_producto):
+        """
+        Busca un producto por su ID (clave primaria).
+        
+        Complejidad: O(log n)
+        """
+        with self._conexion() as conexion:
+            return self._buscar(conexion, id_producto)
+    
+    def buscar_productos_por_nombre(self, nombre):
+        """
+        Busca productos por nombre (búsqueda parcial, sin distinguir mayúsculas).
+        
+        Con 3 o más caracteres usa el índice de trigramas; las consultas
+        más cortas recorren la tabla.
+        
+        Complejidad: O(c) - c candidatos del índice de trigramas
+        """
+        consulta = IndiceNGramas.normalizar(nombre)
+        if len(consulta) < 3:
+            return self._consultar(f"SELECT {COLUMNAS} FROM productos "
+                                   "WHERE instr(nombre_normalizado, ?) > 0 ORDER BY id", (consulta,))
+        frase = '"' + consulta.replace('"', '""') + '"'
+        return self._consultar(f"SELECT {COLUMNAS} FROM productos WHERE id IN "
+                               "(SELECT rowid FROM productos_nombres WHERE productos_nombres MATCH ?) "
+                               "ORDER BY id", (frase,))
+    
+    def _modificar_cantidad(self, id_producto, calcular):
+        """
+        Lee y reescribe el stock de un producto en una transacción.
+        
+        Args:
+            id_producto: ID del producto
+            calcular: Función producto -> nueva cantidad (puede lanzar ValueError)
+            
+        Returns:
+            La nueva cantidad, o None si el producto no existe
+        """
+        with self._transaccion() as conexion:
+            producto = self._buscar(conexion, id_producto)
+            if producto is None:
+                return None
+            nueva_cantidad = calcular(producto)
+            conexion.execute("UPDATE productos SET cantidad = ?, version = ? WHERE id = ?",
+                             (nueva_cantidad, self._nueva_version(conexion), self._numero(id_producto)))
+        self._registrar_cambio()
+        return nueva_cantidad
+    
+    def actualizar_cantidad(self, id_producto, nueva_cantidad):
+        """Actualiza la cantidad de un producto (True si existe)"""
+        def calcular(producto):
+            if nueva_cantidad < 0:
+                raise ValueError("La cantidad no puede ser negativa")
+            return nueva_cantidad
+        return self._modificar_cantidad(id_producto, calcular) is not None
+    
+    def agregar_stock(self, id_producto, cantidad):
+        """Aumenta el stock de un producto (nueva cantidad o -1 si no existe)"""
+        def calcular(producto):
+            if cantidad < 0:
+                raise ValueError("Cantidad debe ser positiva")
+            return producto.cantidad + cantidad
+        resultado = self._modificar_cantidad(id_producto, calcular)
+        return -1 if resultado is None else resultado
+    
+    def restar_stock(self, id_producto, cantidad):
+        """
+        Disminuye el stock de un producto (nueva cantidad o -1 si no existe).
+        
+        Raises:
+            ValueError: Si no hay suficiente stock
+        """
+        def calcular(producto):
+            if cantidad < 0:
+                raise ValueError("Cantidad debe ser positiva")
+            if producto.cantidad < cantidad:
+                raise ValueError(f"Stock insuficiente. Disponible: {producto.cantidad}")
+            return producto.cantidad - cantidad
+        resultado = self._modificar_cantidad(id_producto, calcular)
+        return -1 if resultado is None else resultado
+    
+    def eliminar_producto(self, id_producto):
+        """
+        Elimina un producto del inventario.
+        
+        Complejidad: O(log n)
+        """
+        numero = self._numero(id_producto)
+        if numero is None:
+            return False
+        with self._transaccion() as conexion:
+            eliminado = conexion.execute("DELETE FROM productos WHERE id = ?", (numero,)).rowcount
+        if eliminado:
+            self._registrar_cambio()
+        return bool(eliminado)
+    
+    def obtener_todos_productos(self):
+        """Obtiene todos los productos en orden de ID (O(n))"""
+        return self._consultar(f"SELECT {COLUMNAS} FROM productos ORDER BY id")
+    
+    def iterar_productos(self, cursor=None):
+        """
+        Recorre los productos por páginas de la clave primaria, sin
+        mantener una lectura abierta entre páginas.
+        
+        Complejidad: O(log n) por página de TAMANO_TRAMO_LOTE productos
+        
+        Raises:
+            ValueError: Si el cursor no es un ID de producto
+        """
+        desde = 0 if cursor is None else self._numero_id(cursor)
+        return self._iterar_desde(desde)
+    
+    def _iterar_desde(self, desde):
+        """Generador de iterar_productos a partir del número 'desde' (excluido)"""
+        while True:
+            pagina = self._consultar(f"SELECT {COLUMNAS} FROM productos WHERE id > ? "
+                                     "ORDER BY id LIMIT ?", (desde, self.TAMANO_TRAMO_LOTE))
+            yield from pagina
+            if len(pagina) < self.TAMANO_TRAMO_LOTE:
+                return
+            desde = self._numero(pagina[-1].id_producto)
+    
+    def obtener_productos_por_categoria(self, categoria):
+        """Productos de una categoría (índice por categoría, O(log n + k))"""
+        return self._consultar(f"SELECT {COLUMNAS} FROM productos WHERE categoria = ? ORDER BY id",
+                               (categoria,))
+    
+    def contar_productos_por_categoria(self, categoria):
+        """Cantidad de productos de una categoría (agregado, O(log c))"""
+        with self._conexion() as conexion:
+            fila = conexion.execute("SELECT productos FROM categorias WHERE categoria = ?",
+                                    (categoria,)).fetchone()
+        return fila[0] if fila is not None else 0
+    
+    def obtener_valor_categoria(self, categoria):
+        """Suma de cantidad * precio de una categoría (agregado, O(log c))"""
+        with self._conexion() as conexion:
+            fila = conexion.execute("SELECT valor FROM categorias WHERE categoria = ?",
+                                    (categoria,)).fetchone()
+        return round(fila[0], 2) if fila is not None else 0
+    
+    def obtener_categorias(self):
+        """Categorías con al menos un producto, en orden alfabético (O(c))"""
+        with self._conexion() as conexion:
+            return [fila[0] for fila in
+                    conexion.execute("SELECT categoria FROM categorias ORDER BY categoria")]
+    
+    def obtener_productos_ordenados(self, campo, limite=None, descendente=False):
+        """
+        Productos ordenados por cantidad o precio (top-N sobre el índice).
+        
+        Complejidad: O(log n + k)
+        """
+        self._indice_ordenado(campo)  # Valida el campo
+        direccion = "DESC" if descendente else "ASC"
+        return self._consultar(f"SELECT {COLUMNAS} FROM productos "
+                               f"ORDER BY {campo} {direccion}, id {direccion} LIMIT ?",
+                               (-1 if limite is None else limite,))
+    
+    def obtener_productos_en_rango(self, campo, minimo=None, maximo=None, limite=None,
+                                   descendente=False):
+        """
+        Productos con minimo <= campo <= maximo, ordenados por el campo.
+        
+        Complejidad: O(log n + k) - k a lo sumo el límite
+        """
+        self._indice_ordenado(campo)
+        condiciones, parametros = [], []
+        if minimo is not None:
+            condiciones.append(f"{campo} >= ?")
+            parametros.append(minimo)
+        if maximo is not None:
+            condiciones.append(f"{campo} <= ?")
+            parametros.append(maximo)
+        donde = f"WHERE {' AND '.join(condiciones)} " if condiciones else ""
+        direccion = "DESC" if descendente else "ASC"
+        parametros.append(-1 if limite is None else limite)
+        return iter(self._consultar(f"SELECT {COLUMNAS} FROM productos {donde}"
+                                    f"ORDER BY {campo} {direccion}, id {direccion} LIMIT ?",
+                                    parametros))
+    
+    def _reservar_orden(self, id_cliente, productos_solicitados):
+        """
+        Valida y descuenta el stock de una orden en una transacción (o en
+        un savepoint si es parte de un lote): todo o nada. La orden se
+        guarda en la tabla ordenes en la misma transacción.
+        
+        Raises:
+            ValueError: Si una cantidad no es un entero positivo, o si un
+                producto no existe o no tiene stock suficiente
+        """
+        requerido = self._cantidades_requeridas(productos_solicitados)
+        
+        with self._transaccion() as conexion:
+            productos = {}
+            for id_prod, cantidad in requerido.items():
+                producto = self._buscar(conexion, id_prod)
+                if producto is None:
+                    raise ValueError(f"Producto {id_prod} no existe")
+                if producto.cantidad < cantidad:
+                    raise ValueError(f"Stock insuficiente de {producto.nombre}")
+                productos[id_prod] = producto
+            
+            numero = next(self._numeros_orden)
+            orden = self._armar_orden(f"ORD-{numero}", id_cliente, productos_solicitados, productos)
+            version = self._nueva_version(conexion)
+            conexion.executemany(
+                "UPDATE productos SET cantidad = cantidad - ?, version = ? WHERE id = ?",
+                [(cantidad, version, self._numero(id_prod)) for id_prod, cantidad in requerido.items()])
+            self._guardar_estado(conexion, "numero_orden", numero + 1)
+            conexion.execute("INSERT INTO ordenes (id_orden, orden) VALUES (?, ?)",
+                             (orden["id_orden"], json.dumps(orden)))
+            self._reservas_en_curso[orden["id_orden"]] = orden
+        self._registrar_cambio()
+        return orden
+    
+    def _reservar_lote(self, ordenes):
+        """Reserva todas las órdenes del lote en una sola transacción"""
+        with self._transaccion():
+            return super()._reservar_lote(ordenes)
+    
+    def generar_reporte(self):
+        """
+        Genera el reporte a partir de los agregados por categoría.
+        
+        Complejidad: O(c + log n + b) - el bajo stock sale del índice de cantidad
+        """
+        with self._conexion() as conexion:
+            total, valor = conexion.execute("SELECT TOTAL(productos), TOTAL(valor) "
+                                            "FROM categorias").fetchone()
+        return {
+            "total_productos": int(total),
+            "total_valor_inventario": round(valor, 2),
+            "productos_bajo_stock": self._consultar(
+                f"SELECT {COLUMNAS} FROM productos WHERE cantidad < ? ORDER BY id",
+                (self.umbral_bajo_stock,)),
+            "ordenes_procesadas": len(self.ordenes_procesadas),
+            "ordenes_pendientes": self.obtener_cantidad_ordenes_pendientes()
+        }
+    
+    def obtener_cantidad_total(self):
+        """Cantidad de productos en la base (agregado, O(c))"""
+        with self._conexion() as conexion:
+            return int(conexion.execute("SELECT TOTAL(productos) FROM categorias").fetchone()[0])
+    
+    def obtener_version_producto(self, id_producto):
+        """Versión guardada en la fila del producto (None si no existe)"""
+        numero = self._numero(id_producto)
+        if numero is None:
+            return None
+        with self._conexion() as conexion:
+            fila = conexion.execute("SELECT version FROM productos WHERE id = ?",
+                                    (numero,)).fetchone()
+        return fila[0] if fila is not None else None
+    
+    def establecer_umbral_bajo_stock(self, umbral):
+        """Cambia el umbral y lo guarda; el bajo stock se consulta con el índice de cantidad"""
+        if umbral < 0:
+            raise ValueError("El umbral no puede ser negativo")
+        with self._transaccion() as conexion:
+            self._guardar_estado(conexion, "umbral_bajo_stock", umbral)
+            self.umbral_bajo_stock = umbral
+        self._registrar_cambio()
+    
+    def limpiar(self):
+        """Borra todos los productos, órdenes y contadores"""
+        with self._candado_ordenes:
+            with self._transaccion() as conexion:
+                conexion.execute("DELETE FROM productos")
+                conexion.execute("DELETE FROM categorias")
+                conexion.execute("DELETE FROM ordenes")
+                conexion.execute("DELETE FROM estado WHERE clave != 'version'")
+                self.proximo_id = 1
+                self._numeros_orden = count(1)
+            self.ordenes_venta.limpiar()
+            self.ordenes_procesadas.limpiar()
+            self._reservas_en_curso.clear()
+            self._ordenes_en_proceso.clear()
+        self._registrar_cambio()
+    
+    def guardar_instantanea(self, ruta=None):
+        """
+        No aplica: la base ya es persistente.
+        
+        Raises:
+            ValueError: Siempre
+        """
+        raise ValueError("El almacén SQLite no usa instantáneas: la base ya es persistente")
+    
+    def cerrar(self):
+        """Cierra las conexiones del pool (también las tomadas) y el historial"""
+        with self._candado_conexiones:
+            for conexion in self._conexiones:
+                conexion.close()
+            self._conexiones.clear()
+            self._libres.clear()
+        self._local = threading.local()
+        super().cerrar()
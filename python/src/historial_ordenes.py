@@ -0,0 +1,399 @@
+"""
+Módulo: Historial de Órdenes
+Descripción: Historial acotado de órdenes procesadas: las más recientes en
+memoria (buffer circular) y las anteriores en un segmento JSONL en disco
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from cola import Cola
+
+
+class HistorialOrdenes:
+    """
+    Historial de órdenes procesadas con memoria acotada.
+    
+    Las últimas 'capacidad' órdenes se guardan en una Cola (buffer
+    circular). Al superarla, las más antiguas se escriben al final de un
+    archivo JSONL de solo agregado (el segmento) y se liberan de memoria,
+    así el consumo de memoria tiene un techo fijo sin perder historia.
+    
+    Cada orden recibe al registrarse un número secuencial ("numero") y la
+    hora en que se procesó ("procesada_en", segundos desde epoch). Ambos
+    crecen con el orden de registro (si el reloj del sistema retrocede,
+    procesada_en repite la última hora en vez de bajar), lo que permite paginar por número y
+    filtrar por rango de tiempo con búsqueda binaria sobre un índice
+    disperso del segmento (una entrada cada INTERVALO_INDICE órdenes).
+    
+    Si el segmento ya existe al crear el historial, se retoma: la
+    historia escrita antes sigue disponible. Un segmento temporal (sin
+    ruta) se borra al cerrar el historial.
+    
+    Complejidad de operaciones:
+        - Agregar: O(1) amortizado (más la escritura de lo que se desborda)
+        - Consultar k órdenes desde un número o una fecha:
+          O(log n + k + INTERVALO_INDICE)
+        - Cantidad total: O(1)
+    """
+    
+    INTERVALO_INDICE = 256
+    
+    def __init__(self, capacidad=None, ruta=None):
+        """
+        Crea el historial.
+        
+        Args:
+            capacidad: Órdenes máximas en memoria (None = sin límite y sin disco)
+            ruta: Archivo del segmento. Si hay capacidad y no se indica
+                ruta se usa un archivo temporal.
+                
+        Raises:
+            ValueError: Si la capacidad no es positiva
+        """
+        if capacidad is not None and capacidad < 1:
+            raise ValueError("La capacidad del historial debe ser positiva")
+        
+        self.capacidad = capacidad
+        self._memoria = Cola()
+        self._total = 0          # Próximo número a asignar
+        self._en_disco = 0       # Órdenes [0, _en_disco) están en el segmento
+        self._bytes = 0          # Tamaño escrito del segmento
+        self._indice = []        # (numero, posición en bytes, procesada_en)
+        self._ultima_hora = 0.0  # procesada_en de la última orden registrada
+        self._candado = threading.Lock()
+        
+        self.ruta = ruta
+        self._archivo = None
+        self._temporal = False
+        if capacidad is not None:
+            if ruta is None:
+                descriptor, self.ruta = tempfile.mkstemp(prefix="historial_", suffix=".jsonl")
+                os.close(descriptor)
+                self._temporal = True
+            self._retomar_segmento()
+            self._archivo = open(self.ruta, "ab")
+    
+    def _retomar_segmento(self):
+        """Reconstruye el índice disperso de un segmento existente"""
+        if not os.path.exists(self.ruta):
+            return
+        
+        with open(self.ruta, "rb") as archivo:
+            posicion = 0
+            ultima = None
+            for linea in archivo:
+                if not linea.endswith(b"\n"):
+                    break  # Línea incompleta de una escritura interrumpida
+                if self._en_disco % self.INTERVALO_INDICE == 0:
+                    orden = json.loads(linea)
+                    self._indice.append((self._en_disco, posicion, orden["procesada_en"]))
+                posicion += len(linea)
+                self._en_disco += 1
+                ultima = linea
+        
+        if ultima is not None:
+            self._ultima_hora = json.loads(ultima)["procesada_en"]
+        self._bytes = posicion
+        self._total = self._en_disco
+        os.truncate(self.ruta, posicion)
+    
+    def agregar(self, orden):
+        """
+        Registra una orden procesada.
+        
+        Complejidad: O(1) amortizado
+        
+        Args:
+            orden: Diccionario de la orden (recibe "numero" y "procesada_en")
+        """
+        self.agregar_lote([orden])
+    
+    def agregar_lote(self, ordenes):
+        """
+        Registra varias órdenes procesadas, en orden.
+        
+        Complejidad: O(k) - k es el tamaño del lote
+        
+        Args:
+            ordenes: Lista de órdenes
+        """
+        with self._candado:
+            # time.time() puede retroceder (ajuste del reloj): se mantiene
+            # creciente para que las búsquedas binarias por fecha sigan valiendo
+            ahora = self._ultima_hora = max(time.time(), self._ultima_hora)
+            for orden in ordenes:
+                orden["numero"] = self._total
+                orden["procesada_en"] = ahora
+                self._total += 1
+            self._memoria.encolar_lote(ordenes)
+            
+            if self.capacidad is not None and len(self._memoria) > self.capacidad:
+                self._desbordar(self._memoria.desencolar_lote(len(self._memoria) - self.capacidad))
+    
+    def restaurar(self, ordenes):
+        """
+        Registra órdenes que ya traen "numero" y "procesada_en" (por
+        ejemplo al reproducir un diario), conservando ambos. Se omiten las
+        que ya están registradas (número menor al total), como las del
+        segmento retomado.
+        
+        Complejidad: O(k) - k es la cantidad de órdenes
+        
+        Args:
+            ordenes: Lista de órdenes en orden de número
+        """
+        with self._candado:
+            ordenes = [orden for orden in ordenes if orden["numero"] >= self._total]
+            if not ordenes:
+                return
+            self._memoria.encolar_lote(ordenes)
+            self._total = ordenes[-1]["numero"] + 1
+            self._ultima_hora = max(self._ultima_hora, ordenes[-1]["procesada_en"])
+            
+            if self.capacidad is not None and len(self._memoria) > self.capacidad:
+                self._desbordar(self._memoria.desencolar_lote(len(self._memoria) - self.capacidad))
+    
+    def estado(self):
+        """
+        Contadores y órdenes en memoria, para una instantánea.
+        
+        Las órdenes del segmento no se copian: se fuerza su escritura a
+        disco (fsync) y solo se recuerda cuántas son.
+        
+        Complejidad: O(capacidad)
+        
+        Returns:
+            Diccionario con "total", "en_disco" y "memoria"
+        """
+        with self._candado:
+            if self._archivo is not None:
+                os.fsync(self._archivo.fileno())
+            return {
+                "total": self._total,
+                "en_disco": self._en_disco,
+                "memoria": self._memoria.convertir_a_lista()
+            }
+    
+    def retomar(self, estado):
+        """
+        Vuelve al estado guardado por estado(). El segmento retomado se
+        recorta a las órdenes que tenía entonces (las posteriores vuelven
+        a registrarse al reproducir el diario) y la memoria recibe las que
+        estaban en ella.
+        
+        Complejidad: O(capacidad + INTERVALO_INDICE)
+        
+        Args:
+            estado: Diccionario retornado por estado()
+        """
+        with self._candado:
+            if self._en_disco > estado["en_disco"]:
+                self._recortar(estado["en_disco"])
+            self._memoria.limpiar()
+            self._memoria.encolar_lote(estado["memoria"])
+            self._total = estado["total"]
+            if estado["memoria"]:
+                self._ultima_hora = max(self._ultima_hora, estado["memoria"][-1]["procesada_en"])
+            
+            if self.capacidad is not None and len(self._memoria) > self.capacidad:
+                self._desbordar(self._memoria.desencolar_lote(len(self._memoria) - self.capacidad))
+    
+    def _recortar(self, cantidad):
+        """Deja en el segmento solo sus primeras 'cantidad' órdenes"""
+        entrada = bisect_right([e[0] for e in self._indice], cantidad) - 1
+        numero, posicion = self._indice[entrada][:2]
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(posicion)
+            while numero < cantidad:
+                posicion += len(archivo.readline())
+                numero += 1
+        
+        self._archivo.truncate(posicion)
+        self._indice = [e for e in self._indice if e[0] < cantidad]
+        self._en_disco = cantidad
+        self._bytes = posicion
+    
+    def _desbordar(self, ordenes):
+        """Escribe al segmento las órdenes que ya no caben en memoria"""
+        lineas = []
+        posicion = self._bytes
+        for orden in ordenes:
+            linea = (json.dumps(orden, sort_keys=True, separators=(",", ":")) + "\n").encode()
+            if self._en_disco % self.INTERVALO_INDICE == 0:
+                self._indice.append((self._en_disco, posicion, orden["procesada_en"]))
+            lineas.append(linea)
+            posicion += len(linea)
+            self._en_disco += 1
+        
+        self._archivo.write(b"".join(lineas))
+        self._archivo.flush()
+        self._bytes = posicion
+    
+    def consultar(self, cursor=None, limite=100, desde=None, hasta=None):
+        """
+        Obtiene una página de órdenes en orden de procesamiento.
+        
+        Args:
+            cursor: Número de la última orden ya recibida (None = desde la primera)
+            limite: Cantidad máxima de órdenes
+            desde: Solo órdenes con procesada_en >= desde
+            hasta: Solo órdenes con procesada_en <= hasta
+            
+        Returns:
+            Tupla (órdenes, siguiente cursor o None si no hay más)
+        """
+        inicio = 0 if cursor is None else cursor + 1
+        resultado = []
+        
+        with self._candado:
+            en_disco = self._en_disco
+            fin_disco = self._bytes
+            indice = list(self._indice) if inicio < en_disco else []
+            memoria = self._memoria.convertir_a_lista()
+        
+        if inicio < en_disco:
+            resultado = self._leer_segmento(indice, fin_disco, inicio, limite + 1, desde, hasta)
+        
+        # Los números en memoria son consecutivos: se salta directo al inicio
+        primero = memoria[0]["numero"] if memoria else 0
+        for orden in memoria[max(inicio - primero, 0):]:
+            if len(resultado) > limite:
+                break
+            if desde is not None and orden["procesada_en"] < desde:
+                continue
+            if hasta is not None and orden["procesada_en"] > hasta:
+                break
+            resultado.append(orden)
+        
+        siguiente = resultado[limite - 1]["numero"] if len(resultado) > limite else None
+        return resultado[:limite], siguiente
+    
+    def _leer_segmento(self, indice, fin_disco, inicio, cantidad, desde, hasta):
+        """
+        Lee del segmento hasta 'cantidad' órdenes con número >= inicio
+        dentro del rango de tiempo.
+        
+        El índice disperso da, por búsqueda binaria, la posición desde la
+        que empezar a leer: la última entrada anterior al número pedido o
+        a la fecha 'desde'.
+        """
+        posicion_numero = bisect_right([e[0] for e in indice], inicio) - 1
+        posicion_fecha = 0
+        if desde is not None:
+            posicion_fecha = bisect_left([e[2] for e in indice], desde) - 1
+        entrada = indice[max(posicion_numero, posicion_fecha, 0)]
+        
+        resultado = []
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(entrada[1])
+            leidos = entrada[1]
+            for linea in archivo:
+                leidos += len(linea)
+                if leidos > fin_disco:
+                    break
+                orden = json.loads(linea)
+                if orden["numero"] < inicio or (desde is not None and orden["procesada_en"] < desde):
+                    continue
+                if hasta is not None and orden["procesada_en"] > hasta:
+                    break
+                resultado.append(orden)
+                if len(resultado) >= cantidad:
+                    break
+        return resultado
+    
+    def en_memoria(self):
+        """Cantidad de órdenes guardadas en memoria"""
+        return len(self._memoria)
+    
+    def limpiar(self):
+        """Borra todo el historial, incluido el segmento en disco"""
+        with self._candado:
+            self._memoria.limpiar()
+            self._total = self._en_disco = self._bytes = 0
+            self._indice = []
+            if self._archivo is not None:
+                self._archivo.truncate(0)
+    
+    def cerrar(self):
+        """Cierra el archivo del segmento (y lo borra si es temporal)"""
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        if self._temporal:
+            self._temporal = False
+            try:
+                os.remove(self.ruta)
+            except FileNotFoundError:
+                pass
+    
+    def recorrer(self, desde=None, hasta=None):
+        """
+        Recorre la historia en orden de procesamiento, leyendo el segmento
+        línea a línea (la memoria usada no depende de su tamaño).
+        
+        Con 'desde' la lectura del segmento empieza en la entrada del
+        índice disperso anterior a esa fecha; con 'hasta' el recorrido
+        termina en la primera orden posterior.
+        
+        Complejidad: O(log n + k + INTERVALO_INDICE)
+        
+        Args:
+            desde: Solo órdenes con procesada_en >= desde
+            hasta: Solo órdenes con procesada_en <= hasta
+            
+        Yields:
+            Cada orden, primero las del segmento y luego las de memoria
+        """
+        with self._candado:
+            fin_disco = self._bytes
+            indice = list(self._indice) if desde is not None else []
+            memoria = self._memoria.convertir_a_lista()
+        
+        def en_rango(orden):
+            """None si la orden es anterior a 'desde', False si ya pasó 'hasta'"""
+            if desde is not None and orden["procesada_en"] < desde:
+                return None
+            return hasta is None or orden["procesada_en"] <= hasta
+        
+        if fin_disco:
+            posicion = 0
+            if indice:
+                entrada = bisect_left([e[2] for e in indice], desde) - 1
+                posicion = indice[max(entrada, 0)][1]
+            with open(self.ruta, "rb") as archivo:
+                archivo.seek(posicion)
+                leidos = posicion
+                for linea in archivo:
+                    leidos += len(linea)
+                    if leidos > fin_disco:
+                        break
+                    orden = json.loads(linea)
+                    incluir = en_rango(orden)
+                    if incluir is False:
+                        return
+                    if incluir:
+                        yield orden
+        
+        for orden in memoria:
+            incluir = en_rango(orden)
+            if incluir is False:
+                return
+            if incluir:
+                yield orden
+    
+    def __iter__(self):
+        """Recorre toda la historia: primero el segmento y luego la memoria"""
+        return self.recorrer()
+    
+    def __len__(self):
+        """Cantidad total de órdenes registradas (memoria y disco)"""
+        return self._total
+    
+    def __repr__(self):
+        """Representación en string del historial"""
+        return f"HistorialOrdenes(total={self._total}, en_memoria={len(self._memoria)})"
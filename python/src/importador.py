@@ -0,0 +1,257 @@
+"""
+Módulo: Importador de Catálogo
+Descripción: Importa catálogos CSV o JSONL por flujo, en tramos, sin cargar
+el archivo completo en memoria
+"""
+
+import csv
+import io
+import json
+import math
+import os
+from numbers import Number
+
+
+FORMATOS = ("csv", "jsonl")
+TAMANO_TRAMO = 5000     # Filas por llamada a agregar_productos_lote
+MAXIMO_RECHAZOS = 100   # Rechazos detallados en el resumen (se cuentan todos)
+FACTOR_DIFERIR_NOMBRES = 4  # Se difiere el índice de nombres si filas * 4 > catálogo
+COLUMNAS_REQUERIDAS = ("nombre", "cantidad", "precio")
+
+
+def detectar_formato(nombre=None, tipo_contenido=None):
+    """
+    Deduce el formato por la extensión del archivo o el Content-Type.
+    
+    Args:
+        nombre: Nombre o ruta del archivo (".csv", ".jsonl", ".ndjson")
+        tipo_contenido: Cabecera Content-Type ("text/csv", "application/x-ndjson"...)
+        
+    Returns:
+        "csv", "jsonl" o None si no se reconoce
+    """
+    tipo = (tipo_contenido or "").lower()
+    if "csv" in tipo:
+        return "csv"
+    if "ndjson" in tipo or "jsonl" in tipo or "json-seq" in tipo:
+        return "jsonl"
+    extension = os.path.splitext(nombre or "")[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return None
+
+
+class _FlujoContado(io.RawIOBase):
+    """Envuelve un flujo binario (cualquier objeto con read(n)) y cuenta los bytes leídos"""
+    
+    def __init__(self, flujo):
+        self._flujo = flujo
+        self.leidos = 0
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        datos = self._flujo.read(len(buffer))
+        n = len(datos)
+        buffer[:n] = datos
+        self.leidos += n
+        return n
+
+
+def _numero(texto, entero):
+    """Convierte el texto de una celda CSV en int, o en int/float si no se exige entero"""
+    texto = texto.strip()
+    try:
+        return int(texto)
+    except ValueError:
+        if entero:
+            raise
+    valor = float(texto)
+    if not math.isfinite(valor):
+        raise ValueError(texto)
+    return valor
+
+
+def _fila_csv(fila):
+    """Valida una fila CSV (diccionario de textos) y la convierte en tupla"""
+    nombre = (fila.get("nombre") or "").strip()
+    if not nombre:
+        raise ValueError("Nombre requerido")
+    try:
+        cantidad = _numero(fila.get("cantidad") or "0", entero=True)
+        precio = _numero(fila.get("precio") or "0", entero=False)
+    except ValueError:
+        raise ValueError("Cantidad debe ser entera y precio numérico")
+    return nombre, cantidad, precio, (fila.get("categoria") or "").strip() or "General"
+
+
+def _fila_json(datos):
+    """Valida un objeto JSONL (mismas reglas que POST /api/productos/bulk) y lo convierte en tupla"""
+    if not isinstance(datos, dict):
+        raise ValueError("Cada línea debe ser un objeto JSON")
+    nombre = datos.get("nombre")
+    cantidad = datos.get("cantidad", 0)
+    precio = datos.get("precio", 0)
+    if not isinstance(nombre, str) or not nombre:
+        raise ValueError("Nombre requerido")
+    if (not isinstance(cantidad, int) or isinstance(cantidad, bool)
+            or not isinstance(precio, Number) or isinstance(precio, bool)):
+        raise ValueError("Cantidad debe ser entera y precio numérico")
+    return nombre, cantidad, precio, datos.get("categoria", "General")
+
+
+def _filas_csv(texto):
+    """
+    Recorre un CSV con cabecera.
+    
+    Yields:
+        Tuplas (número de línea, tupla del producto o ValueError)
+        
+    Raises:
+        ValueError: Si falta la cabecera o alguna columna requerida
+    """
+    lector = csv.reader(texto)
+    try:
+        cabecera = [columna.strip().lower() for columna in next(lector)]
+    except StopIteration:
+        raise ValueError("El archivo está vacío")
+    except csv.Error as e:
+        raise ValueError(f"CSV inválido: {e}")
+    faltantes = [c for c in COLUMNAS_REQUERIDAS if c not in cabecera]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en la cabecera: {', '.join(faltantes)}")
+    
+    while True:
+        try:
+            celdas = next(lector)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # Un error de formato deja al lector en un estado no confiable
+            raise ValueError(f"CSV inválido en la línea {lector.line_num}: {e}")
+        if not any(celdas):
+            continue
+        try:
+            if len(celdas) != len(cabecera):
+                raise ValueError(f"Se esperaban {len(cabecera)} columnas y hay {len(celdas)}")
+            yield lector.line_num, _fila_csv(dict(zip(cabecera, celdas)))
+        except ValueError as e:
+            yield lector.line_num, e
+
+
+def _filas_jsonl(texto):
+    """
+    Recorre un archivo JSONL (un objeto por línea).
+    
+    Yields:
+        Tuplas (número de línea, tupla del producto o ValueError)
+    """
+    for numero, linea in enumerate(texto, 1):
+        if not linea.strip():
+            continue
+        try:
+            yield numero, _fila_json(json.loads(linea))
+        except ValueError as e:
+            if isinstance(e, json.JSONDecodeError):
+                e = ValueError("JSON inválido")
+            yield numero, e
+
+
+def importar_catalogo(gestor, flujo, formato, tamano_tramo=TAMANO_TRAMO, progreso=None):
+    """
+    Importa un catálogo leyéndolo por flujo.
+    
+    Las filas se validan a medida que se leen y las válidas se agregan con
+    gestor.agregar_productos_lote cada tamano_tramo filas, así la memoria
+    usada depende del tramo y no del tamaño del archivo.
+    
+    Los nombres se indexan fila por fila mientras la importación es chica
+    respecto del catálogo. Cuando las filas enviadas superan el tamaño
+    inicial del catálogo / FACTOR_DIFERIR_NOMBRES, los tramos siguientes
+    difieren el índice de nombres y al terminar se arma una sola vez (ver
+    GestorInventario.armar_indice_nombres): rehacerlo cuesta O(n + f),
+    que así se reparte en O(FACTOR_DIFERIR_NOMBRES) por fila importada.
+    
+    Las filas rechazadas no detienen la importación: se cuentan y las
+    primeras MAXIMO_RECHAZOS se detallan con su número de línea.
+    
+    Complejidad: O(f log n) - f filas del archivo
+    
+    Args:
+        gestor: GestorInventario destino
+        flujo: Flujo binario a leer (archivo abierto en "rb", cuerpo de
+            una petición... cualquier objeto con read(n))
+        formato: "csv" (con cabecera nombre,cantidad,precio[,categoria])
+            o "jsonl" (objetos {"nombre", "cantidad", "precio", "categoria"})
+        tamano_tramo: Filas por lote
+        progreso: Función opcional que recibe el resumen parcial tras cada tramo
+        
+    Returns:
+        Diccionario con filas, importados, rechazados, rechazos
+        ([{"linea", "error"}]) y bytes leídos
+        
+    Raises:
+        ValueError: Si el formato no es válido, el texto no es UTF-8 o el
+            CSV no tiene las columnas requeridas
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}. Opciones: {', '.join(FORMATOS)}")
+    if tamano_tramo <= 0:
+        raise ValueError("El tamaño de tramo debe ser positivo")
+    
+    contado = _FlujoContado(flujo)
+    texto = io.TextIOWrapper(io.BufferedReader(contado), encoding="utf-8-sig", newline="")
+    filas = _filas_csv(texto) if formato == "csv" else _filas_jsonl(texto)
+    
+    resumen = {"filas": 0, "importados": 0, "rechazados": 0, "rechazos": [], "bytes": 0}
+    catalogo = gestor.obtener_cantidad_total()
+    enviadas = 0
+    diferir = False
+    
+    def rechazar(linea, error):
+        resumen["rechazados"] += 1
+        if len(resumen["rechazos"]) < MAXIMO_RECHAZOS:
+            resumen["rechazos"].append({"linea": linea, "error": str(error)})
+    
+    def insertar(tramo, lineas):
+        nonlocal enviadas, diferir
+        enviadas += len(tramo)
+        diferir = diferir or enviadas * FACTOR_DIFERIR_NOMBRES > catalogo
+        resultados = gestor.agregar_productos_lote(tramo, diferir_nombres=diferir)
+        for linea, resultado in zip(lineas, resultados):
+            if isinstance(resultado, ValueError):
+                rechazar(linea, resultado)
+            else:
+                resumen["importados"] += 1
+        resumen["bytes"] = contado.leidos
+        if progreso is not None:
+            progreso(resumen)
+    
+    tramo, lineas = [], []
+    try:
+        try:
+            for linea, fila in filas:
+                resumen["filas"] += 1
+                if isinstance(fila, ValueError):
+                    rechazar(linea, fila)
+                    continue
+                tramo.append(fila)
+                lineas.append(linea)
+                if len(tramo) == tamano_tramo:
+                    insertar(tramo, lineas)
+                    tramo, lineas = [], []
+        except UnicodeDecodeError:
+            raise ValueError("El archivo debe estar codificado en UTF-8")
+        
+        if tramo:
+            insertar(tramo, lineas)
+    finally:
+        if diferir:
+            gestor.armar_indice_nombres()
+    resumen["bytes"] = contado.leidos
+    # Los rechazos del gestor llegan al final de cada tramo, después de los de validación
+    resumen["rechazos"].sort(key=lambda rechazo: rechazo["linea"])
+    return resumen
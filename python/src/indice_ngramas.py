@@ -0,0 +1,203 @@
+"""
+Módulo: Índice de N-gramas
+Descripción: Índice invertido de n-gramas para búsquedas por subcadena
+"""
+
+
+class IndiceNGramas:
+    """
+    Índice invertido de n-gramas (por defecto trigramas) sobre textos.
+    
+    Cada texto se normaliza una sola vez al indexarlo y se descompone en
+    sus n-gramas. Para buscar una subcadena se intersectan las listas de
+    los n-gramas de la consulta, lo que reduce los candidatos antes de
+    verificar la coincidencia exacta.
+    
+    Una consulta de n-1 caracteres (dos, con el n por defecto) no tiene
+    n-gramas propios, pero todo texto de al menos n caracteres que la
+    contiene tiene un n-grama que empieza o termina con ella: se une la
+    lista de esos n-gramas, que se encuentran por su prefijo y su sufijo
+    de n-1 caracteres. Solo las consultas de un carácter recorren los
+    textos; coinciden con buena parte del catálogo, así que el recorrido
+    cuesta del orden del resultado.
+    
+    Complejidad de operaciones:
+        - Agregar: O(m) - m es la longitud del texto
+        - Eliminar: O(m)
+        - Buscar: O(q + c) - q n-gramas de la consulta, c candidatos
+          (con n-1 caracteres, c es la suma de las listas unidas; con
+          menos, O(t) - t textos)
+    """
+    
+    def __init__(self, n=3):
+        """
+        Inicializa un índice vacío.
+        
+        Args:
+            n: Longitud de los n-gramas (por defecto 3)
+        """
+        self.n = n
+        self._textos = {}      # clave -> texto normalizado (caché)
+        self._orden = {}       # clave -> secuencia de inserción
+        self._ngramas = {}     # n-grama -> conjunto de claves
+        self._prefijos = {}    # primeros n-1 caracteres -> conjunto de n-gramas
+        self._sufijos = {}     # últimos n-1 caracteres -> conjunto de n-gramas
+        self._sin_ngramas = set()  # Claves de textos más cortos que n
+        self._secuencia = 0
+    
+    @staticmethod
+    def normalizar(texto):
+        """
+        Normaliza un texto para comparación sin distinguir mayúsculas.
+        
+        Args:
+            texto: Texto original
+            
+        Returns:
+            Texto normalizado
+        """
+        return texto.lower()
+    
+    def _extraer(self, texto):
+        """Obtiene el conjunto de n-gramas de un texto normalizado"""
+        n = self.n
+        return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+    
+    def agregar(self, clave, texto):
+        """
+        Indexa un texto bajo una clave.
+        
+        Complejidad: O(m)
+        
+        Args:
+            clave: Identificador del texto
+            texto: Texto a indexar
+        """
+        if clave in self._textos:
+            self.eliminar(clave)
+        
+        normalizado = self.normalizar(texto)
+        self._textos[clave] = normalizado
+        self._orden[clave] = self._secuencia
+        self._secuencia += 1
+        
+        if len(normalizado) < self.n:
+            self._sin_ngramas.add(clave)
+        for ngrama in self._extraer(normalizado):
+            claves = self._ngramas.get(ngrama)
+            if claves is None:
+                claves = self._ngramas[ngrama] = set()
+                self._prefijos.setdefault(ngrama[:-1], set()).add(ngrama)
+                self._sufijos.setdefault(ngrama[1:], set()).add(ngrama)
+            claves.add(clave)
+    
+    def eliminar(self, clave):
+        """
+        Quita una clave del índice.
+        
+        Complejidad: O(m)
+        
+        Args:
+            clave: Identificador del texto
+            
+        Returns:
+            True si se eliminó, False si no existía
+        """
+        normalizado = self._textos.pop(clave, None)
+        
+        if normalizado is None:
+            return False
+        
+        del self._orden[clave]
+        self._sin_ngramas.discard(clave)
+        for ngrama in self._extraer(normalizado):
+            claves = self._ngramas[ngrama]
+            claves.discard(clave)
+            if not claves:
+                del self._ngramas[ngrama]
+                self._quitar_afijo(self._prefijos, ngrama[:-1], ngrama)
+                self._quitar_afijo(self._sufijos, ngrama[1:], ngrama)
+        return True
+    
+    @staticmethod
+    def _quitar_afijo(afijos, afijo, ngrama):
+        """Quita un n-grama sin claves del conjunto de su prefijo o sufijo"""
+        ngramas = afijos[afijo]
+        ngramas.discard(ngrama)
+        if not ngramas:
+            del afijos[afijo]
+    
+    def buscar(self, consulta):
+        """
+        Busca las claves cuyo texto contiene la consulta.
+        
+        Una consulta de n-1 caracteres une las listas de los n-gramas que
+        empiezan o terminan con ella; las más cortas se resuelven sobre los
+        textos normalizados en caché.
+        
+        Args:
+            consulta: Subcadena a buscar
+            
+        Returns:
+            Lista de claves en orden de inserción
+        """
+        consulta = self.normalizar(consulta)
+        
+        if consulta and len(consulta) == self.n - 1:
+            return sorted(self._buscar_corta(consulta), key=self._orden.__getitem__)
+        if len(consulta) < self.n:
+            return [c for c, texto in self._textos.items() if consulta in texto]
+        
+        conjuntos = []
+        for ngrama in self._extraer(consulta):
+            claves = self._ngramas.get(ngrama)
+            if claves is None:
+                return []
+            conjuntos.append(claves)
+        
+        # Intersectar empezando por el conjunto más pequeño
+        conjuntos.sort(key=len)
+        candidatos = conjuntos[0].intersection(*conjuntos[1:])
+        
+        # Con consultas de más de n caracteres los n-gramas no garantizan
+        # la contigüidad, por eso se verifica la subcadena completa
+        if len(consulta) > self.n:
+            candidatos = [c for c in candidatos if consulta in self._textos[c]]
+        
+        return sorted(candidatos, key=self._orden.__getitem__)
+    
+    def _buscar_corta(self, consulta):
+        """Claves cuyo texto contiene una consulta de n-1 caracteres"""
+        candidatos = set()
+        for afijos in (self._prefijos, self._sufijos):
+            for ngrama in afijos.get(consulta, ()):
+                candidatos.update(self._ngramas[ngrama])
+        # Los textos más cortos que n no tienen n-gramas: se revisan aparte
+        candidatos.update(c for c in self._sin_ngramas if consulta in self._textos[c])
+        return candidatos
+    
+    def obtener_texto(self, clave):
+        """
+        Obtiene el texto normalizado en caché de una clave.
+        
+        Args:
+            clave: Identificador del texto
+            
+        Returns:
+            El texto normalizado o None si no existe
+        """
+        return self._textos.get(clave)
+    
+    def limpiar(self):
+        """Vacía el índice"""
+        self._textos.clear()
+        self._orden.clear()
+        self._ngramas.clear()
+        self._prefijos.clear()
+        self._sufijos.clear()
+        self._sin_ngramas.clear()
+        self._secuencia = 0
+    
+    def __len__(self):
+        """Retorna la cantidad de textos indexados"""
+        return len(self._textos)
@@ -0,0 +1,333 @@
+"""
+Módulo: Instantánea
+Descripción: Instantánea binaria del inventario (catálogo y órdenes) que se
+lee con mmap para arrancar sin reproducir el diario completo
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+
+from producto import Producto
+
+
+MAGIA = b"INVSNAP\x00"
+VERSION_FORMATO = 1
+
+# magia, versión, crc32 del contenido, id de la instantánea, posición del
+# diario, cantidad de productos, largo de los metadatos
+CABECERA = struct.Struct("<8sIIqqqq")
+
+# Columnas de productos, en orden dentro del archivo: (nombre, tipo de array)
+COLUMNAS = (
+    ("ids", "q"),              # Parte numérica de "PROD-n"
+    ("cantidades", "d"),
+    ("precios", "d"),
+    ("tipos", "B"),            # Bits: 1 = cantidad entera, 2 = precio entero
+    ("categorias", "I"),       # Código en metadatos["categorias"]
+    ("fin_nombres", "Q"),      # Fin del nombre de cada fila en el bloque de nombres
+    ("orden_cantidad", "I"),   # Filas ordenadas por (cantidad, id)
+    ("orden_precio", "I"),     # Filas ordenadas por (precio, id)
+)
+
+CANTIDAD_ENTERA = 1
+PRECIO_ENTERO = 2
+
+
+def _alinear(tamano):
+    """Redondea hacia arriba a múltiplo de 8 (las columnas empiezan alineadas)"""
+    return (tamano + 7) & ~7
+
+
+def escribir_instantanea(ruta, productos, metadatos, ordenes=None, id_instantanea=0,
+                         posicion_diario=0):
+    """
+    Escribe una instantánea de forma atómica (archivo temporal + rename).
+    
+    Los productos se guardan en columnas de ancho fijo y los nombres en un
+    bloque de texto aparte; lo demás (órdenes pendientes, historial,
+    contadores) va en los metadatos JSON.
+    
+    Complejidad: O(n) (O(n log n) si no se dan los órdenes)
+    
+    Args:
+        ruta: Archivo destino
+        productos: Lista de productos en orden de inserción
+        metadatos: Diccionario serializable a JSON (se le agrega "categorias")
+        ordenes: Diccionario campo -> lista de filas ordenadas por
+            (campo, id_producto) para "cantidad" y "precio". Si es None se
+            calculan ordenando.
+        id_instantanea: Identificador que la marca del diario debe repetir
+        posicion_diario: Bytes del diario ya incluidos en la instantánea
+        
+    Returns:
+        Tamaño del archivo en bytes
+    """
+    codigos = {}
+    columnas = {nombre: array(tipo) for nombre, tipo in COLUMNAS}
+    nombres = []
+    fin = 0
+    for producto in productos:
+        cantidad, precio = producto.cantidad, producto.precio
+        columnas["ids"].append(int(producto.id_producto.rsplit("-", 1)[1]))
+        columnas["cantidades"].append(cantidad)
+        columnas["precios"].append(precio)
+        columnas["tipos"].append((CANTIDAD_ENTERA if isinstance(cantidad, int) else 0)
+                                 | (PRECIO_ENTERO if isinstance(precio, int) else 0))
+        columnas["categorias"].append(codigos.setdefault(producto.categoria, len(codigos)))
+        nombre = producto.nombre.encode()
+        nombres.append(nombre)
+        fin += len(nombre)
+        columnas["fin_nombres"].append(fin)
+    
+    if ordenes is None:
+        ordenes = {
+            campo: sorted(range(len(productos)),
+                          key=lambda i: (getattr(productos[i], campo), productos[i].id_producto))
+            for campo in ("cantidad", "precio")
+        }
+    columnas["orden_cantidad"].extend(ordenes["cantidad"])
+    columnas["orden_precio"].extend(ordenes["precio"])
+    
+    metadatos = dict(metadatos, categorias=list(codigos))
+    bloque_metadatos = json.dumps(metadatos, separators=(",", ":")).encode()
+    partes = [bloque_metadatos]
+    tamano = len(bloque_metadatos)
+    for nombre, _ in COLUMNAS:
+        datos = columnas[nombre].tobytes()
+        partes.append(b"\0" * (_alinear(tamano) - tamano))
+        partes.append(datos)
+        tamano = _alinear(tamano) + len(datos)
+    partes.append(b"".join(nombres))
+    contenido = b"".join(partes)
+    
+    cabecera = CABECERA.pack(MAGIA, VERSION_FORMATO, zlib.crc32(contenido), id_instantanea,
+                             posicion_diario, len(productos), len(bloque_metadatos))
+    
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(cabecera)
+        archivo.write(contenido)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    return len(cabecera) + len(contenido)
+
+
+class Instantanea:
+    """
+    Instantánea abierta para lectura.
+    
+    El archivo se mapea en memoria y cada columna se expone como un
+    memoryview tipado sobre el mapa, sin copiar ni decodificar nada al
+    abrir: solo se lee la cabecera, se verifica el CRC y se parsean los
+    metadatos. Los nombres de los productos se decodifican recién cuando
+    se usan (ver ProductoInstantanea).
+    
+    Atributos:
+        id_instantanea: Identificador de la instantánea
+        posicion_diario: Bytes del diario que la instantánea ya incluye
+        cantidad: Cantidad de productos
+        metadatos: Diccionario con el resto del estado
+        categorias: Lista código -> nombre de categoría
+    
+    Complejidad de operaciones:
+        - Abrir: O(tamaño del archivo) por el CRC, sin crear objetos por producto
+        - Nombre de una fila: O(largo del nombre)
+    """
+    
+    def __init__(self, ruta):
+        """
+        Abre y valida la instantánea.
+        
+        Args:
+            ruta: Archivo de la instantánea
+            
+        Raises:
+            ValueError: Si el archivo no es una instantánea válida o está dañado
+        """
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(self._mapa) < CABECERA.size:
+            raise ValueError(f"Instantánea incompleta: {ruta}")
+        (magia, version, crc, self.id_instantanea, self.posicion_diario, self.cantidad,
+         largo_metadatos) = CABECERA.unpack_from(self._mapa)
+        if magia != MAGIA or version != VERSION_FORMATO:
+            raise ValueError(f"Formato de instantánea desconocido: {ruta}")
+        
+        vista = memoryview(self._mapa)
+        if zlib.crc32(vista[CABECERA.size:]) != crc:
+            raise ValueError(f"Instantánea dañada (CRC): {ruta}")
+        
+        posicion = CABECERA.size
+        self.metadatos = json.loads(bytes(vista[posicion:posicion + largo_metadatos]))
+        self.categorias = self.metadatos["categorias"]
+        posicion += largo_metadatos
+        
+        self._columnas = {}
+        for nombre, tipo in COLUMNAS:
+            posicion = CABECERA.size + _alinear(posicion - CABECERA.size)
+            largo = self.cantidad * array(tipo).itemsize
+            self._columnas[nombre] = vista[posicion:posicion + largo].cast(tipo)
+            posicion += largo
+        self._inicio_nombres = posicion
+    
+    def orden(self, campo):
+        """Filas ordenadas por (campo, id_producto) para "cantidad" o "precio" """
+        return self._columnas["orden_" + campo]
+    
+    def nombre(self, fila):
+        """
+        Decodifica el nombre de una fila.
+        
+        Complejidad: O(largo del nombre)
+        """
+        fines = self._columnas["fin_nombres"]
+        inicio = self._inicio_nombres + (fines[fila - 1] if fila else 0)
+        return self._mapa[inicio:self._inicio_nombres + fines[fila]].decode()
+    
+    def productos(self):
+        """
+        Crea los productos de todas las filas, con el nombre sin decodificar.
+        
+        Complejidad: O(n)
+        
+        Returns:
+            Lista de ProductoInstantanea en orden de inserción
+        """
+        c = self._columnas
+        ids, cantidades, precios, tipos, codigos = (
+            c["ids"], c["cantidades"], c["precios"], c["tipos"], c["categorias"]
+        )
+        categorias = self.categorias
+        productos = []
+        for fila in range(self.cantidad):
+            tipo = tipos[fila]
+            cantidad, precio = cantidades[fila], precios[fila]
+            productos.append(ProductoInstantanea(
+                f"PROD-{ids[fila]}",
+                int(cantidad) if tipo & CANTIDAD_ENTERA else cantidad,
+                int(precio) if tipo & PRECIO_ENTERO else precio,
+                categorias[codigos[fila]],
+                self, fila
+            ))
+        return productos
+    
+    def filas(self):
+        """
+        Recorre las filas con el nombre ya decodificado.
+        
+        Yields:
+            Tuplas (id_producto, nombre, cantidad, precio, categoria)
+        """
+        for p in self.productos():
+            yield p.id_producto, p.nombre, p.cantidad, p.precio, p.categoria
+    
+    def __repr__(self):
+        """Representación en string de la instantánea"""
+        return f"Instantanea({self.ruta!r}, productos={self.cantidad})"
+
+
+class ProductoInstantanea(Producto):
+    """
+    Producto cargado de una instantánea.
+    
+    El nombre queda en el archivo mapeado hasta el primer acceso: el slot
+    _nombre empieza vacío, y leer un slot vacío cae en __getattr__, que lo
+    decodifica y lo guarda. Desde ahí se comporta como cualquier Producto.
+    """
+    
+    __slots__ = ('_instantanea', '_fila')
+    
+    def __init__(self, id_producto, cantidad, precio, categoria, instantanea, fila):
+        """
+        Constructor sin nombre decodificado.
+        
+        Args:
+            id_producto: ID único
+            cantidad: Cantidad en stock
+            precio: Precio unitario
+            categoria: Categoría
+            instantanea: Instantanea de donde leer el nombre
+            fila: Fila del producto en la instantánea
+        """
+        self.id_producto = id_producto
+        self._cantidad = cantidad
+        self._precio = precio
+        self._categoria = categoria
+        self._json = None
+        self._instantanea = instantanea
+        self._fila = fila
+    
+    def __getattr__(self, atributo):
+        """Decodifica el nombre la primera vez que se lee _nombre"""
+        if atributo != "_nombre":
+            raise AttributeError(atributo)
+        instantanea = self._instantanea
+        if instantanea is None:
+            # Otro hilo lo decodificó mientras tanto: guarda _nombre antes
+            # de soltar la instantánea, así el slot ya está lleno
+            return self._nombre
+        nombre = instantanea.nombre(self._fila)
+        self._nombre = nombre
+        self._instantanea = None
+        return nombre
+
+
+class InstantaneasPeriodicas:
+    """
+    Hilo que guarda una instantánea del gestor cada 'intervalo' segundos,
+    así el diario a reproducir al arrancar nunca crece más que lo
+    registrado en un intervalo.
+    """
+    
+    def __init__(self, gestor, intervalo, ruta=None):
+        """
+        Configura las instantáneas (no arranca el hilo hasta iniciar()).
+        
+        Args:
+            gestor: GestorInventario a guardar
+            intervalo: Segundos entre instantáneas
+            ruta: Archivo destino (por defecto el ruta_instantanea del gestor)
+            
+        Raises:
+            ValueError: Si el intervalo no es positivo
+        """
+        if intervalo <= 0:
+            raise ValueError("El intervalo de instantáneas debe ser positivo")
+        self.gestor = gestor
+        self.intervalo = intervalo
+        self.ruta = ruta
+        self.ultima = None  # Resultado de la última instantánea o {"error": ...}
+        self._detener = threading.Event()
+        self._hilo = None
+    
+    def iniciar(self):
+        """Arranca el hilo (no hace nada si ya está corriendo)"""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="instantaneas", daemon=True)
+        self._hilo.start()
+    
+    def detener(self):
+        """Detiene el hilo, esperando a que termine la instantánea en curso"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+    
+    def _ciclo(self):
+        """Guarda una instantánea por intervalo hasta que se pida detener"""
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.ultima = self.gestor.guardar_instantanea(self.ruta)
+            except (OSError, ValueError) as e:
+                # Un disco lleno no debe matar el hilo: se reintenta en el próximo intervalo
+                self.ultima = {"error": str(e)}
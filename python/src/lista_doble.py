@@ -0,0 +1,282 @@
+"""
+Módulo: Lista Doblemente Enlazada
+Descripción: Lista enlazada con referencias al nodo anterior y manejadores
+de nodo para eliminar e insertar en O(1)
+"""
+
+from nodo import NodoDoble
+from lista_enlazada import ListaEnlazada
+
+
+class ListaDoblementeEnlazada(ListaEnlazada):
+    """
+    Implementa una Lista Doblemente Enlazada.
+    
+    Cada nodo guarda una referencia al siguiente y al anterior. Las
+    inserciones retornan el nodo creado, que sirve como manejador
+    estable: mientras el elemento esté en la lista, el nodo permite
+    eliminarlo o insertar junto a él sin recorrer la lista.
+    
+    Complejidad de operaciones:
+        - Insertar inicio/final: O(1)
+        - Insertar después de un nodo: O(1)
+        - Eliminar un nodo: O(1)
+        - Eliminar por valor o posición: O(n)
+        - Recorrer en reversa: O(n), O(1) de memoria adicional
+        - Recorrer desde un nodo: O(k), O(1) de memoria adicional
+    """
+    
+    def insertar_inicio(self, dato):
+        """
+        Inserta un elemento al inicio de la lista.
+        
+        Complejidad: O(1)
+        
+        Args:
+            dato: El valor a insertar
+            
+        Returns:
+            El nodo creado
+        """
+        nuevo_nodo = NodoDoble(dato)
+        
+        if self.cabeza is None:
+            self.cabeza = self.cola = nuevo_nodo
+        else:
+            nuevo_nodo.siguiente = self.cabeza
+            self.cabeza.anterior = nuevo_nodo
+            self.cabeza = nuevo_nodo
+        
+        self.cantidad += 1
+        return nuevo_nodo
+    
+    def insertar_final(self, dato):
+        """
+        Inserta un elemento al final de la lista.
+        
+        Complejidad: O(1)
+        
+        Args:
+            dato: El valor a insertar
+            
+        Returns:
+            El nodo creado
+        """
+        nuevo_nodo = NodoDoble(dato)
+        
+        if self.cabeza is None:
+            self.cabeza = self.cola = nuevo_nodo
+        else:
+            nuevo_nodo.anterior = self.cola
+            self.cola.siguiente = nuevo_nodo
+            self.cola = nuevo_nodo
+        
+        self.cantidad += 1
+        return nuevo_nodo
+    
+    def insertar_despues(self, nodo, dato):
+        """
+        Inserta un elemento inmediatamente después de un nodo.
+        
+        Complejidad: O(1)
+        
+        Args:
+            nodo: Nodo de esta lista tras el cual insertar
+            dato: El valor a insertar
+            
+        Returns:
+            El nodo creado
+        """
+        self._validar_nodo(nodo)
+        
+        if nodo is self.cola:
+            return self.insertar_final(dato)
+        
+        nuevo_nodo = NodoDoble(dato)
+        nuevo_nodo.anterior = nodo
+        nuevo_nodo.siguiente = nodo.siguiente
+        nodo.siguiente.anterior = nuevo_nodo
+        nodo.siguiente = nuevo_nodo
+        
+        self.cantidad += 1
+        return nuevo_nodo
+    
+    def insertar_posicion(self, dato, posicion):
+        """
+        Inserta un elemento en una posición específica.
+        
+        Complejidad: O(min(i, n - i))
+        
+        Args:
+            dato: El valor a insertar
+            posicion: La posición donde insertar (0-basada)
+            
+        Returns:
+            El nodo creado
+            
+        Raises:
+            ValueError: Si la posición es inválida
+        """
+        if posicion < 0 or posicion > self.cantidad:
+            raise ValueError(f"Posición inválida: {posicion}")
+        
+        if posicion == 0:
+            return self.insertar_inicio(dato)
+        
+        return self.insertar_despues(self._obtener_nodo(posicion - 1), dato)
+    
+    def _obtener_nodo(self, posicion):
+        """
+        Obtiene el nodo en una posición recorriendo desde el extremo más cercano.
+        
+        Complejidad: O(min(i, n - i))
+        
+        Args:
+            posicion: La posición del nodo
+            
+        Returns:
+            El nodo en esa posición
+        """
+        if posicion <= self.cantidad // 2:
+            return super()._obtener_nodo(posicion)
+        
+        actual = self.cola
+        for _ in range(self.cantidad - 1 - posicion):
+            actual = actual.anterior
+        return actual
+    
+    def _validar_nodo(self, nodo):
+        """
+        Descarta nodos que ya fueron eliminados de la lista.
+        
+        Un nodo enlazado sin anterior solo puede ser la cabeza.
+        
+        Raises:
+            ValueError: Si el nodo no está enlazado en esta lista
+        """
+        if nodo.anterior is None and nodo is not self.cabeza:
+            raise ValueError("El nodo no pertenece a la lista")
+    
+    def eliminar_nodo(self, nodo):
+        """
+        Elimina un nodo usando su manejador.
+        
+        Complejidad: O(1)
+        
+        Args:
+            nodo: Nodo retornado por una inserción en esta lista
+            
+        Returns:
+            El dato del nodo eliminado
+            
+        Raises:
+            ValueError: Si el nodo no está enlazado en esta lista
+        """
+        self._validar_nodo(nodo)
+        
+        if nodo.anterior is None:
+            self.cabeza = nodo.siguiente
+        else:
+            nodo.anterior.siguiente = nodo.siguiente
+        
+        if nodo.siguiente is None:
+            self.cola = nodo.anterior
+        else:
+            nodo.siguiente.anterior = nodo.anterior
+        
+        # Se conserva 'siguiente' para que un recorrido en curso que esté
+        # detenido en este nodo pueda continuar con el resto de la lista
+        nodo.anterior = None
+        self.cantidad -= 1
+        return nodo.dato
+    
+    def buscar_nodo(self, dato):
+        """
+        Busca el nodo que contiene un elemento.
+        
+        Complejidad: O(n)
+        
+        Args:
+            dato: El valor a buscar
+            
+        Returns:
+            El nodo si existe, None en caso contrario
+        """
+        actual = self.cabeza
+        while actual:
+            if actual.dato == dato:
+                return actual
+            actual = actual.siguiente
+        return None
+    
+    def eliminar(self, dato):
+        """
+        Elimina la primera ocurrencia de un elemento.
+        
+        Complejidad: O(n)
+        
+        Args:
+            dato: El valor a eliminar
+            
+        Returns:
+            True si se eliminó, False si no existe
+        """
+        nodo = self.buscar_nodo(dato)
+        
+        if nodo is None:
+            return False
+        
+        self.eliminar_nodo(nodo)
+        return True
+    
+    def eliminar_posicion(self, posicion):
+        """
+        Elimina el elemento en una posición específica.
+        
+        Complejidad: O(min(i, n - i))
+        
+        Args:
+            posicion: La posición a eliminar
+            
+        Returns:
+            El dato eliminado
+            
+        Raises:
+            IndexError: Si la posición es inválida
+        """
+        if posicion < 0 or posicion >= self.cantidad:
+            raise IndexError("Posición fuera de rango")
+        
+        return self.eliminar_nodo(self._obtener_nodo(posicion))
+    
+    def iterar_desde(self, nodo):
+        """
+        Recorre los datos desde un nodo (incluido) hasta el final.
+        
+        Un nodo eliminado durante el recorrido conserva su referencia al
+        siguiente, así que el recorrido continúa por la lista vigente.
+        
+        Complejidad: O(k) - k nodos recorridos, O(1) de memoria adicional
+        
+        Args:
+            nodo: Nodo inicial, o None para un recorrido vacío
+        """
+        actual = nodo
+        while actual:
+            yield actual.dato
+            actual = actual.siguiente
+    
+    def __reversed__(self):
+        """
+        Recorre los datos desde el final siguiendo las referencias anteriores.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional
+        """
+        actual = self.cola
+        while actual:
+            yield actual.dato
+            actual = actual.anterior
+    
+    def __repr__(self):
+        """Representación en string de la lista"""
+        return f"ListaDoblementeEnlazada({list(self)})"
@@ -250,12 +250,38 @@ class ListaEnlazada:
         Returns:
             Lista de Python con todos los datos
         """
-        resultado = []
-        actual = self.cabeza
-        while actual:
-            resultado.append(actual.dato)
-            actual = actual.siguiente
-        return resultado
+        return list(self)
+    
+    def filtrar(self, predicado):
+        """
+        Recorre de forma perezosa los elementos que cumplen un predicado.
+        
+        No crea copias: cada elemento se produce al avanzar el generador,
+        por lo que se puede detener el recorrido en cualquier momento.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional
+        
+        Args:
+            predicado: Función que recibe un dato y retorna True/False
+            
+        Returns:
+            Generador con los datos que cumplen el predicado
+        """
+        return (dato for dato in self if predicado(dato))
+    
+    def mapear(self, funcion):
+        """
+        Recorre de forma perezosa los elementos transformados.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional
+        
+        Args:
+            funcion: Función que se aplica a cada dato
+            
+        Returns:
+            Generador con los resultados de la función
+        """
+        return (funcion(dato) for dato in self)
     
     def esta_vacia(self):
         """
@@ -289,9 +315,41 @@ class ListaEnlazada:
         self.cola = None
         self.cantidad = 0
     
+    def __iter__(self):
+        """
+        Recorre los datos desde la cabeza sin copiar la lista.
+        
+        Complejidad: O(n) en total, O(1) de memoria adicional
+        """
+        actual = self.cabeza
+        while actual:
+            yield actual.dato
+            actual = actual.siguiente
+    
+    def __reversed__(self):
+        """
+        Recorre los datos desde el final.
+        
+        En una lista simple no hay referencia al nodo anterior, así que
+        se guardan las referencias a los nodos antes de recorrerlos.
+        
+        Complejidad: O(n) tiempo y memoria
+        """
+        nodos = []
+        actual = self.cabeza
+        while actual:
+            nodos.append(actual)
+            actual = actual.siguiente
+        for nodo in reversed(nodos):
+            yield nodo.dato
+    
+    def __contains__(self, dato):
+        """Permite usar el operador 'in'"""
+        return self.buscar(dato)
+    
     def __repr__(self):
         """Representación en string de la lista"""
-        return f"ListaEnlazada({self.recorrer()})"
+        return f"ListaEnlazada({list(self)})"
     
     def __len__(self):
         """Retorna la cantidad de elementos"""
@@ -299,5 +357,5 @@ class ListaEnlazada:
     
     def __str__(self):
         """Retorna string amigable de la lista"""
-        elementos = " -> ".join(str(d) for d in self.recorrer())
+        elementos = " -> ".join(str(d) for d in self)
         return f"[{elementos}]" if elementos else "[]"
@@ -0,0 +1,270 @@
+"""
+Módulo: Lista de Salto (Skip List)
+Descripción: Índice ordenado probabilístico para consultas de rango y top-N
+"""
+
+import random
+
+
+class _NodoSalto:
+    """Nodo de la lista de salto con un enlace por nivel"""
+    
+    __slots__ = ('valor', 'desempate', 'dato', 'siguientes', 'anterior')
+    
+    def __init__(self, valor, desempate, dato, niveles):
+        self.valor = valor
+        self.desempate = desempate
+        self.dato = dato
+        self.siguientes = [None] * niveles
+        self.anterior = None  # Solo en el nivel 0, para recorrer en reversa
+
+
+class ListaSalto:
+    """
+    Implementa una Lista de Salto (Skip List) ordenada por valor.
+    
+    Es una lista enlazada ordenada con niveles adicionales de "atajos"
+    elegidos al azar, lo que da búsquedas de tipo binario sin necesidad
+    de rebalancear. Los elementos con el mismo valor se ordenan por un
+    desempate, que junto al valor identifica cada entrada.
+    
+    Complejidad de operaciones (esperada):
+        - Insertar: O(log n)
+        - Eliminar: O(log n)
+        - Primeros/últimos k: O(k)
+        - Rango con k resultados: O(log n + k)
+    """
+    
+    NIVEL_MAXIMO = 32
+    PROBABILIDAD = 0.5
+    
+    def __init__(self):
+        """Inicializa una lista de salto vacía"""
+        self._cabeza = _NodoSalto(None, None, None, self.NIVEL_MAXIMO)
+        self._cola = None
+        self._nivel = 1
+        self.cantidad = 0
+    
+    def _nivel_aleatorio(self):
+        """Elige la altura de un nodo nuevo (distribución geométrica)"""
+        nivel = 1
+        while nivel < self.NIVEL_MAXIMO and random.random() < self.PROBABILIDAD:
+            nivel += 1
+        return nivel
+    
+    def _predecesores(self, valor, desempate):
+        """
+        Obtiene, por nivel, el último nodo con clave menor a (valor, desempate).
+        
+        Complejidad: O(log n)
+        """
+        actualizar = [self._cabeza] * self.NIVEL_MAXIMO
+        actual = self._cabeza
+        clave = (valor, desempate)
+        for nivel in range(self._nivel - 1, -1, -1):
+            siguiente = actual.siguientes[nivel]
+            while siguiente is not None and (siguiente.valor, siguiente.desempate) < clave:
+                actual = siguiente
+                siguiente = actual.siguientes[nivel]
+            actualizar[nivel] = actual
+        return actualizar
+    
+    def insertar(self, valor, desempate, dato):
+        """
+        Inserta una entrada en su posición ordenada.
+        
+        Complejidad: O(log n) esperada
+        
+        Args:
+            valor: Valor por el que se ordena
+            desempate: Valor único que ordena entradas con el mismo valor
+            dato: Dato asociado
+        """
+        actualizar = self._predecesores(valor, desempate)
+        niveles = self._nivel_aleatorio()
+        if niveles > self._nivel:
+            self._nivel = niveles
+        
+        nuevo = _NodoSalto(valor, desempate, dato, niveles)
+        for nivel in range(niveles):
+            nuevo.siguientes[nivel] = actualizar[nivel].siguientes[nivel]
+            actualizar[nivel].siguientes[nivel] = nuevo
+        
+        anterior = actualizar[0]
+        nuevo.anterior = anterior if anterior is not self._cabeza else None
+        if nuevo.siguientes[0] is None:
+            self._cola = nuevo
+        else:
+            nuevo.siguientes[0].anterior = nuevo
+        
+        self.cantidad += 1
+    
+    def cargar_ordenadas(self, entradas):
+        """
+        Llena una lista vacía con entradas que ya vienen ordenadas.
+        
+        Cada nodo se enlaza al final de su nivel, sin buscar predecesores,
+        así la lista completa se arma en tiempo lineal (por ejemplo al
+        cargar una instantánea que guardó el orden).
+        
+        Complejidad: O(n) esperada
+        
+        Args:
+            entradas: Iterable de tuplas (valor, desempate, dato) en orden
+                ascendente de (valor, desempate)
+                
+        Raises:
+            ValueError: Si la lista no está vacía
+        """
+        if self.cantidad:
+            raise ValueError("cargar_ordenadas requiere una lista vacía")
+        
+        ultimos = [self._cabeza] * self.NIVEL_MAXIMO
+        anterior = None
+        for valor, desempate, dato in entradas:
+            niveles = self._nivel_aleatorio()
+            nuevo = _NodoSalto(valor, desempate, dato, niveles)
+            for nivel in range(niveles):
+                ultimos[nivel].siguientes[nivel] = nuevo
+                ultimos[nivel] = nuevo
+            nuevo.anterior = anterior
+            anterior = nuevo
+            if niveles > self._nivel:
+                self._nivel = niveles
+            self.cantidad += 1
+        self._cola = anterior
+    
+    def eliminar(self, valor, desempate):
+        """
+        Elimina la entrada con ese valor y desempate.
+        
+        Complejidad: O(log n) esperada
+        
+        Args:
+            valor: Valor de la entrada
+            desempate: Desempate de la entrada
+            
+        Returns:
+            True si se eliminó, False si no existe
+        """
+        actualizar = self._predecesores(valor, desempate)
+        objetivo = actualizar[0].siguientes[0]
+        if objetivo is None or objetivo.valor != valor or objetivo.desempate != desempate:
+            return False
+        
+        for nivel in range(len(objetivo.siguientes)):
+            actualizar[nivel].siguientes[nivel] = objetivo.siguientes[nivel]
+        
+        if objetivo.siguientes[0] is None:
+            self._cola = objetivo.anterior
+        else:
+            objetivo.siguientes[0].anterior = objetivo.anterior
+        
+        while self._nivel > 1 and self._cabeza.siguientes[self._nivel - 1] is None:
+            self._nivel -= 1
+        
+        self.cantidad -= 1
+        return True
+    
+    def primeros(self, k=None):
+        """
+        Recorre los datos de menor a mayor valor.
+        
+        Complejidad: O(k)
+        
+        Args:
+            k: Cantidad máxima de datos (None para todos)
+            
+        Returns:
+            Generador con los datos en orden ascendente
+        """
+        actual = self._cabeza.siguientes[0]
+        while actual is not None and (k is None or k > 0):
+            yield actual.dato
+            actual = actual.siguientes[0]
+            if k is not None:
+                k -= 1
+    
+    def ultimos(self, k=None):
+        """
+        Recorre los datos de mayor a menor valor.
+        
+        Complejidad: O(k)
+        
+        Args:
+            k: Cantidad máxima de datos (None para todos)
+            
+        Returns:
+            Generador con los datos en orden descendente
+        """
+        actual = self._cola
+        while actual is not None and (k is None or k > 0):
+            yield actual.dato
+            actual = actual.anterior
+            if k is not None:
+                k -= 1
+    
+    def rango(self, minimo=None, maximo=None, descendente=False):
+        """
+        Recorre los datos con minimo <= valor <= maximo en orden ascendente
+        (o descendente, desde el último valor <= maximo hacia atrás).
+        
+        Complejidad: O(log n + k) - k es la cantidad de resultados
+        
+        Args:
+            minimo: Límite inferior inclusivo (None para sin límite)
+            maximo: Límite superior inclusivo (None para sin límite)
+            descendente: True para empezar por el mayor valor
+            
+        Returns:
+            Generador con los datos del rango
+        """
+        if descendente:
+            yield from self._rango_descendente(minimo, maximo)
+            return
+        
+        actual = self._cabeza
+        if minimo is not None:
+            for nivel in range(self._nivel - 1, -1, -1):
+                siguiente = actual.siguientes[nivel]
+                while siguiente is not None and siguiente.valor < minimo:
+                    actual = siguiente
+                    siguiente = actual.siguientes[nivel]
+        actual = actual.siguientes[0]
+        
+        while actual is not None and (maximo is None or actual.valor <= maximo):
+            yield actual.dato
+            actual = actual.siguientes[0]
+    
+    def _rango_descendente(self, minimo, maximo):
+        """Generador de rango en orden descendente (enlaces 'anterior')"""
+        if maximo is None:
+            actual = self._cola
+        else:
+            actual = self._cabeza
+            for nivel in range(self._nivel - 1, -1, -1):
+                siguiente = actual.siguientes[nivel]
+                while siguiente is not None and siguiente.valor <= maximo:
+                    actual = siguiente
+                    siguiente = actual.siguientes[nivel]
+            if actual is self._cabeza:
+                return
+        
+        while actual is not None and (minimo is None or actual.valor >= minimo):
+            yield actual.dato
+            actual = actual.anterior
+    
+    def limpiar(self):
+        """Vacía la lista de salto"""
+        self._cabeza = _NodoSalto(None, None, None, self.NIVEL_MAXIMO)
+        self._cola = None
+        self._nivel = 1
+        self.cantidad = 0
+    
+    def __iter__(self):
+        """Recorre los datos en orden ascendente"""
+        return self.primeros()
+    
+    def __len__(self):
+        """Retorna la cantidad de entradas"""
+        return self.cantidad
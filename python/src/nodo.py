@@ -11,8 +11,12 @@ class Nodo:
     Atributos:
         dato: El valor almacenado en el nodo
         siguiente: Referencia al siguiente nodo (None si es el último)
+    
+    Usa __slots__ para no reservar un __dict__ por instancia.
     """
     
+    __slots__ = ('dato', 'siguiente')
+    
     def __init__(self, dato):
         """
         Constructor del nodo.
@@ -26,3 +30,30 @@ class Nodo:
     def __repr__(self):
         """Representación en string del nodo"""
         return f"Nodo({self.dato})"
+
+
+class NodoDoble(Nodo):
+    """
+    Representa un nodo en una lista doblemente enlazada.
+    
+    Atributos:
+        dato: El valor almacenado en el nodo
+        siguiente: Referencia al siguiente nodo (None si es el último)
+        anterior: Referencia al nodo anterior (None si es el primero)
+    """
+    
+    __slots__ = ('anterior',)
+    
+    def __init__(self, dato):
+        """
+        Constructor del nodo doble.
+        
+        Args:
+            dato: El valor a almacenar en el nodo
+        """
+        super().__init__(dato)
+        self.anterior = None
+    
+    def __repr__(self):
+        """Representación en string del nodo"""
+        return f"NodoDoble({self.dato})"
@@ -0,0 +1,253 @@
+"""
+Módulo: Procesador de Órdenes
+Descripción: Grupo de hilos trabajadores que consume la cola de órdenes de
+un GestorInventario en segundo plano, por lotes
+"""
+
+import logging
+import threading
+import time
+from contextlib import nullcontext
+
+
+registro = logging.getLogger(__name__)
+
+
+class ProcesadorOrdenes:
+    """
+    Procesa las órdenes pendientes de un gestor sin depender de que un
+    cliente llame a procesar_proximo_orden.
+    
+    Cada trabajador toma hasta tamano_lote órdenes con una sola operación
+    sobre la cola (tomar_ordenes), aplica la función de procesamiento a
+    cada una y las registra juntas con completar_ordenes. Cuando la cola
+    está vacía, los trabajadores esperan a que el gestor avise que se
+    encolaron órdenes nuevas.
+    
+    Orden FIFO:
+        Con fifo=True los lotes se toman y se procesan de a uno (los
+        trabajadores se turnan), así las órdenes se completan en el orden
+        de la cola. Con fifo=False los lotes se procesan en paralelo y
+        pueden completarse en otro orden.
+    
+    Función de procesamiento:
+        procesar(orden) se llama por cada orden. Si lanza una excepción la
+        orden se registra con estado "Error" y el mensaje en "error".
+    
+    Fallas del lote:
+        Si falla el gestor (tomar_ordenes o completar_ordenes, por ejemplo
+        por un error de disco) el trabajador registra el error, devuelve a
+        la cola las órdenes del lote que no se completaron y sigue
+        corriendo tras una espera. Las fallas se cuentan en
+        "lotes_fallidos" y la última queda en "ultimo_error".
+    """
+    
+    HILOS = 2
+    TAMANO_LOTE = 32
+    ESPERA = 0.5  # Segundos máximos de espera sin aviso antes de revisar la cola
+    
+    def __init__(self, gestor, hilos=HILOS, tamano_lote=TAMANO_LOTE, procesar=None,
+                 fifo=True, espera=ESPERA):
+        """
+        Configura el procesador (no arranca hilos hasta iniciar()).
+        
+        Args:
+            gestor: GestorInventario cuya cola se consume
+            hilos: Cantidad de trabajadores
+            tamano_lote: Órdenes máximas por lote
+            procesar: Función opcional aplicada a cada orden
+            fifo: Si las órdenes deben completarse en el orden de la cola
+            espera: Segundos máximos que un trabajador duerme sin aviso
+            
+        Raises:
+            ValueError: Si hilos o tamano_lote no son positivos
+        """
+        if hilos < 1 or tamano_lote < 1:
+            raise ValueError("Hilos y tamaño de lote deben ser positivos")
+        
+        self.gestor = gestor
+        self.hilos = hilos
+        self.tamano_lote = tamano_lote
+        self.procesar = procesar
+        self.fifo = fifo
+        self.espera = espera
+        
+        self._trabajadores = []
+        self._estadisticas = []
+        self._detener = threading.Event()
+        self._hay_trabajo = threading.Event()
+        self._candado_fifo = threading.Lock()
+        self._condicion = threading.Condition()
+        self._en_proceso = 0
+        self._inicio = None
+    
+    def iniciar(self):
+        """
+        Arranca los trabajadores (no hace nada si ya están activos).
+        
+        Complejidad: O(h) - h es la cantidad de hilos
+        """
+        if self.esta_activo():
+            return
+        
+        self._detener.clear()
+        self._inicio = time.perf_counter()
+        self._estadisticas = [
+            {"nombre": f"trabajador-{i}", "procesadas": 0, "errores": 0, "lotes": 0,
+             "lotes_fallidos": 0, "ultimo_error": None}
+            for i in range(self.hilos)
+        ]
+        self._trabajadores = [
+            threading.Thread(target=self._trabajar, args=(estadisticas,),
+                             name=estadisticas["nombre"], daemon=True)
+            for estadisticas in self._estadisticas
+        ]
+        self.gestor.suscribir_ordenes(self.notificar)
+        for trabajador in self._trabajadores:
+            trabajador.start()
+    
+    def detener(self, drenar=False, tiempo_maximo=None):
+        """
+        Detiene los trabajadores.
+        
+        Los lotes ya tomados se terminan de procesar; las órdenes que
+        quedan en la cola siguen pendientes.
+        
+        Args:
+            drenar: Si se procesan primero todas las órdenes pendientes
+            tiempo_maximo: Segundos máximos para drenar y para esperar a
+                cada trabajador (None = sin límite)
+                
+        Returns:
+            True si los trabajadores terminaron
+        """
+        if drenar and self.esta_activo():
+            self.drenar(tiempo_maximo)
+        
+        self._detener.set()
+        self._hay_trabajo.set()
+        self.gestor.cancelar_suscripcion_ordenes(self.notificar)
+        for trabajador in self._trabajadores:
+            trabajador.join(tiempo_maximo)
+        return not self.esta_activo()
+    
+    def drenar(self, tiempo_maximo=None):
+        """
+        Espera a que la cola quede vacía y no haya lotes en proceso.
+        
+        Args:
+            tiempo_maximo: Segundos máximos de espera (None = sin límite)
+            
+        Returns:
+            True si se drenó, False si se agotó el tiempo
+            
+        Raises:
+            RuntimeError: Si el procesador no está activo
+        """
+        if not self.esta_activo():
+            raise RuntimeError("El procesador no está activo")
+        
+        limite = None if tiempo_maximo is None else time.monotonic() + tiempo_maximo
+        self.notificar()
+        with self._condicion:
+            while self._en_proceso or self.gestor.obtener_cantidad_ordenes_pendientes():
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                # Espera acotada: las órdenes nuevas no avisan a esta condición
+                self._condicion.wait(self.espera if restante is None else min(restante, self.espera))
+        return True
+    
+    def notificar(self):
+        """Despierta a los trabajadores (el gestor lo llama al encolar)"""
+        self._hay_trabajo.set()
+    
+    def esta_activo(self):
+        """True si algún trabajador sigue corriendo"""
+        return any(trabajador.is_alive() for trabajador in self._trabajadores)
+    
+    def obtener_estadisticas(self):
+        """
+        Obtiene el rendimiento del procesador y de cada trabajador.
+        
+        Returns:
+            Diccionario con el estado, los totales y una entrada por trabajador
+        """
+        transcurrido = time.perf_counter() - self._inicio if self._inicio else 0
+        trabajadores = []
+        for estadisticas in self._estadisticas:
+            datos = dict(estadisticas)
+            datos["ordenes_por_segundo"] = (
+                round(datos["procesadas"] / transcurrido, 2) if transcurrido else 0
+            )
+            trabajadores.append(datos)
+        
+        procesadas = sum(t["procesadas"] for t in trabajadores)
+        return {
+            "activo": self.esta_activo(),
+            "hilos": self.hilos,
+            "tamano_lote": self.tamano_lote,
+            "fifo": self.fifo,
+            "pendientes": self.gestor.obtener_cantidad_ordenes_pendientes(),
+            "en_proceso": self._en_proceso,
+            "procesadas": procesadas,
+            "errores": sum(t["errores"] for t in trabajadores),
+            "lotes_fallidos": sum(t["lotes_fallidos"] for t in trabajadores),
+            "ordenes_por_segundo": round(procesadas / transcurrido, 2) if transcurrido else 0,
+            "trabajadores": trabajadores
+        }
+    
+    def _trabajar(self, estadisticas):
+        """Bucle de un trabajador: tomar un lote, procesarlo, repetir"""
+        while not self._detener.is_set():
+            lote, fallo = [], False
+            with self._candado_fifo if self.fifo else nullcontext():
+                with self._condicion:
+                    self._en_proceso += 1
+                try:
+                    lote = self.gestor.tomar_ordenes(self.tamano_lote)
+                    if lote:
+                        self._procesar_lote(lote, estadisticas)
+                except Exception as e:  # La falla de un lote no detiene al trabajador
+                    fallo = True
+                    self._registrar_falla(lote, estadisticas, e)
+                finally:
+                    with self._condicion:
+                        self._en_proceso -= 1
+                        self._condicion.notify_all()
+            
+            if fallo:
+                # Espera antes de reintentar: el error (disco lleno, base
+                # bloqueada) suele durar más que un lote
+                self._detener.wait(self.espera)
+            elif not lote:
+                self._hay_trabajo.wait(self.espera)
+                self._hay_trabajo.clear()
+    
+    def _registrar_falla(self, lote, estadisticas, error):
+        """Registra la falla de un lote y devuelve a la cola lo no completado"""
+        registro.exception("Falló un lote de %d órdenes en %s", len(lote), estadisticas["nombre"])
+        estadisticas["lotes_fallidos"] += 1
+        estadisticas["ultimo_error"] = f"{type(error).__name__}: {error}"
+        if not lote:
+            return
+        try:
+            self.gestor.devolver_ordenes(lote)
+        except Exception:
+            # Siguen "En proceso": vuelven a la cola al reabrir el gestor
+            registro.exception("No se pudieron devolver las órdenes del lote")
+    
+    def _procesar_lote(self, lote, estadisticas):
+        """Aplica la función de procesamiento y registra el lote completo"""
+        if self.procesar is not None:
+            for orden in lote:
+                try:
+                    self.procesar(orden)
+                except Exception as e:  # La falla de una orden no detiene el lote
+                    orden["estado"] = "Error"
+                    orden["error"] = str(e)
+                    estadisticas["errores"] += 1
+        
+        self.gestor.completar_ordenes(lote)
+        estadisticas["procesadas"] += len(lote)
+        estadisticas["lotes"] += 1
@@ -3,6 +3,8 @@ Módulo: Producto
 Descripción: Clase que representa un Producto en el inventario
 """
 
+import json
+
 
 class Producto:
     """
@@ -14,8 +16,15 @@ class Producto:
         cantidad: Cantidad en stock
         precio: Precio unitario
         categoria: Categoría del producto
+    
+    Usa __slots__ para no reservar un __dict__ por instancia.
+    
+    Guarda su representación JSON ya codificada; asignar nombre,
+    cantidad, precio o categoría la invalida.
     """
     
+    __slots__ = ('id_producto', '_nombre', '_cantidad', '_precio', '_categoria', '_json')
+    
     def __init__(self, id_producto, nombre, cantidad, precio, categoria="General"):
         """
         Constructor del producto.
@@ -28,14 +37,100 @@ class Producto:
             categoria: Categoría (por defecto 'General')
         """
         self.id_producto = id_producto
-        self.nombre = nombre
-        self.cantidad = cantidad
-        self.precio = precio
-        self.categoria = categoria
+        self._nombre = nombre
+        self._cantidad = cantidad
+        self._precio = precio
+        self._categoria = categoria
+        self._json = None
+    
+    @property
+    def nombre(self):
+        return self._nombre
+    
+    @nombre.setter
+    def nombre(self, valor):
+        self._nombre = valor
+        self._json = None
+    
+    @property
+    def cantidad(self):
+        return self._cantidad
+    
+    @cantidad.setter
+    def cantidad(self, valor):
+        self._cantidad = valor
+        self._json = None
+    
+    @property
+    def precio(self):
+        return self._precio
+    
+    @precio.setter
+    def precio(self, valor):
+        self._precio = valor
+        self._json = None
+    
+    @property
+    def categoria(self):
+        return self._categoria
+    
+    @categoria.setter
+    def categoria(self, valor):
+        self._categoria = valor
+        self._json = None
     
     def obtener_total(self):
         """Calcula el valor total del producto"""
-        return self.cantidad * self.precio
+        return self._cantidad * self._precio
+    
+    def convertir_a_dict(self, incluir_total=True):
+        """
+        Convierte el producto al diccionario de la API.
+        
+        Args:
+            incluir_total: Si se agrega el valor total (cantidad * precio)
+            
+        Returns:
+            Diccionario con id, nombre, cantidad, precio, categoria y total
+        """
+        datos = {
+            "id": self.id_producto,
+            "nombre": self._nombre,
+            "cantidad": self._cantidad,
+            "precio": self._precio,
+            "categoria": self._categoria
+        }
+        if incluir_total:
+            datos["total"] = self._cantidad * self._precio
+        return datos
+    
+    def convertir_a_json(self):
+        """
+        Obtiene el producto (con total) codificado como JSON compacto y
+        con claves ordenadas, el mismo formato de las respuestas de la API.
+        
+        Complejidad: O(1) mientras el producto no cambie
+        
+        Returns:
+            String JSON cacheado hasta la próxima modificación
+        """
+        fragmento = self._json
+        if fragmento is None:
+            valores = (self._nombre, self._cantidad, self._precio, self._categoria)
+            nombre, cantidad, precio, categoria = valores
+            fragmento = json.dumps({
+                "id": self.id_producto,
+                "nombre": nombre,
+                "cantidad": cantidad,
+                "precio": precio,
+                "categoria": categoria,
+                "total": cantidad * precio
+            }, sort_keys=True, separators=(",", ":"))
+            self._json = fragmento
+            if (self._nombre, self._cantidad, self._precio, self._categoria) != valores:
+                # Otro hilo lo modificó mientras se codificaba: no cachear
+                self._json = None
+        return fragmento
     
     def __eq__(self, otro):
         """Compara productos por ID"""
@@ -0,0 +1,552 @@
+"""
+Módulo: Pruebas de la API
+Descripción: Verifica que la API Flask (app.py) y la API ASGI (app_asgi.py)
+responden con los mismos contratos JSON
+"""
+
+import sys
+import os
+import json
+import asyncio
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+# Agregar la raíz del proyecto al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app
+import app_asgi
+import servicio_inventario
+from gestor_inventario import GestorInventario
+
+
+def llamar_asgi(metodo, url, cuerpo=None, cabeceras=()):
+    """Ejecuta una petición JSON contra la aplicación ASGI y retorna (estado, cabeceras, cuerpo)"""
+    datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+    return llamar_asgi_crudo(metodo, url, datos, cabeceras=cabeceras)
+
+
+def llamar_asgi_crudo(metodo, url, datos=b"", tipo_contenido=None, cabeceras=(), tamano_mensaje=None):
+    """
+    Ejecuta una petición con cuerpo en bytes contra la aplicación ASGI.
+    
+    Con tamano_mensaje el cuerpo llega en varios mensajes de ese tamaño,
+    como lo entrega un servidor con un cuerpo grande.
+    """
+    partes = urlsplit(url)
+    if tipo_contenido is not None:
+        cabeceras = [*cabeceras, ("Content-Type", tipo_contenido)]
+    scope = {
+        "type": "http",
+        "method": metodo,
+        "path": partes.path,
+        "query_string": partes.query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in cabeceras],
+    }
+    mensajes = []
+    tamano = tamano_mensaje or max(len(datos), 1)
+    trozos = [datos[i:i + tamano] for i in range(0, len(datos), tamano)] or [b""]
+    
+    async def receive():
+        trozo = trozos.pop(0)
+        return {"type": "http.request", "body": trozo, "more_body": bool(trozos)}
+    
+    async def send(mensaje):
+        mensajes.append(mensaje)
+    
+    asyncio.run(app_asgi.app(scope, receive, send))
+    inicio = mensajes[0]
+    respuesta = {k.decode(): v.decode() for k, v in inicio["headers"]}
+    cuerpo_respuesta = b"".join(m.get("body", b"") for m in mensajes[1:])
+    return inicio["status"], respuesta, cuerpo_respuesta
+
+
+def sin_horas(datos):
+    """Quita la hora de procesamiento de las órdenes (difiere entre las dos APIs)"""
+    if isinstance(datos, list):
+        return [sin_horas(elemento) for elemento in datos]
+    if isinstance(datos, dict):
+        return {k: sin_horas(v) for k, v in datos.items() if k != "procesada_en"}
+    return datos
+
+
+def test_contratos_flask_asgi():
+    """Las dos APIs deben responder igual ante la misma secuencia de peticiones"""
+    print("=" * 50)
+    print("PRUEBAS: CONTRATOS FLASK vs ASGI")
+    print("=" * 50)
+    
+    # Cada API trabaja sobre su propio gestor con los mismos datos
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = servicio_inventario.crear_gestor()
+    app_asgi.gestor = servicio_inventario.crear_gestor()
+    servicio_inventario.cargar_datos_ejemplo(app.gestor)
+    servicio_inventario.cargar_datos_ejemplo(app_asgi.gestor)
+    cliente = app.app.test_client()
+    
+    peticiones = [
+        ("GET", "/api/saludo", None),
+        ("GET", "/api/productos", None),
+        ("GET", "/api/productos?orden=precio&direccion=desc&limite=3", None),
+        ("GET", "/api/productos?precio_min=abc", None),
+        ("GET", "/api/productos?precio_min=20&direccion=desc&limite=2", None),
+        ("GET", "/api/productos?cantidad_max=50&orden=precio", None),
+        ("GET", "/api/productos?cursor=&limite=3", None),
+        ("GET", "/api/productos?cursor=PROD-6&limite=3", None),
+        ("GET", "/api/productos?cursor=PROD-1&orden=precio", None),
+        ("GET", "/api/productos/PROD-1", None),
+        ("GET", "/api/productos/PROD-999", None),
+        ("GET", "/api/productos/buscar/arroz", None),
+        ("GET", "/api/categorias/Ropa", None),
+        ("POST", "/api/productos", {"cantidad": 1, "precio": 1}),
+        ("POST", "/api/productos", {"nombre": None, "cantidad": 1, "precio": 1}),
+        ("GET", "/api/categorias/General", None),
+        ("POST", "/api/ordenes", {"id_cliente": "C-1", "productos": [["PROD-2", 3]]}),
+        ("POST", "/api/ordenes", {"id_cliente": "C-2", "productos": [["PROD-1", 500]]}),
+        ("GET", "/api/ordenes/pendiente", None),
+        ("POST", "/api/ordenes/procesar", None),
+        ("GET", "/api/ordenes", None),
+        ("GET", "/api/reporte", None),
+        ("GET", "/api/no-existe", None),
+    ]
+    
+    print(f"\n1. Comparar {len(peticiones)} respuestas")
+    for metodo, url, cuerpo in peticiones:
+        respuesta_flask = cliente.open(url, method=metodo, json=cuerpo)
+        estado, _, datos = llamar_asgi(metodo, url, cuerpo)
+        
+        assert estado == respuesta_flask.status_code, f"Estado distinto en {metodo} {url}"
+        assert sin_horas(json.loads(datos)) == sin_horas(respuesta_flask.get_json()), \
+            f"Cuerpo distinto en {metodo} {url}"
+    
+    estado, _, datos = llamar_asgi("POST", "/api/productos", {"cantidad": 1, "precio": 1})
+    assert estado == 400 and json.loads(datos) == {"error": "Nombre requerido"}, "Error: sin nombre debe ser 400"
+    assert app_asgi.gestor.obtener_cantidad_total() == 8, "Error: el producto sin nombre no debe crearse"
+    
+    print("\n2. Crear y eliminar producto por ASGI")
+    estado, _, datos = llamar_asgi("POST", "/api/productos", {"nombre": "Silla", "cantidad": 4, "precio": 80})
+    assert estado == 201 and json.loads(datos)["nombre"] == "Silla", "Error al crear por ASGI"
+    estado, _, _ = llamar_asgi("DELETE", f"/api/productos/{json.loads(datos)['id']}")
+    assert estado == 200, "Error al eliminar por ASGI"
+    estado, _, _ = llamar_asgi("PUT", "/api/productos", {})
+    assert estado == 405, "Error en método no permitido"
+    
+    print("\n3. Las lecturas ASGI no corren en el bucle de eventos")
+    hilos = []
+    for metodo in ("generar_reporte", "buscar_productos_por_nombre", "buscar_producto_por_id"):
+        original = getattr(app_asgi.gestor, metodo)
+        def registrar(*args, original=original):
+            hilos.append(threading.current_thread())
+            return original(*args)
+        setattr(app_asgi.gestor, metodo, registrar)
+    for url in ("/api/reporte", "/api/productos/buscar/Laptop", "/api/productos/PROD-1"):
+        estado, _, _ = llamar_asgi("GET", url)
+        assert estado == 200, f"Error en GET {url}"
+    assert len(hilos) >= 3 and threading.main_thread() not in hilos, \
+        "Error: las lecturas deben correr en un hilo"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ Las APIs Flask y ASGI responden igual\n")
+
+
+def test_endpoints_bulk():
+    """Carga de productos y órdenes por lote con arreglos JSON y NDJSON"""
+    print("=" * 50)
+    print("PRUEBAS: ENDPOINTS BULK")
+    print("=" * 50)
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = servicio_inventario.crear_gestor()
+    app_asgi.gestor = servicio_inventario.crear_gestor()
+    cliente = app.app.test_client()
+    
+    print("\n1. Productos como arreglo JSON (Flask)")
+    respuesta = cliente.post("/api/productos/bulk", json=[
+        {"nombre": "Laptop", "cantidad": 5, "precio": 999.99, "categoria": "Electrónica"},
+        {"nombre": "Mouse", "cantidad": "muchos", "precio": 29.99},
+        {"cantidad": 3, "precio": 1},
+        {"nombre": "Camisa", "cantidad": 25, "precio": 45},
+    ])
+    datos = respuesta.get_json()
+    assert respuesta.status_code == 200, "Error en estado del lote"
+    assert (datos["total"], datos["exitosos"], datos["fallidos"]) == (4, 2, 2), "Error en conteos"
+    assert [r["estado"] for r in datos["resultados"]] == [201, 400, 400, 201], "Error en resultados"
+    assert datos["resultados"][3]["producto"]["id"] == "PROD-2", "Error en producto creado"
+    
+    print("\n2. Productos como NDJSON (ASGI)")
+    ndjson = "\n".join([
+        json.dumps({"nombre": "Laptop", "cantidad": 5, "precio": 999.99, "categoria": "Electrónica"}),
+        "{roto",
+        json.dumps({"nombre": "Camisa", "cantidad": 25, "precio": 45}),
+        "",
+    ]).encode()
+    estado, _, cuerpo = llamar_asgi_crudo("POST", "/api/productos/bulk", ndjson, "application/x-ndjson")
+    datos = json.loads(cuerpo)
+    assert estado == 200 and datos["exitosos"] == 2, "Error en lote NDJSON"
+    assert datos["resultados"][1] == {"indice": 1, "estado": 400, "error": "JSON inválido en la línea 2"}, \
+        "Error en línea inválida"
+    
+    print("\n3. Órdenes por lote")
+    respuesta = cliente.post("/api/ordenes/bulk", json=[
+        {"id_cliente": "C-1", "productos": [["PROD-1", 2]]},
+        {"id_cliente": "C-2", "productos": [["PROD-1", 50]]},
+        {"id_cliente": "C-3", "productos": [["PROD-9", 1]]},
+        {"id_cliente": "C-4", "productos": [["PROD-2", -1]]},
+    ])
+    datos = respuesta.get_json()
+    assert [r["estado"] for r in datos["resultados"]] == [201, 400, 400, 400], "Error en órdenes por lote"
+    assert datos["resultados"][0]["orden"]["total"] == 1999.98, "Error en orden creada"
+    assert app.gestor.obtener_cantidad_ordenes_pendientes() == 1, "Error en órdenes encoladas"
+    
+    print("\n4. Cuerpos inválidos")
+    assert cliente.post("/api/productos/bulk", data=b"").status_code == 400, "Error con cuerpo vacío"
+    assert cliente.post("/api/ordenes/bulk", data=b"[{roto", content_type="application/json").status_code == 400, \
+        "Error con arreglo inválido"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ Los endpoints bulk funcionan\n")
+
+
+def test_paginacion_y_ndjson():
+    """Recorrido completo por cursor y transmisión NDJSON"""
+    print("=" * 50)
+    print("PRUEBAS: PAGINACIÓN Y NDJSON")
+    print("=" * 50)
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = app_asgi.gestor = servicio_inventario.crear_gestor()
+    for i in range(25):
+        app.gestor.agregar_producto(f"Producto {i}", i, 1.0)
+    cliente = app.app.test_client()
+    
+    print("\n1. Recorrer por páginas de 10 eliminando durante el recorrido")
+    vistos = []
+    cursor = ""
+    while cursor is not None:
+        pagina = cliente.get(f"/api/productos?cursor={cursor}&limite=10").get_json()
+        vistos.extend(p["id"] for p in pagina["productos"])
+        cursor = pagina["siguiente_cursor"]
+        if cursor == "PROD-10":
+            app.gestor.eliminar_producto("PROD-10")  # El cursor sigue siendo válido
+            app.gestor.eliminar_producto("PROD-12")
+    assert vistos == [f"PROD-{i}" for i in range(1, 26) if i != 12], "Error en recorrido por cursor"
+    
+    print("\n2. Parámetros inválidos")
+    assert cliente.get("/api/productos?cursor=&limite=0").status_code == 400, "Error con límite 0"
+    assert cliente.get("/api/productos?cursor=abc").status_code == 400, "Error con cursor inválido"
+    
+    print("\n3. NDJSON por Flask y ASGI")
+    respuesta = cliente.get("/api/productos?formato=ndjson&cantidad_min=20")
+    assert respuesta.mimetype == "application/x-ndjson", "Error en tipo de contenido"
+    lineas = respuesta.get_data().splitlines()
+    assert [json.loads(l)["cantidad"] for l in lineas] == [20, 21, 22, 23, 24], "Error en NDJSON Flask"
+    
+    estado, cabeceras, cuerpo = llamar_asgi("GET", "/api/productos", cabeceras=[("Accept", "application/x-ndjson")])
+    assert estado == 200 and cabeceras["content-type"] == "application/x-ndjson", "Error en NDJSON ASGI"
+    assert len(cuerpo.splitlines()) == 23, "Error en cantidad de líneas NDJSON"
+    assert cuerpo.splitlines()[0] == cliente.get("/api/productos?formato=ndjson").get_data().splitlines()[0], \
+        "Líneas NDJSON distintas"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ La paginación y el NDJSON funcionan\n")
+
+
+def test_etag_condicional():
+    """ETags por versión y respuestas 304 en Flask y ASGI"""
+    print("=" * 50)
+    print("PRUEBAS: ETAG Y GET CONDICIONAL")
+    print("=" * 50)
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = app_asgi.gestor = servicio_inventario.crear_gestor()
+    servicio_inventario.cargar_datos_ejemplo(app.gestor)
+    cliente = app.app.test_client()
+    
+    for url in ("/api/productos", "/api/productos/PROD-1", "/api/reporte"):
+        print(f"\n1. {url}")
+        respuesta = cliente.get(url)
+        etag = respuesta.headers["ETag"]
+        estado, cabeceras, _ = llamar_asgi("GET", url)
+        assert estado == 200 and cabeceras["etag"] == etag, "ETag distinto entre Flask y ASGI"
+        
+        respuesta = cliente.get(url, headers={"If-None-Match": etag})
+        assert respuesta.status_code == 304 and respuesta.get_data() == b"", "Error en 304 de Flask"
+        estado, cabeceras, cuerpo = llamar_asgi("GET", url, cabeceras=[("If-None-Match", f'W/{etag}')])
+        assert estado == 304 and cuerpo == b"" and cabeceras["etag"] == etag, "Error en 304 de ASGI"
+    
+    print("\n2. Un cambio invalida los ETags afectados")
+    etag_lista = cliente.get("/api/productos").headers["ETag"]
+    etag_p1 = cliente.get("/api/productos/PROD-1").headers["ETag"]
+    etag_p2 = cliente.get("/api/productos/PROD-2").headers["ETag"]
+    cliente.put("/api/productos/PROD-1/cantidad", json={"cantidad": 7})
+    assert cliente.get("/api/productos", headers={"If-None-Match": etag_lista}).status_code == 200, \
+        "Error: la lista debería cambiar"
+    assert cliente.get("/api/productos/PROD-1", headers={"If-None-Match": etag_p1}).status_code == 200, \
+        "Error: el producto debería cambiar"
+    assert cliente.get("/api/productos/PROD-2", headers={"If-None-Match": etag_p2}).status_code == 304, \
+        "Error: otro producto no debería cambiar"
+    
+    print("\n3. Sin ETag en errores y variantes distintas")
+    assert "ETag" not in cliente.get("/api/productos/PROD-999").headers, "Error: ETag en 404"
+    etag_ndjson = cliente.get("/api/productos", headers={"Accept": "application/x-ndjson"}).headers["ETag"]
+    assert etag_ndjson != cliente.get("/api/productos").headers["ETag"], "Error: variantes con el mismo ETag"
+    
+    print("\n4. Otra instancia con la misma versión no repite el ETag")
+    etag_lista = cliente.get("/api/productos").headers["ETag"]
+    etag_p2 = cliente.get("/api/productos/PROD-2").headers["ETag"]
+    reiniciado = servicio_inventario.crear_gestor()
+    servicio_inventario.cargar_datos_ejemplo(reiniciado)
+    reiniciado.actualizar_cantidad("PROD-1", 7)
+    assert reiniciado.obtener_version() == app.gestor.obtener_version(), "Error en el caso de prueba"
+    app.gestor = app_asgi.gestor = reiniciado
+    assert cliente.get("/api/productos", headers={"If-None-Match": etag_lista}).status_code == 200, \
+        "Error: un ETag de otra instancia no debe dar 304"
+    assert cliente.get("/api/productos/PROD-2", headers={"If-None-Match": etag_p2}).status_code == 200, \
+        "Error: un ETag de producto de otra instancia no debe dar 304"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ Los ETags y el GET condicional funcionan\n")
+
+
+def test_endpoints_procesador():
+    """Control del procesador de órdenes por la API"""
+    print("=" * 50)
+    print("PRUEBAS: ENDPOINTS DEL PROCESADOR")
+    print("=" * 50)
+    
+    gestor_flask, procesador_flask = app.gestor, app.procesador
+    app.gestor = servicio_inventario.crear_gestor()
+    app.procesador = servicio_inventario.crear_procesador(app.gestor)
+    servicio_inventario.cargar_datos_ejemplo(app.gestor)
+    cliente = app.app.test_client()
+    
+    print("\n1. Drenar sin iniciar")
+    assert cliente.post("/api/procesador/drenar").status_code == 409, "Error: debería rechazar"
+    
+    print("\n2. Iniciar, encolar y drenar")
+    assert cliente.post("/api/procesador/iniciar").get_json()["activo"], "Error al iniciar"
+    for _ in range(5):
+        cliente.post("/api/ordenes", json={"id_cliente": "C-1", "productos": [["PROD-2", 1]]})
+    datos = cliente.post("/api/procesador/drenar", json={"tiempo_maximo": 5}).get_json()
+    assert datos["drenado"] and datos["procesadas"] == 5, "Error al drenar"
+    assert len(cliente.get("/api/ordenes").get_json()) == 5, "Error en órdenes procesadas"
+    
+    print("\n3. Detener")
+    assert cliente.post("/api/procesador/detener", json={"tiempo_maximo": "x"}).status_code == 400, \
+        "Error con tiempo inválido"
+    assert not cliente.post("/api/procesador/detener").get_json()["activo"], "Error al detener"
+    
+    app.gestor, app.procesador = gestor_flask, procesador_flask
+    print("\n✅ Los endpoints del procesador funcionan\n")
+
+
+def test_historial_ordenes():
+    """Paginación y filtro por tiempo de GET /api/ordenes en las dos APIs"""
+    print("=" * 50)
+    print("PRUEBAS: HISTORIAL DE ÓRDENES")
+    print("=" * 50)
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = servicio_inventario.crear_gestor()
+    app_asgi.gestor = app.gestor
+    servicio_inventario.cargar_datos_ejemplo(app.gestor)
+    for i in range(7):
+        app.gestor.crear_orden_venta(f"C-{i}", [("PROD-2", 1)])
+        app.gestor.procesar_proximo_orden()
+    cliente = app.app.test_client()
+    
+    print("\n1. Sin parámetros: historial completo")
+    assert len(cliente.get("/api/ordenes").get_json()) == 7, "Error en historial completo"
+    
+    print("\n2. Páginas por cursor")
+    datos = cliente.get("/api/ordenes?limite=3").get_json()
+    assert [o["numero"] for o in datos["ordenes"]] == [0, 1, 2], "Error en primera página"
+    estado, _, cuerpo = llamar_asgi("GET", f"/api/ordenes?limite=3&cursor={datos['siguiente_cursor']}")
+    datos = json.loads(cuerpo)
+    assert estado == 200 and [o["numero"] for o in datos["ordenes"]] == [3, 4, 5], "Error en página ASGI"
+    datos = cliente.get(f"/api/ordenes?limite=3&cursor={datos['siguiente_cursor']}").get_json()
+    assert [o["id_cliente"] for o in datos["ordenes"]] == ["C-6"], "Error en última página"
+    assert datos["siguiente_cursor"] is None, "Error: no debería haber más páginas"
+    
+    print("\n3. Rango de tiempo y parámetros inválidos")
+    hora = app.gestor.ordenes_procesadas.consultar(3, limite=1)[0][0]["procesada_en"]
+    datos = cliente.get(f"/api/ordenes?desde={hora}").get_json()
+    assert datos["ordenes"] and all(o["procesada_en"] >= hora for o in datos["ordenes"]), "Error en desde"
+    assert cliente.get("/api/ordenes?hasta=0").get_json()["ordenes"] == [], "Error en hasta"
+    assert cliente.get("/api/ordenes?cursor=x").status_code == 400, "Error con cursor inválido"
+    assert cliente.get("/api/ordenes?limite=0").status_code == 400, "Error con límite inválido"
+    
+    print("\n4. Historial completo transmitido desde disco y memoria")
+    app.gestor = GestorInventario(capacidad_historial=10)
+    app_asgi.gestor = app.gestor
+    estado, cabeceras, cuerpo = llamar_asgi("GET", "/api/ordenes")
+    assert estado == 200 and json.loads(cuerpo) == [], "Error con historial vacío"
+    app.gestor.agregar_producto("Mouse", 1000, 1)
+    app.gestor.crear_ordenes_lote([(f"C-{i}", [("PROD-1", 1)]) for i in range(600)])
+    while app.gestor.procesar_proximo_orden() is not None:
+        pass
+    estado, cabeceras, cuerpo = llamar_asgi("GET", "/api/ordenes")
+    ordenes = json.loads(cuerpo)
+    assert cabeceras["content-type"] == "application/json", "Error en Content-Type ASGI"
+    assert [o["numero"] for o in ordenes] == list(range(600)), "Error en el historial transmitido"
+    assert cliente.get("/api/ordenes").get_json() == ordenes, "Error: las dos APIs deben coincidir"
+    
+    app.gestor.cerrar()
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ El historial de órdenes funciona en las dos APIs\n")
+
+
+def test_endpoint_instantanea():
+    """POST /api/instantanea en las dos APIs"""
+    print("=" * 50)
+    print("PRUEBAS: ENDPOINT DE INSTANTÁNEAS")
+    print("=" * 50)
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    cliente = app.app.test_client()
+    
+    print("\n1. Sin ruta configurada")
+    app.gestor = app_asgi.gestor = servicio_inventario.crear_gestor()
+    assert cliente.post("/api/instantanea").status_code == 409, "Error: sin ruta debe ser 409"
+    
+    print("\n2. Guardar y volver a cargar")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.snap")
+        app.gestor = app_asgi.gestor = GestorInventario(ruta_instantanea=ruta)
+        servicio_inventario.cargar_datos_ejemplo(app.gestor)
+        datos = cliente.post("/api/instantanea").get_json()
+        assert datos["productos"] == 8 and datos["bytes"] > 0, "Error en la respuesta Flask"
+        app.gestor.restar_stock("PROD-1", 1)
+        estado, _, cuerpo = llamar_asgi("POST", "/api/instantanea")
+        assert estado == 200 and json.loads(cuerpo)["productos"] == 8, "Error en la respuesta ASGI"
+        recuperado = GestorInventario(ruta_instantanea=ruta)
+        assert recuperado.buscar_producto_por_id("PROD-1").cantidad == 4, "Error al cargar la instantánea"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    
+    print("\n3. Sin recargador si hay archivos")
+    anteriores = {v: os.environ.pop(v, None) for v in ("INVENTARIO_DIARIO", "INVENTARIO_INSTANTANEA",
+                                                        "INVENTARIO_HISTORIAL_RUTA", "INVENTARIO_ALMACEN")}
+    try:
+        assert not servicio_inventario.usa_archivos(), "Error: en memoria se puede recargar"
+        os.environ["INVENTARIO_INSTANTANEA"] = "inventario.snap"
+        assert servicio_inventario.usa_archivos(), "Error: con instantánea no debe recargarse"
+    finally:
+        for variable, valor in anteriores.items():
+            os.environ.pop(variable, None)
+            if valor is not None:
+                os.environ[variable] = valor
+    print("\n✅ El endpoint de instantáneas funciona en las dos APIs\n")
+
+
+def test_endpoint_importar():
+    """POST /api/productos/importar con CSV y JSONL en las dos APIs"""
+    print("=" * 50)
+    print("PRUEBAS: ENDPOINT DE IMPORTACIÓN")
+    print("=" * 50)
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = servicio_inventario.crear_gestor()
+    app_asgi.gestor = servicio_inventario.crear_gestor()
+    cliente = app.app.test_client()
+    
+    print("\n1. CSV por Flask (formato por Content-Type)")
+    csv_datos = "nombre,cantidad,precio,categoria\nLaptop,5,999.99,Electrónica\nMouse,-1,10,\nCamisa,25,45,Ropa\n"
+    respuesta = cliente.post("/api/productos/importar", data=csv_datos.encode(), content_type="text/csv")
+    datos = respuesta.get_json()
+    assert respuesta.status_code == 200, "Error en estado de la importación"
+    assert datos["importados"] == 2 and datos["rechazados"] == 1, "Error en el conteo Flask"
+    assert datos["rechazos"] == [{"linea": 3, "error": "Cantidad y precio deben ser positivos"}], \
+        "Error en el detalle de rechazos"
+    assert app.gestor.buscar_productos_por_nombre("cami")[0].precio == 45, "Error en producto importado"
+    
+    print("\n2. JSONL por ASGI en varios mensajes (formato por parámetro)")
+    lineas = [json.dumps({"nombre": f"Producto {i}", "cantidad": i, "precio": 1.5}) for i in range(200)]
+    lineas.insert(50, "{no es json")
+    estado, _, cuerpo = llamar_asgi_crudo("POST", "/api/productos/importar?formato=jsonl",
+                                          "\n".join(lineas).encode(), tamano_mensaje=100)
+    datos = json.loads(cuerpo)
+    assert estado == 200 and datos["importados"] == 200, "Error en la importación ASGI"
+    assert datos["rechazos"] == [{"linea": 51, "error": "JSON inválido"}], "Error en la línea rechazada"
+    assert app_asgi.gestor.obtener_cantidad_total() == 200, "Error en el total ASGI"
+    
+    print("\n3. Formato desconocido y cabecera incompleta")
+    respuesta = cliente.post("/api/productos/importar", data=b"x")
+    estado, _, _ = llamar_asgi_crudo("POST", "/api/productos/importar", b"x")
+    assert respuesta.status_code == estado == 400, "Error: sin formato debe ser 400"
+    respuesta = cliente.post("/api/productos/importar?formato=csv", data=b"nombre,precio\nA,1\n")
+    assert respuesta.status_code == 400 and "cantidad" in respuesta.get_json()["error"], \
+        "Error: falta la columna cantidad"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ El endpoint de importación funciona en las dos APIs\n")
+
+def test_endpoint_exportar():
+    """GET /api/exportar/productos y /api/exportar/ordenes en las dos APIs"""
+    print("=" * 50)
+    print("PRUEBAS: ENDPOINTS DE EXPORTACIÓN")
+    print("=" * 50)
+    
+    import gzip
+    
+    gestor_flask, gestor_asgi = app.gestor, app_asgi.gestor
+    app.gestor = servicio_inventario.crear_gestor()
+    app_asgi.gestor = servicio_inventario.crear_gestor()
+    for gestor in (app.gestor, app_asgi.gestor):
+        servicio_inventario.cargar_datos_ejemplo(gestor)
+        gestor.crear_orden_venta("CLIENTE-1", [("PROD-1", 1), ("PROD-2", 2)])
+        gestor.procesar_proximo_orden()
+    cliente = app.app.test_client()
+    
+    print("\n1. Catálogo CSV por categoría")
+    url = "/api/exportar/productos?formato=csv&categoria=Ropa"
+    respuesta = cliente.get(url)
+    estado, cabeceras, cuerpo = llamar_asgi_crudo("GET", url)
+    assert respuesta.status_code == estado == 200, "Error en estado de la exportación"
+    assert respuesta.data == cuerpo, "Error: las dos APIs deben exportar lo mismo"
+    assert cuerpo.decode().splitlines()[1:] == ["PROD-6,Camisa,25,45.0,Ropa,1125.0",
+                                                "PROD-7,Pantalón,18,65.0,Ropa,1170.0"], \
+        "Error en filas CSV"
+    assert cabeceras["content-type"].startswith("text/csv"), "Error en Content-Type ASGI"
+    assert respuesta.headers["Content-Disposition"] == cabeceras["content-disposition"] == \
+        'attachment; filename="productos.csv"', "Error en Content-Disposition"
+    
+    print("\n2. Órdenes JSONL con gzip")
+    url = "/api/exportar/ordenes?gzip=1"
+    respuesta = cliente.get(url)
+    estado, cabeceras, cuerpo = llamar_asgi_crudo("GET", url)
+    assert cabeceras["content-type"] == respuesta.headers["Content-Type"] == "application/gzip", \
+        "Error en Content-Type gzip"
+    ordenes = [json.loads(l) for l in gzip.decompress(cuerpo).splitlines()]
+    assert [sin_horas(o) for o in ordenes] == \
+        [sin_horas(json.loads(l)) for l in gzip.decompress(respuesta.data).splitlines()], \
+        "Error: las dos APIs deben exportar las mismas órdenes"
+    assert len(ordenes) == 1 and len(ordenes[0]["productos"]) == 2, "Error en orden exportada"
+    
+    print("\n3. Rango vacío y parámetros inválidos")
+    estado, _, cuerpo = llamar_asgi_crudo("GET", f"/api/exportar/ordenes?desde={ordenes[0]['procesada_en'] + 1}")
+    assert estado == 200 and cuerpo == b"", "Error en rango sin órdenes"
+    for url in ("/api/exportar/productos?formato=xml", "/api/exportar/ordenes?hasta=ayer"):
+        respuesta = cliente.get(url)
+        estado, _, _ = llamar_asgi_crudo("GET", url)
+        assert respuesta.status_code == estado == 400, f"Error: {url} debe ser 400"
+    
+    app.gestor, app_asgi.gestor = gestor_flask, gestor_asgi
+    print("\n✅ Los endpoints de exportación funcionan en las dos APIs\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_contratos_flask_asgi()
+        test_endpoints_bulk()
+        test_paginacion_y_ndjson()
+        test_etag_condicional()
+        test_endpoints_procesador()
+        test_historial_ordenes()
+        test_endpoint_instantanea()
+        test_endpoint_importar()
+        test_endpoint_exportar()
+    except AssertionError as e:
+        print(f"\n❌ Error en test: {e}")
+        sys.exit(1)
@@ -0,0 +1,493 @@
+"""
+Módulo: Pruebas de Concurrencia
+Descripción: Pruebas de estrés multihilo sobre GestorInventario y la API
+que verifican las invariantes de stock
+"""
+
+import sys
+import os
+import random
+import tempfile
+import threading
+
+# Agregar src y la raíz del proyecto al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gestor_inventario import GestorInventario
+from procesador_ordenes import ProcesadorOrdenes
+from diario import DiarioEscritura
+from gestor_sqlite import GestorInventarioSQLite
+
+HILOS = 16
+OPERACIONES_POR_HILO = 300
+STOCK_INICIAL = 500
+
+
+def ejecutar_en_hilos(trabajo, hilos=HILOS):
+    """Ejecuta trabajo(indice) en varios hilos que arrancan a la vez"""
+    barrera = threading.Barrier(hilos)
+    errores = []
+    
+    def envolver(indice):
+        barrera.wait()
+        try:
+            trabajo(indice)
+        except Exception as e:  # Se reporta en el hilo principal
+            errores.append(e)
+    
+    # Cambios de hilo muy frecuentes para forzar intercalados
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        lista_hilos = [threading.Thread(target=envolver, args=(i,)) for i in range(hilos)]
+        for hilo in lista_hilos:
+            hilo.start()
+        for hilo in lista_hilos:
+            hilo.join()
+    finally:
+        sys.setswitchinterval(intervalo)
+    
+    assert not errores, f"Errores en hilos: {errores[:3]}"
+
+
+def test_estres_gestor():
+    """Muchos hilos restan y agregan stock y crean órdenes a la vez"""
+    print("=" * 50)
+    print("ESTRÉS: GESTOR DE INVENTARIO")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    ids = [gestor.agregar_producto(f"Producto {i}", STOCK_INICIAL, 1.5).id_producto for i in range(8)]
+    vendidos = [dict.fromkeys(ids, 0) for _ in range(HILOS)]
+    agregados = [dict.fromkeys(ids, 0) for _ in range(HILOS)]
+    
+    def trabajo(indice):
+        azar = random.Random(indice)
+        for _ in range(OPERACIONES_POR_HILO):
+            id_prod = azar.choice(ids)
+            cantidad = azar.randint(1, 5)
+            operacion = azar.random()
+            try:
+                if operacion < 0.4:
+                    gestor.restar_stock(id_prod, cantidad)
+                elif operacion < 0.8:
+                    gestor.crear_orden_venta(f"CLIENTE-{indice}", [(id_prod, cantidad)])
+                else:
+                    gestor.agregar_stock(id_prod, cantidad)
+                    agregados[indice][id_prod] += cantidad
+                    continue
+            except ValueError:
+                continue  # Stock insuficiente: no se vendió nada
+            vendidos[indice][id_prod] += cantidad
+            if azar.random() < 0.3:
+                gestor.procesar_proximo_orden()
+    
+    print(f"\n1. {HILOS} hilos x {OPERACIONES_POR_HILO} operaciones")
+    ejecutar_en_hilos(trabajo)
+    
+    print("\n2. Verificar invariantes de stock")
+    for id_prod in ids:
+        esperado = (STOCK_INICIAL
+                    + sum(a[id_prod] for a in agregados)
+                    - sum(v[id_prod] for v in vendidos))
+        producto = gestor.buscar_producto_por_id(id_prod)
+        assert producto.cantidad == esperado, f"Stock inconsistente en {id_prod}"
+        assert producto.cantidad >= 0, "Stock negativo"
+    
+    productos = gestor.obtener_todos_productos()
+    valor = round(sum(p.obtener_total() for p in productos), 2)
+    assert gestor.generar_reporte()["total_valor_inventario"] == valor, "Agregado de valor inconsistente"
+    assert gestor.obtener_productos_ordenados("cantidad") == sorted(
+        productos, key=lambda p: (p.cantidad, p.id_producto)), "Índice de cantidad inconsistente"
+    
+    print("\n✅ Estrés del gestor superado\n")
+
+
+def test_reserva_atomica():
+    """Órdenes de varias líneas: todo o nada, sin interbloqueos ni bloqueos entre productos distintos"""
+    print("=" * 50)
+    print("ESTRÉS: RESERVA ATÓMICA DE ÓRDENES")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    ids = [gestor.agregar_producto(f"Producto {i}", STOCK_INICIAL, 1.0).id_producto for i in range(8)]
+    vendidos = [dict.fromkeys(ids, 0) for _ in range(HILOS)]
+    
+    def trabajo(indice):
+        azar = random.Random(indice)
+        for _ in range(OPERACIONES_POR_HILO):
+            # Productos en orden al azar: dos órdenes pueden pedirlos en orden inverso
+            lineas = [(id_prod, azar.randint(1, 5)) for id_prod in azar.sample(ids, azar.randint(2, 4))]
+            if azar.random() < 0.2:
+                lineas.append((azar.choice(ids), STOCK_INICIAL + 1))  # La última línea siempre falla
+            try:
+                gestor.crear_orden_venta(f"CLIENTE-{indice}", lineas)
+            except ValueError:
+                continue
+            for id_prod, cantidad in lineas:
+                vendidos[indice][id_prod] += cantidad
+    
+    print(f"\n1. {HILOS} hilos x {OPERACIONES_POR_HILO} órdenes de varias líneas")
+    ejecutar_en_hilos(trabajo)
+    
+    print("\n2. Verificar que ninguna orden fallida descontó stock")
+    for id_prod in ids:
+        esperado = STOCK_INICIAL - sum(v[id_prod] for v in vendidos)
+        assert gestor.buscar_producto_por_id(id_prod).cantidad == esperado, f"Reserva parcial en {id_prod}"
+    
+    print("\n3. Órdenes sobre productos distintos no se bloquean")
+    candados = gestor._candados_producto
+    ocupado = ids[0]
+    libre = next(i for i in ids[1:] if candados._franja(i) != candados._franja(ocupado))
+    gestor.agregar_stock(libre, 1)
+    with candados.para(ocupado):
+        hilo = threading.Thread(target=gestor.crear_orden_venta, args=("CLIENTE-X", [(libre, 1)]))
+        hilo.start()
+        hilo.join(5)
+        assert not hilo.is_alive(), "Error: la orden esperó el candado de otro producto"
+    
+    print("\n✅ Reserva atómica superada\n")
+
+
+def test_diario_concurrente():
+    """Muchos hilos escriben en el diario a la vez: fsync agrupados y reproducción exacta"""
+    print("=" * 50)
+    print("ESTRÉS: DIARIO CON CONFIRMACIÓN AGRUPADA")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.diario")
+        diario = DiarioEscritura(ruta)
+        grupos = []
+        escribir = diario._escribir
+        diario._escribir = lambda lineas: (grupos.append(len(lineas)), escribir(lineas))
+        
+        gestor = GestorInventario(diario=diario)
+        ids = [gestor.agregar_producto(f"Producto {i}", STOCK_INICIAL, 1.5).id_producto for i in range(8)]
+        
+        def trabajo(indice):
+            azar = random.Random(indice)
+            for _ in range(OPERACIONES_POR_HILO // 3):
+                operacion = azar.random()
+                try:
+                    if operacion < 0.3:
+                        gestor.restar_stock(azar.choice(ids), azar.randint(1, 5))
+                    elif operacion < 0.7:
+                        lineas = [(i, azar.randint(1, 3)) for i in azar.sample(ids, 2)]
+                        gestor.crear_orden_venta(f"CLIENTE-{indice}", lineas)
+                    elif operacion < 0.8:
+                        gestor.agregar_stock(azar.choice(ids), azar.randint(1, 5))
+                    elif operacion < 0.9:
+                        gestor.procesar_proximo_orden()
+                    else:
+                        gestor.completar_ordenes(gestor.tomar_ordenes(3))
+                except ValueError:
+                    continue
+        
+        print(f"\n1. {HILOS} hilos escribiendo con fsync")
+        ejecutar_en_hilos(trabajo)
+        registros = diario.obtener_secuencia()
+        print(f"   {registros} registros en {len(grupos)} escrituras")
+        assert len(grupos) < registros, "Error: los fsync deberían agruparse"
+        
+        esperado = (
+            [p.convertir_a_dict() for p in gestor.obtener_todos_productos()],
+            [o["id_orden"] for o in gestor.ordenes_venta],
+            list(gestor.ordenes_procesadas)
+        )
+        gestor.cerrar()
+        
+        print("\n2. Reproducir y comparar")
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta))
+        obtenido = (
+            [p.convertir_a_dict() for p in recuperado.obtener_todos_productos()],
+            [o["id_orden"] for o in recuperado.ordenes_venta],
+            list(recuperado.ordenes_procesadas)
+        )
+        assert obtenido == esperado, "Error: el estado reproducido no coincide"
+        recuperado.cerrar()
+    
+    print("\n✅ Diario concurrente superado\n")
+
+
+def test_gestor_sqlite_concurrente():
+    """Muchos hilos, cada uno con su conexión, venden y reponen sobre la misma base SQLite"""
+    print("=" * 50)
+    print("ESTRÉS: GESTOR SQLITE")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorInventarioSQLite(os.path.join(directorio, "inventario.db"))
+        ids = [p.id_producto for p in gestor.agregar_productos_lote(
+            (f"Producto {i}", STOCK_INICIAL // 10, 1.5) for i in range(8))]
+        vendidos = [dict.fromkeys(ids, 0) for _ in range(HILOS)]
+        agregados = [dict.fromkeys(ids, 0) for _ in range(HILOS)]
+        
+        def trabajo(indice):
+            azar = random.Random(indice)
+            for _ in range(OPERACIONES_POR_HILO // 3):
+                lineas = [(id_prod, azar.randint(1, 5)) for id_prod in azar.sample(ids, 2)]
+                operacion = azar.random()
+                try:
+                    if operacion < 0.4:
+                        gestor.restar_stock(*lineas[0])
+                        lineas = lineas[:1]
+                    elif operacion < 0.8:
+                        gestor.crear_orden_venta(f"CLIENTE-{indice}", lineas)
+                    else:
+                        gestor.agregar_stock(*lineas[0])
+                        agregados[indice][lineas[0][0]] += lineas[0][1]
+                        continue
+                except ValueError:
+                    continue  # Stock insuficiente: no se vendió nada
+                for id_prod, cantidad in lineas:
+                    vendidos[indice][id_prod] += cantidad
+        
+        print(f"\n1. {HILOS} hilos x {OPERACIONES_POR_HILO // 3} operaciones")
+        ejecutar_en_hilos(trabajo)
+        
+        print("\n2. Verificar invariantes de stock y numeración")
+        for id_prod in ids:
+            esperado = (STOCK_INICIAL // 10
+                        + sum(a[id_prod] for a in agregados)
+                        - sum(v[id_prod] for v in vendidos))
+            assert gestor.buscar_producto_por_id(id_prod).cantidad == esperado, f"Stock inconsistente en {id_prod}"
+        numeros = [o["id_orden"] for o in gestor.ordenes_venta]
+        assert len(set(numeros)) == len(numeros), "Números de orden repetidos"
+        gestor.cerrar()
+    
+    print("\n✅ Gestor SQLite concurrente superado\n")
+
+
+def test_gestor_columnar_concurrente():
+    """Un cambio de stock justo mientras el almacén columnar crece no se pierde"""
+    print("=" * 50)
+    print("ESTRÉS: GESTOR COLUMNAR")
+    print("=" * 50)
+    
+    try:
+        from gestor_columnar import GestorInventarioColumnar
+        from almacen_columnar import AlmacenColumnar
+        gestor = GestorInventarioColumnar(capacidad_inicial=2)
+    except ImportError:
+        print("\n⚠️  NumPy no está instalado, se omite la prueba\n")
+        return
+    
+    id_prod = gestor.agregar_producto("Mouse", 0, 1.0).id_producto
+    hilos = []
+    
+    class AlmacenInterrumpido(AlmacenColumnar):
+        """Otro hilo suma stock entre la copia de la columna y su reemplazo"""
+        
+        def __setattr__(self, nombre, valor):
+            if nombre == "cantidades" and len(valor) > len(self.cantidades):
+                hilo = threading.Thread(target=gestor.agregar_stock, args=(id_prod, 1))
+                hilo.start()
+                hilo.join(0.1)  # Con el candado de catálogo espera al reemplazo
+                hilos.append(hilo)
+            super().__setattr__(nombre, valor)
+    
+    gestor.almacen.__class__ = AlmacenInterrumpido
+    
+    print("\n1. Sumar stock en cada crecimiento del almacén")
+    gestor.agregar_productos_lote((f"Producto {i}", 1, 1.0) for i in range(100))
+    for hilo in hilos:
+        hilo.join()
+    
+    print(f"\n2. Verificar stock tras {len(hilos)} crecimientos")
+    assert len(hilos) >= 5, "Error: el almacén debió crecer"
+    assert gestor.buscar_producto_por_id(id_prod).cantidad == len(hilos), "Error: se perdió stock"
+    
+    print("\n✅ Gestor columnar concurrente superado\n")
+
+
+def test_asgi_diario_agrupado():
+    """Peticiones ASGI concurrentes con diario: la espera del fsync no bloquea el bucle"""
+    print("=" * 50)
+    print("ESTRÉS: API ASGI CON DIARIO")
+    print("=" * 50)
+    
+    import asyncio
+    import json
+    import time
+    import app_asgi
+    
+    peticiones = 20
+    intervalo = 0.05
+    
+    async def crear(indice):
+        cuerpo = json.dumps({"nombre": f"Producto {indice}", "cantidad": 1, "precio": 1}).encode()
+        scope = {"type": "http", "method": "POST", "path": "/api/productos",
+                 "query_string": b"", "headers": []}
+        mensajes = []
+        
+        async def receive():
+            return {"type": "http.request", "body": cuerpo, "more_body": False}
+        
+        async def send(mensaje):
+            mensajes.append(mensaje)
+        
+        await app_asgi.app(scope, receive, send)
+        return mensajes[0]["status"]
+    
+    async def todas():
+        return await asyncio.gather(*(crear(i) for i in range(peticiones)))
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        diario = DiarioEscritura(os.path.join(directorio, "inventario.diario"), intervalo_grupo=intervalo)
+        grupos = []
+        escribir = diario._escribir
+        diario._escribir = lambda lineas: (grupos.append(len(lineas)), escribir(lineas))
+        gestor_anterior, app_asgi.gestor = app_asgi.gestor, GestorInventario(diario=diario)
+        
+        print(f"\n1. {peticiones} POST concurrentes con grupos de {intervalo * 1000:.0f} ms")
+        inicio = time.perf_counter()
+        estados = asyncio.run(todas())
+        segundos = time.perf_counter() - inicio
+        print(f"   {segundos:.2f} s en {len(grupos)} escrituras")
+        assert estados == [201] * peticiones, "Error al crear productos"
+        assert len(grupos) < peticiones, "Error: las escrituras deberían agruparse"
+        assert segundos < peticiones * intervalo / 2, "Error: las peticiones se serializaron"
+        
+        app_asgi.gestor.cerrar()
+        app_asgi.gestor = gestor_anterior
+    
+    print("\n✅ API ASGI con diario superada\n")
+
+
+def test_estres_api():
+    """Muchos hilos golpean la API de órdenes sobre el mismo gestor"""
+    print("=" * 50)
+    print("ESTRÉS: API REST")
+    print("=" * 50)
+    
+    import app
+    
+    app.gestor.limpiar()
+    ids = [app.gestor.agregar_producto(f"Producto {i}", STOCK_INICIAL, 2.0).id_producto for i in range(4)]
+    vendidos = [dict.fromkeys(ids, 0) for _ in range(HILOS)]
+    creadas = [0] * HILOS
+    procesadas = [0] * HILOS
+    
+    def trabajo(indice):
+        azar = random.Random(indice)
+        cliente = app.app.test_client()
+        for _ in range(OPERACIONES_POR_HILO // 3):
+            id_prod = azar.choice(ids)
+            cantidad = azar.randint(1, 10)
+            respuesta = cliente.post('/api/ordenes', json={
+                "id_cliente": f"CLIENTE-{indice}",
+                "productos": [[id_prod, cantidad]]
+            })
+            if respuesta.status_code == 201:
+                vendidos[indice][id_prod] += cantidad
+                creadas[indice] += 1
+            else:
+                assert respuesta.status_code == 400, f"Estado inesperado {respuesta.status_code}"
+            if cliente.post('/api/ordenes/procesar').status_code == 200:
+                procesadas[indice] += 1
+    
+    print(f"\n1. {HILOS} clientes creando y procesando órdenes")
+    ejecutar_en_hilos(trabajo)
+    
+    print("\n2. Verificar stock y órdenes")
+    cliente = app.app.test_client()
+    for id_prod in ids:
+        producto = cliente.get(f'/api/productos/{id_prod}').get_json()
+        esperado = STOCK_INICIAL - sum(v[id_prod] for v in vendidos)
+        assert producto["cantidad"] == esperado, f"Stock inconsistente en {id_prod}"
+    
+    reporte = cliente.get('/api/reporte').get_json()
+    assert reporte["ordenes_procesadas"] == sum(procesadas), "Órdenes procesadas perdidas"
+    assert reporte["ordenes_procesadas"] + reporte["ordenes_pendientes"] == sum(creadas), \
+        "Órdenes creadas perdidas"
+    
+    app.gestor.limpiar()
+    print("\n✅ Estrés de la API superado\n")
+
+
+def test_procesador_ordenes():
+    """Trabajadores en segundo plano consumen la cola mientras otros hilos encolan"""
+    print("=" * 50)
+    print("ESTRÉS: PROCESADOR DE ÓRDENES")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    ids = [gestor.agregar_producto(f"Producto {i}", 10 ** 6, 1.0).id_producto for i in range(4)]
+    
+    def procesar(orden):
+        if orden["productos"][0]["cantidad"] == 7:
+            raise RuntimeError("Rechazada por el procesador")
+    
+    print("\n1. Orden FIFO con 3 trabajadores")
+    procesador = ProcesadorOrdenes(gestor, hilos=3, tamano_lote=4, procesar=procesar, fifo=True)
+    procesador.iniciar()
+    clientes = [f"CLIENTE-{i}" for i in range(200)]
+    for i, cliente in enumerate(clientes):
+        gestor.crear_orden_venta(cliente, [(ids[i % 4], 7 if i % 50 == 0 else 1)])
+    assert procesador.drenar(tiempo_maximo=10), "Error: no se drenó la cola"
+    assert [o["id_cliente"] for o in gestor.ordenes_procesadas] == clientes, "Error en orden FIFO"
+    estadisticas = procesador.obtener_estadisticas()
+    assert estadisticas["procesadas"] == 200 and estadisticas["errores"] == 4, "Error en estadísticas"
+    assert sum(1 for o in gestor.ordenes_procesadas if o["estado"] == "Error") == 4, "Error en hook"
+    assert procesador.detener(tiempo_maximo=5), "Error al detener"
+    
+    print("\n2. Sin FIFO, productores concurrentes")
+    gestor.ordenes_procesadas.limpiar()
+    procesador = ProcesadorOrdenes(gestor, hilos=4, tamano_lote=8, fifo=False)
+    procesador.iniciar()
+    creadas = [0] * HILOS
+    
+    def trabajo(indice):
+        for i in range(OPERACIONES_POR_HILO // 3):
+            gestor.crear_orden_venta(f"CLIENTE-{indice}", [(ids[i % 4], 1)])
+            creadas[indice] += 1
+    
+    ejecutar_en_hilos(trabajo)
+    assert procesador.detener(drenar=True, tiempo_maximo=10), "Error al detener drenando"
+    assert gestor.obtener_cantidad_ordenes_pendientes() == 0, "Quedaron órdenes pendientes"
+    assert len(gestor.ordenes_procesadas) == sum(creadas), "Órdenes perdidas o duplicadas"
+    assert procesador.obtener_estadisticas()["procesadas"] == sum(creadas), "Error en estadísticas"
+    assert all(o["estado"] == "Procesada" for o in gestor.ordenes_procesadas), "Error en estados"
+    
+    print("\n3. Un lote que falla vuelve a la cola y el trabajador sigue")
+    gestor.ordenes_procesadas.limpiar()
+    completar, fallas = gestor.completar_ordenes, [2]
+    
+    def completar_con_fallas(lote):
+        if fallas[0]:
+            fallas[0] -= 1
+            raise OSError("Disco lleno")
+        completar(lote)
+    
+    gestor.completar_ordenes = completar_con_fallas
+    procesador = ProcesadorOrdenes(gestor, hilos=2, tamano_lote=4, espera=0.01)
+    procesador.iniciar()
+    for i in range(20):
+        gestor.crear_orden_venta(f"CLIENTE-{i}", [(ids[0], 1)])
+    assert procesador.drenar(tiempo_maximo=10), "Error: la falla de un lote no debe colgar drenar"
+    estadisticas = procesador.obtener_estadisticas()
+    assert estadisticas["activo"] and estadisticas["lotes_fallidos"] == 2, "Error: el trabajador debe seguir"
+    assert sorted(o["id_cliente"] for o in gestor.ordenes_procesadas) == \
+        sorted(f"CLIENTE-{i}" for i in range(20)), "Error: órdenes perdidas o duplicadas tras la falla"
+    assert not gestor._ordenes_en_proceso, "Error: quedaron órdenes en proceso"
+    assert procesador.detener(tiempo_maximo=5), "Error al detener"
+    del gestor.completar_ordenes
+    
+    print("\n✅ Procesador de órdenes superado\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_estres_gestor()
+        test_reserva_atomica()
+        test_diario_concurrente()
+        test_gestor_sqlite_concurrente()
+        test_gestor_columnar_concurrente()
+        test_asgi_diario_agrupado()
+        test_estres_api()
+        test_procesador_ordenes()
+    except AssertionError as e:
+        print(f"\n❌ Error en test: {e}")
+        sys.exit(1)
@@ -5,14 +5,29 @@ Descripción: Pruebas para las estructuras de datos y el gestor de inventario
 
 import sys
 import os
+import json
+import tempfile
+import time
+from types import SimpleNamespace
 
 # Agregar src al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from lista_enlazada import ListaEnlazada
+from lista_doble import ListaDoblementeEnlazada
 from cola import Cola
+from cola_prioridad import ColaPrioridad, ColaCarriles, ColaConPrioridades
+import historial_ordenes
+from historial_ordenes import HistorialOrdenes
+from diario import DiarioEscritura
+from instantanea import Instantanea, ProductoInstantanea, InstantaneasPeriodicas
 from producto import Producto
 from gestor_inventario import GestorInventario
+from gestor_sqlite import GestorInventarioSQLite
+from importador import importar_catalogo, detectar_formato
+import exportador
+from indice_ngramas import IndiceNGramas
+from lista_salto import ListaSalto
 
 
 def test_lista_enlazada():
@@ -53,9 +68,58 @@ def test_lista_enlazada():
     print(f"\n5. Cantidad de elementos: {len(lista)}")
     assert len(lista) == 3, "Error en cantidad"
     
+    # Test 6: Iteración sin copias
+    print("\n6. Iterar, invertir y vistas perezosas")
+    assert list(lista) == [30, 10, 5], "Error en __iter__"
+    assert list(reversed(lista)) == [5, 10, 30], "Error en __reversed__"
+    assert list(lista.filtrar(lambda x: x > 5)) == [30, 10], "Error en filtrar"
+    assert next(lista.mapear(lambda x: x * 2)) == 60, "Error en mapear"
+    assert 10 in lista and 99 not in lista, "Error en __contains__"
+    
     print("\n✅ Todos los tests de ListaEnlazada pasaron\n")
 
 
+def test_lista_doble():
+    """Pruebas para ListaDoblementeEnlazada"""
+    print("=" * 50)
+    print("PRUEBAS: LISTA DOBLEMENTE ENLAZADA")
+    print("=" * 50)
+    
+    lista = ListaDoblementeEnlazada()
+    
+    # Test 1: Las inserciones retornan manejadores
+    print("\n1. Insertar 10, 20, 30 y guardar sus nodos")
+    n10 = lista.insertar_final(10)
+    n20 = lista.insertar_final(20)
+    n30 = lista.insertar_final(30)
+    lista.insertar_despues(n10, 15)
+    print(f"   Lista: {lista}")
+    assert lista.recorrer() == [10, 15, 20, 30], "Error en insertar_despues"
+    
+    # Test 2: Eliminar por manejador
+    print("\n2. Eliminar nodos 20 (medio) y 30 (final)")
+    assert lista.eliminar_nodo(n20) == 20, "Error en eliminar_nodo"
+    lista.eliminar_nodo(n30)
+    assert lista.recorrer() == [10, 15], "Error al eliminar por nodo"
+    assert list(reversed(lista)) == [15, 10], "Error en enlaces anteriores"
+    
+    # Test 3: Un nodo eliminado no puede volver a usarse
+    print("\n3. Reutilizar un nodo eliminado")
+    try:
+        lista.eliminar_nodo(n30)
+        assert False, "Se esperaba ValueError"
+    except ValueError:
+        pass
+    
+    # Test 4: Operaciones heredadas
+    print("\n4. Insertar y eliminar por posición")
+    lista.insertar_posicion(12, 1)
+    assert lista.eliminar_posicion(2) == 15, "Error en eliminar_posicion"
+    assert lista.eliminar(10) and lista.recorrer() == [12], "Error en eliminar"
+    
+    print("\n✅ Todos los tests de ListaDoblementeEnlazada pasaron\n")
+
+
 def test_cola():
     """Pruebas para Cola"""
     print("=" * 50)
@@ -91,6 +155,25 @@ def test_cola():
     print(f"   Orden de salida: {elementos}")
     assert elementos == [200, 300, 400], "Error en FIFO"
     
+    # Test 5: Iteración sin desencolar
+    print("\n5. Iterar la cola sin extraer")
+    cola.encolar(1)
+    cola.encolar(2)
+    assert list(cola) == [1, 2] and list(reversed(cola)) == [2, 1], "Error en iteración"
+    assert list(cola.filtrar(lambda x: x > 1)) == [2], "Error en filtrar"
+    assert cola.obtener_cantidad() == 2, "La iteración no debe extraer elementos"
+    
+    # Test 6: Buffer circular con vuelta y lotes
+    print("\n6. Lotes que dan la vuelta al buffer")
+    cola = Cola(capacidad_inicial=4)
+    cola.encolar_lote([1, 2, 3])
+    assert cola.desencolar_lote(2) == [1, 2], "Error en desencolar_lote"
+    cola.encolar_lote(range(4, 9))
+    assert cola.frente() == 3 and cola.final() == 8, "Error en frente/final"
+    assert cola.convertir_a_lista() == [3, 4, 5, 6, 7, 8], "Error al dar la vuelta"
+    assert cola.desencolar_lote(100) == [3, 4, 5, 6, 7, 8], "Error al vaciar por lote"
+    assert cola.esta_vacia() and cola.desencolar_lote(5) == [], "Error con cola vacía"
+    
     print("\n✅ Todos los tests de Cola pasaron\n")
 
 
@@ -109,6 +192,16 @@ def test_gestor_inventario():
     p3 = gestor.agregar_producto("Arroz", 50, 2.50, "Alimentos")
     print(f"   Productos agregados: {gestor.obtener_cantidad_total()}")
     assert gestor.obtener_cantidad_total() == 3, "Error en cantidad de productos"
+    assert not hasattr(p1, "__dict__"), "Producto debe usar __slots__"
+    assert p1 == Producto(p1.id_producto, "Otro", 0, 0), "Error en __eq__"
+    for nombre in (None, "", 7):
+        try:
+            gestor.agregar_producto(nombre, 1, 1)
+            assert False, f"Error: debió rechazar el nombre {nombre!r}"
+        except ValueError:
+            pass
+    assert gestor.obtener_cantidad_total() == 3 and gestor.proximo_id == 4, \
+        "Error: un producto rechazado no debe quedar en la lista ni consumir ID"
     
     # Test 2: Buscar producto
     print("\n2. Buscar producto por ID")
@@ -152,6 +245,1285 @@ def test_gestor_inventario():
     print("\n✅ Todos los tests de GestorInventario pasaron\n")
 
 
+def test_indice_por_id():
+    """Pruebas para el índice primario por ID del GestorInventario"""
+    print("=" * 50)
+    print("PRUEBAS: ÍNDICE POR ID")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    p1 = gestor.agregar_producto("Laptop", 5, 999.99, "Electrónica")
+    p2 = gestor.agregar_producto("Mouse", 20, 29.99, "Electrónica")
+    
+    # Test 1: Búsqueda directa
+    print("\n1. Buscar por ID usando el índice")
+    assert gestor.buscar_producto_por_id(p2.id_producto) is p2, "Error en índice"
+    assert gestor.buscar_producto_por_id("PROD-999") is None, "Error con ID inexistente"
+    
+    # Test 2: Eliminar mantiene el índice sincronizado
+    print("\n2. Eliminar producto y verificar el índice")
+    assert gestor.eliminar_producto(p1.id_producto), "Error al eliminar"
+    assert gestor.buscar_producto_por_id(p1.id_producto) is None, "Índice desincronizado"
+    assert not gestor.eliminar_producto(p1.id_producto), "Error al eliminar dos veces"
+    assert gestor.productos.recorrer() == [p2], "Error en la lista tras eliminar"
+    
+    # Test 3: Limpiar vacía el índice
+    print("\n3. Limpiar inventario")
+    gestor.limpiar()
+    assert gestor.buscar_producto_por_id(p2.id_producto) is None, "Error al limpiar índice"
+    
+    print("\n✅ Todos los tests del índice por ID pasaron\n")
+
+
+def test_indice_por_categoria():
+    """Pruebas para el índice de categorías del GestorInventario"""
+    print("=" * 50)
+    print("PRUEBAS: ÍNDICE POR CATEGORÍA")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    p1 = gestor.agregar_producto("Laptop", 5, 1000, "Electrónica")
+    p2 = gestor.agregar_producto("Mouse", 20, 30, "Electrónica")
+    p3 = gestor.agregar_producto("Arroz", 50, 2, "Alimentos")
+    
+    # Test 1: Consulta por categoría
+    print("\n1. Productos de Electrónica")
+    assert gestor.obtener_productos_por_categoria("Electrónica") == [p1, p2], "Error en categoría"
+    assert gestor.obtener_productos_por_categoria("Ropa") == [], "Error con categoría vacía"
+    
+    # Test 2: Conteo y valor por categoría
+    print("\n2. Conteo y valor de Electrónica")
+    assert gestor.contar_productos_por_categoria("Electrónica") == 2, "Error en conteo"
+    assert gestor.obtener_valor_categoria("Electrónica") == 5600, "Error en valor"
+    
+    # Test 3: Los cambios de stock actualizan el valor
+    print("\n3. Cambios de stock y órdenes")
+    gestor.restar_stock(p1.id_producto, 1)
+    gestor.agregar_stock(p3.id_producto, 10)
+    gestor.crear_orden_venta("CLIENTE-001", [(p2.id_producto, 10)])
+    assert gestor.obtener_valor_categoria("Electrónica") == 4300, "Error tras restar stock"
+    assert gestor.obtener_valor_categoria("Alimentos") == 120, "Error tras agregar stock"
+    
+    # Test 4: Eliminar y limpiar
+    print("\n4. Eliminar y limpiar")
+    gestor.eliminar_producto(p3.id_producto)
+    assert gestor.obtener_categorias() == ["Electrónica"], "Error al eliminar categoría"
+    gestor.limpiar()
+    assert gestor.contar_productos_por_categoria("Electrónica") == 0, "Error al limpiar"
+    
+    print("\n✅ Todos los tests del índice por categoría pasaron\n")
+
+
+def test_indice_ngramas():
+    """Pruebas para IndiceNGramas y la búsqueda por nombre"""
+    print("=" * 50)
+    print("PRUEBAS: ÍNDICE DE TRIGRAMAS")
+    print("=" * 50)
+    
+    indice = IndiceNGramas()
+    indice.agregar("A", "Arroz Blanco")
+    indice.agregar("B", "Frijoles")
+    indice.agregar("C", "Arroz Integral")
+    
+    # Test 1: Subcadenas sin distinguir mayúsculas
+    print("\n1. Buscar 'ARROZ' y 'ol'")
+    assert indice.buscar("ARROZ") == ["A", "C"], "Error en búsqueda por trigramas"
+    assert indice.buscar("ol") == ["B"], "Error en consulta corta"
+    assert indice.buscar("rozb") == [], "Error en verificación de subcadena"
+    assert indice.buscar("") == ["A", "B", "C"], "Error en consulta vacía"
+    
+    # Test 2: Eliminar
+    print("\n2. Eliminar y volver a buscar")
+    indice.eliminar("A")
+    assert indice.buscar("arroz") == ["C"], "Error al eliminar del índice"
+    assert indice.buscar("bl") == [], "Error: el bigrama eliminado no debe aparecer"
+    
+    # Test 3: Consultas de dos caracteres sin recorrer los textos
+    print("\n3. Consultas de dos caracteres")
+    indice.agregar("D", "Té")
+    indice.agregar("E", "al")
+    indice.agregar("F", "Sal")
+    assert indice.buscar("al") == ["C", "E", "F"], "Error en bigrama al final o texto corto"
+    assert indice.buscar("ar") == ["C"], "Error en bigrama al inicio"
+    assert indice.buscar("TÉ") == ["D"], "Error en texto más corto que un trigrama"
+    assert indice.buscar("a") == ["C", "E", "F"], "Error en consulta de un carácter"
+    indice.eliminar("F")
+    assert indice.buscar("al") == ["C", "E"], "Error al eliminar un texto corto"
+    
+    # Test 4: Integración con el gestor
+    print("\n3. Búsqueda desde el gestor")
+    gestor = GestorInventario()
+    gestor.agregar_producto("Teclado", 15, 79.99)
+    p2 = gestor.agregar_producto("Teclado Mecánico", 3, 120.0)
+    gestor.eliminar_producto("PROD-1")
+    assert gestor.buscar_productos_por_nombre("tecla") == [p2], "Error en búsqueda del gestor"
+    
+    print("\n✅ Todos los tests del índice de trigramas pasaron\n")
+
+
+def test_reporte_incremental():
+    """Pruebas para los agregados incrementales del reporte"""
+    print("=" * 50)
+    print("PRUEBAS: REPORTE INCREMENTAL")
+    print("=" * 50)
+    
+    gestor = GestorInventario(umbral_bajo_stock=10)
+    p1 = gestor.agregar_producto("Laptop", 5, 1000)
+    p2 = gestor.agregar_producto("Mouse", 20, 30)
+    
+    # Test 1: Valor y bajo stock con umbral configurable
+    print("\n1. Reporte inicial con umbral 10")
+    reporte = gestor.generar_reporte()
+    assert reporte["total_valor_inventario"] == 5600, "Error en valor total"
+    assert reporte["productos_bajo_stock"] == [p1], "Error en bajo stock"
+    
+    # Test 2: Los cambios de stock mueven la membresía
+    print("\n2. Cambios de stock")
+    gestor.agregar_stock(p1.id_producto, 10)
+    gestor.crear_orden_venta("CLIENTE-001", [(p2.id_producto, 15)])
+    reporte = gestor.generar_reporte()
+    assert reporte["total_valor_inventario"] == 15150, "Error tras cambios de stock"
+    assert reporte["productos_bajo_stock"] == [p2], "Error al mover bajo stock"
+    
+    # Test 3: Eliminar y cambiar el umbral
+    print("\n3. Eliminar producto y cambiar umbral")
+    gestor.eliminar_producto(p2.id_producto)
+    gestor.establecer_umbral_bajo_stock(20)
+    reporte = gestor.generar_reporte()
+    assert reporte["total_productos"] == 1, "Error en total de productos"
+    assert reporte["total_valor_inventario"] == 15000, "Error tras eliminar"
+    assert reporte["productos_bajo_stock"] == [p1], "Error al cambiar umbral"
+    
+    print("\n✅ Todos los tests del reporte incremental pasaron\n")
+
+
+def test_operaciones_lote():
+    """Pruebas para la carga de productos y órdenes por lote"""
+    print("=" * 50)
+    print("PRUEBAS: OPERACIONES POR LOTE")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    gestor.TAMANO_TRAMO_LOTE = 2  # Forzar varios tramos
+    
+    # Test 1: Productos por lote con un elemento inválido
+    print("\n1. Agregar 5 productos (uno inválido)")
+    resultados = gestor.agregar_productos_lote([
+        ("Laptop", 5, 1000, "Electrónica"),
+        ("Mouse", 20, 30),
+        ("Roto", -1, 10),
+        ("Camisa", 10, 45, "Ropa"),
+        ("Arroz", 3, 2.5, "Alimentos"),
+    ])
+    assert isinstance(resultados[2], ValueError), "Error: el inválido debería fallar"
+    creados = [r for r in resultados if not isinstance(r, ValueError)]
+    assert [p.id_producto for p in creados] == ["PROD-1", "PROD-2", "PROD-3", "PROD-4"], "Error en IDs"
+    assert len(gestor.productos) == 4, "Error en tamaño"
+    assert gestor.buscar_productos_por_nombre("mous") == [creados[1]], "Error en índice de nombres"
+    assert gestor.generar_reporte()["total_valor_inventario"] == 6057.5, "Error en agregados"
+    
+    # Test 2: Órdenes por lote
+    print("\n2. Crear 3 órdenes por lote (una sin stock)")
+    resultados = gestor.crear_ordenes_lote([
+        ("CLIENTE-001", [("PROD-1", 2)]),
+        ("CLIENTE-002", [("PROD-2", 500)]),
+        ("CLIENTE-003", [("PROD-3", 1), ("PROD-2", 5)]),
+    ])
+    assert isinstance(resultados[1], ValueError), "Error: la orden sin stock debería fallar"
+    assert gestor.obtener_cantidad_ordenes_pendientes() == 2, "Error en órdenes encoladas"
+    assert gestor.procesar_proximo_orden()["id_cliente"] == "CLIENTE-001", "Error en orden FIFO"
+    assert gestor.buscar_producto_por_id("PROD-2").cantidad == 15, "Error en stock"
+    
+    print("\n✅ Todos los tests de operaciones por lote pasaron\n")
+
+
+def test_cursor_productos():
+    """Pruebas para el recorrido de productos desde un cursor estable"""
+    print("=" * 50)
+    print("PRUEBAS: CURSOR DE PRODUCTOS")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    for i in range(10):
+        gestor.agregar_producto(f"Producto {i}", 10, 1.0)
+    
+    def ids(productos):
+        return [p.id_producto for p in productos]
+    
+    # Test 1: Cursor de un producto existente
+    print("\n1. Continuar después de PROD-3")
+    assert ids(gestor.iterar_productos("PROD-3"))[:2] == ["PROD-4", "PROD-5"], "Error en cursor"
+    assert ids(gestor.iterar_productos("PROD-10")) == [], "Error en cursor final"
+    
+    # Test 2: Cursor de productos eliminados (cerca del inicio y del final)
+    print("\n2. Cursor de productos eliminados")
+    for id_prod in ("PROD-2", "PROD-3", "PROD-8", "PROD-9"):
+        gestor.eliminar_producto(id_prod)
+    assert ids(gestor.iterar_productos("PROD-2"))[0] == "PROD-4", "Error con cursor eliminado al inicio"
+    assert ids(gestor.iterar_productos("PROD-8")) == ["PROD-10"], "Error con cursor eliminado al final"
+    
+    # Test 3: Inserciones posteriores aparecen después del cursor
+    print("\n3. Inserción durante la paginación")
+    gestor.eliminar_producto("PROD-10")
+    gestor.agregar_producto("Nuevo", 1, 1.0)
+    assert ids(gestor.iterar_productos("PROD-10")) == ["PROD-11"], "Error tras insertar"
+    
+    # Test 4: Cursor inválido
+    print("\n4. Cursor inválido")
+    try:
+        gestor.iterar_productos("XYZ")
+        assert False, "Debería lanzar ValueError"
+    except ValueError:
+        pass
+    
+    print("\n✅ Todos los tests del cursor de productos pasaron\n")
+
+
+def test_versiones():
+    """Pruebas para la versión global y por producto"""
+    print("=" * 50)
+    print("PRUEBAS: VERSIONES")
+    print("=" * 50)
+    
+    gestor = GestorInventario()
+    p1 = gestor.agregar_producto("Laptop", 10, 1000)
+    p2 = gestor.agregar_producto("Mouse", 20, 30)
+    
+    # Test 1: Cada alta incrementa la versión
+    print("\n1. Versiones al agregar")
+    assert gestor.obtener_version() == 2, "Error en versión global"
+    assert gestor.obtener_version_producto(p1.id_producto) == 1, "Error en versión de producto"
+    
+    # Test 2: Un cambio de stock solo cambia la versión de ese producto
+    print("\n2. Cambio de stock")
+    gestor.restar_stock(p2.id_producto, 5)
+    assert gestor.obtener_version_producto(p2.id_producto) == 3, "Error tras cambiar stock"
+    assert gestor.obtener_version_producto(p1.id_producto) == 1, "Error: versión ajena cambiada"
+    
+    # Test 3: Órdenes, umbral y eliminación también incrementan la versión
+    print("\n3. Órdenes, umbral y eliminación")
+    version = gestor.obtener_version()
+    gestor.crear_orden_venta("CLIENTE-001", [(p1.id_producto, 1)])
+    gestor.procesar_proximo_orden()
+    gestor.establecer_umbral_bajo_stock(3)
+    assert gestor.obtener_version() == version + 4, "Error en versiones de órdenes y umbral"
+    gestor.eliminar_producto(p1.id_producto)
+    assert gestor.obtener_version_producto(p1.id_producto) is None, "Error tras eliminar"
+    
+    # Test 4: Las consultas no cambian la versión
+    print("\n4. Consultas")
+    version = gestor.obtener_version()
+    gestor.generar_reporte()
+    gestor.buscar_productos_por_nombre("mouse")
+    assert gestor.obtener_version() == version, "Error: una consulta cambió la versión"
+    
+    print("\n✅ Todos los tests de versiones pasaron\n")
+
+
+def test_serializacion_producto():
+    """Pruebas para la serialización cacheada de Producto"""
+    print("=" * 50)
+    print("PRUEBAS: SERIALIZACIÓN DE PRODUCTO")
+    print("=" * 50)
+    
+    producto = Producto("PROD-1", "Café", 4, 2.5, "Alimentos")
+    
+    # Test 1: Diccionario y JSON
+    print("\n1. convertir_a_dict y convertir_a_json")
+    assert producto.convertir_a_dict() == {
+        "id": "PROD-1", "nombre": "Café", "cantidad": 4,
+        "precio": 2.5, "categoria": "Alimentos", "total": 10.0
+    }, "Error en diccionario"
+    assert "total" not in producto.convertir_a_dict(incluir_total=False), "Error sin total"
+    assert json.loads(producto.convertir_a_json()) == producto.convertir_a_dict(), "Error en JSON"
+    
+    # Test 2: El fragmento se reutiliza hasta que cambia el producto
+    print("\n2. Cache e invalidación")
+    fragmento = producto.convertir_a_json()
+    assert producto.convertir_a_json() is fragmento, "Error: el JSON debería estar cacheado"
+    producto.cantidad = 10
+    assert json.loads(producto.convertir_a_json())["total"] == 25.0, "Error al cambiar cantidad"
+    producto.precio = 3
+    producto.nombre = "Café molido"
+    datos = json.loads(producto.convertir_a_json())
+    assert (datos["precio"], datos["nombre"]) == (3, "Café molido"), "Error al cambiar precio y nombre"
+    
+    # Test 3: Los cambios de stock del gestor también invalidan
+    print("\n3. Invalidación desde el gestor")
+    gestor = GestorInventario()
+    p = gestor.agregar_producto("Mouse", 20, 30)
+    p.convertir_a_json()
+    gestor.crear_orden_venta("CLIENTE-001", [(p.id_producto, 5)])
+    assert json.loads(p.convertir_a_json())["cantidad"] == 15, "Error: JSON desactualizado"
+    
+    print("\n✅ Todos los tests de serialización pasaron\n")
+
+
+def test_cola_prioridad():
+    """Pruebas para la cola de prioridad y la cola por carriles"""
+    print("=" * 50)
+    print("PRUEBAS: COLA DE PRIORIDAD Y CARRILES")
+    print("=" * 50)
+    
+    # Test 1: Mayor prioridad primero, FIFO entre iguales
+    print("\n1. Prioridades con desempate FIFO")
+    cola = ColaPrioridad()
+    for dato, prioridad in [("a", 0), ("b", 5), ("c", 0), ("d", 5), ("e", 1)]:
+        cola.encolar(dato, prioridad)
+    assert cola.frente() == "b" and cola.prioridad_frente() == 5, "Error en frente"
+    assert cola.convertir_a_lista() == ["b", "d", "e", "a", "c"], "Error en orden de salida"
+    assert cola.desencolar_lote(3) == ["b", "d", "e"], "Error en lote"
+    assert len(cola) == 2, "Error en cantidad"
+    
+    # Test 2: Cola vacía
+    print("\n2. Desencolar de cola vacía")
+    cola.limpiar()
+    try:
+        cola.desencolar()
+        assert False, "Debería lanzar IndexError"
+    except IndexError:
+        pass
+    
+    # Test 3: Round-robin ponderado entre carriles
+    print("\n3. Carriles express:3, mayorista:1")
+    carriles = ColaCarriles({"express": 3, "mayorista": 1})
+    for i in range(8):
+        carriles.encolar(f"E{i}", "express")
+        carriles.encolar(f"M{i}", "mayorista")
+    salida = []
+    while not carriles.esta_vacia():
+        frente = carriles.frente()
+        salida.append(carriles.desencolar())
+        assert salida[-1] == frente, "Error: frente distinto de desencolar"
+    assert salida[:8] == ["E0", "E1", "M0", "E2", "E3", "E4", "M1", "E5"], "Error en planificación"
+    assert salida[-6:] == [f"M{i}" for i in range(2, 8)], "Error: el carril mayorista debe avanzar"
+    
+    # Test 4: Carril desconocido
+    print("\n4. Carril desconocido")
+    try:
+        carriles.encolar("X", "otro")
+        assert False, "Debería lanzar ValueError"
+    except ValueError:
+        pass
+    
+    # Test 5: Gestor con carriles y prioridades
+    print("\n5. Gestor con carriles")
+    gestor = GestorInventario(pesos_carriles={"normal": 1, "express": 2})
+    p = gestor.agregar_producto("Mouse", 100, 30)
+    gestor.crear_orden_venta("C-1", [(p.id_producto, 1)])
+    gestor.crear_orden_venta("C-2", [(p.id_producto, 1)], prioridad=5)
+    gestor.crear_orden_venta("C-3", [(p.id_producto, 1)], carril="express")
+    try:
+        gestor.crear_orden_venta("C-4", [(p.id_producto, 1)], carril="otro")
+        assert False, "Debería lanzar ValueError"
+    except ValueError:
+        pass
+    assert p.cantidad == 97, "Error: una orden rechazada no debe descontar stock"
+    assert gestor.contar_ordenes_por_carril() == {"normal": 2, "express": 1}, "Error en conteo por carril"
+    clientes = [gestor.procesar_proximo_orden()["id_cliente"] for _ in range(3)]
+    assert clientes == ["C-3", "C-2", "C-1"], "Error en orden de procesamiento"
+    
+    # Test 6: Sin carriles la cola FIFO también respeta prioridades
+    print("\n6. Prioridades sin carriles")
+    cola = ColaConPrioridades()
+    for dato, prioridad in [("a", 0), ("b", -1), ("c", 0), ("d", 3), ("e", 3), ("f", 1)]:
+        cola.encolar(dato, prioridad)
+    assert list(cola) == ["d", "e", "f", "a", "c", "b"], "Error en orden de salida"
+    assert cola.frente() == "d" and len(cola) == 6, "Error en frente"
+    assert cola.desencolar_lote(4) == ["d", "e", "f", "a"], "Error en lote"
+    assert [cola.desencolar(), cola.desencolar()] == ["c", "b"] and cola.esta_vacia(), "Error al vaciar"
+    
+    gestor = GestorInventario()
+    p = gestor.agregar_producto("Mouse", 100, 30)
+    gestor.crear_orden_venta("C-1", [(p.id_producto, 1)])
+    gestor.crear_orden_venta("C-2", [(p.id_producto, 1)], prioridad=5)
+    gestor.crear_ordenes_lote([("C-3", [(p.id_producto, 1)]), ("C-4", [(p.id_producto, 1)], 2)])
+    try:
+        gestor.crear_orden_venta("C-5", [(p.id_producto, 1)], carril="express")
+        assert False, "Debería lanzar ValueError: no hay carriles"
+    except ValueError:
+        pass
+    clientes = [gestor.procesar_proximo_orden()["id_cliente"] for _ in range(4)]
+    assert clientes == ["C-2", "C-4", "C-1", "C-3"], "Error en prioridades sin carriles"
+    
+    print("\n✅ Todos los tests de cola de prioridad pasaron\n")
+
+
+def test_historial_ordenes():
+    """Pruebas para el historial acotado de órdenes procesadas"""
+    print("=" * 50)
+    print("PRUEBAS: HISTORIAL DE ÓRDENES")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "historial.jsonl")
+        
+        # Test 1: La memoria queda acotada y el resto va a disco
+        print("\n1. 1000 órdenes con capacidad 50")
+        historial = HistorialOrdenes(capacidad=50, ruta=ruta)
+        historial.agregar({"id_cliente": "C-0"})
+        for inicio in range(1, 1000, 111):
+            historial.agregar_lote([{"id_cliente": f"C-{i}"} for i in range(inicio, inicio + 111)])
+            time.sleep(0.002)  # Lotes con horas distintas para el filtro de tiempo
+        assert len(historial) == 1000, "Error en cantidad total"
+        assert historial.en_memoria() == 50, "Error: la memoria debe quedar acotada"
+        todas = list(historial)
+        assert [o["numero"] for o in todas] == list(range(1000)), "Error en el recorrido"
+        assert todas[999]["id_cliente"] == "C-999", "Error en datos"
+        
+        # Test 2: Paginación por cursor cruzando disco y memoria
+        print("\n2. Paginación por cursor")
+        paginas, cursor = [], None
+        while True:
+            ordenes, cursor = historial.consultar(cursor, limite=300)
+            paginas.append(ordenes)
+            if cursor is None:
+                break
+        assert [len(p) for p in paginas] == [300, 300, 300, 100], "Error en tamaño de páginas"
+        assert [o["numero"] for p in paginas for o in p] == list(range(1000)), "Error en páginas"
+        ordenes, cursor = historial.consultar(940, limite=10)
+        assert [o["numero"] for o in ordenes] == list(range(941, 951)), "Error en página de memoria"
+        
+        # Test 3: Rango de tiempo
+        print("\n3. Filtro por rango de tiempo")
+        desde, hasta = todas[600]["procesada_en"], todas[990]["procesada_en"]
+        esperadas = [o["numero"] for o in todas if desde <= o["procesada_en"] <= hasta]
+        assert 0 < esperadas[0] < 600, "Error en lotes de prueba"
+        ordenes, _ = historial.consultar(limite=1000, desde=desde, hasta=hasta)
+        assert [o["numero"] for o in ordenes] == esperadas, "Error en rango de tiempo"
+        
+        # Test 4: Retomar el segmento existente
+        print("\n4. Retomar historial desde disco")
+        historial.cerrar()
+        retomado = HistorialOrdenes(capacidad=50, ruta=ruta)
+        assert len(retomado) == 950, "Error: deben recuperarse las órdenes en disco"
+        retomado.agregar({"id_cliente": "nuevo"})
+        assert list(retomado)[-1]["numero"] == 950, "Error en numeración al retomar"
+        
+        # Test 5: Limpiar borra también el disco
+        print("\n5. Limpiar")
+        retomado.limpiar()
+        assert len(retomado) == 0 and list(retomado) == [], "Error al limpiar"
+        assert os.path.getsize(ruta) == 0, "Error: el segmento debe quedar vacío"
+        retomado.cerrar()
+    
+    # Test 6: Gestor con historial acotado
+    print("\n6. Gestor con capacidad_historial")
+    gestor = GestorInventario(capacidad_historial=3)
+    p = gestor.agregar_producto("Mouse", 100, 30)
+    for i in range(10):
+        gestor.crear_orden_venta(f"C-{i}", [(p.id_producto, 1)])
+        gestor.procesar_proximo_orden()
+    assert gestor.generar_reporte()["ordenes_procesadas"] == 10, "Error en reporte"
+    assert gestor.ordenes_procesadas.en_memoria() == 3, "Error: memoria no acotada"
+    assert [o["id_cliente"] for o in gestor.ordenes_procesadas] == [f"C-{i}" for i in range(10)], \
+        "Error en el orden del historial"
+    gestor.ordenes_procesadas.cerrar()
+    assert not os.path.exists(gestor.ordenes_procesadas.ruta), "Error: el segmento temporal debe borrarse"
+    
+    # Test 7: procesada_en no retrocede aunque lo haga el reloj
+    print("\n7. Reloj que retrocede")
+    historial = HistorialOrdenes()
+    try:
+        historial_ordenes.time = SimpleNamespace(time=lambda: 1000.0)
+        historial.agregar({"id_cliente": "C-0"})
+        historial_ordenes.time = SimpleNamespace(time=lambda: 900.0)
+        historial.agregar({"id_cliente": "C-1"})
+    finally:
+        historial_ordenes.time = time
+    assert [o["procesada_en"] for o in historial] == [1000.0, 1000.0], "Error: procesada_en retrocedió"
+    
+    print("\n✅ Todos los tests de historial pasaron\n")
+
+
+def estado_gestor(gestor):
+    """Estado observable de un gestor (productos, órdenes y reporte) para comparar"""
+    return {
+        "productos": [p.convertir_a_dict() for p in gestor.obtener_todos_productos()],
+        "pendientes": list(gestor.ordenes_venta),
+        "procesadas": list(gestor.ordenes_procesadas),
+        "reporte": {k: v for k, v in gestor.generar_reporte().items() if k != "productos_bajo_stock"},
+        "umbral": gestor.umbral_bajo_stock,
+        "proximo_id": gestor.proximo_id
+    }
+
+
+def test_diario():
+    """Pruebas para el diario de escritura anticipada y su reproducción"""
+    print("=" * 50)
+    print("PRUEBAS: DIARIO DE ESCRITURA ANTICIPADA")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.diario")
+        
+        # Test 1: Registrar operaciones de todo tipo
+        print("\n1. Operaciones con diario")
+        gestor = GestorInventario(pesos_carriles={"normal": 1, "express": 3},
+                                  diario=DiarioEscritura(ruta, intervalo_grupo=0))
+        laptop = gestor.agregar_producto("Laptop", 10, 1000, "Electrónica")
+        gestor.agregar_productos_lote([("Mouse", 50, 20), ("Teclado", -1, 30), ("Silla", 8, 80, "Muebles")])
+        gestor.agregar_stock(laptop.id_producto, 5)
+        gestor.restar_stock("PROD-2", 3)
+        gestor.actualizar_cantidad("PROD-3", 6)
+        gestor.eliminar_producto("PROD-3")
+        gestor.establecer_umbral_bajo_stock(12)
+        gestor.crear_orden_venta("C-1", [(laptop.id_producto, 2), ("PROD-2", 1)])
+        gestor.crear_orden_venta("C-2", [("PROD-2", 4)], prioridad=5, carril="express")
+        gestor.crear_ordenes_lote([("C-3", [("PROD-2", 1)]), ("C-4", [("PROD-9", 1)]), ("C-5", [("PROD-2", 2)])])
+        gestor.procesar_proximo_orden()
+        gestor.completar_ordenes(gestor.tomar_ordenes(1))
+        tomadas = gestor.tomar_ordenes(1)  # Quedan en proceso al "caerse"
+        esperado = estado_gestor(gestor)
+        gestor.cerrar()
+        
+        # Test 2: Reproducir en un gestor nuevo
+        print("\n2. Reproducir el diario")
+        recuperado = GestorInventario(pesos_carriles={"normal": 1, "express": 3},
+                                      diario=DiarioEscritura(ruta))
+        estado = estado_gestor(recuperado)
+        for clave in ("productos", "procesadas", "umbral", "proximo_id"):
+            assert estado[clave] == esperado[clave], f"Error al reproducir {clave}"
+        assert estado["reporte"]["total_valor_inventario"] == esperado["reporte"]["total_valor_inventario"], \
+            "Error en agregados reproducidos"
+        pendientes = [o["id_orden"] for o in estado["pendientes"]]
+        assert sorted(pendientes) == sorted([o["id_orden"] for o in esperado["pendientes"]]
+                                            + [o["id_orden"] for o in tomadas]), \
+            "Error: las órdenes en proceso deben volver a la cola"
+        orden = recuperado.crear_orden_venta("C-6", [("PROD-1", 1)])
+        assert orden["id_orden"] == "ORD-5", "Error en la numeración de órdenes"
+        assert recuperado.agregar_producto("Lámpara", 3, 15).id_producto == "PROD-4", "Error en proximo_id"
+        recuperado.cerrar()
+        
+        # Test 3: Última línea incompleta
+        print("\n3. Escritura interrumpida al final")
+        tamano = os.path.getsize(ruta)
+        with open(ruta, "ab") as archivo:
+            archivo.write(b'0badc0de {"op":"eliminar","id":"PR')
+        recuperado = GestorInventario(pesos_carriles={"normal": 1, "express": 3}, diario=DiarioEscritura(ruta))
+        assert recuperado.buscar_producto_por_id("PROD-4") is not None, "Error: registro válido perdido"
+        assert os.path.getsize(ruta) == tamano, "Error: debe recortarse la línea incompleta"
+        recuperado.cerrar()
+        
+        # Test 4: Reserva sin encolar se anula al reproducir
+        print("\n4. Reserva huérfana")
+        ruta_reserva = os.path.join(directorio, "reserva.diario")
+        diario = DiarioEscritura(ruta_reserva)
+        diario.confirmar({"op": "producto", "id": "PROD-1", "nombre": "Mouse", "cantidad": 10,
+                          "precio": 20, "categoria": "General"})
+        diario.confirmar({"op": "reserva", "orden": {
+            "id_orden": "ORD-1", "id_cliente": "C-1", "total": 60, "estado": "Pendiente",
+            "productos": [{"id_producto": "PROD-1", "nombre": "Mouse", "cantidad": 3,
+                           "precio_unitario": 20, "subtotal": 60}]
+        }})
+        diario.cerrar()
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta_reserva))
+        assert recuperado.buscar_producto_por_id("PROD-1").cantidad == 10, "Error: la reserva debe anularse"
+        assert recuperado.obtener_cantidad_ordenes_pendientes() == 0, "Error: la orden no debe encolarse"
+        recuperado.cerrar()
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta_reserva))
+        assert recuperado.buscar_producto_por_id("PROD-1").cantidad == 10, "Error: la anulación debe persistir"
+        recuperado.cerrar()
+        
+        # Test 5: limpiar() entre la reserva y el encolado de una orden
+        print("\n5. Limpiar con una reserva en curso")
+        ruta_limpiar = os.path.join(directorio, "limpiar.diario")
+        gestor = GestorInventario(diario=DiarioEscritura(ruta_limpiar))
+        gestor.agregar_producto("Mouse", 10, 20)
+        reservar = gestor._reservar_orden
+        
+        def reservar_y_limpiar(*args):
+            orden = reservar(*args)
+            gestor.limpiar()  # Otro hilo limpia antes de que la orden se encole
+            return orden
+        
+        gestor._reservar_orden = reservar_y_limpiar
+        try:
+            gestor.crear_orden_venta("C-1", [("PROD-1", 1)])
+            assert False, "Error: la orden descartada no debe crearse"
+        except ValueError:
+            pass
+        gestor.agregar_producto("Teclado", 5, 30)
+        resultados = gestor.crear_ordenes_lote([("C-2", [("PROD-1", 1)])])
+        assert str(resultados[0]) == "El inventario se limpió mientras se creaba la orden", \
+            "Error: la orden del lote debe descartarse"
+        gestor._reservar_orden = reservar
+        assert gestor.obtener_cantidad_ordenes_pendientes() == 0, "Error: la cola debe quedar vacía"
+        gestor.agregar_producto("Silla", 4, 80)
+        assert gestor.crear_orden_venta("C-3", [("PROD-1", 1)])["id_orden"] == "ORD-1", \
+            "Error en la numeración tras limpiar"
+        gestor.cerrar()
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta_limpiar))
+        assert [o["id_orden"] for o in recuperado.ordenes_venta] == ["ORD-1"], "Error al reproducir"
+        recuperado.cerrar()
+        
+        # Un diario antiguo con "encolar" después de "limpiar" también arranca
+        diario = DiarioEscritura(ruta_reserva)
+        diario.confirmar({"op": "limpiar"})
+        diario.confirmar({"op": "encolar", "ordenes": [["ORD-1", 0, None]]})
+        diario.cerrar()
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta_reserva))
+        assert recuperado.obtener_cantidad_ordenes_pendientes() == 0, "Error: debe omitir la orden descartada"
+        recuperado.cerrar()
+        
+        # Test 6: Reservas de productos distintos llegan al diario fuera de orden
+        print("\n6. Reservas fuera de orden en el diario")
+        ruta_orden = os.path.join(directorio, "orden.diario")
+        diario = DiarioEscritura(ruta_orden)
+        for numero in (1, 2):
+            diario.confirmar({"op": "producto", "id": f"PROD-{numero}", "nombre": f"P{numero}",
+                              "cantidad": 5, "precio": 1, "categoria": "General"})
+        for numero in (2, 1):
+            diario.confirmar({"op": "reserva", "orden": {
+                "id_orden": f"ORD-{numero}", "id_cliente": "C", "total": 1, "estado": "Pendiente",
+                "productos": [{"id_producto": f"PROD-{numero}", "nombre": f"P{numero}", "cantidad": 1,
+                               "precio_unitario": 1, "subtotal": 1}]}})
+        diario.confirmar({"op": "encolar", "ordenes": [["ORD-2", 0, None], ["ORD-1", 0, None]]})
+        diario.cerrar()
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta_orden))
+        assert recuperado.crear_orden_venta("C", [("PROD-1", 1)])["id_orden"] == "ORD-3", \
+            "Error: el próximo número debe salir de la mayor reserva"
+        recuperado.cerrar()
+    
+    print("\n✅ Todos los tests de diario pasaron\n")
+
+
+def test_instantanea():
+    """Pruebas para las instantáneas binarias y la reproducción del resto del diario"""
+    print("=" * 50)
+    print("PRUEBAS: INSTANTÁNEAS")
+    print("=" * 50)
+    
+    carriles = {"normal": 1, "express": 3}
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.diario")
+        ruta_instantanea = os.path.join(directorio, "inventario.snap")
+        
+        # Test 1: Guardar una instantánea vacía el diario
+        print("\n1. Guardar instantánea")
+        gestor = GestorInventario(pesos_carriles=carriles, diario=DiarioEscritura(ruta),
+                                  ruta_instantanea=ruta_instantanea)
+        gestor.agregar_productos_lote([("Laptop", 10, 1000, "Electrónica"), ("Mouse", 50, 20.5),
+                                       ("Silla", 8, 80, "Muebles"), ("Lámpara", 3, 15, "Muebles")])
+        gestor.eliminar_producto("PROD-3")
+        gestor.establecer_umbral_bajo_stock(9)
+        gestor.crear_orden_venta("C-1", [("PROD-1", 2), ("PROD-2", 1)])
+        gestor.crear_orden_venta("C-2", [("PROD-2", 4)], prioridad=5, carril="express")
+        gestor.crear_orden_venta("C-3", [("PROD-2", 1)], carril="express")
+        gestor.procesar_proximo_orden()
+        tomadas = gestor.tomar_ordenes(1)
+        reserva = gestor._reservar_orden("C-4", [("PROD-4", 2)])  # Reservada, sin encolar
+        resultado = gestor.guardar_instantanea()
+        assert resultado["productos"] == 3, "Error en productos guardados"
+        registros = list(DiarioEscritura(ruta).leer())
+        assert [r["op"] for r in registros] == ["instantanea"], "Error: el diario debe quedar vacío"
+        
+        # Test 2: Operaciones posteriores solo en el diario
+        print("\n2. Operaciones después de la instantánea")
+        gestor.agregar_producto("Teclado", 4, 30, "Electrónica")
+        gestor.agregar_stock("PROD-1", 7)
+        gestor.completar_ordenes(tomadas)
+        gestor.crear_orden_venta("C-5", [("PROD-5", 1)])
+        gestor.completar_ordenes(gestor.tomar_ordenes(1))
+        esperado = estado_gestor(gestor)
+        gestor.cerrar()
+        
+        # Test 3: Cargar instantánea y reproducir el resto
+        print("\n3. Recuperar desde instantánea + diario")
+        recuperado = GestorInventario(pesos_carriles=carriles, diario=DiarioEscritura(ruta),
+                                      ruta_instantanea=ruta_instantanea)
+        assert isinstance(recuperado.buscar_producto_por_id("PROD-1"), ProductoInstantanea), \
+            "Error: los productos deben cargarse de la instantánea"
+        # Un segundo hilo que entró a __getattr__ antes de que el primero
+        # guardara el nombre lo encuentra ya decodificado
+        perezoso = recuperado.buscar_producto_por_id("PROD-1")
+        assert perezoso.nombre == perezoso.__getattr__("_nombre"), "Error en nombre ya decodificado"
+        assert recuperado._nombres_pendientes, "Error: el índice de nombres debe armarse al buscar"
+        estado = estado_gestor(recuperado)
+        lampara = esperado["productos"][2]
+        lampara.update(cantidad=lampara["cantidad"] + 2, total=(lampara["cantidad"] + 2) * 15)
+        assert estado["productos"] == esperado["productos"], "Error en productos recuperados"
+        assert estado["procesadas"] == esperado["procesadas"], "Error en historial recuperado"
+        assert [o["id_orden"] for o in estado["pendientes"]] == \
+            [o["id_orden"] for o in esperado["pendientes"]], "Error en la cola recuperada"
+        assert estado["umbral"] == 9 and estado["proximo_id"] == esperado["proximo_id"], \
+            "Error en contadores recuperados"
+        assert lampara["id"] == "PROD-4" and lampara["cantidad"] == 3, \
+            "Error: la reserva sin encolar debe anularse"
+        assert recuperado.obtener_version_producto("PROD-1") is not None, "Error en versiones"
+        
+        # Test 4: Índices armados sin inserciones
+        print("\n4. Índices tras la carga")
+        for campo in ("cantidad", "precio"):
+            assert [p.id_producto for p in recuperado.obtener_productos_ordenados(campo)] == \
+                [p.id_producto for p in sorted(recuperado.obtener_todos_productos(),
+                                               key=lambda p: (getattr(p, campo), p.id_producto))], \
+                f"Error en el índice ordenado por {campo}"
+        assert [p.id_producto for p in recuperado.buscar_productos_por_nombre("lap")] == ["PROD-1"], \
+            "Error en la búsqueda por nombre diferida"
+        assert recuperado.contar_productos_por_categoria("Muebles") == 1, "Error en índice de categorías"
+        assert recuperado.obtener_cantidad_ordenes_pendientes() == len(esperado["pendientes"])
+        assert recuperado.crear_orden_venta("C-6", [("PROD-2", 1)])["id_orden"] == "ORD-6", \
+            "Error en la numeración de órdenes"
+        esperado = estado_gestor(recuperado)
+        recuperado.cerrar()
+        
+        # Test 5: Caída entre la instantánea y el vaciado del diario
+        print("\n5. Instantánea sin vaciar el diario")
+        gestor = GestorInventario(pesos_carriles=carriles, diario=DiarioEscritura(ruta),
+                                  ruta_instantanea=ruta_instantanea)
+        gestor._diario.reiniciar = lambda registro: None
+        gestor.guardar_instantanea()
+        gestor.restar_stock("PROD-2", 5)
+        esperado = estado_gestor(gestor)
+        gestor.cerrar()
+        recuperado = GestorInventario(pesos_carriles=carriles, diario=DiarioEscritura(ruta),
+                                      ruta_instantanea=ruta_instantanea)
+        assert estado_gestor(recuperado)["productos"] == esperado["productos"], \
+            "Error: solo debe reproducirse lo posterior a la instantánea"
+        recuperado.cerrar()
+        
+        # Test 6: Archivos dañados o faltantes
+        print("\n6. Instantánea dañada o faltante")
+        with open(ruta_instantanea, "r+b") as archivo:
+            archivo.seek(-1, os.SEEK_END)
+            archivo.write(b"?")
+        try:
+            Instantanea(ruta_instantanea)
+            assert False, "Error: debe detectarse el daño"
+        except ValueError:
+            pass
+        try:
+            GestorInventario(diario=DiarioEscritura(ruta), ruta_instantanea=ruta_instantanea)
+            assert False, "Error: una instantánea dañada no debe cargarse"
+        except ValueError:
+            pass
+        os.remove(ruta_instantanea)
+        try:
+            GestorInventario(diario=DiarioEscritura(ruta))
+            assert False, "Error: el diario sin su instantánea debe rechazarse"
+        except ValueError:
+            pass
+        
+        # Test 7: Solo instantánea (sin diario) y gestor columnar
+        print("\n7. Instantánea sin diario")
+        gestor = GestorInventario()
+        gestor.agregar_productos_lote([(f"Producto {i}", i % 7, 1.5 * i) for i in range(50)])
+        gestor.guardar_instantanea(ruta_instantanea)
+        copia = GestorInventario(ruta_instantanea=ruta_instantanea)
+        assert estado_gestor(copia) == estado_gestor(gestor), "Error al cargar solo la instantánea"
+        try:
+            from gestor_columnar import GestorInventarioColumnar
+        except ImportError:
+            GestorInventarioColumnar = None
+        if GestorInventarioColumnar is not None:
+            columnar = GestorInventarioColumnar(ruta_instantanea=ruta_instantanea)
+            assert columnar.generar_reporte()["total_valor_inventario"] == \
+                gestor.generar_reporte()["total_valor_inventario"], "Error en la carga columnar"
+            columnar.guardar_instantanea(ruta_instantanea)
+            copia = GestorInventario(ruta_instantanea=ruta_instantanea)
+            assert [p.id_producto for p in copia.obtener_productos_ordenados("cantidad")] == \
+                [p.id_producto for p in gestor.obtener_productos_ordenados("cantidad")], \
+                "Error en el orden calculado por la instantánea columnar"
+        
+        # Test 8: Instantáneas periódicas
+        print("\n8. Instantáneas periódicas")
+        os.remove(ruta_instantanea)
+        periodicas = InstantaneasPeriodicas(gestor, 0.02, ruta_instantanea)
+        periodicas.iniciar()
+        time.sleep(0.2)
+        periodicas.detener()
+        assert periodicas.ultima["productos"] == 50, "Error en la instantánea periódica"
+        assert os.path.exists(ruta_instantanea), "Error: debe existir la instantánea"
+        
+        # Test 9: El historial en disco no se copia a la instantánea
+        print("\n9. Historial con segmento en disco")
+        os.remove(ruta_instantanea)
+        os.remove(ruta)
+        ruta_historial = os.path.join(directorio, "historial.jsonl")
+        opciones = {"capacidad_historial": 5, "ruta_historial": ruta_historial,
+                    "ruta_instantanea": ruta_instantanea}
+        gestor = GestorInventario(diario=DiarioEscritura(ruta), **opciones)
+        p = gestor.agregar_producto("Mouse", 1000, 20)
+        for i in range(40):
+            gestor.crear_orden_venta(f"C-{i}", [(p.id_producto, 1)])
+            gestor.procesar_proximo_orden()
+        gestor.guardar_instantanea()
+        metadatos = Instantanea(ruta_instantanea).metadatos["historial"]
+        assert metadatos["total"] == 40 and metadatos["en_disco"] == 35, "Error en contadores"
+        assert len(metadatos["memoria"]) == 5, "Error: solo deben guardarse las órdenes en memoria"
+        for i in range(40, 52):
+            gestor.crear_orden_venta(f"C-{i}", [(p.id_producto, 1)])
+            gestor.procesar_proximo_orden()
+        esperado = estado_gestor(gestor)
+        gestor.cerrar()
+        
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta), **opciones)
+        assert estado_gestor(recuperado) == esperado, "Error en historial recuperado"
+        assert recuperado.ordenes_procesadas.en_memoria() == 5, "Error: memoria no acotada"
+        recuperado.guardar_instantanea()
+        recuperado.cerrar()
+        
+        # Sin instantánea: el segmento se retoma y el diario agrega lo que falta
+        os.remove(ruta_instantanea)
+        os.remove(ruta)
+        gestor = GestorInventario(diario=DiarioEscritura(ruta), **opciones)
+        assert len(gestor.ordenes_procesadas) == 47, "Error: debe retomarse el segmento"
+        p = gestor.agregar_producto("Teclado", 10, 30)
+        gestor.crear_orden_venta("C-52", [(p.id_producto, 1)])
+        gestor.procesar_proximo_orden()
+        esperado = list(gestor.ordenes_procesadas)
+        gestor.cerrar()
+        recuperado = GestorInventario(diario=DiarioEscritura(ruta), **opciones)
+        assert list(recuperado.ordenes_procesadas) == esperado, \
+            "Error: el diario no debe duplicar órdenes del segmento"
+        recuperado.cerrar()
+    
+    print("\n✅ Todos los tests de instantáneas pasaron\n")
+
+
+def test_lista_salto():
+    """Pruebas para ListaSalto y las consultas ordenadas del gestor"""
+    print("=" * 50)
+    print("PRUEBAS: LISTA DE SALTO")
+    print("=" * 50)
+    
+    indice = ListaSalto()
+    for i, valor in enumerate([30, 10, 20, 10, 50]):
+        indice.insertar(valor, i, f"d{i}")
+    
+    # Test 1: Orden, top-N y rango
+    print("\n1. Orden ascendente, descendente y rango")
+    assert list(indice) == ["d1", "d3", "d2", "d0", "d4"], "Error en orden"
+    assert list(indice.ultimos(2)) == ["d4", "d0"], "Error en ultimos"
+    assert list(indice.rango(10, 20)) == ["d1", "d3", "d2"], "Error en rango"
+    assert list(indice.rango(minimo=25)) == ["d0", "d4"], "Error en rango abierto"
+    assert list(indice.rango(10, 25, descendente=True)) == ["d2", "d3", "d1"], "Error en rango desc"
+    assert list(indice.rango(maximo=5, descendente=True)) == [], "Error en rango desc vacío"
+    assert list(indice.rango(minimo=25, descendente=True)) == ["d4", "d0"], "Error en rango desc abierto"
+    
+    # Test 2: Eliminar
+    print("\n2. Eliminar entradas")
+    assert indice.eliminar(10, 1) and not indice.eliminar(10, 1), "Error en eliminar"
+    assert indice.eliminar(50, 4), "Error al eliminar el último"
+    assert list(indice.ultimos()) == ["d0", "d2", "d3"], "Error en enlaces anteriores"
+    
+    # Test 3: Índices del gestor siguen los cambios de stock
+    print("\n3. Consultas ordenadas del gestor")
+    gestor = GestorInventario()
+    p1 = gestor.agregar_producto("Laptop", 5, 999.99)
+    p2 = gestor.agregar_producto("Mouse", 20, 29.99)
+    p3 = gestor.agregar_producto("Teclado", 15, 79.99)
+    gestor.restar_stock(p2.id_producto, 18)
+    assert gestor.obtener_productos_ordenados("cantidad", 2) == [p2, p1], "Error en top-N"
+    assert gestor.obtener_productos_ordenados("precio", 1, True) == [p1], "Error en top-N desc"
+    assert list(gestor.obtener_productos_en_rango("precio", 20, 100)) == [p2, p3], "Error en rango"
+    assert list(gestor.obtener_productos_en_rango("precio", 20, None, 2, True)) == [p1, p3], \
+        "Error en rango desc con límite"
+    gestor.eliminar_producto(p2.id_producto)
+    assert gestor.obtener_productos_ordenados("cantidad") == [p1, p3], "Error tras eliminar"
+    
+    print("\n✅ Todos los tests de ListaSalto pasaron\n")
+
+
+def test_gestor_columnar():
+    """Pruebas para GestorInventarioColumnar (requiere NumPy)"""
+    print("=" * 50)
+    print("PRUEBAS: GESTOR COLUMNAR")
+    print("=" * 50)
+    
+    try:
+        from gestor_columnar import GestorInventarioColumnar
+        gestor = GestorInventarioColumnar(capacidad_inicial=2)
+    except ImportError:
+        print("\n⚠️  NumPy no está instalado, se omiten las pruebas\n")
+        return
+    
+    # Test 1: Misma interfaz que GestorInventario
+    print("\n1. Agregar productos (el almacén crece)")
+    p1 = gestor.agregar_producto("Laptop", 5, 1000, "Electrónica")
+    p2 = gestor.agregar_producto("Mouse", 20, 30, "Electrónica")
+    p3 = gestor.agregar_producto("Arroz", 3, 2, "Alimentos")
+    assert gestor.buscar_producto_por_id("PROD-2") is p2, "Error en búsqueda por ID"
+    assert gestor.buscar_productos_por_nombre("arr") == [p3], "Error en búsqueda por nombre"
+    
+    # Test 2: Reportes y filtros vectorizados
+    print("\n2. Reporte, categorías y consultas ordenadas")
+    gestor.crear_orden_venta("CLIENTE-001", [(p2.id_producto, 18)])
+    reporte = gestor.generar_reporte()
+    assert reporte["total_valor_inventario"] == 5066, "Error en valor total"
+    assert reporte["productos_bajo_stock"] == [p2, p3], "Error en bajo stock"
+    assert gestor.obtener_productos_por_categoria("Electrónica") == [p1, p2], "Error en categoría"
+    assert gestor.obtener_valor_categoria("Electrónica") == 5060, "Error en valor de categoría"
+    assert gestor.obtener_productos_ordenados("cantidad", 2) == [p2, p3], "Error en top-N"
+    assert list(gestor.obtener_productos_en_rango("precio", 2, 30)) == [p3, p2], "Error en rango"
+    assert list(gestor.obtener_productos_en_rango("precio", 2, 30, 1, True)) == [p2], \
+        "Error en rango desc con límite"
+    
+    # Test 3: Eliminar
+    print("\n3. Eliminar producto")
+    gestor.eliminar_producto(p3.id_producto)
+    assert gestor.obtener_categorias() == ["Electrónica"], "Error al eliminar"
+    assert gestor.generar_reporte()["total_productos"] == 2, "Error en total tras eliminar"
+    
+    # Test 4: Tipos iguales a los del gestor en memoria
+    print("\n4. Tipos de cantidad y precio")
+    assert type(p1.precio) is int and p1.convertir_a_dict()["precio"] == 1000, "Error: el precio int debe seguir int"
+    assert type(gestor.agregar_producto("Cable", 4.0, 2.5).precio) is float, "Error en precio float"
+    for cantidad in (2.5, True):
+        try:
+            gestor.agregar_producto("Fracción", cantidad, 1)
+            assert False, f"Error: debió rechazar la cantidad {cantidad!r}"
+        except ValueError:
+            pass
+    try:
+        gestor.actualizar_cantidad(p1.id_producto, 1.5)
+        assert False, "Error: debió rechazar la cantidad no entera"
+    except ValueError:
+        pass
+    assert p1.cantidad == 5 and gestor.obtener_cantidad_total() == 3, "Error: no debe truncar ni agregar"
+    
+    print("\n✅ Todos los tests del gestor columnar pasaron\n")
+
+
+def test_gestor_sqlite():
+    """Pruebas para GestorInventarioSQLite (mismos resultados que en memoria)"""
+    print("=" * 50)
+    print("PRUEBAS: GESTOR SQLITE")
+    print("=" * 50)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "inventario.db")
+        memoria = GestorInventario()
+        gestor = GestorInventarioSQLite(ruta)
+        
+        def ambos(operacion):
+            """Aplica la operación a los dos gestores y compara los resultados"""
+            esperado, obtenido = operacion(memoria), operacion(gestor)
+            assert repr(obtenido) == repr(esperado), f"SQLite: {obtenido!r}, memoria: {esperado!r}"
+            return obtenido
+        
+        # Test 1: Altas, también por lote con un elemento inválido
+        print("\n1. Agregar productos")
+        ambos(lambda g: g.agregar_producto("Laptop Dell", 5, 999.99, "Electrónica"))
+        ambos(lambda g: g.agregar_producto("Mouse", 20, 30, "Electrónica"))
+        resultados = ambos(lambda g: g.agregar_productos_lote([
+            ("Arroz", 3, 2.5, "Alimentos"), ("Inválido", -1, 1), ("Lámpara", 8, 45)
+        ]))
+        assert isinstance(resultados[1], ValueError), "Error en elemento inválido del lote"
+        
+        # Test 2: Búsquedas (índice de trigramas y consultas cortas)
+        print("\n2. Búsquedas por ID y por nombre")
+        ambos(lambda g: g.buscar_producto_por_id("PROD-4"))
+        ambos(lambda g: g.buscar_producto_por_id("no-existe"))
+        ambos(lambda g: g.buscar_productos_por_nombre("LAMP"))
+        ambos(lambda g: g.buscar_productos_por_nombre("o"))
+        ambos(lambda g: g.buscar_productos_por_nombre('"x'))
+        
+        # Test 3: Stock y órdenes, todo o nada
+        print("\n3. Stock y órdenes")
+        ambos(lambda g: g.restar_stock("PROD-2", 18))
+        ambos(lambda g: g.agregar_stock("PROD-9", 1))
+        ambos(lambda g: g.actualizar_cantidad("PROD-4", 2))
+        ambos(lambda g: g.crear_orden_venta("CLIENTE-001", [("PROD-1", 2), ("PROD-3", 1)]))
+        ambos(lambda g: g.crear_ordenes_lote([
+            ("CLIENTE-002", [("PROD-1", 1)]),
+            ("CLIENTE-003", [("PROD-2", 1), ("PROD-1", 99)]),
+            ("CLIENTE-004", [("PROD-2", 2)])
+        ]))
+        for g in (memoria, gestor):
+            try:
+                g.restar_stock("PROD-1", 99)
+                assert False, "Error: debió fallar por stock insuficiente"
+            except ValueError:
+                pass
+        assert gestor.buscar_producto_por_id("PROD-2").cantidad == 0, "Error: la orden fallida descontó stock"
+        ambos(lambda g: g.procesar_proximo_orden()["id_orden"])
+        
+        # Test 4: Consultas y reporte
+        print("\n4. Categorías, ordenados, rangos y reporte")
+        ambos(lambda g: g.obtener_productos_por_categoria("Electrónica"))
+        ambos(lambda g: g.contar_productos_por_categoria("Electrónica"))
+        ambos(lambda g: g.obtener_valor_categoria("Electrónica"))
+        ambos(lambda g: sorted(g.obtener_categorias()))
+        ambos(lambda g: g.obtener_productos_ordenados("precio", 2, descendente=True))
+        ambos(lambda g: list(g.obtener_productos_en_rango("cantidad", 1, 3)))
+        ambos(lambda g: list(g.obtener_productos_en_rango("precio", 10, None, 2, True)))
+        ambos(lambda g: list(g.iterar_productos("PROD-1")))
+        reporte = ambos(lambda g: {**g.generar_reporte(), "productos_bajo_stock":
+                                   sorted(g.generar_reporte()["productos_bajo_stock"], key=repr)})
+        assert reporte["ordenes_procesadas"] == 1, "Error en órdenes del reporte"
+        ambos(lambda g: g.eliminar_producto("PROD-3"))
+        ambos(lambda g: g.eliminar_producto("PROD-3"))
+        ambos(lambda g: g.obtener_cantidad_total())
+        version = gestor.obtener_version_producto("PROD-2")
+        gestor.agregar_stock("PROD-2", 1)
+        assert gestor.obtener_version_producto("PROD-2") > version, "Error en versión del producto"
+        
+        # Otra escritura entre el COMMIT y _registrar_cambio recibe otra versión
+        import threading
+        registrar, versiones = gestor._registrar_cambio, []
+        def registrar_tarde(*args, **kwargs):
+            if not versiones:
+                versiones.append(gestor.obtener_version_producto("PROD-2"))
+                hilo = threading.Thread(target=gestor.agregar_stock, args=("PROD-2", 1))
+                hilo.start()
+                hilo.join()
+                versiones.append(gestor.obtener_version_producto("PROD-2"))
+            registrar(*args, **kwargs)
+        gestor._registrar_cambio = registrar_tarde
+        gestor.agregar_stock("PROD-2", 1)
+        del gestor._registrar_cambio
+        assert versiones[1] > versiones[0], "Error: dos cambios no deben compartir versión"
+        
+        # Un hilo por pedido no deja una conexión abierta por hilo
+        for _ in range(300):
+            hilo = threading.Thread(target=gestor.buscar_producto_por_id, args=("PROD-2",))
+            hilo.start()
+            hilo.join()
+        assert len(gestor._conexiones) <= gestor.MAX_CONEXIONES_LIBRES, \
+            f"Error: {len(gestor._conexiones)} conexiones abiertas tras 300 hilos"
+        
+        # Test 5: Los datos persisten al reabrir la base
+        print("\n5. Reabrir la base")
+        gestor.establecer_umbral_bajo_stock(10)
+        gestor.cerrar()
+        gestor = GestorInventarioSQLite(ruta)
+        assert gestor.umbral_bajo_stock == 10, "Error: no se guardó el umbral"
+        assert gestor.obtener_version() >= versiones[1], "Error: la versión no debe retroceder"
+        assert [o["id_orden"] for o in gestor.ordenes_venta] == ["ORD-2", "ORD-3"], \
+            "Error: deben retomarse las órdenes pendientes"
+        assert gestor.agregar_producto("Nuevo", 1, 1).id_producto == "PROD-5", "Error en próximo ID"
+        orden = gestor.crear_orden_venta("CLIENTE-005", [("PROD-5", 1)])
+        assert orden["id_orden"] == "ORD-4", "Error en numeración de órdenes"
+        
+        # Tomada sin completar vuelve a la cola; reservada sin encolar se anula
+        tomada = gestor.tomar_ordenes(1)
+        stock = gestor.buscar_producto_por_id("PROD-1").cantidad
+        gestor._reservar_orden("CLIENTE-006", [("PROD-1", 1)])
+        gestor.cerrar()
+        gestor = GestorInventarioSQLite(ruta)
+        assert [o["id_orden"] for o in gestor.ordenes_venta] == ["ORD-2", "ORD-3", "ORD-4"], \
+            "Error: la orden tomada debe volver a la cola"
+        assert gestor.buscar_producto_por_id("PROD-1").cantidad == stock, \
+            "Error: la reserva sin encolar debe devolver su stock"
+        gestor.completar_ordenes(gestor.tomar_ordenes(2))
+        gestor.procesar_proximo_orden()
+        gestor.cerrar()
+        gestor = GestorInventarioSQLite(ruta)
+        assert gestor.obtener_cantidad_ordenes_pendientes() == 0, "Error: quedaron órdenes procesadas"
+        assert tomada[0]["id_orden"] == "ORD-2", "Error en la orden tomada"
+        try:
+            gestor.guardar_instantanea()
+            assert False, "Error: SQLite no usa instantáneas"
+        except ValueError:
+            pass
+        gestor.cerrar()
+    
+    print("\n✅ Todos los tests del gestor SQLite pasaron\n")
+
+
+def test_importador():
+    """Pruebas para la importación de catálogos CSV y JSONL por flujo"""
+    print("=" * 50)
+    print("PRUEBAS: IMPORTADOR DE CATÁLOGO")
+    print("=" * 50)
+    
+    import io
+    
+    # Test 1: Detección de formato
+    print("\n1. Detectar formato")
+    assert detectar_formato("catalogo.CSV") == "csv", "Error con extensión .csv"
+    assert detectar_formato("datos.ndjson") == "jsonl", "Error con extensión .ndjson"
+    assert detectar_formato(tipo_contenido="text/csv; charset=utf-8") == "csv", "Error con Content-Type"
+    assert detectar_formato("datos.txt") is None, "Error con formato desconocido"
+    
+    # Test 2: CSV con BOM, filas inválidas y tramos
+    print("\n2. Importar CSV por tramos")
+    gestor = GestorInventario()
+    gestor.agregar_producto("Existente", 1, 1)
+    texto = ("\ufeffNombre,Cantidad,Precio,Categoria,Extra\n"
+             "Laptop,5,999.99,Electrónica,x\n"
+             "Mouse,muchos,10,,x\n"
+             "\"Arroz, 1kg\",50,2,Alimentos,x\n"
+             "\n"
+             "Negativo,-3,1,,x\n"
+             "Corta,1\n"
+             "Teclado,15,79.5,,x\n")
+    avances = []
+    resumen = importar_catalogo(gestor, io.BytesIO(texto.encode()), "csv", tamano_tramo=2,
+                                progreso=lambda r: avances.append(r["importados"]))
+    assert resumen["filas"] == 6, "Error en filas leídas"
+    assert resumen["importados"] == 3 and resumen["rechazados"] == 3, "Error en conteos"
+    assert [r["linea"] for r in resumen["rechazos"]] == [3, 6, 7], "Error en líneas rechazadas"
+    assert resumen["rechazos"][1]["error"] == "Cantidad y precio deben ser positivos", \
+        "Error: debe aplicar las reglas de agregar_producto"
+    assert resumen["bytes"] == len(texto.encode()), "Error en bytes leídos"
+    assert avances == [2, 3], "Error en el progreso por tramo"
+    arroz = gestor.buscar_producto_por_id("PROD-3")
+    assert (arroz.nombre, arroz.cantidad, arroz.precio, arroz.categoria) == ("Arroz, 1kg", 50, 2, "Alimentos"), \
+        "Error en producto importado"
+    assert isinstance(arroz.precio, int), "Error: el precio entero debe quedar entero"
+    assert gestor.buscar_producto_por_id("PROD-4").categoria == "General", "Error en categoría por defecto"
+    
+    # Test 3: El índice de nombres diferido se arma al terminar la importación
+    print("\n3. Búsqueda por nombre tras importar")
+    assert not gestor._nombres_pendientes, "Error: el índice debe armarse al terminar"
+    assert [p.id_producto for p in gestor.buscar_productos_por_nombre("e")] == \
+        ["PROD-1", "PROD-4"], "Error en búsqueda corta"
+    assert [p.nombre for p in gestor.buscar_productos_por_nombre("ARROZ")] == ["Arroz, 1kg"], \
+        "Error en búsqueda con el índice"
+    gestor.agregar_producto("Monitor", 2, 150)
+    assert len(gestor.buscar_productos_por_nombre("monit")) == 1, "Error: el índice no siguió actualizándose"
+    
+    # Una importación chica respecto del catálogo indexa fila por fila
+    gestor.agregar_productos_lote([(f"Relleno {i}", 1, 1) for i in range(20)])
+    pendientes = []
+    importar_catalogo(gestor, io.BytesIO(b"nombre,cantidad,precio\nSilla,4,30\n"), "csv",
+                      progreso=lambda r: pendientes.append(gestor._nombres_pendientes))
+    assert pendientes == [False], "Error: una importación chica no debe diferir el índice"
+    assert len(gestor.buscar_productos_por_nombre("silla")) == 1, "Error en la fila importada"
+    
+    # Altas y bajas mientras se arma el índice, sin el candado de catálogo
+    gestor._diferir_indice_nombres()
+    assert [p.nombre for p in gestor.buscar_productos_por_nombre("silla")] == ["Silla"], \
+        "Error: con el índice pendiente se recorren los nombres"
+    recorrer = gestor.iterar_productos
+    def recorrer_con_cambios():
+        for numero, producto in enumerate(recorrer()):
+            if numero == 0:
+                gestor.eliminar_producto("PROD-1")      # Ya recorrido
+                gestor.eliminar_producto("PROD-3")      # Aún no recorrido
+                gestor.agregar_producto("Lámpara", 1, 1)
+            yield producto
+    gestor.iterar_productos = recorrer_con_cambios
+    gestor.armar_indice_nombres()
+    del gestor.iterar_productos
+    assert not gestor._nombres_pendientes and gestor._cambios_nombres is None, "Error al armar el índice"
+    assert gestor.buscar_productos_por_nombre("existente") == [], "Error: la baja debe aplicarse"
+    assert gestor.buscar_productos_por_nombre("arroz") == [], "Error: la baja debe aplicarse"
+    assert [p.nombre for p in gestor.buscar_productos_por_nombre("lámpara")] == ["Lámpara"], \
+        "Error: el alta debe aplicarse"
+    assert len(gestor._indice_nombres) == gestor.obtener_cantidad_total(), "Error en el índice armado"
+    
+    # Test 4: JSONL sobre el gestor SQLite
+    print("\n4. Importar JSONL en SQLite")
+    lineas = [
+        json.dumps({"nombre": "Silla", "cantidad": 4, "precio": 80, "categoria": "Hogar"}),
+        "[1, 2]",
+        "{roto",
+        json.dumps({"nombre": "Mesa", "cantidad": 2, "precio": 150.5}),
+        json.dumps({"nombre": "Lámpara", "cantidad": True, "precio": 10}),
+    ]
+    with tempfile.TemporaryDirectory() as directorio:
+        sqlite = GestorInventarioSQLite(os.path.join(directorio, "inventario.db"))
+        resumen = importar_catalogo(sqlite, io.BytesIO("\n".join(lineas).encode()), "jsonl")
+        assert resumen["importados"] == 2, "Error en importados JSONL"
+        assert [r["error"] for r in resumen["rechazos"]] == [
+            "Cada línea debe ser un objeto JSON", "JSON inválido", "Cantidad debe ser entera y precio numérico"
+        ], "Error en rechazos JSONL"
+        assert sqlite.buscar_productos_por_nombre("mesa")[0].precio == 150.5, "Error en producto JSONL"
+        sqlite.cerrar()
+    
+    # Test 5: Errores que detienen la importación
+    print("\n5. Cabecera incompleta, formato y codificación")
+    for flujo, formato in ((b"nombre,precio\nA,1\n", "csv"), (b"", "csv"), (b"{}", "xml"),
+                           (b"nombre,cantidad,precio\n\xff,1,1\n", "csv")):
+        try:
+            importar_catalogo(GestorInventario(), io.BytesIO(flujo), formato)
+            assert False, f"Error: debió rechazar {flujo!r} ({formato})"
+        except ValueError:
+            pass
+    
+    print("\n✅ Todos los tests del importador pasaron\n")
+
+
+def test_exportador():
+    """Pruebas para la exportación por flujo del catálogo y de las órdenes"""
+    print("=" * 50)
+    print("PRUEBAS: EXPORTADOR")
+    print("=" * 50)
+    
+    import csv
+    import gzip
+    import io
+    
+    gestor = GestorInventario()
+    gestor.agregar_producto("Laptop", 5, 999.99, "Electrónica")
+    gestor.agregar_producto("Arroz, 1kg", 50, 2, "Alimentos")
+    gestor.agregar_producto("Mouse", 10, 25.5, "Electrónica")
+    
+    # Test 1: CSV con cabecera y comillas
+    print("\n1. Catálogo en CSV")
+    texto = b"".join(exportador.exportar_productos(gestor, "csv")).decode()
+    filas = list(csv.reader(io.StringIO(texto)))
+    assert filas[0] == list(exportador.COLUMNAS_PRODUCTOS), "Error en cabecera CSV"
+    assert filas[2] == ["PROD-2", "Arroz, 1kg", "50", "2", "Alimentos", "100"], "Error en fila CSV"
+    assert len(filas) == 4, "Error en cantidad de filas"
+    
+    # Test 2: JSONL igual a la API y filtro por categoría
+    print("\n2. Catálogo en JSONL por categoría")
+    gestor.iterar_productos = None  # Con categoría se usa el índice, sin recorrer el catálogo
+    lineas = b"".join(exportador.exportar_productos(gestor, "jsonl", categoria="Electrónica")).splitlines()
+    del gestor.iterar_productos
+    assert [json.loads(l)["id"] for l in lineas] == ["PROD-1", "PROD-3"], "Error en filtro por categoría"
+    assert json.loads(lineas[0]) == gestor.buscar_producto_por_id("PROD-1").convertir_a_dict(), \
+        "Error: debe usar el formato de la API"
+    with tempfile.TemporaryDirectory() as directorio:
+        sqlite = GestorInventarioSQLite(os.path.join(directorio, "inventario.db"))
+        sqlite.agregar_productos_lote([(p.nombre, p.cantidad, p.precio, p.categoria)
+                                       for p in gestor.obtener_todos_productos()])
+        assert b"".join(exportador.exportar_productos(sqlite, "jsonl", categoria="Electrónica")) \
+            .splitlines() == lineas, "Error en la exportación por categoría de SQLite"
+        sqlite.cerrar()
+    
+    # Test 3: Muchos bloques y gzip
+    print("\n3. Bloques y compresión gzip")
+    gestor.agregar_productos_lote((f"Producto {i}", 1, 1) for i in range(1000))
+    bloques = list(exportador.exportar_productos(gestor, "ndjson"))
+    assert len(bloques) == 4, "Error: debe transmitir por bloques"
+    comprimido = b"".join(exportador.exportar_productos(gestor, "ndjson", comprimir=True))
+    assert gzip.decompress(comprimido) == b"".join(bloques), "Error en gzip"
+    assert len(comprimido) < len(b"".join(bloques)) // 4, "Error: gzip debe comprimir"
+    try:
+        exportador.exportar_productos(gestor, "xml")
+        assert False, "Error: debió rechazar el formato"
+    except ValueError:
+        pass
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        # Test 4: Órdenes en disco y memoria con rango de tiempo
+        print("\n4. Órdenes por rango de tiempo")
+        historial = HistorialOrdenes(capacidad=20, ruta=os.path.join(directorio, "historial.jsonl"))
+        for inicio in range(0, 300, 50):
+            historial.agregar_lote([{"id_orden": f"ORD-{i}", "id_cliente": "C", "total": 2,
+                                     "productos": [{"id_producto": "PROD-1", "cantidad": 1,
+                                                    "precio_unitario": 1, "subtotal": 1}] * 2}
+                                    for i in range(inicio, inicio + 50)])
+            time.sleep(0.002)
+        assert historial.en_memoria() == 20, "Error en historial de prueba"
+        todas = list(historial)
+        desde, hasta = todas[120]["procesada_en"], todas[290]["procesada_en"]
+        esperadas = [o["numero"] for o in todas if desde <= o["procesada_en"] <= hasta]
+        assert [o["numero"] for o in historial.recorrer(desde, hasta)] == esperadas, "Error en recorrer"
+        lineas = b"".join(exportador.exportar_ordenes(historial, "jsonl", desde, hasta)).splitlines()
+        assert [json.loads(l)["numero"] for l in lineas] == esperadas, "Error en órdenes exportadas"
+        
+        # Test 5: Órdenes en CSV (una fila por línea) a un archivo
+        print("\n5. Órdenes en CSV a archivo")
+        ruta = os.path.join(directorio, "ordenes.csv.gz")
+        escritos = exportador.guardar_exportacion(
+            exportador.exportar_ordenes(historial, "csv", hasta=todas[9]["procesada_en"], comprimir=True), ruta)
+        assert escritos == os.path.getsize(ruta) and not os.path.exists(ruta + ".tmp"), \
+            "Error al guardar la exportación"
+        with gzip.open(ruta, "rt", newline="") as archivo:
+            filas = list(csv.DictReader(archivo))
+        assert len(filas) >= 20 and len(filas) % 2 == 0, "Error: una fila por línea de orden"
+        assert filas[1]["id_orden"] == "ORD-0" and filas[1]["subtotal"] == "1", "Error en fila de orden"
+    
+    print("\n✅ Todos los tests del exportador pasaron\n")
+
+
 def test_integracion():
     """Test de integración completa"""
     print("=" * 50)
@@ -198,8 +1570,26 @@ def test_integracion():
 if __name__ == "__main__":
     try:
         test_lista_enlazada()
+        test_lista_doble()
         test_cola()
         test_gestor_inventario()
+        test_indice_por_id()
+        test_indice_por_categoria()
+        test_indice_ngramas()
+        test_reporte_incremental()
+        test_operaciones_lote()
+        test_cursor_productos()
+        test_versiones()
+        test_serializacion_producto()
+        test_cola_prioridad()
+        test_historial_ordenes()
+        test_diario()
+        test_instantanea()
+        test_lista_salto()
+        test_gestor_columnar()
+        test_gestor_sqlite()
+        test_importador()
+        test_exportador()
         test_integracion()
         
         print("=" * 50)